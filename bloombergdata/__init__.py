@@ -0,0 +1,11 @@
+"""
+BloombergData Command Line
+Single entry point for the collection scripts and schedulers:
+
+    python -m bloombergdata collect vix
+    python -m bloombergdata schedule daily
+    python -m bloombergdata status
+
+Only the standard library is imported at start-up; a command imports its
+collector (and with it pandas, numpy and blpapi) when it runs.
+"""
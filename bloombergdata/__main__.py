@@ -0,0 +1,5 @@
+import sys
+
+from bloombergdata.cli import main
+
+sys.exit(main())
@@ -0,0 +1,151 @@
+"""
+Command Line Interface
+argparse front end over the collection scripts, schedulers and run-state
+store. Heavy modules are imported inside the command that needs them, so
+`--help`, `status` and `metrics` start within STARTUP_BUDGET_MS while
+`collect` pays for pandas/blpapi only when it actually collects.
+"""
+
+import argparse
+import os
+import sys
+from collections import namedtuple
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPTS_DIR = os.path.join(PROJECT_ROOT, 'scripts')
+METRICS_DIR = os.path.join(PROJECT_ROOT, 'data', 'metrics')
+
+STARTUP_BUDGET_MS = 200     # --help and the light commands must start within this
+
+Command = namedtuple('Command', ['script', 'help'])
+
+COLLECTORS = {
+    'vix': Command('vix_data_fetcher.py', 'VIX futures and target-delta options'),
+    'vix-refresh': Command('refresh_vix_data.py', 'VIX spot/futures/options pipeline (pass --full, --days N)'),
+    'historical': Command('fetch_historical_volatility.py',
+                          'Incremental SPX + top 50 historical volatility (pass --csv, --legacy-latest)'),
+    'ten-year': Command('fetch_ten_year_volatility_data.py',
+                        '10-year volatility dataset (pass --local-realized, --csv, --legacy-latest)'),
+    'labeled': Command('fetch_labeled_volatility_data.py', 'Current labeled volatility snapshot'),
+    'spx-weights': Command('fetch_spx_weights.py', 'SPX index member weights'),
+    'spy-weights': Command('fetch_spy_weights.py', 'SPY holdings weights'),
+}
+
+SCHEDULERS = {
+    'vix': Command('vix_daily_scheduler.py', 'VIX collection after each session close (pass --create-configs)'),
+    'daily': Command('scheduler.py', 'Daily volatility/weights collection job graph'),
+}
+
+# Collections recorded in the run-state store by the fetchers
+COLLECTION_NAMES = ['vix_data', 'vix_refresh', 'historical_volatility', 'ten_year_volatility']
+
+
+def _run_script(command, extra_args):
+    """Import a script in-process and call its main(); returns an exit code"""
+    if PROJECT_ROOT not in sys.path:
+        sys.path.insert(0, PROJECT_ROOT)
+    from src.data_collection.job_dag import load_script
+
+    script_path = os.path.join(SCRIPTS_DIR, command.script)
+    # Scripts read their flags (--csv, --legacy-latest, ...) from sys.argv
+    sys.argv = [script_path, *extra_args]
+    result = load_script(script_path).main()
+    return 1 if result is False else 0
+
+
+def cmd_collect(args):
+    return _run_script(COLLECTORS[args.name], args.script_args)
+
+
+def cmd_schedule(args):
+    return _run_script(SCHEDULERS[args.name], args.script_args)
+
+
+def cmd_status(args):
+    if PROJECT_ROOT not in sys.path:
+        sys.path.insert(0, PROJECT_ROOT)
+    from src.data_collection.run_state import DEFAULT_DB_NAME, RunStateStore
+
+    db_path = os.path.join(PROJECT_ROOT, 'data', DEFAULT_DB_NAME)
+    if not os.path.exists(db_path):
+        print("No runs recorded yet")
+        return 0
+
+    store = RunStateStore(db_path)
+    stale = store.stale_collections(COLLECTION_NAMES, max_age_hours=args.stale_after)
+
+    print("Collections:")
+    for name in COLLECTION_NAMES:
+        last = store.last_collection(name)
+        if last is None:
+            print(f"  {name:<24} never run")
+            continue
+        flag = '  STALE' if name in stale else ''
+        print(f"  {name:<24} {last['status']:<8} {last['finished_at'] or 'running':<20} "
+              f"rows={last['rows'] or 0:,} failed_tasks={last['failed_tasks']}{flag}")
+
+    print("\nRecent runs:")
+    for run in store.recent_runs(limit=args.limit):
+        duration = f"{run['duration_seconds']:.0f}s" if run['duration_seconds'] is not None else '-'
+        print(f"  #{run['run_id']:<5} {run['scheduler']:<12} {run['session_date'] or '-':<11} "
+              f"{run['status']:<8} {run['started_at']}  {duration}")
+    return 1 if stale else 0
+
+
+def cmd_metrics(args):
+    if not os.path.isdir(METRICS_DIR):
+        print("No metrics exported yet")
+        return 0
+
+    if args.name is None:
+        for name in sorted(os.listdir(METRICS_DIR)):
+            if name.endswith('.prom'):
+                print(os.path.splitext(name)[0])
+        return 0
+
+    path = os.path.join(METRICS_DIR, f"{args.name}.{'json' if args.json else 'prom'}")
+    if not os.path.exists(path):
+        print(f"ERROR: No metrics exported for {args.name}")
+        return 1
+    with open(path) as f:
+        sys.stdout.write(f.read())
+    return 0
+
+
+def _add_script_command(subparsers, name, commands, handler, help_text):
+    parser = subparsers.add_parser(name, help=help_text,
+                                   description='\n'.join(f'  {key:<12} {command.help}'
+                                                         for key, command in commands.items()),
+                                   formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('name', choices=list(commands))
+    parser.add_argument('script_args', nargs=argparse.REMAINDER, help='Flags passed through to the script')
+    parser.set_defaults(handler=handler)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='bloombergdata',
+                                     description='Bloomberg volatility and VIX data collection')
+    subparsers = parser.add_subparsers(dest='command', metavar='command')
+    subparsers.required = True
+
+    _add_script_command(subparsers, 'collect', COLLECTORS, cmd_collect, 'Run one collection now')
+    _add_script_command(subparsers, 'schedule', SCHEDULERS, cmd_schedule, 'Run a scheduler in the foreground')
+
+    status = subparsers.add_parser('status', help='Last collections and scheduler runs from the run-state store')
+    status.add_argument('--limit', type=int, default=10, help='Scheduler runs to list')
+    status.add_argument('--stale-after', type=float, default=30, help='Hours without success before stale')
+    status.set_defaults(handler=cmd_status)
+
+    metrics = subparsers.add_parser('metrics', help='Show exported instrumentation metrics')
+    metrics.add_argument('name', nargs='?', help='Metrics file (e.g. vix_data); lists them when omitted')
+    metrics.add_argument('--json', action='store_true', help='Show the JSON export instead of Prometheus text')
+    metrics.set_defaults(handler=cmd_metrics)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        return args.handler(args)
+    except KeyboardInterrupt:
+        return 130
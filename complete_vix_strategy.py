@@ -15,6 +15,9 @@ import time
 from pathlib import Path
 import logging
 
+from src.analysis.black76 import attach_forward, fill_missing_greeks
+from src.analysis.vix_term_structure import GENERIC_FUTURES, attach_expiries
+
 try:
     import blpapi
     print("✅ Bloomberg API imported successfully")
@@ -201,10 +204,30 @@ class CompleteVIXStrategy:
         
         return pd.DataFrame(all_option_data)
     
-    def identify_target_delta_options(self, options_df):
-        """Identify specific options closest to target deltas for position entry"""
+    def identify_target_delta_options(self, options_df, futures_df=None, expiry_calendar=None):
+        """
+        Identify specific options closest to target deltas for position entry
+        
+        futures_df: optional UX strip history; options missing DELTA_MID/IVOL_MID
+        get Black-76 greeks off the future expiring with them on their quote date
+        expiry_calendar: expiries the option tickers were built from, so each
+        generic future is matched to the same expiry dates
+        """
         print("🎯 Identifying target delta options for strategy entry...")
         
+        # Options quoted after their expiry have no time value left to price
+        expired = pd.to_datetime(options_df['expiry_date']) < pd.to_datetime(options_df['date'])
+        if expired.any():
+            print(f"⚠️  Dropping {expired.sum()} options quoted after their expiry")
+            options_df = options_df[~expired]
+        
+        if futures_df is not None and len(futures_df) > 0:
+            expiries = [exp['expiry_date'] for exp in expiry_calendar] if expiry_calendar else None
+            futures = attach_expiries(futures_df, expiries=expiries)
+            futures['forward_price'] = futures['settle'].fillna(futures['last'])
+            forward = attach_forward(options_df, futures, price_column='forward_price')
+            options_df = fill_missing_greeks(options_df, forward, price_column='mid', vol_column='ivol')
+        
         target_positions = []
         
         # Group by expiry to find entry points for each monthly cycle
@@ -263,12 +286,13 @@ class CompleteVIXStrategy:
         return pd.DataFrame(target_positions)
     
     def get_historical_futures_data(self):
-        """Get historical UX1 (front month) futures data for hedging"""
-        print("📊 Collecting UX1 front month futures data for hedging...")
+        """Get UX futures strip data: UX1 for hedging, UX1-UX9 as option forwards"""
+        print("📊 Collecting UX futures strip data for hedging and forwards...")
         
         try:
             request = self.refDataService.createRequest("HistoricalDataRequest")
-            request.getElement("securities").appendValue("UX1 Index")
+            for ticker in GENERIC_FUTURES:
+                request.getElement("securities").appendValue(ticker)
             
             for field in ["PX_LAST", "PX_SETTLE", "PX_VOLUME", "OPEN_INT"]:
                 request.getElement("fields").appendValue(field)
@@ -284,9 +308,10 @@ class CompleteVIXStrategy:
             while True:
                 event = self.session.nextEvent(30000)
                 
-                if event.eventType() == blpapi.Event.RESPONSE:
+                if event.eventType() in (blpapi.Event.PARTIAL_RESPONSE, blpapi.Event.RESPONSE):
                     for msg in event:
                         securityData = msg.getElement("securityData")
+                        security = securityData.getElementAsString("security")
                         
                         if securityData.hasElement("fieldData"):
                             fieldDataArray = securityData.getElement("fieldData")
@@ -297,21 +322,23 @@ class CompleteVIXStrategy:
                                 
                                 row = {
                                     'date': trade_date.strftime('%Y-%m-%d'),
-                                    'ticker': 'UX1 Index',
+                                    'ticker': security,
                                     'last': fieldData.getElement("PX_LAST").getValue() if fieldData.hasElement("PX_LAST") else np.nan,
                                     'settle': fieldData.getElement("PX_SETTLE").getValue() if fieldData.hasElement("PX_SETTLE") else np.nan,
                                     'volume': fieldData.getElement("PX_VOLUME").getValue() if fieldData.hasElement("PX_VOLUME") else np.nan,
                                     'open_interest': fieldData.getElement("OPEN_INT").getValue() if fieldData.hasElement("OPEN_INT") else np.nan
                                 }
                                 futures_data.append(row)
-                    break
+                    
+                    if event.eventType() == blpapi.Event.RESPONSE:
+                        break
                 
                 if event.eventType() == blpapi.Event.TIMEOUT:
                     print("⚠️  Timeout getting futures data")
                     break
             
             df = pd.DataFrame(futures_data)
-            print(f"✅ Collected {len(df)} UX1 futures records")
+            print(f"✅ Collected {len(df)} UX futures strip records")
             return df
             
         except Exception as e:
@@ -349,11 +376,13 @@ class CompleteVIXStrategy:
                 print("❌ No option data retrieved")
                 return None
             
-            # 3. Identify target delta positions
-            target_positions_df = self.identify_target_delta_options(options_df)
+            # 3. Get the UX strip: each option is priced off the future expiring with it, UX1 is the hedge
+            strip_df = self.get_historical_futures_data()
+            futures_df = strip_df[strip_df['ticker'] == 'UX1 Index'].reset_index(drop=True) if len(strip_df) > 0 else strip_df
             
-            # 4. Get futures data
-            futures_df = self.get_historical_futures_data()
+            # 4. Identify target delta positions
+            target_positions_df = self.identify_target_delta_options(options_df, futures_df=strip_df,
+                                                                     expiry_calendar=expiry_calendar)
             
             # 5. Collect and save strategy data
             strategy_data = {
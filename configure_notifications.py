@@ -83,13 +83,17 @@ def setup_schedule_config():
     
     config = {}
     
-    # Collection time
-    time_input = input("Daily collection time (HH:MM, default: 18:30): ").strip()
-    config['daily_collection_time'] = time_input if time_input else "18:30"
+    # Collection starts after the close once the settlement is published; non-trading days are skipped
+    close_input = input("Exchange close time (HH:MM ET, default: 16:00): ").strip()
+    config['close_time'] = close_input if close_input else "16:00"
     
-    # Weekend collection
-    weekend_input = input("Collect data on weekends? (y/n, default: n): ").lower()
-    config['weekend_collection'] = weekend_input.startswith('y')
+    config['probe_ticker'] = input("Settlement probe security (default: UX1 Index): ").strip() or "UX1 Index"
+    config['probe_field'] = input("Settlement probe field (default: PX_SETTLE): ").strip() or "PX_SETTLE"
+    config['settle_delay_minutes'] = 15
+    config['probe_interval_minutes'] = 5
+    
+    deadline_input = input("Latest collection start if the settlement is late (HH:MM, default: 18:30): ").strip()
+    config['deadline_time'] = deadline_input if deadline_input else "18:30"
     
     # Retry settings
     retry_input = input("Number of retry attempts on failure (default: 3): ").strip()
@@ -249,9 +253,11 @@ def main():
         print("3. Check logs for any issues")
         
         # Show schedule summary
-        print(f"\n📅 Your schedule:")
-        print(f"   Collection time: {schedule_config['daily_collection_time']}")
-        print(f"   Weekend collection: {'Yes' if schedule_config['weekend_collection'] else 'No'}")
+        print("\n📅 Your schedule:")
+        print(f"   Collection: after the {schedule_config['close_time']} close, once "
+              f"{schedule_config['probe_ticker']} {schedule_config['probe_field']} is published "
+              f"(by {schedule_config['deadline_time']} at the latest)")
+        print("   Non-trading days: skipped")
         print(f"   Retry attempts: {schedule_config['retry_attempts']}")
         print(f"   Success alerts: {'Yes' if schedule_config['alert_on_success'] else 'No'}")
         print(f"   Failure alerts: {'Yes' if schedule_config['alert_on_failure'] else 'No'}")
@@ -0,0 +1,92 @@
+"""
+Deduplicated Volatility Store Builder
+Fold every saved volatility pull under data/raw, data/processed and
+data/historical_volatility into the content-addressed volatility store
+
+Only volatility columns (the store's VOLATILITY_COLUMNS) are ingested; files
+without any (weights, holdings, market caps) are skipped. Each ingest adds a
+pack file, so the build skips the per-ingest compaction and compacts the store
+into one pack once at the end.
+"""
+
+import sys
+import os
+import time
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+import pandas as pd
+
+from src.utils.dedupe_store import DedupeVolatilityStore
+
+SOURCE_DIRS = [
+    os.path.join('data', 'raw'),
+    os.path.join('data', 'processed'),
+    os.path.join('data', 'historical_volatility')
+]
+DATE_COLUMNS = ['date', 'collection_timestamp', 'timestamp']
+STORE_DIR = os.path.join(project_root, 'data', 'volatility_store')
+
+
+def find_source_files():
+    """List CSV/Parquet files under the source directories, oldest first"""
+    files = []
+    for source_dir in SOURCE_DIRS:
+        for root, _, names in os.walk(os.path.join(project_root, source_dir)):
+            for name in names:
+                if name.endswith('.csv') or name.endswith('.parquet'):
+                    files.append(os.path.join(root, name))
+    # Oldest pulls first so later restatements land in the revision log
+    return sorted(files, key=os.path.getmtime)
+
+
+def main():
+    """Main execution function"""
+    print("=" * 70)
+    print("DEDUPLICATED VOLATILITY STORE BUILD")
+    print("=" * 70)
+
+    store = DedupeVolatilityStore(STORE_DIR)
+    files = find_source_files()
+    print(f"Found {len(files)} candidate files")
+
+    start = time.time()
+    totals = {'observations': 0, 'blocks_unchanged': 0, 'blocks_written': 0, 'revisions': 0}
+
+    for path in files:
+        try:
+            df = pd.read_parquet(path) if path.endswith('.parquet') else pd.read_csv(path)
+        except Exception as e:
+            print(f"   WARNING: Could not read {path}: {e}")
+            continue
+
+        date_column = next((col for col in DATE_COLUMNS if col in df.columns), None)
+        if 'ticker' not in df.columns or date_column is None:
+            continue
+        if not store.value_columns(df, date_column):
+            # Weights, holdings and other non-volatility datasets stay out of the store
+            continue
+
+        stats = store.ingest(df, os.path.relpath(path, project_root), date_column=date_column, compact=False)
+        for key in totals:
+            totals[key] += stats[key]
+        print(f"   {os.path.relpath(path, project_root)}: "
+              f"{stats['blocks_written']} new blocks, {stats['blocks_unchanged']} unchanged, "
+              f"{stats['revisions']} revisions")
+
+    compaction = store.compact()
+
+    print(f"\nSUCCESS: Store built in {time.time() - start:.1f}s")
+    print(f"   Observations ingested: {totals['observations']:,}")
+    print(f"   Blocks written: {totals['blocks_written']:,}")
+    print(f"   Blocks deduplicated: {totals['blocks_unchanged']:,}")
+    print(f"   Revisions logged: {totals['revisions']:,}")
+    print(f"   Packs compacted: {compaction['packs_before']} -> {compaction['packs_before'] - compaction['packs_removed']}")
+    print(f"   Store: {STORE_DIR}")
+    return True
+
+
+if __name__ == "__main__":
+    main()
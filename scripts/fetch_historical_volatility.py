@@ -21,7 +21,31 @@ except ImportError as e:
     print(f"IMPORT ERROR: {e}")
     SPX_TICKER = 'SPX Index'
 
-class HistoricalVolatilityFetcher:
+from src.analysis.vol_matrix_cache import VolatilityMatrixCache
+from src.data_collection.run_state import DEFAULT_DB_NAME, RunStateStore
+from src.data_collection.session_pool import PooledSessionMixin
+from src.data_collection.task_runner import RetryableTaskError, TaskRunner, build_tasks
+from src.utils.columnar_writer import ColumnarDatasetWriter
+from src.utils.dedupe_store import DedupeVolatilityStore
+from src.utils.instrumentation import METRICS, InstrumentedSession
+
+COLLECTION_NAME = 'historical_volatility'
+
+def data_needs():
+    """Realized and implied history this job needs, for the request planner"""
+    from src.data_collection.request_planner import DataNeed
+
+    fetcher = HistoricalVolatilityFetcher()
+    tickers = fetcher.load_spx_components()
+    start_date, end_date = fetcher.get_collection_date_range(incremental=True)
+    if not tickers or not start_date:
+        return []
+    return [
+        DataNeed('realized', tickers, fetcher.realized_fields, start_date, end_date),
+        DataNeed('implied', tickers, fetcher.implied_fields, start_date, end_date)
+    ]
+
+class HistoricalVolatilityFetcher(PooledSessionMixin):
     """Fetch comprehensive historical volatility data with incremental updates"""
     
     def __init__(self):
@@ -29,7 +53,11 @@ class HistoricalVolatilityFetcher:
         self.refDataService = None
         self.project_root = project_root
         self.data_dir = os.path.join(project_root, 'data', 'historical_volatility')
-        self.log_file = os.path.join(self.data_dir, 'collection_log.json')
+        self.log_file = os.path.join(self.data_dir, 'collection_log.json')  # Legacy log, read until the first recorded run
+        self.run_state = RunStateStore(os.path.join(project_root, 'data', DEFAULT_DB_NAME))
+        self.writer = ColumnarDatasetWriter(self.data_dir, 'historical_volatility')
+        self.store = DedupeVolatilityStore(os.path.join(project_root, 'data', 'volatility_store'))
+        self.matrix_cache = VolatilityMatrixCache(os.path.join(self.data_dir, 'matrix_cache', 'historical_volatility'))
         
         # Volatility field mappings
         self.realized_fields = {
@@ -53,11 +81,19 @@ class HistoricalVolatilityFetcher:
         # Create directories
         os.makedirs(self.data_dir, exist_ok=True)
     
-    def connect(self):
-        """Connect to Bloomberg Terminal"""
+    def connect(self, session_pool=None):
+        """Connect to Bloomberg Terminal, or borrow a session from a shared pool"""
+        if session_pool is not None:
+            try:
+                self.borrow_session(session_pool)
+                return True
+            except Exception as e:
+                print(f"ERROR: Bloomberg connection failed: {e}")
+                return False
+        
         try:
             sessionOptions = blpapi.SessionOptions()
-            self.session = blpapi.Session(sessionOptions)
+            self.session = InstrumentedSession(blpapi.Session(sessionOptions))
             
             if not self.session.start():
                 print("ERROR: Failed to start Bloomberg session")
@@ -102,33 +138,28 @@ class HistoricalVolatilityFetcher:
             return None
     
     def load_collection_log(self):
-        """Load collection log to track what's been collected"""
+        """Latest successful collection from the run-state store"""
         try:
+            last = self.run_state.last_collection(COLLECTION_NAME, status='success')
+            if last:
+                return {
+                    'last_collection_date': last['end_date'],
+                    'securities_collected': last['details'].get('securities_collected', []),
+                    'total_observations': last['rows'],
+                    'last_updated': last['finished_at']
+                }
             if os.path.exists(self.log_file):
                 with open(self.log_file, 'r') as f:
                     return json.load(f)
-            else:
-                # Initialize new log
-                return {
-                    'last_collection_date': None,
-                    'securities_collected': [],
-                    'date_ranges': {},
-                    'total_observations': 0,
-                    'created': datetime.now().isoformat()
-                }
+            return {
+                'last_collection_date': None,
+                'securities_collected': [],
+                'total_observations': 0
+            }
         except Exception as e:
             print(f"WARNING: Could not load collection log: {e}")
             return {}
     
-    def save_collection_log(self, log_data):
-        """Save collection log"""
-        try:
-            log_data['last_updated'] = datetime.now().isoformat()
-            with open(self.log_file, 'w') as f:
-                json.dump(log_data, f, indent=2, default=str)
-        except Exception as e:
-            print(f"WARNING: Could not save collection log: {e}")
-    
     def get_collection_date_range(self, incremental=True):
         """Determine date range for collection"""
         try:
@@ -156,106 +187,135 @@ class HistoricalVolatilityFetcher:
             print(f"ERROR: Failed to determine date range: {e}")
             return None, None
     
-    def fetch_historical_volatility(self, tickers, vol_fields, start_date, end_date, data_type):
-        """Fetch historical volatility data for given tickers and date range"""
-        try:
-            print(f"INFO: Fetching {data_type} volatility data...")
-            print(f"   Securities: {len(tickers)}")
-            print(f"   Fields: {list(vol_fields.keys())}")
-            print(f"   Date range: {start_date} to {end_date}")
-            
-            all_data = []
-            bloomberg_fields = list(vol_fields.values())
-            
-            # Process securities in batches
-            batch_size = 10
-            for batch_idx in range(0, len(tickers), batch_size):
-                batch_tickers = tickers[batch_idx:batch_idx + batch_size]
-                batch_num = batch_idx // batch_size + 1
-                total_batches = (len(tickers) + batch_size - 1) // batch_size
-                
-                print(f"   Processing batch {batch_num}/{total_batches}: {len(batch_tickers)} securities")
-                
-                for ticker in batch_tickers:
-                    print(f"     Fetching {ticker}...")
+    def fetch_security(self, ticker, vol_fields, start_date, end_date, data_type):
+        """
+        Fetch one security's history for one field group
+
+        Returns an empty DataFrame for a security Bloomberg rejects (retrying
+        cannot help); raises RetryableTaskError on a timeout.
+        """
+        request = self.refDataService.createRequest("HistoricalDataRequest")
+        request.getElement("securities").appendValue(ticker)
+        
+        for field in vol_fields.values():
+            request.getElement("fields").appendValue(field)
+        
+        request.set("startDate", start_date)
+        request.set("endDate", end_date)
+        request.set("periodicitySelection", "DAILY")
+        
+        self.session.sendRequest(request)
+        
+        # Process response
+        ticker_data = []
+        while True:
+            event = self.session.nextEvent(10000)  # 10 second timeout
+            
+            if event.eventType() == blpapi.Event.RESPONSE:
+                with METRICS.timer('parse_seconds', source='historical_volatility'):
+                    for msg in event:
+                        securityData = msg.getElement("securityData")
                     
-                    try:
-                        request = self.refDataService.createRequest("HistoricalDataRequest")
-                        request.getElement("securities").appendValue(ticker)
-                        
-                        for field in bloomberg_fields:
-                            request.getElement("fields").appendValue(field)
-                        
-                        request.set("startDate", start_date)
-                        request.set("endDate", end_date)
-                        request.set("periodicitySelection", "DAILY")
-                        
-                        self.session.sendRequest(request)
+                        if securityData.hasElement("securityError"):
+                            print(f"       WARNING: Error for {ticker}")
+                            break
+                    
+                        fieldDataArray = securityData.getElement("fieldData")
+                    
+                        for i in range(fieldDataArray.numValues()):
+                            fieldData = fieldDataArray.getValue(i)
+                            date = fieldData.getElement("date").getValue()
                         
-                        # Process response
-                        ticker_data = []
-                        while True:
-                            event = self.session.nextEvent(10000)  # 10 second timeout
-                            
-                            if event.eventType() == blpapi.Event.RESPONSE:
-                                for msg in event:
-                                    securityData = msg.getElement("securityData")
-                                    
-                                    if securityData.hasElement("securityError"):
-                                        print(f"       WARNING: Error for {ticker}")
-                                        break
-                                    
-                                    fieldDataArray = securityData.getElement("fieldData")
-                                    
-                                    for i in range(fieldDataArray.numValues()):
-                                        fieldData = fieldDataArray.getValue(i)
-                                        date = fieldData.getElement("date").getValue()
-                                        
-                                        row_data = {
-                                            'date': date.strftime('%Y-%m-%d'),
-                                            'ticker': ticker,
-                                            'data_type': data_type
-                                        }
-                                        
-                                        # Map Bloomberg fields to clean names
-                                        for clean_name, bloomberg_field in vol_fields.items():
-                                            if fieldData.hasElement(bloomberg_field):
-                                                value = fieldData.getElement(bloomberg_field).getValue()
-                                                row_data[clean_name] = value if value is not None else np.nan
-                                            else:
-                                                row_data[clean_name] = np.nan
-                                        
-                                        ticker_data.append(row_data)
-                                break
-                            
-                            if event.eventType() == blpapi.Event.TIMEOUT:
-                                print(f"       WARNING: Timeout for {ticker}")
-                                break
+                            row_data = {
+                                'date': date.strftime('%Y-%m-%d'),
+                                'ticker': ticker,
+                                'data_type': data_type
+                            }
                         
-                        all_data.extend(ticker_data)
-                        print(f"       Retrieved {len(ticker_data)} observations")
+                            # Map Bloomberg fields to clean names
+                            for clean_name, bloomberg_field in vol_fields.items():
+                                if fieldData.hasElement(bloomberg_field):
+                                    value = fieldData.getElement(bloomberg_field).getValue()
+                                    row_data[clean_name] = value if value is not None else np.nan
+                                else:
+                                    row_data[clean_name] = np.nan
                         
-                    except Exception as e:
-                        print(f"       ERROR: Failed to fetch {ticker}: {e}")
-                        continue
-            
-            if all_data:
-                df = pd.DataFrame(all_data)
-                df['date'] = pd.to_datetime(df['date'])
-                df = df.sort_values(['date', 'ticker'])
-                
-                print(f"SUCCESS: Retrieved {len(df)} total observations for {data_type}")
-                return df
-            else:
-                print(f"WARNING: No data retrieved for {data_type}")
-                return pd.DataFrame()
-                
-        except Exception as e:
-            print(f"ERROR: Failed to fetch {data_type} data: {e}")
-            return pd.DataFrame()
+                            ticker_data.append(row_data)
+                break
+            
+            if event.eventType() == blpapi.Event.TIMEOUT:
+                self.session_timed_out = True
+                raise RetryableTaskError(f"Timeout for {ticker}")
+        
+        METRICS.inc('rows_parsed_total', len(ticker_data), source='historical_volatility')
+        print(f"     {ticker} ({data_type}): {len(ticker_data)} observations")
+        return pd.DataFrame(ticker_data)
+    
+    def fetch_historical_volatility(self, tickers, start_date, end_date, runner=None):
+        """
+        Fetch realized and implied volatility for every ticker as independent tasks
+        
+        Each (ticker, field group) is one task; a failed task is retried on its
+        own with backoff and tasks finished by an earlier run over the same date
+        range are read back from the task journal instead of re-requested.
+        
+        Returns (DataFrame of all journaled observations, runner summary).
+        """
+        field_groups = {'realized': self.realized_fields, 'implied': self.implied_fields}
+        runner = runner or TaskRunner(os.path.join(self.data_dir, 'task_journal', f'{start_date}_{end_date}'))
+        tasks = build_tasks(tickers, list(field_groups), start_date, end_date)
+        
+        print("INFO: Fetching historical volatility data...")
+        print(f"   Securities: {len(tickers)}")
+        print(f"   Field groups: {list(field_groups)}")
+        print(f"   Date range: {start_date} to {end_date}")
+        print(f"   Tasks: {len(tasks)}")
+        
+        def fetch_task(task):
+            return self.fetch_security(task.security, field_groups[task.field_group],
+                                       task.start_date, task.end_date, task.field_group)
+        
+        summary = runner.run(tasks, fetch_task)
+        df = runner.load(tasks)
+        
+        if df.empty:
+            print("WARNING: No volatility data retrieved")
+            return df, summary
+        
+        df['date'] = pd.to_datetime(df['date'])
+        df = df.sort_values(['date', 'ticker'])
+        print(f"SUCCESS: Retrieved {len(df)} total observations "
+              f"({summary['completed']} tasks fetched, {summary['skipped']} from journal, "
+              f"{len(summary['failed'])} failed)")
+        return df, summary
+    
+    def volatility_from_planned(self, planned):
+        """
+        Realized and implied observations from rows the request planner fetched
+
+        Returns (DataFrame, summary) shaped like fetch_historical_volatility's.
+        """
+        frames = []
+        for data_type in ('realized', 'implied'):
+            frame = planned.frame(data_type)
+            if not frame.empty:
+                frame = frame.copy()
+                frame.insert(2, 'data_type', data_type)
+                frames.append(frame)
+        summary = {'completed': 0, 'skipped': 0, 'retries': 0,
+                   'failed': {ticker: 'Planned request failed' for ticker in planned.failed_securities}}
+        
+        if not frames:
+            print("WARNING: No volatility data retrieved")
+            return pd.DataFrame(), summary
+        
+        df = pd.concat(frames, ignore_index=True).sort_values(['date', 'ticker'])
+        print(f"SUCCESS: Retrieved {len(df)} total observations from the planned requests "
+              f"({len(planned.failed_securities)} securities failed)")
+        return df, summary
     
-    def save_volatility_data(self, realized_df, implied_df, start_date, end_date):
-        """Save volatility data in both CSV and Parquet formats"""
+    def save_volatility_data(self, realized_df, implied_df, start_date, end_date, export_csv=False):
+        """Save volatility data as a single Parquet file, with CSV export on demand"""
         try:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             
@@ -271,28 +331,43 @@ class HistoricalVolatilityFetcher:
                 return None
             
             print(f"INFO: Saving {len(combined_df)} observations...")
-            
-            # Save main time series files
-            base_filename = f'historical_volatility_timeseries_{start_date}_{end_date}_{timestamp}'
-            
-            # CSV format
-            csv_file = os.path.join(self.data_dir, f'{base_filename}.csv')
-            combined_df.to_csv(csv_file, index=False)
-            print(f"SUCCESS: CSV saved to: {csv_file}")
-            
-            # Parquet format
-            parquet_file = os.path.join(self.data_dir, f'{base_filename}.parquet')
-            combined_df.to_parquet(parquet_file, index=False)
-            print(f"SUCCESS: Parquet saved to: {parquet_file}")
-            
-            # Also save latest versions (for easy access)
-            latest_csv = os.path.join(self.data_dir, 'historical_volatility_latest.csv')
-            latest_parquet = os.path.join(self.data_dir, 'historical_volatility_latest.parquet')
-            
-            combined_df.to_csv(latest_csv, index=False)
-            combined_df.to_parquet(latest_parquet, index=False)
-            
-            print(f"SUCCESS: Latest files updated")
+            tag = f'timeseries_{start_date}_{end_date}_{timestamp}'
+            
+            # Fold the pull into the deduplicated store (one copy per block, restatements logged);
+            # the published dataset is the store's unified history, not just this pull
+            dataset_df = combined_df
+            try:
+                store_stats = self.store.ingest(combined_df, tag)
+                print(f"SUCCESS: Store: {store_stats['blocks_written']} new blocks, "
+                      f"{store_stats['revisions']} revisions"
+                      f"{', compacted' if store_stats['compacted'] else ''}")
+                history_start = datetime.now() - timedelta(days=3*365)
+                dataset_df = self.store.load_frame(
+                    {'realized': self.realized_fields, 'implied': self.implied_fields},
+                    tickers=combined_df['ticker'].unique().tolist(), start_date=history_start.strftime('%Y-%m-%d')
+                )
+            except Exception as e:
+                print(f"WARNING: Could not update volatility store, publishing this pull only: {e}")
+            
+            # Single Parquet write; the latest manifest is switched atomically
+            parquet_file = self.writer.write(dataset_df, tag=tag)
+            print(f"SUCCESS: Parquet saved to: {parquet_file} ({len(dataset_df)} rows)")
+            print(f"SUCCESS: Latest manifest updated: {self.writer.manifest_file}")
+            if self.writer.legacy_latest:
+                print(f"SUCCESS: Legacy latest files updated: {self.writer.latest_csv_file}")
+            
+            # Fold the new rows into the (date x ticker) matrix cache
+            try:
+                matrices = self.matrix_cache.refresh_all(combined_df)
+                print(f"SUCCESS: Matrix cache: {len(matrices)} matrices refreshed")
+            except Exception as e:
+                print(f"WARNING: Could not refresh matrix cache: {e}")
+            
+            # Timestamped CSV copy only when explicitly requested
+            csv_file = None
+            if export_csv:
+                csv_file = self.writer.export_csv(parquet_file.replace('.parquet', '.csv'), parquet_file)
+                print(f"SUCCESS: CSV saved to: {csv_file}")
             
             # Create summary
             summary = {
@@ -319,20 +394,26 @@ class HistoricalVolatilityFetcher:
             
             print(f"SUCCESS: Summary saved to: {summary_file}")
             
-            return csv_file, parquet_file, summary
+            return parquet_file, csv_file, summary
             
         except Exception as e:
             print(f"ERROR: Failed to save volatility data: {e}")
             return None
     
     def disconnect(self):
-        """Disconnect from Bloomberg"""
-        if self.session:
+        """Disconnect from Bloomberg (pooled sessions go back to the pool unless a request timed out)"""
+        if not self.return_session() and self.session:
             self.session.stop()
             print("SUCCESS: Bloomberg session disconnected")
 
-def main():
-    """Main execution function for historical volatility collection"""
+def main(session_pool=None, prefetched=None):
+    """
+    Main execution function for historical volatility collection
+
+    prefetched: PlannedData from the request planner; when given, the data is
+    taken from it instead of requested here, except for securities whose
+    planned request failed, which are fetched on this job's session.
+    """
     print("="*80)
     print("HISTORICAL VOLATILITY DATA COLLECTION")
     print("="*80)
@@ -340,10 +421,13 @@ def main():
     print("Collecting 3 years of historical volatility data for SPX + Top 50 components...")
     
     fetcher = HistoricalVolatilityFetcher()
+    # Pass --legacy-latest to also refresh historical_volatility_latest.parquet/.csv
+    fetcher.writer.legacy_latest = '--legacy-latest' in sys.argv
+    collection_id = None
     
     try:
-        # Connect to Bloomberg
-        if not fetcher.connect():
+        # Connect to Bloomberg (not needed when the planner already fetched the data)
+        if prefetched is None and not fetcher.connect(session_pool):
             return False
         
         # Load SPX components
@@ -354,35 +438,63 @@ def main():
         
         # Determine collection date range
         print("\n2. Determining collection date range...")
-        start_date, end_date = fetcher.get_collection_date_range(incremental=True)
+        if prefetched is not None:
+            # The range the planner fetched, not one recomputed after it ran
+            need = prefetched.needs['realized']
+            start_date, end_date = need.start_date.strftime('%Y%m%d'), need.end_date.strftime('%Y%m%d')
+        else:
+            start_date, end_date = fetcher.get_collection_date_range(incremental=True)
         if not start_date or not end_date:
             return False
         
-        # Collect realized volatility data
-        print("\n3. Collecting historical realized volatility...")
-        realized_df = fetcher.fetch_historical_volatility(
-            tickers, fetcher.realized_fields, start_date, end_date, 'realized'
-        )
+        collection_id = fetcher.run_state.start_collection(COLLECTION_NAME, start_date, end_date)
         
-        # Collect implied volatility data  
-        print("\n4. Collecting historical implied volatility...")
-        implied_df = fetcher.fetch_historical_volatility(
-            tickers, fetcher.implied_fields, start_date, end_date, 'implied'
-        )
+        # Collect realized and implied volatility data
+        print("\n3. Collecting historical realized and implied volatility...")
+        if prefetched is not None:
+            runner = None
+            volatility_df, task_summary = fetcher.volatility_from_planned(prefetched)
+            if prefetched.failed_securities:
+                # Fetched here on this job's own session so a retry does not replay the planner's failure
+                print(f"INFO: Fetching {len(prefetched.failed_securities)} securities whose planned request failed...")
+                if not fetcher.connect(session_pool):
+                    raise ConnectionError("Bloomberg connection failed")
+                runner = TaskRunner(os.path.join(fetcher.data_dir, 'task_journal', f'{start_date}_{end_date}'))
+                retry_df, task_summary = fetcher.fetch_historical_volatility(
+                    prefetched.failed_securities, start_date, end_date, runner)
+                volatility_df = pd.concat([volatility_df, retry_df], ignore_index=True).sort_values(['date', 'ticker'])
+        else:
+            runner = TaskRunner(os.path.join(fetcher.data_dir, 'task_journal', f'{start_date}_{end_date}'))
+            volatility_df, task_summary = fetcher.fetch_historical_volatility(tickers, start_date, end_date, runner)
+        realized_df = volatility_df[volatility_df['data_type'] == 'realized'] if not volatility_df.empty else volatility_df
+        implied_df = volatility_df[volatility_df['data_type'] == 'implied'] if not volatility_df.empty else volatility_df
         
         # Save all data
-        print("\n5. Saving historical volatility data...")
-        result = fetcher.save_volatility_data(realized_df, implied_df, start_date, end_date)
+        print("\n4. Saving historical volatility data...")
+        # Pass --csv to also export a CSV copy for tools that still need one
+        result = fetcher.save_volatility_data(
+            realized_df, implied_df, start_date, end_date, export_csv='--csv' in sys.argv
+        )
         
         if result:
-            csv_file, parquet_file, summary = result
+            parquet_file, csv_file, summary = result
+            
+            # Record the collection; the range only advances once every task succeeded
+            fetcher.run_state.finish_collection(
+                collection_id, 'partial' if task_summary['failed'] else 'success',
+                rows=summary['total_observations'], securities=summary['securities_count'],
+                retries=task_summary['retries'], failed_tasks=len(task_summary['failed']),
+                details={'securities_collected': tickers, 'failed_tasks': task_summary['failed'],
+                         'parquet_file': parquet_file}
+            )
+            
+            if task_summary['failed']:
+                print(f"\nERROR: {len(task_summary['failed'])} task(s) still failing; "
+                      f"partial data saved, re-run to retry only those")
+                return False
             
-            # Update collection log
-            log_data = fetcher.load_collection_log()
-            log_data['last_collection_date'] = end_date
-            log_data['securities_collected'] = tickers
-            log_data['total_observations'] = summary['total_observations']
-            fetcher.save_collection_log(log_data)
+            if runner is not None:
+                runner.clear()
             
             print(f"\nSUCCESS: Historical volatility collection completed!")
             print(f"   Total observations: {summary['total_observations']:,}")
@@ -393,15 +505,19 @@ def main():
             
             return True
         else:
+            fetcher.run_state.finish_collection(collection_id, 'failed', error='Failed to save data')
             print("ERROR: Failed to save data")
             return False
             
     except Exception as e:
+        if collection_id is not None:
+            fetcher.run_state.finish_collection(collection_id, 'failed', error=str(e))
         print(f"ERROR: Error in main execution: {e}")
         return False
     
     finally:
         fetcher.disconnect()
+        METRICS.export(os.path.join(project_root, 'data', 'metrics'), COLLECTION_NAME)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -13,6 +13,8 @@ import json
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, project_root)
 
+from src.data_collection.session_pool import PooledSessionMixin
+
 try:
     import blpapi
     from config.bloomberg_config import SPX_TICKER, VOLATILITY_FIELDS, CLEAN_COLUMN_NAMES
@@ -26,15 +28,70 @@ except ImportError as e:
         'implied_vol_3m_atm': '3MTH_IMPVOL_100.0%MNY_DF'
     }
 
-class VolatilityDataFetcher:
+# Securities to process
+SECURITIES = [
+    SPX_TICKER,  # SPX Index first
+    'SPY US Equity',  # SPY ETF
+    # Top 20 SPX components
+    'AAPL US Equity', 'MSFT US Equity', 'NVDA US Equity', 'AMZN US Equity',
+    'META US Equity', 'GOOGL US Equity', 'GOOG US Equity', 'LLY US Equity',
+    'AVGO US Equity', 'JPM US Equity', 'TSLA US Equity', 'WMT US Equity',
+    'V US Equity', 'UNH US Equity', 'XOM US Equity', 'MA US Equity',
+    'PG US Equity', 'JNJ US Equity', 'COST US Equity', 'HD US Equity'
+]
+
+# Volatility fields with proper labels
+VOL_FIELD_MAPPING = {
+    'realized_vol_30d': 'VOLATILITY_30D',
+    'realized_vol_90d': 'VOLATILITY_90D',
+    'realized_vol_120d': 'VOLATILITY_120D',
+    'realized_vol_260d': 'VOLATILITY_260D',
+    'implied_vol_1m_atm': '1MTH_IMPVOL_100.0%MNY_DF',
+    'implied_vol_3m_atm': '3MTH_IMPVOL_100.0%MNY_DF',
+    'implied_vol_6m_atm': '6MTH_IMPVOL_100.0%MNY_DF'
+}
+
+# SPX implied volatility fields with clean labels
+SURFACE_MAPPING = {
+    'implied_vol_1m_atm': '1MTH_IMPVOL_100.0%MNY_DF',
+    'implied_vol_2m_atm': '2MTH_IMPVOL_100.0%MNY_DF',
+    'implied_vol_3m_atm': '3MTH_IMPVOL_100.0%MNY_DF',
+    'implied_vol_6m_atm': '6MTH_IMPVOL_100.0%MNY_DF',
+    'implied_vol_12m_atm': '12MTH_IMPVOL_100.0%MNY_DF',
+    'implied_vol_3m_90_moneyness': '3MTH_IMPVOL_90.0%MNY_DF',
+    'implied_vol_3m_95_moneyness': '3MTH_IMPVOL_95.0%MNY_DF',
+    'implied_vol_3m_100_moneyness': '3MTH_IMPVOL_100.0%MNY_DF',
+    'implied_vol_3m_105_moneyness': '3MTH_IMPVOL_105.0%MNY_DF',
+    'implied_vol_3m_110_moneyness': '3MTH_IMPVOL_110.0%MNY_DF'
+}
+
+
+def data_needs():
+    """Current values this job needs, for the request planner"""
+    from src.data_collection.request_planner import DataNeed
+
+    return [
+        DataNeed('volatility', SECURITIES, VOL_FIELD_MAPPING, snapshot=True),
+        DataNeed('spx_surface', [SPX_TICKER], SURFACE_MAPPING, snapshot=True)
+    ]
+
+class VolatilityDataFetcher(PooledSessionMixin):
     """Fetch volatility data with proper implied/realized labeling"""
     
     def __init__(self):
         self.session = None
         self.refDataService = None
     
-    def connect(self):
-        """Connect to Bloomberg Terminal"""
+    def connect(self, session_pool=None):
+        """Connect to Bloomberg Terminal, or borrow a session from a shared pool"""
+        if session_pool is not None:
+            try:
+                self.borrow_session(session_pool)
+                return True
+            except Exception as e:
+                print(f"ERROR: Bloomberg connection failed: {e}")
+                return False
+        
         try:
             sessionOptions = blpapi.SessionOptions()
             self.session = blpapi.Session(sessionOptions)
@@ -102,9 +159,11 @@ class VolatilityDataFetcher:
                                     continue
                                 
                                 fieldData = security.getElement("fieldData")
+                                # Reference data is the current value, so it is as of the collection date
                                 vol_record = {
                                     'ticker': ticker,
-                                    'collection_timestamp': datetime.now().isoformat()
+                                    'collection_timestamp': datetime.now().isoformat(),
+                                    'as_of_date': pd.Timestamp(datetime.now().date())
                                 }
                                 
                                 # Map Bloomberg fields to clean labels
@@ -118,6 +177,7 @@ class VolatilityDataFetcher:
                         break
                     
                     if event.eventType() == blpapi.Event.TIMEOUT:
+                        self.session_timed_out = True
                         print("WARNING: Timeout in volatility batch processing")
                         break
             
@@ -135,19 +195,7 @@ class VolatilityDataFetcher:
         try:
             print("INFO: Fetching SPX volatility surface with proper labels...")
             
-            # SPX implied volatility fields with clean labels
-            surface_mapping = {
-                'implied_vol_1m_atm': '1MTH_IMPVOL_100.0%MNY_DF',
-                'implied_vol_2m_atm': '2MTH_IMPVOL_100.0%MNY_DF',
-                'implied_vol_3m_atm': '3MTH_IMPVOL_100.0%MNY_DF',
-                'implied_vol_6m_atm': '6MTH_IMPVOL_100.0%MNY_DF',
-                'implied_vol_12m_atm': '12MTH_IMPVOL_100.0%MNY_DF',
-                'implied_vol_3m_90_moneyness': '3MTH_IMPVOL_90.0%MNY_DF',
-                'implied_vol_3m_95_moneyness': '3MTH_IMPVOL_95.0%MNY_DF',
-                'implied_vol_3m_100_moneyness': '3MTH_IMPVOL_100.0%MNY_DF',
-                'implied_vol_3m_105_moneyness': '3MTH_IMPVOL_105.0%MNY_DF',
-                'implied_vol_3m_110_moneyness': '3MTH_IMPVOL_110.0%MNY_DF'
-            }
+            surface_mapping = SURFACE_MAPPING
             
             bloomberg_fields = list(surface_mapping.values())
             
@@ -182,6 +230,7 @@ class VolatilityDataFetcher:
                     break
                 
                 if event.eventType() == blpapi.Event.TIMEOUT:
+                    self.session_timed_out = True
                     print("WARNING: Timeout getting SPX volatility surface")
                     break
             
@@ -196,6 +245,39 @@ class VolatilityDataFetcher:
             print(f"ERROR: Failed to get SPX volatility surface: {e}")
             return None
     
+    def volatility_from_planned(self, planned):
+        """
+        Labeled volatility frame from rows the request planner fetched
+
+        as_of_date is the date of each security's latest value. Securities
+        whose planned request failed are requested here on this fetcher's session.
+        """
+        vol_df = planned.frame('volatility').rename(columns={'date': 'as_of_date'})
+        vol_df.insert(0, 'ticker', vol_df.pop('ticker'))
+        vol_df.insert(1, 'collection_timestamp', datetime.now().isoformat())
+        for ticker in planned.security_errors:
+            print(f"WARNING: Error for {ticker}")
+        print(f"SUCCESS: Retrieved volatility data for {len(vol_df)} securities (planned request)")
+        
+        failed = [ticker for ticker in planned.needs['volatility'].securities if ticker in planned.failed_securities]
+        if failed:
+            print(f"INFO: Requesting {len(failed)} securities whose planned request failed...")
+            retry_df = self.get_current_volatility_with_labels(failed, VOL_FIELD_MAPPING)
+            if retry_df is not None and not retry_df.empty:
+                vol_df = pd.concat([vol_df, retry_df], ignore_index=True)
+        return vol_df
+    
+    def spx_surface_from_planned(self, planned):
+        """SPX volatility surface dict from rows the request planner fetched"""
+        if SPX_TICKER in planned.failed_securities:
+            return self.get_spx_volatility_surface_labeled()
+        surface_df = planned.frame('spx_surface')
+        if surface_df.empty:
+            print("ERROR: Error getting SPX volatility surface")
+            return None
+        row = surface_df.iloc[-1]
+        return {clean_name: None if pd.isna(row[clean_name]) else row[clean_name] for clean_name in SURFACE_MAPPING}
+    
     def save_volatility_data_labeled(self, vol_df, spx_surface, tickers_processed):
         """Save volatility data with proper labels and metadata"""
         try:
@@ -270,47 +352,33 @@ class VolatilityDataFetcher:
             return None, None, None
     
     def disconnect(self):
-        """Disconnect from Bloomberg"""
-        if self.session:
+        """Disconnect from Bloomberg (pooled sessions go back to the pool unless a request timed out)"""
+        if not self.return_session() and self.session:
             self.session.stop()
             print("SUCCESS: Bloomberg session disconnected")
 
-def main():
-    """Main execution function with proper volatility labeling"""
+def main(session_pool=None, prefetched=None):
+    """
+    Main execution function with proper volatility labeling
+
+    prefetched: PlannedData from the request planner; when given, the data is
+    taken from it instead of requested here, except for securities whose
+    planned request failed, which are requested on this job's session.
+    """
     print("="*70)
     print("LABELED VOLATILITY DATA COLLECTION")
     print("="*70)
     print(f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     
-    # Define securities to process
-    securities = [
-        SPX_TICKER,  # SPX Index first
-        'SPY US Equity',  # SPY ETF
-        # Top 20 SPX components
-        'AAPL US Equity', 'MSFT US Equity', 'NVDA US Equity', 'AMZN US Equity',
-        'META US Equity', 'GOOGL US Equity', 'GOOG US Equity', 'LLY US Equity',
-        'AVGO US Equity', 'JPM US Equity', 'TSLA US Equity', 'WMT US Equity',
-        'V US Equity', 'UNH US Equity', 'XOM US Equity', 'MA US Equity',
-        'PG US Equity', 'JNJ US Equity', 'COST US Equity', 'HD US Equity'
-    ]
-    
-    # Volatility fields with proper labels
-    vol_field_mapping = {
-        'realized_vol_30d': 'VOLATILITY_30D',
-        'realized_vol_90d': 'VOLATILITY_90D',
-        'realized_vol_120d': 'VOLATILITY_120D',
-        'realized_vol_260d': 'VOLATILITY_260D',
-        'implied_vol_1m_atm': '1MTH_IMPVOL_100.0%MNY_DF',
-        'implied_vol_3m_atm': '3MTH_IMPVOL_100.0%MNY_DF',
-        'implied_vol_6m_atm': '6MTH_IMPVOL_100.0%MNY_DF'
-    }
+    securities = SECURITIES
+    vol_field_mapping = VOL_FIELD_MAPPING
     
     # Create fetcher instance
     fetcher = VolatilityDataFetcher()
     
     try:
-        # Connect to Bloomberg
-        if not fetcher.connect():
+        # Connect to Bloomberg (not needed when the planner fetched all of the data)
+        if (prefetched is None or prefetched.failed_securities) and not fetcher.connect(session_pool):
             return False
         
         print(f"\nProcessing {len(securities)} securities for LABELED volatility data...")
@@ -319,7 +387,10 @@ def main():
         
         # Get current volatility data with labels
         print("\n1. Fetching LABELED volatility data...")
-        vol_df = fetcher.get_current_volatility_with_labels(securities, vol_field_mapping)
+        if prefetched is not None:
+            vol_df = fetcher.volatility_from_planned(prefetched)
+        else:
+            vol_df = fetcher.get_current_volatility_with_labels(securities, vol_field_mapping)
         
         if vol_df is not None and not vol_df.empty:
             print(f"\nSUCCESS: Labeled volatility data summary:")
@@ -334,7 +405,10 @@ def main():
         
         # Get SPX volatility surface with labels
         print("\n2. Fetching LABELED SPX volatility surface...")
-        spx_surface = fetcher.get_spx_volatility_surface_labeled()
+        if prefetched is not None:
+            spx_surface = fetcher.spx_surface_from_planned(prefetched)
+        else:
+            spx_surface = fetcher.get_spx_volatility_surface_labeled()
         
         if spx_surface:
             print("SUCCESS: SPX labeled volatility surface retrieved:")
@@ -13,6 +13,8 @@ import json
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, project_root)
 
+from src.data_collection.session_pool import PooledSessionMixin
+
 try:
     import blpapi
     from config.bloomberg_config import SPX_TICKER
@@ -20,15 +22,23 @@ except ImportError as e:
     print(f"IMPORT ERROR: {e}")
     SPX_TICKER = 'SPX Index'
 
-class SPXIndexWeights:
+class SPXIndexWeights(PooledSessionMixin):
     """Build S&P 500 market cap weighted index from SPX components"""
     
     def __init__(self):
         self.session = None
         self.refDataService = None
     
-    def connect(self):
-        """Connect to Bloomberg Terminal"""
+    def connect(self, session_pool=None):
+        """Connect to Bloomberg Terminal, or borrow a session from a shared pool"""
+        if session_pool is not None:
+            try:
+                self.borrow_session(session_pool)
+                return True
+            except Exception as e:
+                print(f"ERROR: Bloomberg connection failed: {e}")
+                return False
+        
         try:
             sessionOptions = blpapi.SessionOptions()
             self.session = blpapi.Session(sessionOptions)
@@ -87,6 +97,7 @@ class SPXIndexWeights:
                     break
                 
                 if event.eventType() == blpapi.Event.TIMEOUT:
+                    self.session_timed_out = True
                     print("ERROR: Timeout getting SPX members")
                     return None
             
@@ -183,6 +194,7 @@ class SPXIndexWeights:
                         break
                     
                     if event.eventType() == blpapi.Event.TIMEOUT:
+                        self.session_timed_out = True
                         print(f"   WARNING: Timeout for batch {batch_num}")
                         break
             
@@ -285,12 +297,12 @@ class SPXIndexWeights:
             return None, None, None
     
     def disconnect(self):
-        """Disconnect from Bloomberg"""
-        if self.session:
+        """Disconnect from Bloomberg (pooled sessions go back to the pool unless a request timed out)"""
+        if not self.return_session() and self.session:
             self.session.stop()
             print("SUCCESS: Bloomberg session disconnected")
 
-def main():
+def main(session_pool=None):
     """Main execution function"""
     print("="*70)
     print("SPX INDEX MARKET CAP WEIGHTED COMPONENTS")
@@ -301,7 +313,7 @@ def main():
     spx = SPXIndexWeights()
     
     try:
-        if not spx.connect():
+        if not spx.connect(session_pool):
             return False
         
         # Step 1: Get SPX Index members
@@ -13,6 +13,8 @@ import json
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, project_root)
 
+from src.data_collection.session_pool import PooledSessionMixin
+
 try:
     import blpapi
     from config.bloomberg_config import SPY_TICKER
@@ -20,15 +22,23 @@ except ImportError as e:
     print(f"IMPORT ERROR: {e}")
     SPY_TICKER = 'SPY US Equity'
 
-class SPYMembershipTester:
+class SPYMembershipTester(PooledSessionMixin):
     """Test ETF membership/constituent fields for SPY"""
     
     def __init__(self):
         self.session = None
         self.refDataService = None
     
-    def connect(self):
-        """Connect to Bloomberg Terminal"""
+    def connect(self, session_pool=None):
+        """Connect to Bloomberg Terminal, or borrow a session from a shared pool"""
+        if session_pool is not None:
+            try:
+                self.borrow_session(session_pool)
+                return True
+            except Exception as e:
+                print(f"ERROR: Bloomberg connection failed: {e}")
+                return False
+        
         try:
             sessionOptions = blpapi.SessionOptions()
             self.session = blpapi.Session(sessionOptions)
@@ -184,6 +194,7 @@ class SPYMembershipTester:
                     break
                 
                 if event.eventType() == blpapi.Event.TIMEOUT:
+                    self.session_timed_out = True
                     return {
                         'success': False,
                         'error': 'Request timeout',
@@ -290,12 +301,12 @@ class SPYMembershipTester:
             return None
     
     def disconnect(self):
-        """Disconnect from Bloomberg"""
-        if self.session:
+        """Disconnect from Bloomberg (pooled sessions go back to the pool unless a request timed out)"""
+        if not self.return_session() and self.session:
             self.session.stop()
             print("SUCCESS: Bloomberg session disconnected")
 
-def main():
+def main(session_pool=None):
     """Main execution function"""
     print("="*70)
     print("BLOOMBERG SPY MEMBERSHIP FIELDS TEST")
@@ -306,7 +317,7 @@ def main():
     tester = SPYMembershipTester()
     
     try:
-        if not tester.connect():
+        if not tester.connect(session_pool):
             return False
         
         # Test membership fields
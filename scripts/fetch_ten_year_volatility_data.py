@@ -10,7 +10,6 @@ import pandas as pd
 from datetime import datetime, timedelta
 import json
 import numpy as np
-import time
 
 # Add project root to path
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -18,20 +17,66 @@ sys.path.insert(0, project_root)
 
 try:
     import blpapi
-    from config.bloomberg_config import SPX_TICKER
+    from config.bloomberg_config import SPX_TICKER, MARKET_DATA_FIELDS
 except ImportError as e:
     print(f"IMPORT ERROR: {e}")
     SPX_TICKER = 'SPX Index'
+    MARKET_DATA_FIELDS = {
+        'last_price': 'PX_LAST',
+        'open_price': 'PX_OPEN',
+        'high_price': 'PX_HIGH',
+        'low_price': 'PX_LOW'
+    }
 
-class TenYearVolatilityFetcher:
+from src.data_collection.collection_journal import CollectionJournal
+from src.data_collection.run_state import DEFAULT_DB_NAME, RunStateStore
+from src.data_collection.session_pool import PooledSessionMixin
+from src.analysis.realized_volatility import (LOCAL_DATA_TYPE, LOCAL_REALIZED_FIELDS, PRICE_COLUMNS,
+                                              realized_volatility_wide)
+from src.analysis.vol_matrix_cache import VolatilityMatrixCache
+from src.utils.columnar_writer import ColumnarDatasetWriter
+from src.utils.dedupe_store import DedupeVolatilityStore
+from src.utils.instrumentation import METRICS, InstrumentedSession
+
+COLLECTION_NAME = 'ten_year_volatility'
+
+def data_needs(local_realized=False):
+    """History still missing from the ten-year journal, for the request planner"""
+    from src.data_collection.request_planner import DataNeed
+
+    fetcher = TenYearVolatilityFetcher(local_realized=local_realized)
+    securities = fetcher.load_target_securities() or []
+    completed = fetcher.journal.completed_securities()
+    remaining = [ticker for ticker in securities if ticker not in completed]
+    if not remaining:
+        return []
+    if local_realized:
+        return [
+            DataNeed('implied', remaining, fetcher.implied_fields, fetcher.price_start_date, fetcher.end_date),
+            DataNeed('prices', remaining, fetcher.price_fields, fetcher.price_start_date, fetcher.end_date)
+        ]
+    return [
+        DataNeed('realized', remaining, fetcher.realized_fields, fetcher.start_date, fetcher.end_date),
+        DataNeed('implied', remaining, fetcher.implied_fields, fetcher.start_date, fetcher.end_date)
+    ]
+
+class TenYearVolatilityFetcher(PooledSessionMixin):
     """Fetch 10 years of comprehensive historical volatility data"""
     
-    def __init__(self):
+    def __init__(self, local_realized=False):
         self.session = None
+        self.local_realized = local_realized
         self.refDataService = None
         self.project_root = project_root
         self.data_dir = os.path.join(project_root, 'data', 'historical_volatility')
-        self.progress_file = os.path.join(self.data_dir, 'ten_year_progress.json')
+        self.progress_file = os.path.join(self.data_dir, 'ten_year_progress.json')  # Legacy progress, read once
+        self.run_state = RunStateStore(os.path.join(project_root, 'data', DEFAULT_DB_NAME))
+        self.collection_id = None
+        self.writer = ColumnarDatasetWriter(self.data_dir, 'ten_year_volatility')
+        self.store = DedupeVolatilityStore(os.path.join(project_root, 'data', 'volatility_store'))
+        self.matrix_cache = VolatilityMatrixCache(os.path.join(self.data_dir, 'matrix_cache', 'ten_year_volatility'))
+        self.journal = CollectionJournal(os.path.join(self.data_dir, 'ten_year_journal'))
+        self.failed_securities = set()
         
         # Volatility field mappings with clean labels
         self.realized_fields = {
@@ -48,23 +93,38 @@ class TenYearVolatilityFetcher:
             'implied_vol_12m_atm': '12MTH_IMPVOL_100.0%MNY_DF'
         }
         
+        # OHLC used to compute realized vol locally (requested with the implied fields)
+        self.price_fields = {
+            clean_name: MARKET_DATA_FIELDS[clean_name] for clean_name in PRICE_COLUMNS.values()
+        }
+        
         # Create directories
         os.makedirs(self.data_dir, exist_ok=True)
         
         # Set 10-year date range
         self.end_date = datetime.now()
         self.start_date = self.end_date - timedelta(days=10*365 + 3)  # 10 years + leap days
+        # Local realized vol needs a year of prices before the first reported date
+        self.price_start_date = self.start_date - timedelta(days=400)
         
         print(f"📅 10-Year Collection Period:")
         print(f"   Start: {self.start_date.strftime('%Y-%m-%d')}")
         print(f"   End: {self.end_date.strftime('%Y-%m-%d')}")
         print(f"   Total period: {(self.end_date - self.start_date).days:,} days")
     
-    def connect(self):
-        """Connect to Bloomberg Terminal"""
+    def connect(self, session_pool=None):
+        """Connect to Bloomberg Terminal, or borrow a session from a shared pool"""
+        if session_pool is not None:
+            try:
+                self.borrow_session(session_pool)
+                return True
+            except Exception as e:
+                print(f"ERROR: Bloomberg connection failed: {e}")
+                return False
+        
         try:
             sessionOptions = blpapi.SessionOptions()
-            self.session = blpapi.Session(sessionOptions)
+            self.session = InstrumentedSession(blpapi.Session(sessionOptions))
             
             if not self.session.start():
                 print("ERROR: Failed to start Bloomberg session")
@@ -126,13 +186,14 @@ class TenYearVolatilityFetcher:
             return None
     
     def load_progress(self):
-        """Load collection progress to enable resumption"""
+        """Load collection progress (from the latest recorded collection) to enable resumption"""
         try:
-            if os.path.exists(self.progress_file):
+            last = self.run_state.last_collection(COLLECTION_NAME)
+            if last:
+                progress = last['details']
+            elif os.path.exists(self.progress_file):
                 with open(self.progress_file, 'r') as f:
                     progress = json.load(f)
-                print(f"INFO: Loaded existing progress - {len(progress.get('completed_securities', []))} securities completed")
-                return progress
             else:
                 return {
                     'start_date': self.start_date.strftime('%Y-%m-%d'),
@@ -142,26 +203,44 @@ class TenYearVolatilityFetcher:
                     'collection_started': datetime.now().isoformat(),
                     'last_updated': None
                 }
+            print(f"INFO: Loaded existing progress - {len(progress.get('completed_securities', []))} securities completed")
+            return progress
         except Exception as e:
             print(f"WARNING: Could not load progress: {e}")
             return {}
     
     def save_progress(self, progress):
-        """Save collection progress"""
+        """Save collection progress to this run's collection record"""
         try:
             progress['last_updated'] = datetime.now().isoformat()
-            with open(self.progress_file, 'w') as f:
-                json.dump(progress, f, indent=2)
+            if self.collection_id is None:
+                self.collection_id = self.run_state.start_collection(
+                    COLLECTION_NAME, self.start_date.strftime('%Y%m%d'), self.end_date.strftime('%Y%m%d'),
+                    details=progress
+                )
+            else:
+                self.run_state.update_collection(
+                    self.collection_id, details=progress,
+                    securities=len(progress.get('completed_securities', [])),
+                    failed_tasks=len(progress.get('failed_securities', []))
+                )
         except Exception as e:
             print(f"WARNING: Could not save progress: {e}")
     
-    def fetch_security_volatility_data(self, ticker, vol_fields, data_type):
+    def finish_collection(self, status, rows=None, error=None):
+        """Close this run's collection record"""
+        if self.collection_id is None:
+            self.collection_id = self.run_state.start_collection(
+                COLLECTION_NAME, self.start_date.strftime('%Y%m%d'), self.end_date.strftime('%Y%m%d'))
+        self.run_state.finish_collection(self.collection_id, status, rows=rows, error=error)
+    
+    def fetch_security_volatility_data(self, ticker, vol_fields, data_type, start_date=None):
         """Fetch 10 years of volatility data for a single security"""
         try:
             print(f"      Fetching {data_type} data for {ticker}...")
             
             bloomberg_fields = list(vol_fields.values())
-            start_date_str = self.start_date.strftime('%Y%m%d')
+            start_date_str = (start_date or self.start_date).strftime('%Y%m%d')
             end_date_str = self.end_date.strftime('%Y%m%d')
             
             request = self.refDataService.createRequest("HistoricalDataRequest")
@@ -182,40 +261,43 @@ class TenYearVolatilityFetcher:
                 event = self.session.nextEvent(30000)  # 30 second timeout
                 
                 if event.eventType() == blpapi.Event.RESPONSE:
-                    for msg in event:
-                        securityData = msg.getElement("securityData")
+                    with METRICS.timer('parse_seconds', source='ten_year_volatility'):
+                        for msg in event:
+                            securityData = msg.getElement("securityData")
                         
-                        if securityData.hasElement("securityError"):
-                            print(f"         WARNING: Error for {ticker}")
-                            return pd.DataFrame()
+                            if securityData.hasElement("securityError"):
+                                print(f"         WARNING: Error for {ticker}")
+                                return pd.DataFrame()
                         
-                        fieldDataArray = securityData.getElement("fieldData")
+                            fieldDataArray = securityData.getElement("fieldData")
                         
-                        for i in range(fieldDataArray.numValues()):
-                            fieldData = fieldDataArray.getValue(i)
-                            date = fieldData.getElement("date").getValue()
+                            for i in range(fieldDataArray.numValues()):
+                                fieldData = fieldDataArray.getValue(i)
+                                date = fieldData.getElement("date").getValue()
                             
-                            row_data = {
-                                'date': date.strftime('%Y-%m-%d'),
-                                'ticker': ticker,
-                                'data_type': data_type
-                            }
+                                row_data = {
+                                    'date': date.strftime('%Y-%m-%d'),
+                                    'ticker': ticker,
+                                    'data_type': data_type
+                                }
                             
-                            # Map Bloomberg fields to clean names
-                            for clean_name, bloomberg_field in vol_fields.items():
-                                if fieldData.hasElement(bloomberg_field):
-                                    value = fieldData.getElement(bloomberg_field).getValue()
-                                    row_data[clean_name] = value if value is not None else np.nan
-                                else:
-                                    row_data[clean_name] = np.nan
+                                # Map Bloomberg fields to clean names
+                                for clean_name, bloomberg_field in vol_fields.items():
+                                    if fieldData.hasElement(bloomberg_field):
+                                        value = fieldData.getElement(bloomberg_field).getValue()
+                                        row_data[clean_name] = value if value is not None else np.nan
+                                    else:
+                                        row_data[clean_name] = np.nan
                             
-                            ticker_data.append(row_data)
+                                ticker_data.append(row_data)
                     break
                 
                 if event.eventType() == blpapi.Event.TIMEOUT:
+                    self.session_timed_out = True
                     print(f"         WARNING: Timeout for {ticker}")
                     return pd.DataFrame()
             
+            METRICS.inc('rows_parsed_total', len(ticker_data), source='ten_year_volatility')
             if ticker_data:
                 df = pd.DataFrame(ticker_data)
                 df['date'] = pd.to_datetime(df['date'])
@@ -229,14 +311,61 @@ class TenYearVolatilityFetcher:
             print(f"         ERROR: Failed to fetch {ticker}: {e}")
             return pd.DataFrame()
     
-    def collect_ten_year_data(self, securities):
-        """Main collection function for 10-year data"""
+    def fetch_security_with_local_realized(self, ticker):
+        """
+        One request for implied vol plus OHLC; realized vol is computed locally
+        
+        Rows get data_type 'realized_local' and their own columns
+        (realized_vol_cc_30d/90d/180d/252d: exact trading-day windows,
+        close-to-close returns annualized over 252 days), so they never
+        overwrite Bloomberg's realized_vol_<n>d history.
+        """
+        combined_df = self.fetch_security_volatility_data(
+            ticker, {**self.implied_fields, **self.price_fields}, 'implied',
+            start_date=self.price_start_date
+        )
+        return self.split_local_realized(combined_df)
+    
+    def split_local_realized(self, combined_df):
+        """(realized, implied) frames from one security's implied vol + OHLC rows"""
+        if len(combined_df) == 0:
+            return pd.DataFrame(), pd.DataFrame()
+        
+        price_columns = list(self.price_fields.keys())
+        realized_df = realized_volatility_wide(combined_df[['date', 'ticker'] + price_columns])
+        
+        in_range = combined_df['date'] >= pd.Timestamp(self.start_date.date())
+        implied_df = combined_df[in_range].drop(columns=price_columns)
+        implied_df = implied_df.dropna(subset=list(self.implied_fields.keys()), how='all')
+        realized_df = realized_df[realized_df['date'] >= pd.Timestamp(self.start_date.date())]
+        
+        print(f"         SUCCESS: {len(realized_df):,} locally computed realized observations")
+        return realized_df.reset_index(drop=True), implied_df.reset_index(drop=True)
+    
+    def security_from_planned(self, ticker, planned):
+        """(realized, implied) frames for one security from rows the request planner fetched"""
+        frames = {}
+        for name, frame in planned.frames.items():
+            frame = frame[frame['ticker'] == ticker]
+            if name != 'prices':
+                frame = frame.copy()
+                frame.insert(2, 'data_type', name)
+            frames[name] = frame
+        
+        if 'prices' in frames:
+            # Planned with local_realized: implied vol and OHLC arrive as separate needs
+            combined_df = frames['implied'].merge(frames['prices'], on=['date', 'ticker'], how='outer')
+            combined_df['data_type'] = 'implied'
+            return self.split_local_realized(combined_df.sort_values('date').reset_index(drop=True))
+        return frames['realized'].reset_index(drop=True), frames['implied'].reset_index(drop=True)
+    
+    def collect_ten_year_data(self, securities, prefetched=None):
+        """Main collection function for 10-year data (from planner rows when prefetched is given)"""
         progress = self.load_progress()
-        completed_securities = set(progress.get('completed_securities', []))
+        # Only securities whose data is journaled on disk count as completed
+        completed_securities = self.journal.completed_securities()
         failed_securities = set(progress.get('failed_securities', []))
-        
-        all_realized_data = []
-        all_implied_data = []
+        progress['completed_securities'] = list(completed_securities)
         
         total_securities = len(securities)
         
@@ -257,30 +386,41 @@ class TenYearVolatilityFetcher:
             print(f"\n📊 Processing {ticker} ({i+1}/{total_securities})")
             print(f"   Progress: {((i+1)/total_securities)*100:.1f}%")
             
+            # Securities whose planned request failed are fetched on this job's own session
+            planned = prefetched is not None and ticker not in prefetched.failed_securities
             try:
-                # Fetch realized volatility data
-                realized_df = self.fetch_security_volatility_data(
-                    ticker, self.realized_fields, 'realized'
-                )
-                
-                # Fetch implied volatility data
-                implied_df = self.fetch_security_volatility_data(
-                    ticker, self.implied_fields, 'implied'
-                )
+                if planned:
+                    realized_df, implied_df = self.security_from_planned(ticker, prefetched)
+                elif self.local_realized:
+                    realized_df, implied_df = self.fetch_security_with_local_realized(ticker)
+                else:
+                    # Fetch realized volatility data
+                    realized_df = self.fetch_security_volatility_data(
+                        ticker, self.realized_fields, 'realized'
+                    )
+                    
+                    # Fetch implied volatility data
+                    implied_df = self.fetch_security_volatility_data(
+                        ticker, self.implied_fields, 'implied'
+                    )
                 
                 # Check if we got meaningful data
                 realized_success = len(realized_df) > 100  # At least 100 observations
                 implied_success = len(implied_df) > 100
                 
+                security_frames = []
                 if realized_success:
-                    all_realized_data.append(realized_df)
+                    security_frames.append(realized_df)
                     print(f"      ✅ Realized data: {len(realized_df):,} obs")
                 
                 if implied_success:
-                    all_implied_data.append(implied_df)
+                    security_frames.append(implied_df)
                     print(f"      ✅ Implied data: {len(implied_df):,} obs")
                 
-                if realized_success or implied_success:
+                if security_frames:
+                    # Write-ahead: data is on disk before the security is marked complete
+                    self.journal.append(ticker, pd.concat(security_frames, ignore_index=True))
+                    
                     completed_securities.add(ticker)
                     progress['completed_securities'] = list(completed_securities)
                     
@@ -289,47 +429,42 @@ class TenYearVolatilityFetcher:
                         failed_securities.remove(ticker)
                         progress['failed_securities'] = list(failed_securities)
                     
-                    print(f"      ✅ {ticker} completed successfully")
+                    print(f"      ✅ {ticker} completed successfully (journaled)")
                 else:
                     failed_securities.add(ticker)
                     progress['failed_securities'] = list(failed_securities)
                     print(f"      ❌ {ticker} failed - insufficient data")
                 
-                # Save progress every 5 securities
-                if (i + 1) % 5 == 0:
-                    self.save_progress(progress)
-                    print(f"      💾 Progress saved")
+                self.save_progress(progress)
                 
                 # Brief pause to avoid overwhelming Bloomberg
-                time.sleep(1)
+                if not planned:
+                    METRICS.sleep(1, reason='rate_limit')
                 
             except Exception as e:
                 print(f"      ❌ Error processing {ticker}: {e}")
                 failed_securities.add(ticker)
                 progress['failed_securities'] = list(failed_securities)
+                self.save_progress(progress)
                 continue
         
         # Final progress save
         self.save_progress(progress)
+        self.failed_securities = failed_securities
         
-        # Combine all data
+        # Combine all journaled data, including securities from earlier runs
         print(f"\n📊 COMBINING 10-YEAR DATA...")
-        combined_data = []
-        
-        if all_realized_data:
-            realized_combined = pd.concat(all_realized_data, ignore_index=True)
-            combined_data.append(realized_combined)
-            print(f"   Realized data: {len(realized_combined):,} total observations")
+        final_df = self.journal.load_all()
         
-        if all_implied_data:
-            implied_combined = pd.concat(all_implied_data, ignore_index=True)
-            combined_data.append(implied_combined)
-            print(f"   Implied data: {len(implied_combined):,} total observations")
-        
-        if combined_data:
-            final_df = pd.concat(combined_data, ignore_index=True)
+        if len(final_df) > 0:
             final_df = final_df.sort_values(['ticker', 'date'])
             
+            for data_type in ['realized', LOCAL_DATA_TYPE, 'implied']:
+                type_count = (final_df['data_type'] == data_type).sum()
+                if data_type == LOCAL_DATA_TYPE and type_count == 0:
+                    continue
+                print(f"   {data_type.capitalize()} data: {type_count:,} total observations")
+            
             print(f"\n✅ 10-YEAR COLLECTION SUMMARY:")
             print(f"   Total observations: {len(final_df):,}")
             print(f"   Securities: {final_df['ticker'].nunique()}")
@@ -342,7 +477,7 @@ class TenYearVolatilityFetcher:
             print("❌ No data collected")
             return pd.DataFrame()
     
-    def save_ten_year_data(self, df):
+    def save_ten_year_data(self, df, export_csv=False):
         """Save 10-year volatility data with comprehensive metadata"""
         try:
             if len(df) == 0:
@@ -353,26 +488,35 @@ class TenYearVolatilityFetcher:
             
             print(f"\n💾 SAVING 10-YEAR VOLATILITY DATA...")
             
-            # Save main dataset in multiple formats
-            base_filename = f'ten_year_volatility_data_{timestamp}'
-            
-            # CSV format
-            csv_file = os.path.join(self.data_dir, f'{base_filename}.csv')
-            df.to_csv(csv_file, index=False)
-            print(f"   ✅ CSV: {csv_file}")
-            
-            # Parquet format (faster loading)
-            parquet_file = os.path.join(self.data_dir, f'{base_filename}.parquet')
-            df.to_parquet(parquet_file, index=False)
+            # Single Parquet write; the latest manifest is switched atomically
+            parquet_file = self.writer.write(df, tag=f'data_{timestamp}')
             print(f"   ✅ Parquet: {parquet_file}")
+            print(f"   ✅ Latest manifest updated: {self.writer.manifest_file}")
+            if self.writer.legacy_latest:
+                print(f"   ✅ Legacy latest files updated: {self.writer.latest_csv_file}")
+            
+            # Fold the pull into the deduplicated store (one copy per block, restatements logged)
+            try:
+                # Local realized columns are stored under their own names, apart from VOLATILITY_<n>D
+                store_stats = self.store.ingest(df, os.path.basename(parquet_file),
+                                                fields=list(LOCAL_REALIZED_FIELDS))
+                print(f"   ✅ Store: {store_stats['blocks_written']} new blocks, "
+                      f"{store_stats['revisions']} revisions")
+            except Exception as e:
+                print(f"   ⚠️ Could not update volatility store: {e}")
             
-            # Update latest files
-            latest_csv = os.path.join(self.data_dir, 'ten_year_volatility_latest.csv')
-            latest_parquet = os.path.join(self.data_dir, 'ten_year_volatility_latest.parquet')
+            # Rebuild the (date x ticker) matrix cache from the full dataset
+            try:
+                matrices = self.matrix_cache.refresh_all(df, full=True)
+                print(f"   ✅ Matrix cache: {len(matrices)} matrices refreshed")
+            except Exception as e:
+                print(f"   ⚠️ Could not refresh matrix cache: {e}")
             
-            df.to_csv(latest_csv, index=False)
-            df.to_parquet(latest_parquet, index=False)
-            print(f"   ✅ Latest files updated")
+            # Timestamped CSV copy only when explicitly requested
+            csv_file = None
+            if export_csv:
+                csv_file = self.writer.export_csv(parquet_file.replace('.parquet', '.csv'), parquet_file)
+                print(f"   ✅ CSV: {csv_file}")
             
             # Create comprehensive summary
             summary = {
@@ -394,16 +538,16 @@ class TenYearVolatilityFetcher:
                 },
                 'data_quality': {
                     'realized_observations': len(df[df['data_type'] == 'realized']),
+                    'local_realized_observations': len(df[df['data_type'] == LOCAL_DATA_TYPE]),
                     'implied_observations': len(df[df['data_type'] == 'implied']),
                     'spx_observations': len(df[df['ticker'] == 'SPX Index']),
                     'component_observations': len(df[df['ticker'] != 'SPX Index']),
                     'completeness_by_field': {}
                 },
                 'file_info': {
-                    'csv_file': csv_file,
                     'parquet_file': parquet_file,
-                    'latest_csv': latest_csv,
-                    'latest_parquet': latest_parquet
+                    'latest_manifest': self.writer.manifest_file,
+                    'csv_file': csv_file
                 }
             }
             
@@ -424,30 +568,42 @@ class TenYearVolatilityFetcher:
             print(f"\n🎉 10-YEAR DATA COLLECTION COMPLETE!")
             print(f"   Files ready for advanced volatility analysis")
             
-            return csv_file, parquet_file, summary_file
+            return parquet_file, csv_file, summary_file
             
         except Exception as e:
             print(f"ERROR: Failed to save 10-year data: {e}")
             return None
     
     def disconnect(self):
-        """Disconnect from Bloomberg"""
-        if self.session:
+        """Disconnect from Bloomberg (pooled sessions go back to the pool unless a request timed out)"""
+        if not self.return_session() and self.session:
             self.session.stop()
             print("SUCCESS: Bloomberg session disconnected")
 
-def main():
-    """Main execution function for 10-year volatility collection"""
+def main(session_pool=None, prefetched=None):
+    """
+    Main execution function for 10-year volatility collection
+
+    prefetched: PlannedData from the request planner; when given, the data is
+    taken from it instead of requested here, except for securities whose
+    planned request failed, which are fetched on this job's session.
+    """
     print("🚀 10-YEAR HISTORICAL VOLATILITY DATA COLLECTION")
     print("=" * 70)
     print(f"Collecting comprehensive 10-year volatility dataset...")
     print(f"This may take 2-4 hours depending on Bloomberg performance")
     
-    fetcher = TenYearVolatilityFetcher()
+    # Pass --local-realized to compute realized vol from OHLC instead of VOLATILITY_<n>D
+    local_realized = '--local-realized' in sys.argv
+    if prefetched is not None:
+        local_realized = 'prices' in prefetched.needs
+    fetcher = TenYearVolatilityFetcher(local_realized=local_realized)
+    # Pass --legacy-latest to also refresh ten_year_volatility_latest.parquet/.csv
+    fetcher.writer.legacy_latest = '--legacy-latest' in sys.argv
     
     try:
-        # Connect to Bloomberg
-        if not fetcher.connect():
+        # Connect to Bloomberg (not needed when the planner fetched all of the data)
+        if (prefetched is None or prefetched.failed_securities) and not fetcher.connect(session_pool):
             return False
         
         # Load target securities
@@ -458,17 +614,25 @@ def main():
         
         # Collect 10-year data
         print(f"\n2. Starting 10-year data collection...")
-        ten_year_df = fetcher.collect_ten_year_data(securities)
+        ten_year_df = fetcher.collect_ten_year_data(securities, prefetched)
         
         if len(ten_year_df) == 0:
+            fetcher.finish_collection('failed', rows=0, error='No data collected')
             print("❌ No data collected")
             return False
         
         # Save data
         print(f"\n3. Saving 10-year dataset...")
-        result = fetcher.save_ten_year_data(ten_year_df)
+        # Pass --csv to also export a CSV copy for tools that still need one
+        result = fetcher.save_ten_year_data(ten_year_df, export_csv='--csv' in sys.argv)
+        fetcher.finish_collection('success' if result else 'failed', rows=len(ten_year_df),
+                                  error=None if result else 'Failed to save data')
         
         if result:
+            # A fully collected dataset starts the next run afresh;
+            # with failures left the journal stays so a re-run only retries those
+            if not fetcher.failed_securities:
+                fetcher.journal.clear()
             print(f"\n✅ SUCCESS: 10-year volatility dataset created!")
             print(f"   Ready for professional-grade risk premium analysis")
             print(f"   Use this data in your advanced volatility notebooks")
@@ -478,15 +642,18 @@ def main():
             return False
             
     except KeyboardInterrupt:
+        fetcher.finish_collection('failed', error='Interrupted by user')
         print("\n⚠️ Collection interrupted by user")
-        print("Progress has been saved - you can resume later")
+        print("Completed securities are journaled - you can resume later")
         return False
     except Exception as e:
+        fetcher.finish_collection('failed', error=str(e))
         print(f"❌ Error in main execution: {e}")
         return False
     
     finally:
         fetcher.disconnect()
+        METRICS.export(os.path.join(project_root, 'data', 'metrics'), 'ten_year_volatility')
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
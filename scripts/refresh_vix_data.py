@@ -0,0 +1,151 @@
+"""
+VIX Data Refresh
+Refresh VIX spot, futures and options through the staged VIX pipeline
+(discover -> plan -> fetch/normalize/store) as one planned request batch.
+
+Runs incrementally from the last successful refresh; pass --full to rebuild
+the whole history (--years, default 10) or --days N to refresh a fixed window.
+
+After the refresh the derived files are rebuilt from the store: the 10 and 50
+delta calls per date and expiry (vix_target_delta_options_10yr_<timestamp>.csv)
+and the constant-maturity term structure (vix_term_structure_10yr_<timestamp>.csv).
+This is the job the VIX daily scheduler runs.
+"""
+
+import sys
+import os
+from datetime import datetime, timedelta
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.analysis.delta_selection import select_target_delta_options
+from src.analysis.vix_term_structure import term_structure_frame
+from src.data_collection.run_state import DEFAULT_DB_NAME, RunStateStore
+from src.data_collection.vix_pipeline import VIXPipeline
+from src.utils.dedupe_store import DedupeVolatilityStore
+from src.utils.instrumentation import METRICS
+
+COLLECTION_NAME = 'vix_refresh'
+DEFAULT_YEARS = 10
+OVERLAP_DAYS = 5    # Re-pull the last few days so late settlements and restatements are picked up
+TARGET_DELTAS = (0.10, 0.50)
+
+
+def _flag_value(flag, default):
+    if flag in sys.argv:
+        return int(sys.argv[sys.argv.index(flag) + 1])
+    return default
+
+
+def refresh_range(run_state, end_date):
+    """(start_date, end_date) for this run from the flags and the last successful refresh"""
+    if '--days' in sys.argv:
+        return end_date - timedelta(days=_flag_value('--days', 0)), end_date
+
+    last = None if '--full' in sys.argv else run_state.last_collection(COLLECTION_NAME, status='success')
+    if last and last['end_date']:
+        start_date = datetime.strptime(last['end_date'], '%Y-%m-%d') - timedelta(days=OVERLAP_DAYS)
+        return min(start_date, end_date), end_date
+    return end_date - timedelta(days=365 * _flag_value('--years', DEFAULT_YEARS)), end_date
+
+
+def save_derived(pipeline, data_dir):
+    """
+    Target delta options and term structure over the whole stored history
+
+    Returns {'target_delta_file', 'target_delta_records', 'term_structure_file',
+    'term_structure_records'}; a file is None when there is nothing to write.
+    """
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    derived = {'target_delta_file': None, 'target_delta_records': 0,
+               'term_structure_file': None, 'term_structure_records': 0}
+
+    # Closest calls to 10 and 50 delta per date/expiry, within 5 delta points
+    target_delta_df = select_target_delta_options(pipeline.load_options(), target_deltas=TARGET_DELTAS,
+                                                  calls_only=True)
+    if len(target_delta_df) > 0:
+        delta_file = os.path.join(data_dir, f'vix_target_delta_options_10yr_{timestamp}.csv')
+        target_delta_df.to_csv(delta_file, index=False)
+        derived.update(target_delta_file=delta_file, target_delta_records=len(target_delta_df))
+
+    # Constant-maturity curve (30/60/90/180d) with roll yield, slope and curvature; spot is the 0-day point
+    futures_df = pipeline.load_futures()
+    if len(futures_df) > 0:
+        spot = pipeline.load_spot().set_index('date')['vix_level']
+        term_structure_df = term_structure_frame(futures_df, spot=spot)
+        term_structure_df = term_structure_df.rename_axis('date').reset_index()
+        term_file = os.path.join(data_dir, f'vix_term_structure_10yr_{timestamp}.csv')
+        term_structure_df.to_csv(term_file, index=False)
+        derived.update(term_structure_file=term_file, term_structure_records=len(term_structure_df))
+
+    return derived
+
+
+def main(session_pool=None):
+    """Main execution function for the VIX refresh"""
+    print("=" * 80)
+    print("VIX DATA REFRESH")
+    print("=" * 80)
+    print(f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+
+    run_state = RunStateStore(os.path.join(project_root, 'data', DEFAULT_DB_NAME))
+    store = DedupeVolatilityStore(os.path.join(project_root, 'data', 'volatility_store'))
+    data_dir = os.path.join(project_root, 'data', 'vix_data')
+    pipeline = VIXPipeline(data_dir, store, session_pool=session_pool)
+    collection_id = None
+
+    try:
+        end_date = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        start_date, end_date = refresh_range(run_state, end_date)
+        print(f"📅 Range: {start_date:%Y-%m-%d} to {end_date:%Y-%m-%d}")
+        collection_id = run_state.start_collection(COLLECTION_NAME, f'{start_date:%Y-%m-%d}', f'{end_date:%Y-%m-%d}')
+
+        summary = pipeline.run(start_date, end_date)
+
+        status = 'partial' if summary['failed_requests'] else 'success'
+        if summary['rows'] == 0:
+            status = 'failed'
+        derived = save_derived(pipeline, data_dir) if status != 'failed' else {}
+        run_state.finish_collection(
+            collection_id, status, rows=summary['rows'], securities=summary['securities'],
+            retries=summary['retries'], failed_tasks=len(summary['failed_requests']),
+            details={'requests': summary['requests'], 'failed_requests': summary['failed_requests'],
+                     'security_errors': summary['security_errors'], 'store': summary['store'],
+                     **derived}
+        )
+
+        if summary['security_errors']:
+            print(f"⚠️  {len(summary['security_errors'])} securities rejected by Bloomberg")
+        if status == 'failed':
+            print("ERROR: No VIX data returned")
+            return False
+        if status == 'partial':
+            print(f"\nERROR: {len(summary['failed_requests'])} request(s) still failing; "
+                  f"partial data stored, re-run to retry only those")
+            return False
+
+        store_stats = summary['store']
+        print("\nSUCCESS: VIX refresh completed!")
+        print(f"   Securities: {summary['securities']:,} in {summary['requests']} requests")
+        print(f"   Rows: {summary['rows']:,}")
+        print(f"   Store: {store_stats['blocks_written']} blocks written, "
+              f"{store_stats['blocks_unchanged']} unchanged, {store_stats['revisions']} revisions")
+        print(f"   Target delta options: {derived['target_delta_records']:,} → {derived['target_delta_file']}")
+        print(f"   Term structure: {derived['term_structure_records']:,} days → {derived['term_structure_file']}")
+        return True
+
+    except Exception as e:
+        if collection_id is not None:
+            run_state.finish_collection(collection_id, 'failed', error=str(e))
+        print(f"ERROR: Error in VIX refresh: {e}")
+        return False
+
+    finally:
+        METRICS.export(os.path.join(project_root, 'data', 'metrics'), COLLECTION_NAME)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -5,23 +5,22 @@ Daily Bloomberg data collection with email/slack alerts
 
 import os
 import sys
-import schedule
-import time
-import smtplib
 import json
 import pandas as pd
 from datetime import datetime, timedelta
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from email.mime.base import MIMEBase
-from email import encoders
-import subprocess
 import logging
 
 # Add project root to path
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, project_root)
 
+from src.data_collection.job_dag import JobContext, JobGraph, script_job
+from src.data_collection.market_close_trigger import MarketCloseTrigger, settlement_probe
+from src.data_collection.request_planner import planner_job
+from src.data_collection.run_state import DEFAULT_DB_NAME, RunStateStore
+from src.data_collection.session_pool import BloombergSessionPool
+from src.utils.notification_dispatcher import dispatcher_from_config
+
 # Configure logging
 import os
 
@@ -45,6 +44,23 @@ class DataCollectionScheduler:
     def __init__(self):
         self.setup_directories()
         self.config = self.load_config()
+        self.session_pool = None
+        self.run_state = RunStateStore(os.path.join(project_root, 'data', DEFAULT_DB_NAME))
+        self.notifier = dispatcher_from_config(
+            self.config['email'], self.config['slack'],
+            local_path=self.config['notifications']['local_sink_path'],
+            coalesce_seconds=self.config['notifications']['coalesce_seconds'],
+            min_interval_seconds=self.config['notifications']['min_interval_seconds']
+        )
+        trigger_config = self.config['trigger']
+        self.trigger = MarketCloseTrigger(
+            probe=self.probe_settlement,
+            close_time=trigger_config['close_time'],
+            settle_delay_minutes=trigger_config['settle_delay_minutes'],
+            probe_interval_minutes=trigger_config['probe_interval_minutes'],
+            deadline_time=trigger_config['deadline_time'],
+            timezone=trigger_config['timezone']
+        )
 
     
     def load_config(self):
@@ -61,13 +77,35 @@ class DataCollectionScheduler:
             # Slack settings (optional)
             'slack': {
                 'webhook_url': 'https://hooks.slack.com/your/webhook/url',  # UPDATE THIS
-                'channel': '#bloomberg-data'
+                'channel': '#bloomberg-data',
+                'username': 'Bloomberg Data Bot'
+            },
+            # Delivery runs in a background thread; alerts arriving close together become one digest
+            'notifications': {
+                'coalesce_seconds': 30,
+                'min_interval_seconds': 60,
+                'local_sink_path': None  # e.g. 'logs/notifications.jsonl' to write locally instead of sending
             },
             # Data collection settings
             'collection': {
                 'max_retries': 3,
                 'retry_delay_minutes': 30,
-                'data_quality_threshold': 0.8  # 80% data completeness required
+                'session_pool_size': 2,  # Bloomberg sessions shared by concurrent jobs
+                'planned_requests': True,  # Plan the volatility jobs' Bloomberg requests together and fetch once
+                'include_ten_year': False,  # Also complete the ten-year dataset in the daily run
+                'data_quality_threshold': 0.8,  # 80% data completeness required
+                'stale_after_hours': 30,  # A collection without a success this long is reported stale
+                'tracked_collections': ['historical_volatility']
+            },
+            # Collection starts after each trading session's close once the settlement is published
+            'trigger': {
+                'close_time': '16:00',
+                'settle_delay_minutes': 15,
+                'probe_ticker': 'UX1 Index',
+                'probe_field': 'PX_SETTLE',
+                'probe_interval_minutes': 5,
+                'deadline_time': '20:00',  # Run anyway if the settlement has not appeared by then
+                'timezone': 'US/Eastern'
             }
         }
         return config
@@ -78,74 +116,89 @@ class DataCollectionScheduler:
         for directory in directories:
             os.makedirs(directory, exist_ok=True)
 
-    def run_script(self, script_path, script_name):
-        """Run a data collection script with error handling"""
-        try:
-            logging.info(f"Starting {script_name}...")
+    def build_job_graph(self):
+        """
+        Daily collection jobs; the historical universe comes from the SPX weights
+
+        With planned_requests the volatility jobs declare their data needs and
+        one planner job fetches the union of them before they run.
+        """
+        collection = self.config['collection']
+        retry = {'max_attempts': collection['max_retries'], 'retry_delay': collection['retry_delay_minutes'] * 60}
+        scripts_dir = os.path.join(project_root, 'scripts')
+        volatility_jobs = {
+            'labeled_volatility': ('Current Volatility Data', 'fetch_labeled_volatility_data.py'),
+            'historical_volatility': ('Historical Volatility Update', 'fetch_historical_volatility.py')
+        }
+        if collection['include_ten_year']:
+            volatility_jobs['ten_year_volatility'] = ('Ten-Year Volatility Data', 'fetch_ten_year_volatility_data.py')
 
-            # Run the script
-            result = subprocess.run(
-                [sys.executable, script_path],
-                capture_output=True,
-                text=True,
-                timeout=3600  # 1 hour timeout
-            )
+        graph = JobGraph()
+        graph.add('SPY Weights Data', script_job(os.path.join(scripts_dir, 'fetch_spy_weights.py')), **retry)
+        graph.add('SPX Index Weights', script_job(os.path.join(scripts_dir, 'fetch_spx_weights.py')), **retry)
 
-            if result.returncode == 0:
-                logging.info(f"SUCCESS: {script_name} completed successfully")
-                return True, result.stdout, None
-            else:
-                logging.error(f"FAILED: {script_name} failed with return code {result.returncode}")
-                logging.error(f"STDERR: {result.stderr}")  # Show actual error
-                return False, result.stdout, result.stderr
+        if collection['planned_requests']:
+            consumers = {consumer: os.path.join(scripts_dir, script)
+                         for consumer, (_, script) in volatility_jobs.items()}
+            graph.add('Planned Bloomberg Requests',
+                      planner_job(consumers, os.path.join(project_root, 'data', 'request_plan', 'task_journal'),
+                                  workers=collection['session_pool_size']),
+                      depends_on=['SPX Index Weights'], **retry)
+            for consumer, (name, script) in volatility_jobs.items():
+                graph.add(name, script_job(os.path.join(scripts_dir, script), consumer=consumer),
+                          depends_on=['Planned Bloomberg Requests'], **retry)
+        else:
+            for consumer, (name, script) in volatility_jobs.items():
+                # Labeled data is a snapshot of the fixed top 20; the others need the SPX weights
+                depends_on = [] if consumer == 'labeled_volatility' else ['SPX Index Weights']
+                graph.add(name, script_job(os.path.join(scripts_dir, script)), depends_on=depends_on, **retry)
+        return graph
 
-        except subprocess.TimeoutExpired:
-            logging.error(f"TIMEOUT: {script_name} timed out after 1 hour")
-            return False, None, "Script timed out"
-        except Exception as e:
-            logging.error(f"EXCEPTION: {script_name} failed with exception: {e}")
-            return False, None, str(e)
+    def probe_settlement(self, session_date):
+        """True once the probe security's settlement for session_date is on Bloomberg"""
+        # The probing session stays open for the collection that follows
+        if self.session_pool is None:
+            self.session_pool = BloombergSessionPool(size=self.config['collection']['session_pool_size'])
+        probe = settlement_probe(self.session_pool, ticker=self.config['trigger']['probe_ticker'],
+                                 field=self.config['trigger']['probe_field'])
+        return probe(session_date)
 
-    def collect_daily_data(self):
-        """Run daily data collection with retries"""
+    def collect_daily_data(self, session_date=None, reason=None):
+        """Run the daily collection jobs in-process, independent jobs concurrently"""
         logging.info("=" * 60)
         logging.info("DAILY BLOOMBERG DATA COLLECTION STARTED")
         logging.info("=" * 60)
+        if session_date is not None:
+            logging.info(f"Session {session_date}: "
+                         f"{'settlement published' if reason == 'available' else 'settlement not confirmed by deadline'}")
 
-        collection_results = {}  # FIX: Initialize this variable
-
-        # Scripts to run
-        scripts = [
-            ('scripts/fetch_labeled_volatility_data.py', 'Current Volatility Data'),  # Use emoji-free version
-            ('scripts/fetch_spy_weights.py', 'SPY Weights Data'),  # Use emoji-free version
-            ('scripts/fetch_historical_volatility.py', 'Historical Volatility Update')  # Use emoji-free version
-        ]
-
-        for script_path, script_name in scripts:
-            success = False
-            retries = 0
-
-            while not success and retries < self.config['collection']['max_retries']:
-                if retries > 0:
-                    logging.info(f"Retrying {script_name} (attempt {retries + 1})")
-                    time.sleep(self.config['collection']['retry_delay_minutes'] * 60)
+        graph = self.build_job_graph()
+        run_id = self.run_state.start_run('daily_collection', session_date, reason)
+        session_pool = self.session_pool or BloombergSessionPool(size=self.config['collection']['session_pool_size'])
+        try:
+            job_results = graph.run(JobContext(session_pool=session_pool))
+        finally:
+            session_pool.close()
+            self.session_pool = None
 
-                success, stdout, stderr = self.run_script(script_path, script_name)
-                retries += 1
+        for job_name, result in job_results.items():
+            self.run_state.record_task(run_id, job_name, result['status'], attempts=result['attempts'],
+                                       duration_seconds=round(result['duration_seconds'], 1), error=result['error'],
+                                       started_at=result['started_at'], finished_at=result['finished_at'])
+            log = logging.info if result['success'] else logging.error
+            log(f"{result['status'].upper()}: {job_name} ({result['attempts']} attempt(s), "
+                f"{result['duration_seconds']:.1f}s)")
 
-                collection_results[script_name] = {
-                    'success': success,
-                    'attempts': retries,
-                    'stdout': stdout,
-                    'stderr': stderr,
-                    'timestamp': datetime.now().isoformat()
-                }
+        succeeded = sum(result['success'] for result in job_results.values())
+        run_status = 'success' if succeeded == len(job_results) else 'partial' if succeeded else 'failed'
+        self.run_state.finish_run(run_id, run_status)
 
-                if success:
-                    break
+        chain, chain_seconds = graph.critical_path(job_results)
+        logging.info(f"Critical path: {' -> '.join(chain)} ({chain_seconds:.1f}s)")
 
-        # Generate report
-        report = self.generate_daily_report(collection_results)
+        # Generate report from the recorded run
+        report = self.generate_daily_report(run_id)
+        collection_results = report['script_results']
 
         # Send notifications
         self.send_notifications(report, collection_results)
@@ -156,10 +209,24 @@ class DataCollectionScheduler:
 
         return collection_results
     
-    def generate_daily_report(self, collection_results):
-        """Generate daily data collection report"""
+    def generate_daily_report(self, run_id):
+        """Generate the daily data collection report for a recorded run"""
         timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         
+        collection_results = {
+            task['name']: {
+                'success': task['status'] == 'success',
+                'status': task['status'],
+                'attempts': task['attempts'],
+                'retries': task['retries'],
+                'rows': task['rows'],
+                'stderr': task['error'],
+                'duration_seconds': task['duration_seconds'],
+                'timestamp': task['finished_at']
+            }
+            for task in self.run_state.run_tasks(run_id)
+        }
+        
         # Calculate success rate
         total_scripts = len(collection_results)
         successful_scripts = sum(1 for result in collection_results.values() if result['success'])
@@ -176,9 +243,16 @@ class DataCollectionScheduler:
                 'success_rate': success_rate,
                 'overall_status': 'SUCCESS' if success_rate >= 80 else 'PARTIAL' if success_rate >= 50 else 'FAILED'
             },
+            'run_id': run_id,
             'script_results': collection_results,
             'data_quality': data_quality,
-            'next_collection': (datetime.now() + timedelta(days=1)).strftime('%Y-%m-%d 09:00:00')
+            'stale_collections': self.run_state.stale_collections(
+                self.config['collection']['tracked_collections'], self.config['collection']['stale_after_hours']),
+            'weekly_success': {
+                name: f"{successes}/{total}"
+                for name, (successes, total) in self.run_state.task_success_rate(datetime.now() - timedelta(days=7)).items()
+            },
+            'next_collection': f"{self.trigger.next_session()} after {self.config['trigger']['close_time']} close"
         }
         
         # Save report
@@ -239,18 +313,11 @@ class DataCollectionScheduler:
             logging.error(f"Error assessing data quality: {e}")
             return {'error': str(e)}
     
-    def send_email_notification(self, report):
-        """Send email notification with daily report"""
-        try:
-            msg = MIMEMultipart()
-            msg['From'] = self.config['email']['sender_email']
-            msg['To'] = ', '.join(self.config['email']['recipient_emails'])
-            msg['Subject'] = f"Bloomberg Data Collection Report - {datetime.now().strftime('%Y-%m-%d')}"
-            
-            # Create email body
-            status_emoji = "✅" if report['summary']['overall_status'] == 'SUCCESS' else "⚠️" if report['summary']['overall_status'] == 'PARTIAL' else "❌"
-            
-            body = f"""
+    def format_report_message(self, report):
+        """Plain-text daily report for email and Slack"""
+        status_emoji = "✅" if report['summary']['overall_status'] == 'SUCCESS' else "⚠️" if report['summary']['overall_status'] == 'PARTIAL' else "❌"
+        
+        body = f"""
 {status_emoji} Bloomberg Data Collection Daily Report
 {'='*50}
 
@@ -262,104 +329,50 @@ Summary:
 
 Script Results:
 """
-            
-            for script_name, result in report['script_results'].items():
-                status = "✅" if result['success'] else "❌"
-                body += f"• {status} {script_name} (attempts: {result['attempts']})\n"
-            
-            body += f"""
+        
+        for script_name, result in report['script_results'].items():
+            status = "✅" if result['success'] else "❌"
+            body += f"• {status} {script_name} (attempts: {result['attempts']})\n"
+        
+        body += f"""
 Data Quality:
 • Volatility files: {report['data_quality']['volatility_data']['files_available']}
 • SPY weights files: {report['data_quality']['spy_weights']['files_available']}
+• Stale collections: {', '.join(report['stale_collections']) or 'none'}
 
 Next collection scheduled: {report['next_collection']}
 
 ---
 Automated Bloomberg Data Collection System
 """
-            
-            msg.attach(MIMEText(body, 'plain'))
-            
-            # Send email
-            server = smtplib.SMTP(self.config['email']['smtp_server'], self.config['email']['smtp_port'])
-            server.starttls()
-            server.login(self.config['email']['sender_email'], self.config['email']['sender_password'])
-            text = msg.as_string()
-            server.sendmail(self.config['email']['sender_email'], self.config['email']['recipient_emails'], text)
-            server.quit()
-            
-            logging.info("✅ Email notification sent successfully")
-            
-        except Exception as e:
-            logging.error(f"❌ Failed to send email notification: {e}")
-    
-    def send_slack_notification(self, report):
-        """Send Slack notification (optional)"""
-        try:
-            import requests
-            
-            status_emoji = "✅" if report['summary']['overall_status'] == 'SUCCESS' else "⚠️" if report['summary']['overall_status'] == 'PARTIAL' else "❌"
-            
-            message = {
-                "channel": self.config['slack']['channel'],
-                "username": "Bloomberg Data Bot",
-                "text": f"{status_emoji} Daily Bloomberg Data Collection Complete",
-                "attachments": [
-                    {
-                        "color": "good" if report['summary']['overall_status'] == 'SUCCESS' else "warning" if report['summary']['overall_status'] == 'PARTIAL' else "danger",
-                        "fields": [
-                            {
-                                "title": "Success Rate",
-                                "value": f"{report['summary']['success_rate']:.1f}%",
-                                "short": True
-                            },
-                            {
-                                "title": "Scripts Completed",
-                                "value": f"{report['summary']['successful_scripts']}/{report['summary']['total_scripts']}",
-                                "short": True
-                            }
-                        ]
-                    }
-                ]
-            }
-            
-            response = requests.post(self.config['slack']['webhook_url'], json=message)
-            if response.status_code == 200:
-                logging.info("✅ Slack notification sent successfully")
-            else:
-                logging.error(f"❌ Slack notification failed: {response.status_code}")
-                
-        except Exception as e:
-            logging.error(f"❌ Failed to send Slack notification: {e}")
+        
+        return body
     
     def send_notifications(self, report, collection_results):
-        """Send all configured notifications"""
-        # Always send email
-        self.send_email_notification(report)
-        
-        # Send Slack if configured
-        if self.config['slack']['webhook_url'] != 'https://hooks.slack.com/your/webhook/url':
-            self.send_slack_notification(report)
+        """Queue the daily report for email/Slack delivery in the background"""
+        subject = f"Bloomberg Data Collection Report - {datetime.now().strftime('%Y-%m-%d')}"
+        level = 'info' if report['summary']['overall_status'] == 'SUCCESS' else 'error'
+        if not self.notifier.notify(subject, self.format_report_message(report), level):
+            logging.warning("No notification channel configured, report not sent")
     
     def start_scheduler(self):
-        """Start the daily scheduler"""
+        """Start the market-close scheduler"""
         logging.info("🚀 Starting Bloomberg Data Collection Scheduler")
         
-        # Schedule daily collection at 9:00 AM
-        schedule.every().day.at("09:00").do(self.collect_daily_data)
-        
-        # Optional: Schedule additional collections
-        # schedule.every().day.at("17:00").do(self.collect_daily_data)  # End of day
-        
-        logging.info("📅 Scheduled daily data collection at 09:00 AM")
+        trigger_config = self.config['trigger']
+        logging.info(f"📅 Collection triggered after each trading session's {trigger_config['close_time']} close "
+                     f"once {trigger_config['probe_ticker']} {trigger_config['probe_field']} is published "
+                     f"(next session: {self.trigger.next_session()})")
         logging.info("⏰ Scheduler running... Press Ctrl+C to stop")
         
         try:
-            while True:
-                schedule.run_pending()
-                time.sleep(60)  # Check every minute
+            # Sleeps until the next session's close; non-trading days are skipped
+            self.trigger.run(self.collect_daily_data)
         except KeyboardInterrupt:
             logging.info("🛑 Scheduler stopped by user")
+        finally:
+            # Deliver anything still queued before the process exits
+            self.notifier.close()
 
 def main():
     """Main execution function"""
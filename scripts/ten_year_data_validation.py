@@ -11,6 +11,14 @@ import plotly.express as px
 from plotly.subplots import make_subplots
 from datetime import datetime
 import json
+import os
+import sys
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.utils.columnar_writer import ColumnarDatasetWriter
 
 def load_and_validate_ten_year_data():
     """Load and validate the 10-year volatility dataset"""
@@ -18,11 +26,14 @@ def load_and_validate_ten_year_data():
     print("🔍 VALIDATING 10-YEAR VOLATILITY DATASET")
     print("=" * 60)
     
-    # Load the data
-    data_path = r'C:\Users\acmuser\PycharmProjects\BloombergData\data\historical_volatility\ten_year_volatility_latest.csv'
+    # Load the latest published dataset
+    writer = ColumnarDatasetWriter(
+        os.path.join(project_root, 'data', 'historical_volatility'), 'ten_year_volatility'
+    )
+    data_path = writer.latest_path()
     
     try:
-        df = pd.read_csv(data_path)
+        df = writer.load_latest()
         df['date'] = pd.to_datetime(df['date'])
         
         print(f"✅ Successfully loaded dataset")
@@ -3,19 +3,21 @@ VIX Daily Data Scheduler with Email/Slack Alerts
 Windows-compatible scheduler for daily VIX data collection and monitoring
 """
 
-import schedule
 import time
-import subprocess
 import sys
 import os
 import json
 import logging
-import smtplib
-import requests
 from datetime import datetime, timedelta
 from pathlib import Path
-from email.mime.text import MimeText
-from email.mime.multipart import MimeMultipart
+
+sys.path.insert(0, str(Path(__file__).parent.parent.absolute()))
+
+from src.data_collection.job_dag import JobContext, JobGraph, script_job
+from src.data_collection.market_close_trigger import MarketCloseTrigger, settlement_probe
+from src.data_collection.run_state import DEFAULT_DB_NAME, RunStateStore
+from src.data_collection.session_pool import BloombergSessionPool
+from src.utils.notification_dispatcher import dispatcher_from_config
 
 # Configure logging
 logging.basicConfig(
@@ -28,6 +30,8 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+VIX_COLLECTION = 'vix_refresh'  # Run-state collection recorded by scripts/refresh_vix_data.py
+
 class VIXScheduler:
     """
     Daily scheduler for VIX data collection with comprehensive monitoring
@@ -45,8 +49,13 @@ class VIXScheduler:
         self.scripts_dir.mkdir(parents=True, exist_ok=True)
         
         self.schedule_config = self.load_schedule_config()
+        self.session_pool = None
+        self.last_result = None
+        self.run_state = RunStateStore(self.project_root / 'data' / DEFAULT_DB_NAME)
+        self.trigger = self.build_trigger()
         self.email_config = self.load_email_config()
         self.slack_config = self.load_slack_config()
+        self.notifier = self.build_notifier()
         
         logger.info("VIX Scheduler initialized")
     
@@ -55,11 +64,19 @@ class VIXScheduler:
         config_file = self.config_dir / 'schedule_config.json'
         
         default_config = {
-            "daily_collection_time": "18:30",  # 6:30 PM (after market close)
-            "weekend_collection": False,
+            "close_time": "16:00",  # Exchange close; collection starts once the settlement is published
+            "settle_delay_minutes": 15,
+            "probe_ticker": "UX1 Index",
+            "probe_field": "PX_SETTLE",
+            "probe_interval_minutes": 5,
+            "deadline_time": "18:30",  # Collect by then even if the probe never confirms
             "retry_attempts": 3,
             "retry_delay_minutes": 15,
             "data_validation": True,
+            "stale_after_hours": 30,  # Validation alerts when no successful collection is this recent
+            "notification_coalesce_seconds": 30,  # Alerts this close together go out as one digest
+            "notification_min_interval_seconds": 60,
+            "notification_sink_path": None,  # e.g. "logs/notifications.jsonl" to write locally instead of sending
             "alert_on_failure": True,
             "alert_on_success": True,
             "timezone": "US/Eastern"
@@ -77,6 +94,29 @@ class VIXScheduler:
         
         return config
     
+    def build_trigger(self):
+        """Market-close trigger probing for the day's settlement"""
+        config = self.schedule_config
+        return MarketCloseTrigger(
+            probe=self.probe_settlement,
+            close_time=config.get('close_time', '16:00'),
+            settle_delay_minutes=config.get('settle_delay_minutes', 15),
+            probe_interval_minutes=config.get('probe_interval_minutes', 5),
+            # Older configs only have the fixed collection time; it becomes the latest start
+            deadline_time=config.get('deadline_time', config.get('daily_collection_time', '18:30')),
+            timezone=config.get('timezone', 'US/Eastern')
+        )
+    
+    def probe_settlement(self, session_date):
+        """True once the probe security's settlement for session_date is on Bloomberg"""
+        # The probing session stays open for the collection that follows
+        if self.session_pool is None:
+            self.session_pool = BloombergSessionPool(size=1)
+        probe = settlement_probe(self.session_pool,
+                                 ticker=self.schedule_config.get('probe_ticker', 'UX1 Index'),
+                                 field=self.schedule_config.get('probe_field', 'PX_SETTLE'))
+        return probe(session_date)
+    
     def load_email_config(self):
         """Load email configuration"""
         config_file = self.config_dir / 'email_config.json'
@@ -104,82 +144,46 @@ class VIXScheduler:
             logger.warning(f"Slack config not found at {config_file}")
             return None
     
-    def send_email_notification(self, subject, body):
-        """Send email notification"""
-        if not self.email_config:
-            logger.warning("Email config not available, skipping email notification")
-            return False
-        
-        try:
-            msg = MimeMultipart()
-            msg['From'] = self.email_config['sender_email']
-            msg['To'] = ', '.join(self.email_config['recipient_emails'])
-            msg['Subject'] = f"[VIX Data] {subject}"
-            
-            msg.attach(MimeText(body, 'plain'))
-            
-            server = smtplib.SMTP(self.email_config['smtp_server'], self.email_config['smtp_port'])
-            server.starttls()
-            server.login(self.email_config['sender_email'], self.email_config['sender_password'])
-            
-            text = msg.as_string()
-            server.sendmail(self.email_config['sender_email'], self.email_config['recipient_emails'], text)
-            server.quit()
-            
-            logger.info("Email notification sent successfully")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Failed to send email notification: {e}")
-            return False
+    def build_notifier(self):
+        """Background email/Slack dispatcher; notification_sink_path sends to a local file instead"""
+        slack_config = self.slack_config
+        if slack_config:
+            slack_config = {'icon_emoji': ':chart_with_upwards_trend:', **slack_config}
+        return dispatcher_from_config(
+            self.email_config, slack_config,
+            local_path=self.schedule_config.get('notification_sink_path'),
+            subject_prefix='[VIX Data] ', slack_prefix='🔔 VIX Data Alert\n',
+            coalesce_seconds=self.schedule_config.get('notification_coalesce_seconds', 30),
+            min_interval_seconds=self.schedule_config.get('notification_min_interval_seconds', 60)
+        )
     
-    def send_slack_notification(self, message):
-        """Send Slack notification"""
-        if not self.slack_config:
-            logger.warning("Slack config not available, skipping Slack notification")
-            return False
-        
-        try:
-            payload = {
-                "channel": self.slack_config['channel'],
-                "text": f"🔔 VIX Data Alert\n{message}",
-                "username": "VIX Data Bot",
-                "icon_emoji": ":chart_with_upwards_trend:"
-            }
-            
-            response = requests.post(self.slack_config['webhook_url'], json=payload)
-            
-            if response.status_code == 200:
-                logger.info("Slack notification sent successfully")
-                return True
-            else:
-                logger.error(f"Slack notification failed: {response.status_code}")
-                return False
-                
-        except Exception as e:
-            logger.error(f"Failed to send Slack notification: {e}")
-            return False
+    def notify(self, subject, message, level='info'):
+        """Queue an email/Slack notification; returns immediately"""
+        if not self.notifier.notify(subject, message, level):
+            logger.warning(f"No notification channel configured, skipping: {subject}")
     
     def run_vix_collection(self):
-        """Execute VIX data collection script"""
+        """Execute the VIX pipeline refresh in-process on the shared session pool"""
         try:
             logger.info("Starting daily VIX data collection...")
             
-            # Path to the VIX data fetcher script
-            vix_script = self.scripts_dir / 'vix_data_fetcher.py'
+            # Incremental VIXPipeline refresh plus the target delta and term structure files
+            vix_script = self.scripts_dir / 'refresh_vix_data.py'
             
             if not vix_script.exists():
-                raise FileNotFoundError(f"VIX data fetcher script not found: {vix_script}")
+                raise FileNotFoundError(f"VIX refresh script not found: {vix_script}")
             
-            # Run the VIX data collection script
-            result = subprocess.run(
-                [sys.executable, str(vix_script)],
-                capture_output=True,
-                text=True,
-                timeout=3600  # 1 hour timeout
-            )
+            graph = JobGraph()
+            graph.add('VIX Data Collection', script_job(str(vix_script)))
+            session_pool = self.session_pool or BloombergSessionPool(size=1)
+            try:
+                result = graph.run(JobContext(session_pool=session_pool))['VIX Data Collection']
+            finally:
+                if session_pool is not self.session_pool:
+                    session_pool.close()
+            self.last_result = result
             
-            if result.returncode == 0:
+            if result['success']:
                 logger.info("VIX data collection completed successfully")
                 
                 if self.schedule_config.get('alert_on_success', True):
@@ -187,19 +191,15 @@ class VIXScheduler:
 ✅ Daily VIX Data Collection - SUCCESS
 
 📅 Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-📊 Collection completed successfully
+📊 Collection completed successfully in {result['duration_seconds']:.0f}s
 🗂️ Data saved to: {self.data_dir}
-
-Output:
-{result.stdout[-500:] if result.stdout else 'No output'}
                     """
                     
-                    self.send_email_notification("Daily Collection Success", success_message)
-                    self.send_slack_notification(success_message)
+                    self.notify("Daily Collection Success", success_message)
                 
                 return True
             else:
-                raise subprocess.CalledProcessError(result.returncode, vix_script, result.stderr)
+                raise RuntimeError(result['error'])
                 
         except Exception as e:
             logger.error(f"VIX data collection failed: {e}")
@@ -214,70 +214,80 @@ Output:
 Please check:
 1. Bloomberg Terminal is running and logged in
 2. Network connectivity is stable
-3. VIX data fetcher script is accessible
+3. VIX refresh script is accessible
 4. Sufficient disk space for data storage
 
 Log file: vix_scheduler.log
                 """
                 
-                self.send_email_notification("Daily Collection FAILED", error_message)
-                self.send_slack_notification(error_message)
+                self.notify("Daily Collection FAILED", error_message, level='error')
             
             return False
     
     def validate_recent_data(self):
         """Validate that recent data collection was successful"""
         try:
-            # Check for recent data files
-            today = datetime.now().strftime('%Y%m%d')
-            yesterday = (datetime.now() - timedelta(days=1)).strftime('%Y%m%d')
+            # Latest successful collection recorded by the fetcher
+            max_age_hours = self.schedule_config.get('stale_after_hours', 30)
+            stale = self.run_state.stale_collections([VIX_COLLECTION], max_age_hours)
+            last = self.run_state.last_collection(VIX_COLLECTION, status='success')
             
-            recent_files = []
-            for date_pattern in [today, yesterday]:
-                pattern = f"vix_*{date_pattern}*.csv"
-                recent_files.extend(list(self.data_dir.glob(pattern)))
-            
-            if recent_files:
-                logger.info(f"Found {len(recent_files)} recent VIX data files")
+            if not stale and last['rows']:
+                logger.info(f"Latest VIX collection finished {last['finished_at']} with {last['rows']:,} rows")
                 return True
             else:
-                logger.warning("No recent VIX data files found")
+                logger.warning("No recent successful VIX collection recorded")
+                last_run = self.run_state.last_collection(VIX_COLLECTION)
                 
                 alert_message = f"""
 ⚠️ VIX Data Validation Warning
 
 📅 Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-📁 No recent VIX data files found in {self.data_dir}
+📁 No successful VIX collection with data in the last {max_age_hours} hours
+🕐 Last success: {last['finished_at'] if last else 'never'}
+📋 Latest collection: {f"{last_run['status']} ({last_run['error'] or 'no error recorded'})" if last_run else 'none recorded'}
 
 This could indicate:
 - Collection process is not running
-- Files are being saved to different location
+- Contracts are failing after retries
 - Data collection is failing silently
 
 Please investigate immediately.
                 """
                 
-                self.send_email_notification("Data Validation Warning", alert_message)
-                self.send_slack_notification(alert_message)
+                self.notify("Data Validation Warning", alert_message, level='error')
                 return False
                 
         except Exception as e:
             logger.error(f"Data validation failed: {e}")
             return False
     
-    def daily_collection_job(self):
+    def daily_collection_job(self, session_date=None, reason=None):
         """Main daily collection job with retry logic"""
         logger.info("="*60)
         logger.info("DAILY VIX DATA COLLECTION JOB STARTED")
         logger.info("="*60)
+        if session_date is not None:
+            logger.info(f"Session {session_date}: "
+                        f"{'settlement published' if reason == 'available' else 'settlement not confirmed by deadline'}")
         
         max_attempts = self.schedule_config.get('retry_attempts', 3)
         retry_delay = self.schedule_config.get('retry_delay_minutes', 15)
         
+        # One session pool for every attempt of the day (the probe may have opened it already)
+        self.session_pool = self.session_pool or BloombergSessionPool(size=1)
+        run_id = self.run_state.start_run('vix_daily', session_date, reason)
+        started_at = datetime.now().isoformat(timespec='seconds')
+        duration = 0.0
+        success = False
+        
         for attempt in range(1, max_attempts + 1):
             logger.info(f"Collection attempt {attempt}/{max_attempts}")
             
+            self.last_result = None
             success = self.run_vix_collection()
+            if self.last_result is not None:
+                duration += self.last_result['duration_seconds']
             
             if success:
                 logger.info("Daily VIX collection completed successfully")
@@ -294,6 +304,17 @@ Please investigate immediately.
                 else:
                     logger.error("All collection attempts failed")
         
+        self.session_pool.close()
+        self.session_pool = None
+        
+        collection = self.run_state.last_collection(VIX_COLLECTION)
+        self.run_state.record_task(
+            run_id, 'VIX Data Collection', 'success' if success else 'failed', attempts=attempt,
+            duration_seconds=round(duration, 1), rows=collection['rows'] if collection else None,
+            error=None if success else ((collection or {}).get('error') or (self.last_result or {}).get('error')),
+            started_at=started_at
+        )
+        self.run_state.finish_run(run_id, 'success' if success else 'failed')
         logger.info("Daily VIX collection job completed")
     
     def weekend_maintenance_job(self):
@@ -307,6 +328,11 @@ Please investigate immediately.
         # Check for old log files
         log_files = list(Path('.').glob('*.log'))
         
+        # Success rate of the week's runs, from the run-state store
+        successes, total = self.run_state.task_success_rate(datetime.now() - timedelta(days=7)).get(
+            'VIX Data Collection', (0, 0))
+        weekly_success = f"{successes}/{total} successful"
+        
         maintenance_report = f"""
 🔧 Weekend VIX Data System Maintenance
 
@@ -315,52 +341,38 @@ Please investigate immediately.
 💾 Data Directory Size: {size_mb:.2f} MB
 📁 Total Data Files: {len(list(self.data_dir.rglob('*.csv')))}
 📝 Log Files: {len(log_files)}
+✅ Collections this week: {weekly_success}
 
-Next scheduled collection: {schedule.next_run()}
+Next collection: after the {self.trigger.next_session()} close
         """
         
-        self.send_email_notification("Weekend System Maintenance", maintenance_report)
-        self.send_slack_notification(maintenance_report)
+        self.notify("Weekend System Maintenance", maintenance_report)
         
         logger.info("Weekend maintenance completed")
     
     def setup_schedule(self):
-        """Setup the daily schedule"""
-        collection_time = self.schedule_config.get('daily_collection_time', '18:30')
-        weekend_collection = self.schedule_config.get('weekend_collection', False)
-        
-        if weekend_collection:
-            # Schedule daily collection including weekends
-            schedule.every().day.at(collection_time).do(self.daily_collection_job)
-            logger.info(f"Scheduled daily VIX collection at {collection_time} (including weekends)")
-        else:
-            # Schedule only on weekdays
-            schedule.every().monday.at(collection_time).do(self.daily_collection_job)
-            schedule.every().tuesday.at(collection_time).do(self.daily_collection_job)
-            schedule.every().wednesday.at(collection_time).do(self.daily_collection_job)
-            schedule.every().thursday.at(collection_time).do(self.daily_collection_job)
-            schedule.every().friday.at(collection_time).do(self.daily_collection_job)
-            logger.info(f"Scheduled weekday VIX collection at {collection_time}")
-        
-        # Schedule weekend maintenance
-        schedule.every().saturday.at("10:00").do(self.weekend_maintenance_job)
+        """Announce the market-close schedule"""
+        close_time = self.schedule_config.get('close_time', '16:00')
+        next_session = self.trigger.next_session()
+        logger.info(f"Collection triggered after each trading session's close ({close_time}) "
+                    f"once {self.schedule_config.get('probe_ticker', 'UX1 Index')} "
+                    f"{self.schedule_config.get('probe_field', 'PX_SETTLE')} is published")
         
         # Send startup notification
         startup_message = f"""
 🚀 VIX Data Scheduler Started
 
 📅 Startup Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-⏰ Daily Collection: {collection_time}
-📊 Weekend Collection: {'Enabled' if weekend_collection else 'Disabled'}
+⏰ Daily Collection: after the {close_time} close, once the settlement is published
+📊 Non-trading days: skipped (exchange calendar)
 🔄 Retry Attempts: {self.schedule_config.get('retry_attempts', 3)}
 
-Next scheduled run: {schedule.next_run()}
+Next session: {next_session}
 
 System is now monitoring VIX data collection.
         """
         
-        self.send_email_notification("VIX Scheduler Started", startup_message)
-        self.send_slack_notification(startup_message)
+        self.notify("VIX Scheduler Started", startup_message)
     
     def run(self):
         """Run the scheduler"""
@@ -371,9 +383,8 @@ System is now monitoring VIX data collection.
         logger.info("Scheduler is now running. Press Ctrl+C to stop.")
         
         try:
-            while True:
-                schedule.run_pending()
-                time.sleep(60)  # Check every minute
+            # Sleeps until the next session's close (or Saturday maintenance); no polling
+            self.trigger.run(self.daily_collection_job, on_weekly=self.weekend_maintenance_job)
                 
         except KeyboardInterrupt:
             logger.info("Scheduler stopped by user")
@@ -387,8 +398,11 @@ System is now monitoring VIX data collection.
 To restart the scheduler, run the script again.
             """
             
-            self.send_email_notification("VIX Scheduler Stopped", shutdown_message)
-            self.send_slack_notification(shutdown_message)
+            self.notify("VIX Scheduler Stopped", shutdown_message)
+        
+        finally:
+            # Deliver anything still queued before the process exits
+            self.notifier.close()
 
 def create_config_templates():
     """Create configuration file templates"""
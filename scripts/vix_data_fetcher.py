@@ -3,37 +3,28 @@ VIX Futures and Options Data Fetcher
 Collects 10 years of VIX 1-month futures and options data from Bloomberg API
 Supports daily scheduling and automated alerts/notifications
 """
-EMAIL_LEGACY = False  # Disable email temporarily
 import sys
 import os
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta, date
 import json
-import time
-import smtplib
-import requests
-try:
-    from email.mime.text import MimeText
-    from email.mime.multipart import MimeMultipart
-    EMAIL_LEGACY = True
-except ImportError:
-    from email.message import EmailMessage
-    EMAIL_LEGACY = False
 from pathlib import Path
 
 # Add project root to path
 project_root = Path(__file__).parent.parent.absolute()
 sys.path.insert(0, str(project_root))
 
-try:
-    import blpapi
-    print("✅ Bloomberg API imported successfully")
-except ImportError as e:
-    print(f"❌ Bloomberg API import error: {e}")
-    sys.exit(1)
+from src.analysis.delta_selection import select_target_delta_options
+from src.data_collection.run_state import DEFAULT_DB_NAME, RunStateStore
+from src.data_collection.session_pool import PooledSessionMixin
+from src.data_collection.task_runner import CollectionTask, RetryableTaskError, TaskRunner
+from src.utils.instrumentation import METRICS, InstrumentedSession
+from src.utils.notification_dispatcher import dispatcher_from_config, shared_dispatcher
 
-class VIXDataFetcher:
+COLLECTION_NAME = 'vix_data'
+
+class VIXDataFetcher(PooledSessionMixin):
     """
     Comprehensive VIX Futures and Options Data Collection System
     Handles 1-month VIX futures and 10/50 delta call options with historical data
@@ -42,8 +33,11 @@ class VIXDataFetcher:
     def __init__(self):
         self.session = None
         self.refDataService = None
+        self.failed_tasks = {}
+        self.task_retries = 0
         self.project_root = project_root
         self.data_dir = self.project_root / 'data' / 'vix_data'
+        self.run_state = RunStateStore(self.project_root / 'data' / DEFAULT_DB_NAME)
         self.config_dir = self.project_root / 'config'
         self.log_file = self.data_dir / 'vix_collection_log.json'
         
@@ -87,11 +81,26 @@ class VIXDataFetcher:
         print(f"📅 Collection Period: {self.start_date.strftime('%Y-%m-%d')} to {self.end_date.strftime('%Y-%m-%d')}")
         print(f"💾 Data Directory: {self.data_dir}")
     
-    def connect(self):
-        """Connect to Bloomberg Terminal"""
+    def connect(self, session_pool=None):
+        """Connect to Bloomberg Terminal, or borrow a session from a shared pool"""
+        if session_pool is not None:
+            try:
+                self.borrow_session(session_pool)
+                return True
+            except Exception as e:
+                print(f"❌ Bloomberg connection failed: {e}")
+                return False
+        
+        # Imported here so loading this module (CLI, job graph) does not pay for blpapi
+        try:
+            import blpapi
+        except ImportError as e:
+            print(f"❌ Bloomberg API import error: {e}")
+            return False
+        
         try:
             sessionOptions = blpapi.SessionOptions()
-            self.session = blpapi.Session(sessionOptions)
+            self.session = InstrumentedSession(blpapi.Session(sessionOptions))
             
             if not self.session.start():
                 print("❌ Failed to start Bloomberg session")
@@ -187,161 +196,122 @@ class VIXDataFetcher:
         print(f"📋 Generated {len(option_tickers)} VIX option tickers")
         return option_tickers
     
-    def get_historical_futures_data(self, tickers, batch_size=10):
+    def fetch_contract_history(self, ticker, fields, static_fields):
         """
-        Fetch historical data for VIX futures contracts
+        Fetch one contract's daily history over the collection period
+
+        Parameters:
+        - ticker: Bloomberg ticker
+        - fields: {clean name: Bloomberg field}
+        - static_fields: Columns repeated on every row (contract type, expiry, ...)
+
+        Returns an empty DataFrame for a contract Bloomberg rejects; raises
+        RetryableTaskError on a timeout so the task runner retries it.
         """
-        print(f"📊 Fetching historical VIX futures data...")
-        all_data = []
+        import blpapi
         
-        bloomberg_fields = list(self.vix_futures_fields.values())
+        request = self.refDataService.createRequest("HistoricalDataRequest")
+        request.getElement("securities").appendValue(ticker)
         
-        for i in range(0, len(tickers), batch_size):
-            batch = tickers[i:i + batch_size]
-            print(f"   Processing futures batch {i//batch_size + 1}/{(len(tickers)-1)//batch_size + 1}")
-            
-            for ticker_info in batch:
-                ticker = ticker_info['ticker']
-                print(f"     Fetching {ticker}...")
-                
-                # Create historical data request
-                request = self.refDataService.createRequest("HistoricalDataRequest")
-                request.getElement("securities").appendValue(ticker)
-                
-                for field in bloomberg_fields:
-                    request.getElement("fields").appendValue(field)
-                
-                request.set("startDate", self.start_date.strftime('%Y%m%d'))
-                request.set("endDate", self.end_date.strftime('%Y%m%d'))
-                request.set("periodicitySelection", "DAILY")
-                
-                self.session.sendRequest(request)
-                
-                # Process response
-                ticker_data = []
-                while True:
-                    event = self.session.nextEvent(30000)  # 30 second timeout
+        for field in fields.values():
+            request.getElement("fields").appendValue(field)
+        
+        request.set("startDate", self.start_date.strftime('%Y%m%d'))
+        request.set("endDate", self.end_date.strftime('%Y%m%d'))
+        request.set("periodicitySelection", "DAILY")
+        
+        self.session.sendRequest(request)
+        
+        # Process response
+        ticker_data = []
+        while True:
+            event = self.session.nextEvent(30000)  # 30 second timeout
+            
+            if event.eventType() == blpapi.Event.RESPONSE:
+                with METRICS.timer('parse_seconds', source='vix_data'):
+                    for msg in event:
+                        securityData = msg.getElement("securityData")
                     
-                    if event.eventType() == blpapi.Event.RESPONSE:
-                        for msg in event:
-                            securityData = msg.getElement("securityData")
-                            
-                            if securityData.hasElement("securityError"):
-                                print(f"         WARNING: Error for {ticker}")
-                                break
-                            
-                            fieldDataArray = securityData.getElement("fieldData")
-                            
-                            for j in range(fieldDataArray.numValues()):
-                                fieldData = fieldDataArray.getValue(j)
-                                data_date = fieldData.getElement("date").getValue()
-                                
-                                row_data = {
-                                    'date': data_date.strftime('%Y-%m-%d'),
-                                    'ticker': ticker,
-                                    'contract_type': 'VIX_1M_Future',
-                                    'expiry_date': ticker_info['expiry_date'].strftime('%Y-%m-%d')
-                                }
-                                
-                                # Map Bloomberg fields to clean names
-                                for clean_name, bloomberg_field in self.vix_futures_fields.items():
-                                    if fieldData.hasElement(bloomberg_field):
-                                        value = fieldData.getElement(bloomberg_field).getValue()
-                                        row_data[clean_name] = value if value is not None else np.nan
-                                    else:
-                                        row_data[clean_name] = np.nan
-                                
-                                ticker_data.append(row_data)
-                        break
+                        if securityData.hasElement("securityError"):
+                            print(f"         WARNING: Error for {ticker}")
+                            break
                     
-                    if event.eventType() == blpapi.Event.TIMEOUT:
-                        print(f"         TIMEOUT: {ticker}")
-                        break
-                
-                all_data.extend(ticker_data)
-                time.sleep(0.1)  # Rate limiting
+                        fieldDataArray = securityData.getElement("fieldData")
+                    
+                        for j in range(fieldDataArray.numValues()):
+                            fieldData = fieldDataArray.getValue(j)
+                            data_date = fieldData.getElement("date").getValue()
+                        
+                            row_data = {'date': data_date.strftime('%Y-%m-%d'), 'ticker': ticker, **static_fields}
+                        
+                            # Map Bloomberg fields to clean names
+                            for clean_name, bloomberg_field in fields.items():
+                                if fieldData.hasElement(bloomberg_field):
+                                    value = fieldData.getElement(bloomberg_field).getValue()
+                                    row_data[clean_name] = value if value is not None else np.nan
+                                else:
+                                    row_data[clean_name] = np.nan
+                        
+                            ticker_data.append(row_data)
+                break
+            
+            if event.eventType() == blpapi.Event.TIMEOUT:
+                self.session_timed_out = True
+                raise RetryableTaskError(f"Timeout for {ticker}")
+        
+        METRICS.inc('rows_parsed_total', len(ticker_data), source='vix_data')
+        return pd.DataFrame(ticker_data)
+    
+    def task_runner(self):
+        """Task runner journaling finished contracts for the current collection period"""
+        period = f"{self.start_date.strftime('%Y%m%d')}_{self.end_date.strftime('%Y%m%d')}"
+        return TaskRunner(self.data_dir / 'task_journal' / period)
+    
+    def _run_contract_tasks(self, contracts, field_group, fields, static_fields, pause, runner=None):
+        """Fetch every contract as its own task; failed contracts are retried individually"""
+        runner = runner or self.task_runner()
+        start, end = self.start_date.strftime('%Y%m%d'), self.end_date.strftime('%Y%m%d')
+        tasks = [CollectionTask(info['ticker'], field_group, start, end, context=info) for info in contracts]
         
-        df = pd.DataFrame(all_data)
+        def fetch_task(task):
+            print(f"     Fetching {task.security}...")
+            try:
+                return self.fetch_contract_history(task.security, fields, static_fields(task.context))
+            finally:
+                METRICS.sleep(pause, reason='rate_limit')
+        
+        summary = runner.run(tasks, fetch_task)
+        self.failed_tasks.update(summary['failed'])
+        self.task_retries += summary['retries']
+        return runner.load(tasks)
+    
+    def get_historical_futures_data(self, tickers, runner=None):
+        """
+        Fetch historical data for VIX futures contracts
+        """
+        print(f"📊 Fetching historical VIX futures data...")
+        df = self._run_contract_tasks(
+            tickers, 'futures', self.vix_futures_fields,
+            lambda info: {'contract_type': 'VIX_1M_Future',
+                          'expiry_date': info['expiry_date'].strftime('%Y-%m-%d')},
+            pause=0.1, runner=runner
+        )
         print(f"✅ Collected {len(df)} VIX futures data points")
         return df
     
-    def get_historical_options_data(self, option_tickers, batch_size=5):
+    def get_historical_options_data(self, option_tickers, runner=None):
         """
         Fetch historical data for VIX options with delta targeting
         """
         print(f"📊 Fetching historical VIX options data...")
-        all_data = []
-        
-        bloomberg_fields = list(self.vix_options_fields.values())
-        
-        for i in range(0, len(option_tickers), batch_size):
-            batch = option_tickers[i:i + batch_size]
-            print(f"   Processing options batch {i//batch_size + 1}/{(len(option_tickers)-1)//batch_size + 1}")
-            
-            for ticker_info in batch:
-                ticker = ticker_info['ticker']
-                print(f"     Fetching {ticker}...")
-                
-                # Create historical data request
-                request = self.refDataService.createRequest("HistoricalDataRequest")
-                request.getElement("securities").appendValue(ticker)
-                
-                for field in bloomberg_fields:
-                    request.getElement("fields").appendValue(field)
-                
-                request.set("startDate", self.start_date.strftime('%Y%m%d'))
-                request.set("endDate", self.end_date.strftime('%Y%m%d'))
-                request.set("periodicitySelection", "DAILY")
-                
-                self.session.sendRequest(request)
-                
-                # Process response
-                ticker_data = []
-                while True:
-                    event = self.session.nextEvent(30000)  # 30 second timeout
-                    
-                    if event.eventType() == blpapi.Event.RESPONSE:
-                        for msg in event:
-                            securityData = msg.getElement("securityData")
-                            
-                            if securityData.hasElement("securityError"):
-                                print(f"         WARNING: Error for {ticker}")
-                                break
-                            
-                            fieldDataArray = securityData.getElement("fieldData")
-                            
-                            for j in range(fieldDataArray.numValues()):
-                                fieldData = fieldDataArray.getValue(j)
-                                data_date = fieldData.getElement("date").getValue()
-                                
-                                row_data = {
-                                    'date': data_date.strftime('%Y-%m-%d'),
-                                    'ticker': ticker,
-                                    'contract_type': 'VIX_Call_Option',
-                                    'strike': ticker_info['strike'],
-                                    'expiry_date': ticker_info['expiry_date'].strftime('%Y-%m-%d'),
-                                    'underlying_future': ticker_info['underlying_future']
-                                }
-                                
-                                # Map Bloomberg fields to clean names
-                                for clean_name, bloomberg_field in self.vix_options_fields.items():
-                                    if fieldData.hasElement(bloomberg_field):
-                                        value = fieldData.getElement(bloomberg_field).getValue()
-                                        row_data[clean_name] = value if value is not None else np.nan
-                                    else:
-                                        row_data[clean_name] = np.nan
-                                
-                                ticker_data.append(row_data)
-                        break
-                    
-                    if event.eventType() == blpapi.Event.TIMEOUT:
-                        print(f"         TIMEOUT: {ticker}")
-                        break
-                
-                all_data.extend(ticker_data)
-                time.sleep(0.2)  # More conservative rate limiting for options
-        
-        df = pd.DataFrame(all_data)
+        df = self._run_contract_tasks(
+            option_tickers, 'options', self.vix_options_fields,
+            lambda info: {'contract_type': 'VIX_Call_Option',
+                          'strike': info['strike'],
+                          'expiry_date': info['expiry_date'].strftime('%Y-%m-%d'),
+                          'underlying_future': info['underlying_future']},
+            pause=0.2, runner=runner  # More conservative rate limiting for options
+        )
         print(f"✅ Collected {len(df)} VIX options data points")
         return df
     
@@ -351,28 +321,9 @@ class VIXDataFetcher:
         """
         print("🎯 Filtering for target delta options (10Δ and 50Δ calls)...")
         
-        target_deltas = [0.10, 0.50]
-        filtered_data = []
-        
-        # Group by date and expiry
-        for (date, expiry), group in options_df.groupby(['date', 'expiry_date']):
-            # Filter valid options with delta data
-            valid_options = group.dropna(subset=['delta'])
-            
-            if len(valid_options) == 0:
-                continue
-            
-            for target_delta in target_deltas:
-                # Find option closest to target delta
-                valid_options['delta_diff'] = abs(valid_options['delta'] - target_delta)
-                closest_option = valid_options.loc[valid_options['delta_diff'].idxmin()].copy()
-                
-                closest_option['target_delta'] = target_delta
-                closest_option['delta_label'] = f"{int(target_delta*100)}Δ"
-                
-                filtered_data.append(closest_option.to_dict())
+        # One sorted pass over all date/expiry groups; picks must be within 5 delta points
+        filtered_df = select_target_delta_options(options_df, target_deltas=[0.10, 0.50])
         
-        filtered_df = pd.DataFrame(filtered_data)
         print(f"✅ Filtered to {len(filtered_df)} target delta options")
         return filtered_df
     
@@ -431,96 +382,62 @@ class VIXDataFetcher:
             print(f"❌ Failed to save VIX data: {e}")
             return None
     
-    def send_email_alert(self, subject, body, config_file='email_config.json'):
-        """
-        Send email notification
-        """
-        try:
-            config_path = self.config_dir / config_file
-            if not config_path.exists():
-                print(f"⚠️ Email config not found: {config_path}")
-                return False
-            
-            with open(config_path) as f:
-                config = json.load(f)
-            
-            msg = MimeMultipart()
-            msg['From'] = config['sender_email']
-            msg['To'] = ', '.join(config['recipient_emails'])
-            msg['Subject'] = subject
-            
-            msg.attach(MimeText(body, 'plain'))
-            
-            server = smtplib.SMTP(config['smtp_server'], config['smtp_port'])
-            server.starttls()
-            server.login(config['sender_email'], config['sender_password'])
-            
-            text = msg.as_string()
-            server.sendmail(config['sender_email'], config['recipient_emails'], text)
-            server.quit()
-            
-            print("✅ Email alert sent successfully")
-            return True
-            
-        except Exception as e:
-            print(f"❌ Failed to send email: {e}")
-            return False
+    def _load_config(self, config_file):
+        config_path = self.config_dir / config_file
+        if not config_path.exists():
+            print(f"⚠️ Notification config not found: {config_path}")
+            return None
+        with open(config_path) as f:
+            return json.load(f)
+    
+    @property
+    def notifier(self):
+        """Background email/Slack dispatcher shared by every fetcher in the process"""
+        return shared_dispatcher(
+            ('vix_data_fetcher', str(self.config_dir)),
+            lambda: dispatcher_from_config(self._load_config('email_config.json'),
+                                           self._load_config('slack_config.json'))
+        )
     
-    def send_slack_webhook(self, message, config_file='slack_config.json'):
+    def notify(self, subject, body, level='info'):
         """
-        Send Slack webhook notification
+        Queue an email/Slack notification; delivery happens in the background
         """
         try:
-            config_path = self.config_dir / config_file
-            if not config_path.exists():
-                print(f"⚠️ Slack config not found: {config_path}")
-                return False
-            
-            with open(config_path) as f:
-                config = json.load(f)
-            
-            payload = {
-                "channel": config['channel'],
-                "text": message,
-                "username": "VIX Data Bot"
-            }
-            
-            response = requests.post(config['webhook_url'], json=payload)
-            
-            if response.status_code == 200:
-                print("✅ Slack notification sent successfully")
-                return True
-            else:
-                print(f"❌ Slack notification failed: {response.status_code}")
-                return False
-                
+            return self.notifier.notify(subject, body, level)
         except Exception as e:
-            print(f"❌ Failed to send Slack notification: {e}")
+            print(f"❌ Failed to queue notification: {e}")
             return False
     
-    def run_full_collection(self):
+    def run_full_collection(self, session_pool=None):
         """
         Run complete VIX data collection process
         """
         print("🚀 Starting comprehensive VIX data collection...")
+        collection_id = self.run_state.start_collection(
+            COLLECTION_NAME, self.start_date.strftime('%Y%m%d'), self.end_date.strftime('%Y%m%d'))
+        recorded = False
         
         try:
             # Connect to Bloomberg
-            if not self.connect():
-                return False
+            if not self.connect(session_pool):
+                raise ConnectionError("Bloomberg connection failed")
             
             # Generate contract tickers
             print("\n📋 Generating VIX contract tickers...")
             futures_info = self.generate_vix_future_tickers(self.start_date.date(), self.end_date.date())
             options_info = self.generate_vix_option_tickers(futures_info)
             
-            # Collect futures data
+            # Collect futures data (contracts journaled by an earlier attempt are skipped)
+            runner = self.task_runner()
+            self.failed_tasks = {}
+            self.task_retries = 0
             print("\n📊 Collecting VIX futures data...")
-            futures_df = self.get_historical_futures_data(futures_info)
+            futures_df = self.get_historical_futures_data(futures_info, runner)
             
             # Collect options data
             print("\n📊 Collecting VIX options data...")
-            options_df = self.get_historical_options_data(options_info)
+            options_df = self.get_historical_options_data(options_info, runner)
             
             # Filter for target delta options
             if len(options_df) > 0:
@@ -533,6 +450,24 @@ class VIXDataFetcher:
             summary = self.save_data(futures_df, options_df, target_delta_df)
             
             if summary:
+                data_summary = summary['data_summary']
+                self.run_state.finish_collection(
+                    collection_id, 'partial' if self.failed_tasks else 'success',
+                    rows=data_summary['futures_records'] + data_summary['options_records'],
+                    securities=data_summary['unique_futures_contracts'] + data_summary['unique_options_contracts'],
+                    retries=self.task_retries, failed_tasks=len(self.failed_tasks),
+                    details={**data_summary, 'files_created': summary['files_created'],
+                             'failed_tasks': self.failed_tasks}
+                )
+                recorded = True
+            
+            if summary and self.failed_tasks:
+                raise Exception(f"{len(self.failed_tasks)} contract(s) still failing after retries; "
+                                f"partial data saved, a re-run fetches only those")
+            
+            if summary:
+                runner.clear()
+                
                 # Send notifications
                 success_message = f"""
 ✅ VIX Data Collection Completed Successfully
@@ -550,8 +485,7 @@ class VIXDataFetcher:
 Timestamp: {summary['collection_timestamp']}
                 """
                 
-                self.send_email_alert("VIX Data Collection - Success", success_message)
-                self.send_slack_webhook(success_message)
+                self.notify("VIX Data Collection - Success", success_message)
                 
                 print("🎉 VIX data collection completed successfully!")
                 return True
@@ -559,22 +493,25 @@ Timestamp: {summary['collection_timestamp']}
                 raise Exception("Failed to save data")
                 
         except Exception as e:
+            if not recorded:
+                self.run_state.finish_collection(collection_id, 'failed', error=str(e),
+                                                 retries=self.task_retries, failed_tasks=len(self.failed_tasks))
             error_message = f"❌ VIX Data Collection Failed\n\nError: {str(e)}\nTimestamp: {datetime.now()}"
-            self.send_email_alert("VIX Data Collection - ERROR", error_message)
-            self.send_slack_webhook(error_message)
+            self.notify("VIX Data Collection - ERROR", error_message, level='error')
             print(f"💥 Collection failed: {e}")
             return False
         
         finally:
             self.disconnect()
+            METRICS.export(self.project_root / 'data' / 'metrics', COLLECTION_NAME)
     
     def disconnect(self):
-        """Disconnect from Bloomberg"""
-        if self.session:
+        """Disconnect from Bloomberg (pooled sessions go back to the pool unless a request timed out)"""
+        if not self.return_session() and self.session:
             self.session.stop()
             print("✅ Bloomberg session disconnected")
 
-def main():
+def main(session_pool=None):
     """Main execution function"""
     print("="*70)
     print("VIX FUTURES & OPTIONS DATA COLLECTION SYSTEM")
@@ -585,7 +522,7 @@ def main():
     fetcher = VIXDataFetcher()
     
     # Run full collection
-    success = fetcher.run_full_collection()
+    success = fetcher.run_full_collection(session_pool)
     
     if success:
         print("\n🎊 VIX data collection pipeline completed successfully!")
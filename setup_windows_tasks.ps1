@@ -41,7 +41,6 @@ if (-not (Test-Path $ProjectPath)) {
 }
 
 # Define script paths
-$VIXFetcherScript = Join-Path $ProjectPath "scripts\vix_data_fetcher.py"
 $SchedulerScript = Join-Path $ProjectPath "scripts\vix_daily_scheduler.py"
 $LogPath = Join-Path $ProjectPath "logs"
 $DataPath = Join-Path $ProjectPath "data\vix_data"
@@ -86,8 +85,8 @@ if exist "venv\Scripts\activate.bat" (
     echo [%date% %time%] Virtual environment activated >> "$LogPath\task_execution.log"
 )
 
-REM Run the VIX data collection
-"$PythonPath" "$VIXFetcherScript" >> "$LogPath\vix_collection.log" 2>&1
+REM Run the VIX data collection (exit code reflects the collection result)
+"$PythonPath" -m bloombergdata collect vix >> "$LogPath\vix_collection.log" 2>&1
 
 if %ERRORLEVEL% EQU 0 (
     echo [%date% %time%] VIX collection completed successfully >> "$LogPath\task_execution.log"
@@ -0,0 +1,130 @@
+"""
+Basket Volatility Engine
+Vectorized market-cap-weighted basket volatility for the top 50 SPX components.
+Replaces the per-date / per-ticker loops in the basket notebooks with matrix
+operations over (field x date x ticker) arrays, for any number of tenors at once.
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.analysis.vol_matrix_cache import VolatilityMatrix
+
+MIN_WEIGHT_COVERAGE = 60  # Minimum % of basket weight with data on a date
+MIN_OBSERVATIONS = 50     # Minimum observations for a component to be used
+WEIGHT_COLUMN = 'normalized_weight'
+
+
+def _weight_vector(weights_data, tickers, weight_column):
+    """Align basket weights (in %) to a ticker axis; tickers outside the basket get 0"""
+    weights = weights_data.drop_duplicates('ticker').set_index('ticker')[weight_column]
+    return weights.reindex(tickers).fillna(0.0).to_numpy(dtype='float64')
+
+
+def _align(matrix, dates, tickers):
+    """Reindex a matrix onto the given axes"""
+    if matrix.dates.equals(dates) and matrix.tickers.equals(tickers):
+        return matrix
+    frame = matrix.to_frame().reindex(index=dates, columns=tickers)
+    return VolatilityMatrix(matrix.data_type, matrix.field, dates, tickers, frame.to_numpy())
+
+
+def basket_volatility_from_matrices(matrices, weights_data, min_coverage=MIN_WEIGHT_COVERAGE,
+                                    min_observations=MIN_OBSERVATIONS, weight_column=WEIGHT_COLUMN):
+    """
+    Weighted basket volatility for one or more matrices sharing date/ticker axes
+
+    Parameters:
+    - matrices: list of VolatilityMatrix with identical dates and tickers
+    - weights_data: DataFrame with 'ticker' and weight_column (weights in %)
+    - min_coverage: Minimum weight coverage (%) required on a date
+    - min_observations: Components need more than this many observations to count
+
+    Returns a tidy DataFrame with columns
+    ['date', 'field', 'basket_vol', 'weight_coverage', 'components_count'].
+    """
+    if not matrices:
+        return pd.DataFrame(columns=['date', 'field', 'basket_vol', 'weight_coverage', 'components_count'])
+
+    dates = matrices[0].dates
+    tickers = matrices[0].tickers
+    values = np.stack([matrix.values for matrix in matrices])        # (field, date, ticker)
+    observed = ~np.stack([matrix.missing for matrix in matrices])    # (field, date, ticker)
+
+    # Components with enough history per field, weighted by basket weight
+    weights = _weight_vector(weights_data, tickers, weight_column)
+    eligible = (observed.sum(axis=1) > min_observations) & (weights > 0)   # (field, ticker)
+    field_weights = np.where(eligible, weights, 0.0)
+
+    coverage = np.einsum('fdt,ft->fd', observed, field_weights)
+    weighted_sum = np.einsum('fdt,ft->fd', np.where(observed, values, 0.0), field_weights)
+    counts = np.einsum('fdt,ft->fd', observed, eligible.astype('float64'))
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        basket_vol = weighted_sum / coverage
+
+    n_fields, n_dates = coverage.shape
+    result = pd.DataFrame({
+        'date': np.tile(dates.values, n_fields),
+        'field': np.repeat([matrix.field for matrix in matrices], n_dates),
+        'basket_vol': basket_vol.ravel(),
+        'weight_coverage': coverage.ravel(),
+        'components_count': counts.ravel().astype('int64')
+    })
+    return result[result['weight_coverage'] > min_coverage].reset_index(drop=True)
+
+
+def calculate_basket_volatilities(vol_data, weights_data, data_type, vol_fields,
+                                  min_coverage=MIN_WEIGHT_COVERAGE, min_observations=MIN_OBSERVATIONS,
+                                  weight_column=WEIGHT_COLUMN, matrix_cache=None):
+    """
+    Basket volatility for several tenors of one data type in a single pass
+
+    Parameters:
+    - vol_data: Long frame with ['date', 'ticker', 'data_type', vol fields...]
+    - weights_data: DataFrame with 'ticker' and weight_column (weights in %)
+    - data_type: 'realized' or 'implied'
+    - vol_fields: List of volatility columns, e.g. ['implied_vol_1m_atm', 'implied_vol_12m_atm']
+    - matrix_cache: Optional VolatilityMatrixCache to reuse persisted matrices
+
+    Returns the tidy frame from basket_volatility_from_matrices.
+    """
+    if isinstance(vol_fields, str):
+        vol_fields = [vol_fields]
+
+    if matrix_cache is not None:
+        matrices = [matrix_cache.refresh(vol_data, data_type, field) for field in vol_fields]
+        # Cached matrices may have grown different axes; align them on the union
+        dates = matrices[0].dates
+        tickers = matrices[0].tickers
+        for matrix in matrices[1:]:
+            dates = dates.union(matrix.dates)
+            tickers = tickers.union(matrix.tickers)
+        matrices = [_align(matrix, dates, tickers) for matrix in matrices]
+    else:
+        matrices = [VolatilityMatrix.from_long(vol_data, data_type, field) for field in vol_fields]
+
+    return basket_volatility_from_matrices(
+        matrices, weights_data, min_coverage=min_coverage,
+        min_observations=min_observations, weight_column=weight_column
+    )
+
+
+def calculate_basket_volatility(vol_data, weights_data, data_type, vol_field,
+                                min_coverage=MIN_WEIGHT_COVERAGE, min_observations=MIN_OBSERVATIONS,
+                                weight_column=WEIGHT_COLUMN, prefix='top50'):
+    """
+    Drop-in replacement for the notebooks' _calculate_basket_volatility
+
+    Returns a DataFrame with columns ['date', f'{prefix}_{data_type}_vol',
+    f'{data_type}_weight_coverage', f'{data_type}_components_count'].
+    """
+    basket = calculate_basket_volatilities(
+        vol_data, weights_data, data_type, [vol_field],
+        min_coverage=min_coverage, min_observations=min_observations, weight_column=weight_column
+    )
+    return basket.drop(columns='field').rename(columns={
+        'basket_vol': f'{prefix}_{data_type}_vol',
+        'weight_coverage': f'{data_type}_weight_coverage',
+        'components_count': f'{data_type}_components_count'
+    })
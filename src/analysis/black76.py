@@ -0,0 +1,275 @@
+"""
+Black-76 Option Pricing
+Vectorized Black-76 prices, greeks and implied volatility for options on
+futures, used for VIX options priced off the matching UX future. Whole chains
+(every strike, expiry and date) are evaluated in one NumPy pass, so missing
+DELTA_MID / IVOL_MID fields can be filled locally instead of re-requested.
+
+Conventions follow Bloomberg's option fields:
+- implied vol in volatility points (87.2 for 87.2%)
+- vega per 1 vol point, theta per calendar day
+- chain-level gamma per 1% move in the future, as GAMMA_MID
+- time to expiry in calendar days / 365
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+
+try:
+    from scipy.special import ndtr as _ndtr
+except ImportError:
+    _ndtr = None
+
+DAYS_PER_YEAR = 365.0
+MIN_EXPIRY_YEARS = 1e-6
+IV_BOUNDS = (1e-4, 10.0)   # 0.01% to 1000% annualized
+IV_TOLERANCE = 1e-8
+IV_MAX_ITERATIONS = 100
+
+_SQRT_2PI = math.sqrt(2 * math.pi)
+_erfc = np.frompyfunc(math.erfc, 1, 1)
+
+
+def norm_cdf(x):
+    """Standard normal CDF (scipy when available, math.erfc otherwise)"""
+    x = np.asarray(x, dtype='float64')
+    if _ndtr is not None:
+        return _ndtr(x)
+    return 0.5 * np.asarray(_erfc(-x / math.sqrt(2)), dtype='float64')
+
+
+def norm_pdf(x):
+    x = np.asarray(x, dtype='float64')
+    return np.exp(-0.5 * x * x) / _SQRT_2PI
+
+
+def _prepare(forward, strike, expiry_years, sigma, rate, is_call):
+    forward, strike, expiry_years, sigma, rate, is_call = np.broadcast_arrays(
+        np.asarray(forward, dtype='float64'),
+        np.asarray(strike, dtype='float64'),
+        np.maximum(np.asarray(expiry_years, dtype='float64'), MIN_EXPIRY_YEARS),
+        np.asarray(sigma, dtype='float64'),
+        np.asarray(rate, dtype='float64'),
+        np.asarray(is_call, dtype=bool)
+    )
+    return forward, strike, expiry_years, sigma, rate, is_call
+
+
+def _d1_d2(forward, strike, expiry_years, sigma):
+    vol_sqrt_t = sigma * np.sqrt(expiry_years)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        d1 = (np.log(forward / strike) + 0.5 * vol_sqrt_t ** 2) / vol_sqrt_t
+    return d1, d1 - vol_sqrt_t
+
+
+def black76_price(forward, strike, expiry_years, sigma, rate=0.0, is_call=True):
+    """
+    Black-76 option price
+
+    Parameters (scalars or arrays, broadcast together):
+    - forward: Futures price
+    - strike: Option strike
+    - expiry_years: Time to expiry in years
+    - sigma: Volatility as a decimal (0.85 for 85%)
+    - rate: Continuously compounded discount rate
+    - is_call: True for calls, False for puts
+    """
+    forward, strike, expiry_years, sigma, rate, is_call = _prepare(
+        forward, strike, expiry_years, sigma, rate, is_call
+    )
+    d1, d2 = _d1_d2(forward, strike, expiry_years, sigma)
+    discount = np.exp(-rate * expiry_years)
+    call = discount * (forward * norm_cdf(d1) - strike * norm_cdf(d2))
+    put = discount * (strike * norm_cdf(-d2) - forward * norm_cdf(-d1))
+    return np.where(is_call, call, put)
+
+
+def black76_greeks(forward, strike, expiry_years, sigma, rate=0.0, is_call=True):
+    """
+    Black-76 price and greeks in one pass
+
+    Returns a dict of arrays: price, delta (vs the future), gamma (per 1.0 move
+    in the future), vega (per vol point) and theta (per calendar day).
+    """
+    forward, strike, expiry_years, sigma, rate, is_call = _prepare(
+        forward, strike, expiry_years, sigma, rate, is_call
+    )
+    d1, d2 = _d1_d2(forward, strike, expiry_years, sigma)
+    discount = np.exp(-rate * expiry_years)
+    sqrt_t = np.sqrt(expiry_years)
+    pdf_d1 = norm_pdf(d1)
+    cdf_d1 = norm_cdf(d1)
+    cdf_d2 = norm_cdf(d2)
+
+    call = discount * (forward * cdf_d1 - strike * cdf_d2)
+    put = discount * (strike * (1 - cdf_d2) - forward * (1 - cdf_d1))
+    price = np.where(is_call, call, put)
+
+    delta = np.where(is_call, discount * cdf_d1, discount * (cdf_d1 - 1))
+    gamma = discount * pdf_d1 / (forward * sigma * sqrt_t)
+    vega = discount * forward * pdf_d1 * sqrt_t
+    # dV/dt with t = time to expiry, reported as the one-day decay
+    theta = -discount * forward * pdf_d1 * sigma / (2 * sqrt_t) + rate * price
+
+    return {
+        'price': price,
+        'delta': delta,
+        'gamma': gamma,
+        'vega': vega / 100,
+        'theta': theta / DAYS_PER_YEAR
+    }
+
+
+def implied_volatility(price, forward, strike, expiry_years, rate=0.0, is_call=True,
+                       tol=IV_TOLERANCE, max_iter=IV_MAX_ITERATIONS, bounds=IV_BOUNDS):
+    """
+    Black-76 implied volatility for arrays of option prices
+
+    Newton steps on every element at once; an element falls back to bisection
+    of its bracket whenever the Newton step leaves the bracket or vega vanishes.
+    Prices outside the no-arbitrage bounds return NaN.
+
+    Returns volatility as a decimal.
+    """
+    forward, strike, expiry_years, price, rate, is_call = _prepare(
+        forward, strike, expiry_years, price, rate, is_call
+    )
+    shape = price.shape
+    forward, strike, expiry_years, price, rate, is_call = (
+        np.atleast_1d(a).ravel() for a in (forward, strike, expiry_years, price, rate, is_call)
+    )
+
+    discount = np.exp(-rate * expiry_years)
+    intrinsic = discount * np.where(is_call, np.maximum(forward - strike, 0), np.maximum(strike - forward, 0))
+    upper = discount * np.where(is_call, forward, strike)
+    solvable = np.isfinite(price) & (price > intrinsic) & (price < upper) & (forward > 0) & (strike > 0)
+
+    lo = np.full(price.shape, bounds[0])
+    hi = np.full(price.shape, bounds[1])
+    # Brenner-Subrahmanyam starting point, good near the money
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sigma = np.sqrt(2 * np.pi / expiry_years) * price / (discount * forward)
+    sigma = np.clip(np.nan_to_num(sigma, nan=0.5), bounds[0], bounds[1])
+
+    active = solvable.copy()
+    converged = np.zeros(price.shape, dtype=bool)
+    for _ in range(max_iter):
+        if not active.any():
+            break
+        index = np.flatnonzero(active)
+        current = sigma[index]
+        greeks = black76_greeks(forward[index], strike[index], expiry_years[index],
+                                current, rate[index], is_call[index])
+        diff = greeks['price'] - price[index]
+        vega = greeks['vega'] * 100
+
+        lo[index] = np.where(diff < 0, current, lo[index])
+        hi[index] = np.where(diff > 0, current, hi[index])
+        done = (np.abs(diff) < tol) | (hi[index] - lo[index] < tol)
+
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            newton = current - diff / vega
+        bisect = ~np.isfinite(newton) | (newton <= lo[index]) | (newton >= hi[index])
+        step = np.where(bisect, 0.5 * (lo[index] + hi[index]), newton)
+
+        sigma[index] = np.where(done, current, step)
+        converged[index[done]] = True
+        active[index[done]] = False
+
+    return np.where(solvable & converged, sigma, np.nan).reshape(shape)
+
+
+def expiry_years(valuation_dates, expiry_dates):
+    """Calendar-day time to expiry in years"""
+    valuation_dates = pd.to_datetime(pd.Series(valuation_dates)).to_numpy()
+    expiry_dates = pd.to_datetime(pd.Series(expiry_dates)).to_numpy()
+    return (expiry_dates - valuation_dates) / np.timedelta64(1, 'D') / DAYS_PER_YEAR
+
+
+def attach_forward(options_df, futures_df, price_column='settle'):
+    """
+    Forward for each option row from the future expiring with it
+
+    Matches on (date, expiry_date); returns a Series aligned with options_df.
+    """
+    futures = futures_df[['date', 'expiry_date', price_column]].copy()
+    futures['date'] = pd.to_datetime(futures['date'])
+    futures['expiry_date'] = pd.to_datetime(futures['expiry_date'])
+    futures = futures.dropna(subset=[price_column]).drop_duplicates(['date', 'expiry_date'], keep='last')
+
+    keys = pd.DataFrame({
+        'date': pd.to_datetime(options_df['date']).to_numpy(),
+        'expiry_date': pd.to_datetime(options_df['expiry_date']).to_numpy()
+    })
+    matched = keys.merge(futures, on=['date', 'expiry_date'], how='left')
+    return pd.Series(matched[price_column].to_numpy(), index=options_df.index, name='forward')
+
+
+def chain_greeks(options_df, forward, price_column='mid', rate=0.0, is_call=True):
+    """
+    Implied vol and greeks for every row of an option chain
+
+    Parameters:
+    - options_df: Frame with 'date', 'expiry_date', 'strike' and price_column
+    - forward: Scalar, column name, or array/Series aligned with options_df
+
+    Returns a DataFrame indexed like options_df with
+    ['forward', 'expiry_years', 'ivol', 'delta', 'gamma', 'vega', 'theta'] in
+    Bloomberg units (ivol in vol points, gamma per 1% move in the future).
+    Rows quoted after their expiry get NaN rather than a clipped expiry.
+    """
+    if isinstance(forward, str):
+        forward = options_df[forward]
+    forward = np.broadcast_to(np.asarray(forward, dtype='float64'), (len(options_df),))
+    strike = options_df['strike'].to_numpy(dtype='float64')
+    years = expiry_years(options_df['date'], options_df['expiry_date'])
+    years = np.where(years >= 0, years, np.nan)    # Quoted after expiry: no greeks
+    price = options_df[price_column].to_numpy(dtype='float64')
+
+    sigma = implied_volatility(price, forward, strike, years, rate=rate, is_call=is_call)
+    greeks = black76_greeks(forward, strike, years, sigma, rate=rate, is_call=is_call)
+
+    return pd.DataFrame({
+        'forward': forward,
+        'expiry_years': years,
+        'ivol': sigma * 100,
+        'delta': greeks['delta'],
+        'gamma': greeks['gamma'] * forward / 100,
+        'vega': greeks['vega'],
+        'theta': greeks['theta']
+    }, index=options_df.index)
+
+
+def fill_missing_greeks(options_df, forward, price_column='mid', vol_column='ivol', rate=0.0):
+    """
+    Fill missing Bloomberg greeks with Black-76 values
+
+    Rows where delta or vol_column is NaN are priced locally, and only the
+    missing fields are filled; values Bloomberg populated are kept as is.
+    Adds 'greeks_source' ('bloomberg', 'black76', or NaN if neither has a delta)
+    and returns a copy.
+    """
+    df = options_df.copy()
+    for column in ['delta', 'gamma', 'vega', 'theta', vol_column]:
+        if column not in df.columns:
+            df[column] = np.nan
+
+    had_delta = df['delta'].notna()
+    df['greeks_source'] = np.where(had_delta, 'bloomberg', None)
+    missing = ~had_delta | df[vol_column].isna()
+    if not missing.any():
+        return df
+
+    if isinstance(forward, str):
+        forward = df[forward]
+    forward = np.broadcast_to(np.asarray(forward, dtype='float64'), (len(df),))
+
+    local = chain_greeks(df[missing], forward[missing.to_numpy()], price_column=price_column, rate=rate)
+    local = local.rename(columns={'ivol': vol_column})
+    for column in ['delta', 'gamma', 'vega', 'theta', vol_column]:
+        df.loc[missing, column] = df.loc[missing, column].fillna(local[column])
+
+    df.loc[~had_delta & df['delta'].notna(), 'greeks_source'] = 'black76'
+    return df
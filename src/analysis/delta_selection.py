@@ -0,0 +1,77 @@
+"""
+Target Delta Selection
+Picks the option closest to each target delta for every (date, expiry) group of
+an option chain history in one vectorized pass: the chain is sorted once by
+(group, delta) and each target is located with searchsorted, so ten years of
+daily chains need no Python-level group iteration.
+"""
+
+import numpy as np
+import pandas as pd
+
+TARGET_DELTAS = (0.10, 0.50)
+MAX_DELTA_ERROR = 0.05     # Within 5 delta points
+GROUP_KEYS = ('date', 'expiry_date')
+
+# Groups are laid out on one number line as group_code * spacing + delta; the
+# spacing exceeds the delta range so groups never overlap
+_GROUP_SPACING = 4.0
+
+
+def select_target_delta_options(options_df, target_deltas=TARGET_DELTAS, group_keys=GROUP_KEYS,
+                                max_delta_error=MAX_DELTA_ERROR, calls_only=False):
+    """
+    Closest option to each target delta, per group
+
+    Parameters:
+    - options_df: Option chain rows with a 'delta' column and the group_keys
+    - target_deltas: Deltas as decimals, e.g. (0.10, 0.50)
+    - group_keys: Columns defining one chain, normally (date, expiry_date)
+    - max_delta_error: Drop picks further than this from the target (None keeps all)
+    - calls_only: Only consider rows with positive delta
+
+    Returns the selected rows with 'delta_diff', 'target_delta' and 'delta_label'
+    added, ordered by group then target. When two strikes are equally close the
+    lower delta wins.
+    """
+    group_keys = list(group_keys)
+    columns = list(options_df.columns) + ['delta_diff', 'target_delta', 'delta_label']
+    chain = options_df.dropna(subset=['delta'])
+    if calls_only:
+        chain = chain[chain['delta'] > 0]
+    if len(chain) == 0:
+        return pd.DataFrame(columns=columns)
+
+    chain = chain.sort_values(group_keys + ['delta'], kind='mergesort')
+    codes = chain.groupby(group_keys, sort=False, dropna=False).ngroup().to_numpy()
+    deltas = chain['delta'].to_numpy(dtype='float64')
+
+    # Group extents in the sorted chain (codes ascend because the chain is sorted)
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    ends = np.r_[starts[1:], len(codes)]
+    group_codes = codes[starts]
+
+    line = codes * _GROUP_SPACING + deltas
+    targets = np.asarray(target_deltas, dtype='float64')
+
+    # (group, target) grid, flattened group-major
+    n_groups, n_targets = len(starts), len(targets)
+    grid_start = np.repeat(starts, n_targets)
+    grid_end = np.repeat(ends, n_targets)
+    grid_target = np.tile(targets, n_groups)
+    position = np.searchsorted(line, np.repeat(group_codes, n_targets) * _GROUP_SPACING + grid_target)
+
+    # Nearest neighbour on either side, kept inside the group
+    right = np.minimum(position, grid_end - 1)
+    left = np.maximum(position - 1, grid_start)
+    take_left = np.abs(deltas[left] - grid_target) <= np.abs(deltas[right] - grid_target)
+    chosen = np.where(take_left, left, right)
+    delta_diff = np.abs(deltas[chosen] - grid_target)
+
+    keep = np.ones(len(chosen), dtype=bool) if max_delta_error is None else delta_diff < max_delta_error
+    selected = chain.iloc[chosen[keep]].copy()
+    selected['delta_diff'] = delta_diff[keep]
+    selected['target_delta'] = grid_target[keep]
+    selected['delta_label'] = [f"{int(round(target * 100))}Δ" for target in grid_target[keep]]
+
+    return selected.reset_index(drop=True)
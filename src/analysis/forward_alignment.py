@@ -0,0 +1,132 @@
+"""
+Forward Volatility Alignment
+Pair today's implied volatility with the realized volatility observed over the
+following trading days, for every tenor pair and ticker in one vectorized pass.
+
+Horizons are counted in exchange trading sessions, matching Bloomberg's
+VOLATILITY_<n>D windows, and realized values are matched with merge_asof so a
+horizon that lands on a data gap picks up the nearest session instead of
+dropping the row.
+"""
+
+import pandas as pd
+
+from src.utils.trading_calendar import TradingCalendar
+
+# (implied_col, realized_col, horizon in trading sessions)
+FORWARD_COMPARISON_PAIRS = [
+    ('implied_vol_1m_atm', 'realized_vol_30d', 30),
+    ('implied_vol_3m_atm', 'realized_vol_90d', 90),
+    ('implied_vol_6m_atm', 'realized_vol_180d', 180),
+    ('implied_vol_12m_atm', 'realized_vol_252d', 252)
+]
+
+DEFAULT_TOLERANCE = pd.Timedelta(days=5)
+
+# Ticker given to single-ticker frames without a 'ticker' column
+DEFAULT_TICKER = 'SPX Index'
+
+
+def _with_ticker(df):
+    return df if 'ticker' in df.columns else df.assign(ticker=DEFAULT_TICKER)
+
+
+def _stack_fields(df, fields, field_name, value_name):
+    """Long (date, ticker, field, value) rows for the requested columns, NaNs dropped"""
+    fields = [field for field in fields if field in df.columns]
+    if not fields:
+        return pd.DataFrame(columns=['date', 'ticker', field_name, value_name])
+    stacked = df[['date', 'ticker'] + fields].melt(
+        id_vars=['date', 'ticker'], var_name=field_name, value_name=value_name
+    ).dropna(subset=[value_name])
+    stacked['date'] = pd.to_datetime(stacked['date'])
+    return stacked
+
+
+def align_forward(implied_df, realized_df, pairs=FORWARD_COMPARISON_PAIRS, calendar=None,
+                  tolerance=DEFAULT_TOLERANCE):
+    """
+    Align implied vol on each date with realized vol `horizon` trading sessions later
+
+    Parameters:
+    - implied_df: Frame with ['date', 'ticker'] and implied vol columns ('ticker'
+      defaults to DEFAULT_TICKER for single-ticker frames)
+    - realized_df: Frame with ['date', 'ticker'] and realized vol columns
+    - pairs: List of (implied_col, realized_col, horizon_sessions)
+    - calendar: Optional TradingCalendar; built from the data range if omitted
+    - tolerance: Maximum distance between the target session and the realized observation
+
+    Returns a tidy DataFrame with one row per (date, ticker, pair):
+    ['date', 'ticker', 'implied_field', 'realized_field', 'tenor_days', 'target_date',
+     'realized_date', 'implied_vol', 'realized_vol', 'vol_spread', 'vol_ratio', 'abs_spread']
+    """
+    pairs = [pair for pair in pairs if pair[0] in implied_df.columns and pair[1] in realized_df.columns]
+    columns = ['date', 'ticker', 'implied_field', 'realized_field', 'tenor_days', 'target_date',
+               'realized_date', 'implied_vol', 'realized_vol', 'vol_spread', 'vol_ratio', 'abs_spread']
+    if not pairs:
+        return pd.DataFrame(columns=columns)
+
+    pair_df = pd.DataFrame(pairs, columns=['implied_field', 'realized_field', 'tenor_days'])
+    implied_df, realized_df = _with_ticker(implied_df), _with_ticker(realized_df)
+
+    implied = _stack_fields(implied_df, pair_df['implied_field'].unique(), 'implied_field', 'implied_vol')
+    realized = _stack_fields(realized_df, pair_df['realized_field'].unique(), 'realized_field', 'realized_vol')
+    if len(implied) == 0 or len(realized) == 0:
+        return pd.DataFrame(columns=columns)
+
+    # Every implied observation expanded to each pair it takes part in
+    left = implied.merge(pair_df, on='implied_field', how='inner')
+
+    if calendar is None:
+        all_dates = pd.concat([implied['date'], realized['date']])
+        calendar = TradingCalendar.covering(all_dates, forward_days=int(pair_df['tenor_days'].max()))
+
+    # Positional shift along the session axis, one vectorized pass for all pairs
+    positions = calendar.session_positions(left['date']) + left['tenor_days'].to_numpy()
+    in_range = positions < len(calendar.sessions)
+    left = left[in_range].copy()
+    left['target_date'] = calendar.sessions.values[positions[in_range]]
+    left['target_date'] = left['target_date'].astype('datetime64[ns]')
+
+    right = realized.rename(columns={'date': 'realized_date'})
+    right['realized_date'] = right['realized_date'].astype('datetime64[ns]')
+
+    aligned = pd.merge_asof(
+        left.sort_values('target_date'),
+        right.sort_values('realized_date'),
+        left_on='target_date',
+        right_on='realized_date',
+        by=['ticker', 'realized_field'],
+        direction='nearest',
+        tolerance=tolerance
+    ).dropna(subset=['realized_vol'])
+
+    aligned['vol_spread'] = aligned['implied_vol'] - aligned['realized_vol']
+    aligned['vol_ratio'] = aligned['implied_vol'] / aligned['realized_vol']
+    aligned['abs_spread'] = aligned['vol_spread'].abs()
+
+    return aligned[columns].sort_values(['ticker', 'tenor_days', 'date']).reset_index(drop=True)
+
+
+def to_comparison_frame(aligned, implied_col, realized_col):
+    """
+    One pair from align_forward in the layout the analysis modules expect
+
+    Columns: ['date', 'ticker', implied_col, realized_col, 'vol_spread', 'vol_ratio', 'abs_spread']
+    """
+    pair = aligned[(aligned['implied_field'] == implied_col) & (aligned['realized_field'] == realized_col)]
+    return pair.rename(columns={'implied_vol': implied_col, 'realized_vol': realized_col})[
+        ['date', 'ticker', implied_col, realized_col, 'vol_spread', 'vol_ratio', 'abs_spread']
+    ].reset_index(drop=True)
+
+
+def split_by_tenor(aligned):
+    """
+    Split an align_forward result into one comparison frame per pair
+
+    Returns {tenor_days: to_comparison_frame(...)} in increasing tenor order.
+    """
+    return {
+        int(tenor_days): to_comparison_frame(rows, rows['implied_field'].iloc[0], rows['realized_field'].iloc[0])
+        for tenor_days, rows in aligned.groupby('tenor_days', sort=True)
+    }
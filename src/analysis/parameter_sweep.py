@@ -0,0 +1,255 @@
+"""
+Strategy Parameter Sweep
+Runs a grid of strategy configurations across a process pool and collects
+Sharpe, drawdown and turnover per configuration into one frame.
+
+Inputs (option chains, vol matrices) are published once into shared memory;
+each worker attaches to the blocks when it starts and rebuilds its frames
+from them, so tasks only carry their parameter dict and no input data is
+pickled per task.
+
+Strategies:
+- vix_call_spread: backtest_vix_call_spread over inputs {'options', 'futures'}
+- vol_spread: vol_spread_pnl over inputs {'spreads'} from build_spread_inputs
+
+Usage:
+    grid = {'tenor': ['1m', '3m', '12m'], 'hedge_ratio': [0.8, 1.0, 1.2]}
+    results = run_parameter_sweep('vol_spread', grid, {'spreads': spread_inputs})
+"""
+
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from src.analysis.vix_strategy_backtest import backtest_vix_call_spread
+from src.analysis.vol_spread_strategy import vol_spread_pnl
+
+TRADING_DAYS_PER_YEAR = 252
+
+# Inputs attached in this worker process: {name: DataFrame}
+_WORKER_INPUTS = {}
+_WORKER_BLOCKS = []
+
+
+def expand_grid(grid):
+    """
+    Parameter dicts for every combination in a grid
+
+    Parameters:
+    - grid: {name: list of values}, or an explicit list of parameter dicts
+    """
+    if isinstance(grid, (list, tuple)):
+        return [dict(params) for params in grid]
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+
+def performance_metrics(dates, pnl, turnover):
+    """
+    Headline metrics for a daily P&L series
+
+    Parameters:
+    - dates: Trading dates of the P&L
+    - pnl: Daily P&L in dollars
+    - turnover: Units traded per day (contracts or vega), annualized in the result
+    """
+    pnl = np.asarray(pnl, dtype='float64')
+    if len(pnl) == 0:
+        return {'trading_days': 0, 'total_pnl': 0.0, 'annual_pnl': np.nan, 'annual_vol': np.nan,
+                'sharpe_ratio': np.nan, 'max_drawdown': np.nan, 'annual_turnover': np.nan}
+
+    cumulative = np.cumsum(pnl)
+    drawdown = cumulative - np.maximum.accumulate(np.maximum(cumulative, 0.0))
+    years = len(pnl) / TRADING_DAYS_PER_YEAR
+    std = pnl.std(ddof=1) if len(pnl) > 1 else 0.0
+
+    return {
+        'start_date': pd.Timestamp(dates[0]).strftime('%Y-%m-%d'),
+        'end_date': pd.Timestamp(dates[-1]).strftime('%Y-%m-%d'),
+        'trading_days': int(len(pnl)),
+        'total_pnl': float(cumulative[-1]),
+        'annual_pnl': float(cumulative[-1] / years),
+        'annual_vol': float(std * np.sqrt(TRADING_DAYS_PER_YEAR)),
+        'sharpe_ratio': float(pnl.mean() / std * np.sqrt(TRADING_DAYS_PER_YEAR)) if std > 0 else 0.0,
+        'max_drawdown': float(drawdown.min()),
+        'annual_turnover': float(np.sum(turnover) / years)
+    }
+
+
+def _run_vix_call_spread(inputs, params):
+    params = dict(params)
+    short_delta = params.pop('short_delta', 50)
+    long_delta = params.pop('long_delta', 10)
+    long_ratio = params.pop('long_ratio', 2)
+    results = backtest_vix_call_spread(inputs['options'], inputs['futures'],
+                                       legs={short_delta: -1, long_delta: long_ratio}, **params)
+    if results is None:
+        return {'error': 'no cycle had both legs'}
+
+    daily = results['daily']
+    metrics = performance_metrics(daily['date'].to_numpy(), daily['total_pnl'].to_numpy(),
+                                  (daily['option_contracts_traded'] + daily['future_contracts_traded']).to_numpy())
+    metrics['cycles_traded'] = results['summary']['cycles_traded']
+    return metrics
+
+
+def _run_vol_spread(inputs, params):
+    daily = vol_spread_pnl(inputs['spreads'], **params)
+    return performance_metrics(daily['date'].to_numpy(), daily['total_pnl'].to_numpy(),
+                               daily['traded_vega'].to_numpy())
+
+
+STRATEGIES = {
+    'vix_call_spread': _run_vix_call_spread,
+    'vol_spread': _run_vol_spread
+}
+
+
+class SharedInputs:
+    """
+    DataFrames published column by column into shared memory blocks
+
+    Numeric and datetime columns are copied into blocks as-is; other columns
+    are stored as integer codes with their categories kept in the (small)
+    spec that workers receive once at start-up. A named index is kept as a
+    column and restored on attach.
+
+    Use as a context manager so the blocks are unlinked afterwards.
+    """
+
+    def __init__(self, frames):
+        self.blocks = []
+        self.spec = {}
+        for name, frame in frames.items():
+            self.spec[name] = self._publish(frame)
+
+    def _publish(self, frame):
+        index_name = frame.index.name
+        if index_name is not None:
+            frame = frame.reset_index()
+
+        columns = []
+        for column in frame.columns:
+            values = frame[column]
+            categories = None
+            if pd.api.types.is_datetime64_any_dtype(values):
+                array = values.to_numpy(dtype='datetime64[ns]')
+            elif pd.api.types.is_numeric_dtype(values) or pd.api.types.is_bool_dtype(values):
+                array = values.to_numpy()
+            else:
+                codes, uniques = pd.factorize(values, use_na_sentinel=True)
+                array, categories = codes, list(uniques)
+
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+            self.blocks.append(block)
+            columns.append((column, block.name, array.shape, array.dtype.str, categories))
+
+        return {'columns': columns, 'index': index_name}
+
+    def close(self):
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def attach_inputs(spec):
+    """
+    Rebuild the DataFrames described by a SharedInputs spec
+
+    Returns ({name: DataFrame}, blocks); keep the blocks referenced while the
+    frames are in use.
+    """
+    frames, blocks = {}, []
+    for name, frame_spec in spec.items():
+        data = {}
+        for column, block_name, shape, dtype, categories in frame_spec['columns']:
+            block = shared_memory.SharedMemory(name=block_name)
+            blocks.append(block)
+            array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+            if categories is None:
+                data[column] = array
+            else:
+                data[column] = pd.Categorical.from_codes(array, categories=categories).astype(object)
+        frame = pd.DataFrame(data)
+        if frame_spec['index'] is not None:
+            frame = frame.set_index(frame_spec['index'])
+        frames[name] = frame
+    return frames, blocks
+
+
+def _init_worker(spec):
+    global _WORKER_INPUTS, _WORKER_BLOCKS
+    _WORKER_INPUTS, _WORKER_BLOCKS = attach_inputs(spec)
+
+
+def _run_config(task):
+    """Run one configuration in a worker; errors are reported in the result row"""
+    strategy, params = task
+    start = time.perf_counter()
+    try:
+        result = STRATEGIES[strategy](_WORKER_INPUTS, params)
+    except Exception as e:
+        result = {'error': str(e)}
+    result['runtime_seconds'] = time.perf_counter() - start
+    return {**params, **result}
+
+
+def run_parameter_sweep(strategy, grid, inputs, max_workers=None, chunksize=None):
+    """
+    Evaluate every configuration of a strategy over shared inputs
+
+    Parameters:
+    - strategy: Key of STRATEGIES
+    - grid: {param: values} or list of parameter dicts (see expand_grid)
+    - inputs: {name: DataFrame} the strategy reads
+    - max_workers: Worker processes (default: CPU count); 1 runs in this process
+    - chunksize: Configurations handed to a worker at a time (default: spread evenly)
+
+    Returns one row per configuration: the parameters, start/end dates,
+    total/annual P&L, annual vol, Sharpe, max drawdown, annual turnover and
+    runtime, sorted by Sharpe ratio.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown strategy '{strategy}', expected one of {list(STRATEGIES)}")
+
+    configs = expand_grid(grid)
+    tasks = [(strategy, params) for params in configs]
+    max_workers = max_workers or os.cpu_count() or 1
+    max_workers = min(max_workers, len(tasks)) or 1
+    print(f"🔄 Sweeping {len(tasks)} {strategy} configurations on {max_workers} worker(s)...")
+
+    start = time.perf_counter()
+    if max_workers == 1:
+        global _WORKER_INPUTS
+        _WORKER_INPUTS = inputs
+        try:
+            rows = [_run_config(task) for task in tasks]
+        finally:
+            _WORKER_INPUTS = {}
+    else:
+        chunksize = chunksize or max(1, len(tasks) // (max_workers * 4))
+        with SharedInputs(inputs) as shared:
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                     initargs=(shared.spec,)) as executor:
+                rows = list(executor.map(_run_config, tasks, chunksize=chunksize))
+
+    results = pd.DataFrame(rows)
+    failed = results['error'].notna().sum() if 'error' in results.columns else 0
+    print(f"✅ {len(results) - failed}/{len(results)} configurations completed in "
+          f"{time.perf_counter() - start:.1f}s")
+    if 'sharpe_ratio' in results.columns:
+        results = results.sort_values('sharpe_ratio', ascending=False, na_position='last')
+    return results.reset_index(drop=True)
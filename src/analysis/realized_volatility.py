@@ -0,0 +1,190 @@
+"""
+Realized Volatility Engine
+Computes realized volatility locally from daily OHLC prices instead of pulling
+Bloomberg's VOLATILITY_<n>D fields. All tickers are processed together as
+(date x ticker) matrices, and any window length can be used.
+
+Estimators (annualized, in volatility points like Bloomberg):
+- close_to_close: sample std of log close-to-close returns
+- parkinson: high/low range estimator
+- garman_klass: high/low range plus open-to-close
+- yang_zhang: overnight + open-to-close + Rogers-Satchell, robust to opening gaps
+"""
+
+import numpy as np
+import pandas as pd
+
+ESTIMATORS = ('close_to_close', 'parkinson', 'garman_klass', 'yang_zhang')
+DEFAULT_WINDOWS = (21, 63, 126, 252)
+ANNUALIZATION_DAYS = 252
+
+# Clean price columns, as named in MARKET_DATA_FIELDS
+PRICE_COLUMNS = {
+    'open': 'open_price',
+    'high': 'high_price',
+    'low': 'low_price',
+    'close': 'last_price'
+}
+
+# Windows (exact trading-day counts) computed when realized vol is produced
+# locally instead of requested from Bloomberg
+LOCAL_REALIZED_WINDOWS = (30, 90, 180, 252)
+
+# Locally computed rows get their own data_type and column names
+# (realized_vol_<estimator code>_<n>d) so they never land on Bloomberg's
+# realized_vol_<n>d / VOLATILITY_<n>D history
+LOCAL_DATA_TYPE = 'realized_local'
+
+ESTIMATOR_CODES = {
+    'close_to_close': 'cc',
+    'parkinson': 'parkinson',
+    'garman_klass': 'gk',
+    'yang_zhang': 'yz'
+}
+
+
+def local_realized_column(estimator, window):
+    """Dataset column for a locally computed estimator/window (e.g. 'realized_vol_cc_30d')"""
+    return f'realized_vol_{ESTIMATOR_CODES[estimator]}_{window}d'
+
+
+# Columns of the default (close-to-close) local computation: {column: window}
+LOCAL_REALIZED_FIELDS = {local_realized_column('close_to_close', window): window
+                         for window in LOCAL_REALIZED_WINDOWS}
+
+
+def price_matrices(prices, price_columns=PRICE_COLUMNS):
+    """
+    Pivot a long price frame into aligned (date x ticker) matrices
+
+    Parameters:
+    - prices: Frame with ['date', 'ticker'] and the price columns
+    - price_columns: {'open'|'high'|'low'|'close': column name}
+
+    Returns {'open': DataFrame, ...} sharing one date index and ticker columns.
+    Non-positive prices are treated as missing.
+    """
+    prices = prices.copy()
+    prices['date'] = pd.to_datetime(prices['date'])
+    present = {key: col for key, col in price_columns.items() if col in prices.columns}
+    wide = prices.pivot_table(index='date', columns='ticker', values=list(present.values()), aggfunc='last')
+
+    matrices = {}
+    for key, col in present.items():
+        matrix = wide[col].astype('float64')
+        matrices[key] = matrix.where(matrix > 0)
+    return matrices
+
+
+def _rolling_mean(frame, window, min_periods):
+    return frame.rolling(window, min_periods=min_periods).mean()
+
+
+def _rolling_var(frame, window, min_periods):
+    return frame.rolling(window, min_periods=min_periods).var()
+
+
+def estimate_variance(matrices, estimator, window, min_periods=None):
+    """
+    Daily variance for one estimator over a rolling window
+
+    Parameters:
+    - matrices: Output of price_matrices
+    - estimator: One of ESTIMATORS
+    - window: Window length in trading days
+    - min_periods: Observations required in the window (default: the full window)
+
+    Returns a (date x ticker) DataFrame of daily (not annualized) variances.
+    """
+    min_periods = window if min_periods is None else min_periods
+    close = matrices['close']
+
+    if estimator == 'close_to_close':
+        returns = np.log(close / close.shift(1))
+        return _rolling_var(returns, window, min_periods)
+
+    high, low, open_ = matrices['high'], matrices['low'], matrices['open']
+    log_hl = np.log(high / low)
+    log_co = np.log(close / open_)
+
+    if estimator == 'parkinson':
+        return _rolling_mean(log_hl ** 2, window, min_periods) / (4 * np.log(2))
+
+    if estimator == 'garman_klass':
+        daily = 0.5 * log_hl ** 2 - (2 * np.log(2) - 1) * log_co ** 2
+        return _rolling_mean(daily, window, min_periods)
+
+    if estimator == 'yang_zhang':
+        overnight = np.log(open_ / close.shift(1))
+        rogers_satchell = np.log(high / close) * np.log(high / open_) + np.log(low / close) * np.log(low / open_)
+        k = 0.34 / (1.34 + (window + 1) / (window - 1))
+        return (
+            _rolling_var(overnight, window, min_periods)
+            + k * _rolling_var(log_co, window, min_periods)
+            + (1 - k) * _rolling_mean(rogers_satchell, window, min_periods)
+        )
+
+    raise ValueError(f"Unknown estimator '{estimator}', expected one of {ESTIMATORS}")
+
+
+def realized_volatility(prices, windows=DEFAULT_WINDOWS, estimators=ESTIMATORS,
+                        annualization=ANNUALIZATION_DAYS, min_periods=None,
+                        price_columns=PRICE_COLUMNS):
+    """
+    Realized volatility for every ticker, window and estimator
+
+    Parameters:
+    - prices: Long frame with ['date', 'ticker'] and OHLC columns (see PRICE_COLUMNS)
+    - windows: Window lengths in trading days
+    - estimators: Subset of ESTIMATORS; range-based ones need open/high/low
+    - annualization: Trading days per year
+
+    Returns a tidy DataFrame with ['date', 'ticker', 'estimator', 'window', 'realized_vol'],
+    realized_vol in volatility points (e.g. 18.5 for 18.5%).
+    """
+    matrices = price_matrices(prices, price_columns)
+    if 'close' not in matrices:
+        raise ValueError(f"Price frame needs a '{price_columns['close']}' column")
+
+    frames = []
+    for estimator in estimators:
+        if estimator != 'close_to_close' and not {'open', 'high', 'low'} <= set(matrices):
+            print(f"⚠️  Skipping {estimator}: open/high/low prices not available")
+            continue
+        for window in windows:
+            variance = estimate_variance(matrices, estimator, window, min_periods)
+            vol = np.sqrt(variance.clip(lower=0) * annualization) * 100
+            stacked = vol.stack().dropna().rename('realized_vol').reset_index()
+            stacked['estimator'] = estimator
+            stacked['window'] = window
+            frames.append(stacked)
+
+    if not frames:
+        return pd.DataFrame(columns=['date', 'ticker', 'estimator', 'window', 'realized_vol'])
+
+    result = pd.concat(frames, ignore_index=True)
+    return result[['date', 'ticker', 'estimator', 'window', 'realized_vol']]
+
+
+def realized_volatility_wide(prices, windows=LOCAL_REALIZED_WINDOWS, estimators=('close_to_close',),
+                             annualization=ANNUALIZATION_DAYS, min_periods=None,
+                             price_columns=PRICE_COLUMNS):
+    """
+    Realized volatility in the dataset layout used by the volatility fetchers
+
+    Returns a frame with ['date', 'ticker', 'data_type', <column>...] with
+    data_type LOCAL_DATA_TYPE and one local_realized_column(estimator, window)
+    per estimator and window (e.g. 'realized_vol_cc_30d', 'realized_vol_yz_90d').
+    """
+    matrices = price_matrices(prices, price_columns)
+    columns = {}
+    for estimator in estimators:
+        for window in windows:
+            variance = estimate_variance(matrices, estimator, window, min_periods)
+            vol = np.sqrt(variance.clip(lower=0) * annualization) * 100
+            columns[local_realized_column(estimator, window)] = vol.stack().dropna()
+
+    # Columns are aligned on the union of their (date, ticker) index
+    wide = pd.DataFrame(columns).dropna(how='all').reset_index()
+    wide.insert(2, 'data_type', LOCAL_DATA_TYPE)
+    return wide.sort_values(['ticker', 'date']).reset_index(drop=True)
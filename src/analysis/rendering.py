@@ -0,0 +1,289 @@
+"""
+Volatility Chart Rendering
+Opt-in figure building for the analysis modules. Plotly is imported only when a
+figure is actually built, long series are downsampled before rendering, and
+figures can be collected into a single HTML/PNG report instead of opening a
+browser window per chart.
+"""
+
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_MAX_POINTS = 2000
+
+
+def downsample_lttb(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets downsampling
+
+    Keeps the first and last points and, from each bucket in between, the point
+    forming the largest triangle with the previous pick and the next bucket's mean.
+    Returns the indices of the retained points.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype='float64')
+    y = np.asarray(y, dtype='float64')
+
+    # Bucket boundaries for the n - 2 interior points
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    picked = np.empty(n_out, dtype=int)
+    picked[0] = 0
+    picked[-1] = n - 1
+
+    previous = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start = end
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        areas = np.abs(
+            (x[previous] - avg_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (avg_y - y[previous])
+        )
+        previous = start + int(np.argmax(areas))
+        picked[i + 1] = previous
+
+    return picked
+
+
+def downsample_frame(df, value_columns, max_points=DEFAULT_MAX_POINTS, date_column='date'):
+    """
+    Downsample a time-series frame for plotting
+
+    Uses LTTB on the first value column so spikes in the series survive; the
+    other columns are taken at the same rows. NaNs in the driving column are dropped.
+    """
+    if max_points is None or len(df) <= max_points:
+        return df
+
+    driver = df.dropna(subset=[value_columns[0]]).sort_values(date_column)
+    x = pd.to_datetime(driver[date_column]).values.astype('datetime64[ns]').view('int64')
+    keep = downsample_lttb(x, driver[value_columns[0]].to_numpy(), max_points)
+    return driver.iloc[keep]
+
+
+def build_forward_looking_figure(comparison_df, title_suffix="", max_points=DEFAULT_MAX_POINTS):
+    """Three-panel forward-looking risk premium figure (comparison, premium, distribution)"""
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    implied_col = [col for col in comparison_df.columns if 'implied_vol' in col][0]
+    realized_col = [col for col in comparison_df.columns if 'realized_vol' in col][0]
+
+    comparison_df = comparison_df.sort_values('date')
+    # Rolling premium on the full series, then thin both for display
+    rolling_premium = comparison_df['vol_spread'].rolling(window=60, center=True).mean()
+    plot_df = comparison_df.assign(rolling_premium=rolling_premium)
+    plot_df = downsample_frame(plot_df, ['vol_spread', implied_col, realized_col], max_points)
+
+    fig = make_subplots(
+        rows=3, cols=1,
+        subplot_titles=[
+            f'Forward-Looking Volatility Comparison {title_suffix}',
+            'Volatility Risk Premium Over Time',
+            'Risk Premium Distribution'
+        ],
+        vertical_spacing=0.08,
+        specs=[[{"secondary_y": False}],
+               [{"secondary_y": True}],
+               [{"secondary_y": False}]]
+    )
+
+    # Plot 1: Time series comparison
+    fig.add_trace(
+        go.Scatter(
+            x=plot_df['date'],
+            y=plot_df[implied_col],
+            mode='lines',
+            name='Implied Vol (Today)',
+            line=dict(color='#ff7f0e', width=2)
+        ),
+        row=1, col=1
+    )
+
+    fig.add_trace(
+        go.Scatter(
+            x=plot_df['date'],
+            y=plot_df[realized_col],
+            mode='lines',
+            name='Future Realized Vol',
+            line=dict(color='#1f77b4', width=2)
+        ),
+        row=1, col=1
+    )
+
+    # Plot 2: Risk premium with rolling average
+    fig.add_trace(
+        go.Scatter(
+            x=plot_df['date'],
+            y=plot_df['vol_spread'],
+            mode='lines',
+            name='Risk Premium',
+            line=dict(color='#2ca02c', width=1, dash='dot'),
+            opacity=0.6
+        ),
+        row=2, col=1
+    )
+
+    fig.add_trace(
+        go.Scatter(
+            x=plot_df['date'],
+            y=plot_df['rolling_premium'],
+            mode='lines',
+            name='60-Day Rolling Avg Premium',
+            line=dict(color='#d62728', width=3)
+        ),
+        row=2, col=1
+    )
+
+    # Plot 3: Distribution uses the full series
+    fig.add_trace(
+        go.Histogram(
+            x=comparison_df['vol_spread'],
+            nbinsx=50,
+            name='Premium Distribution',
+            marker_color='rgba(55, 128, 191, 0.7)',
+            showlegend=False
+        ),
+        row=3, col=1
+    )
+
+    # Add zero lines
+    for row in [1, 2]:
+        fig.add_hline(y=0, line_dash="dot", line_color="gray", opacity=0.5, row=row, col=1)
+
+    fig.update_layout(
+        title=f'Advanced Volatility Risk Premium Analysis {title_suffix}',
+        height=1000,
+        template='plotly_white',
+        showlegend=True
+    )
+
+    fig.update_yaxes(title_text="Volatility (%)", row=1, col=1)
+    fig.update_yaxes(title_text="Risk Premium (%)", row=2, col=1)
+    fig.update_yaxes(title_text="Frequency", row=3, col=1)
+    fig.update_xaxes(title_text="Risk Premium (%)", row=3, col=1)
+
+    return fig
+
+
+def build_lagged_comparison_figure(comparison_df, max_points=DEFAULT_MAX_POINTS):
+    """Implied vs future realized vol with the risk premium on a secondary axis"""
+    import plotly.graph_objects as go
+
+    implied_col = [col for col in comparison_df.columns if 'implied_vol' in col][0]
+    realized_col = [col for col in comparison_df.columns if 'realized_vol' in col][0]
+    plot_df = downsample_frame(comparison_df, ['vol_spread', implied_col, realized_col], max_points)
+
+    fig = go.Figure()
+
+    fig.add_trace(
+        go.Scatter(
+            x=plot_df['date'],
+            y=plot_df[implied_col],
+            mode='lines',
+            name='Implied Volatility (Forward-Looking)',
+            line=dict(color='#ff7f0e', width=2),
+            hovertemplate='<b>Implied Vol</b><br>Date: %{x}<br>Vol: %{y:.2f}%<extra></extra>'
+        )
+    )
+
+    fig.add_trace(
+        go.Scatter(
+            x=plot_df['date'],
+            y=plot_df[realized_col],
+            mode='lines',
+            name='Future Realized Volatility',
+            line=dict(color='#1f77b4', width=2),
+            hovertemplate='<b>Future Realized Vol</b><br>Date: %{x}<br>Vol: %{y:.2f}%<extra></extra>'
+        )
+    )
+
+    fig.add_trace(
+        go.Scatter(
+            x=plot_df['date'],
+            y=plot_df['vol_spread'],
+            mode='lines',
+            name='Vol Risk Premium (Implied - Future Realized)',
+            line=dict(color='#2ca02c', width=2, dash='dash'),
+            yaxis='y2',
+            hovertemplate='<b>Vol Risk Premium</b><br>Date: %{x}<br>Premium: %{y:.2f}%<extra></extra>'
+        )
+    )
+
+    fig.add_hline(y=0, line_dash="dot", line_color="gray", opacity=0.5)
+
+    fig.update_layout(
+        title=f'Properly Lagged Volatility Analysis: {comparison_df["comparison_type"].iloc[0]}',
+        xaxis_title='Date',
+        yaxis_title='Volatility (%)',
+        yaxis2=dict(
+            title='Volatility Risk Premium (%)',
+            overlaying='y',
+            side='right'
+        ),
+        height=600,
+        template='plotly_white',
+        legend=dict(x=0.02, y=0.98)
+    )
+
+    return fig
+
+
+class FigureReport:
+    """
+    Collect figures and write them out together instead of showing each one
+
+    Usage:
+        report = FigureReport('VRP scan')
+        report.add(fig, 'SPX 90d')
+        report.write_html('reports/vrp_scan.html')
+    """
+
+    def __init__(self, title='Volatility Analysis Report'):
+        self.title = title
+        self.figures = []
+
+    def add(self, fig, name=None):
+        self.figures.append((name or f'Figure {len(self.figures) + 1}', fig))
+
+    def __len__(self):
+        return len(self.figures)
+
+    def write_html(self, path):
+        """Write every figure into one self-contained HTML file (plotly.js embedded once)"""
+        sections = []
+        for i, (name, fig) in enumerate(self.figures):
+            fig_html = fig.to_html(full_html=False, include_plotlyjs=(i == 0))
+            sections.append(f'<h2>{name}</h2>\n{fig_html}')
+
+        html = (
+            f'<html><head><meta charset="utf-8"><title>{self.title}</title></head><body>\n'
+            f'<h1>{self.title}</h1>\n<p>Generated {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}</p>\n'
+            + '\n'.join(sections)
+            + '\n</body></html>'
+        )
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(html)
+        return path
+
+    def write_png(self, output_dir, width=1200, height=None):
+        """Write one PNG per figure (requires kaleido); returns the file paths"""
+        os.makedirs(output_dir, exist_ok=True)
+        paths = []
+        for i, (name, fig) in enumerate(self.figures):
+            safe_name = ''.join(ch if ch.isalnum() else '_' for ch in name).strip('_')
+            path = os.path.join(output_dir, f'{i + 1:02d}_{safe_name}.png')
+            fig.write_image(path, width=width, height=height)
+            paths.append(path)
+        return paths
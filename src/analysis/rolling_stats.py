@@ -0,0 +1,331 @@
+"""
+Streaming Volatility Premium Statistics
+Incrementally maintained risk-premium statistics per (ticker, tenor). Each new
+aligned observation updates running Welford moments, a fixed-size rolling
+window (mean/std/quantiles) and per-regime / per-year counters, and the state is
+persisted between runs so a daily update touches only the new rows instead of
+recomputing ten years of history.
+"""
+
+import bisect
+import json
+import os
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+ROLLING_WINDOW = 60
+EXTREME_PREMIUM = 10
+REGIME_BINS = [0, 12, 20, 30, float('inf')]
+REGIME_LABELS = ['Very Low Vol', 'Low Vol', 'Elevated Vol', 'High Vol']
+
+
+class RunningStats:
+    """Expanding count/mean/variance/min/max using Welford's update"""
+
+    def __init__(self, count=0, mean=0.0, m2=0.0, min_value=None, max_value=None):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+        self.min = min_value
+        self.max = max_value
+
+    def add(self, x):
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+        self.min = x if self.min is None else min(self.min, x)
+        self.max = x if self.max is None else max(self.max, x)
+
+    @property
+    def std(self):
+        """Sample standard deviation (ddof=1, as pandas)"""
+        return float(np.sqrt(self.m2 / (self.count - 1))) if self.count > 1 else np.nan
+
+    def to_dict(self):
+        return {'count': self.count, 'mean': self.mean, 'm2': self.m2,
+                'min': self.min, 'max': self.max}
+
+    @classmethod
+    def from_dict(cls, state):
+        return cls(state['count'], state['mean'], state['m2'], state['min'], state['max'])
+
+
+class RollingWindowStats:
+    """
+    Mean, variance and quantiles over the last `window` observations
+
+    Moments use the sliding Welford update (add the new value, remove the one
+    leaving the window); a sorted copy of the window serves the quantiles.
+    Only the window contents are persisted, and the moments are rebuilt from
+    them on load so rounding error cannot accumulate across runs.
+    """
+
+    def __init__(self, window=ROLLING_WINDOW, dates=(), values=()):
+        self.window = window
+        self.dates = deque(dates)
+        self.values = deque(values)
+        self.sorted_values = sorted(self.values)
+        self.mean = 0.0
+        self.m2 = 0.0
+        for n, x in enumerate(self.values, start=1):
+            delta = x - self.mean
+            self.mean += delta / n
+            self.m2 += delta * (x - self.mean)
+
+    def __len__(self):
+        return len(self.values)
+
+    @property
+    def is_full(self):
+        return len(self.values) == self.window
+
+    def add(self, date, x):
+        self.dates.append(date)
+        self.values.append(x)
+        bisect.insort(self.sorted_values, x)
+        n = len(self.values)
+        delta = x - self.mean
+        self.mean += delta / n
+        self.m2 += delta * (x - self.mean)
+
+        if n > self.window:
+            self.dates.popleft()
+            old = self.values.popleft()
+            del self.sorted_values[bisect.bisect_left(self.sorted_values, old)]
+            n -= 1
+            old_mean = self.mean
+            self.mean -= (old - self.mean) / n
+            self.m2 -= (old - old_mean) * (old - self.mean)
+
+    @property
+    def std(self):
+        n = len(self.values)
+        return float(np.sqrt(max(self.m2, 0.0) / (n - 1))) if n > 1 else np.nan
+
+    def quantile(self, q):
+        """Linear-interpolated quantile, matching pandas' default"""
+        if not self.sorted_values:
+            return np.nan
+        position = q * (len(self.sorted_values) - 1)
+        lower = int(np.floor(position))
+        upper = min(lower + 1, len(self.sorted_values) - 1)
+        weight = position - lower
+        return self.sorted_values[lower] * (1 - weight) + self.sorted_values[upper] * weight
+
+    @property
+    def center_date(self):
+        """Date a centered rolling window of this size is labelled with (as rolling(center=True))"""
+        return self.dates[self.window // 2] if self.is_full else None
+
+    def to_dict(self):
+        return {'window': self.window, 'dates': list(self.dates), 'values': list(self.values)}
+
+    @classmethod
+    def from_dict(cls, state):
+        return cls(state['window'], state['dates'], state['values'])
+
+
+class PremiumSeriesState:
+    """
+    All streaming statistics for one (ticker, tenor) premium series
+
+    Observations must arrive in date order; dates at or before last_date are
+    ignored, so re-applying an overlapping batch is harmless.
+    """
+
+    def __init__(self, ticker, tenor_days, window=ROLLING_WINDOW):
+        self.ticker = ticker
+        self.tenor_days = int(tenor_days)
+        self.last_date = None
+        self.premium = RunningStats()
+        self.overpricing = RunningStats()
+        self.underpricing = RunningStats()
+        self.extreme_over = 0
+        self.extreme_under = 0
+        self.rolling = RollingWindowStats(window)
+        self.regimes = {}
+        self.yearly = {}
+
+    def update(self, date, implied_vol, vol_spread):
+        """Apply one aligned observation; returns False if it was already applied"""
+        date = pd.Timestamp(date).strftime('%Y-%m-%d')
+        if self.last_date is not None and date <= self.last_date:
+            return False
+
+        self.premium.add(vol_spread)
+        if vol_spread > 0:
+            self.overpricing.add(vol_spread)
+        elif vol_spread < 0:
+            self.underpricing.add(vol_spread)
+        self.extreme_over += int(vol_spread > EXTREME_PREMIUM)
+        self.extreme_under += int(vol_spread < -EXTREME_PREMIUM)
+
+        self.rolling.add(date, vol_spread)
+
+        regime_pos = bisect.bisect_left(REGIME_BINS, implied_vol) - 1
+        if 0 <= regime_pos < len(REGIME_LABELS):
+            self.regimes.setdefault(REGIME_LABELS[regime_pos], RunningStats()).add(vol_spread)
+        self.yearly.setdefault(date[:4], RunningStats()).add(vol_spread)
+
+        self.last_date = date
+        return True
+
+    def snapshot(self):
+        """Current statistics, named like analyze_volatility_risk_premium_batch's summary"""
+        premium = self.premium
+        n = premium.count
+        std = premium.std
+        return {
+            'ticker': self.ticker,
+            'tenor_days': self.tenor_days,
+            'observations': n,
+            'mean_premium': premium.mean if n else np.nan,
+            'std_premium': std,
+            'min_premium': premium.min,
+            'max_premium': premium.max,
+            'sharpe_ratio': premium.mean / std if n > 1 and std > 0 else 0.0,
+            'implied_higher_pct': self.overpricing.count / n * 100 if n else np.nan,
+            'avg_overpricing': self.overpricing.mean if self.overpricing.count else np.nan,
+            'avg_underpricing': self.underpricing.mean if self.underpricing.count else np.nan,
+            'extreme_overpricing_pct': self.extreme_over / n * 100 if n else np.nan,
+            'extreme_underpricing_pct': self.extreme_under / n * 100 if n else np.nan,
+            'rolling_mean': self.rolling.mean if len(self.rolling) else np.nan,
+            'rolling_std': self.rolling.std,
+            'rolling_median': self.rolling.quantile(0.5),
+            'rolling_q05': self.rolling.quantile(0.05),
+            'rolling_q95': self.rolling.quantile(0.95),
+            'rolling_center_date': self.rolling.center_date,
+            'last_date': self.last_date
+        }
+
+    def regime_frame(self):
+        return pd.DataFrame([
+            {'ticker': self.ticker, 'tenor_days': self.tenor_days, 'vol_regime': label,
+             'mean': stats.mean, 'std': stats.std, 'count': stats.count}
+            for label, stats in self.regimes.items()
+        ])
+
+    def to_dict(self):
+        return {
+            'ticker': self.ticker,
+            'tenor_days': self.tenor_days,
+            'last_date': self.last_date,
+            'premium': self.premium.to_dict(),
+            'overpricing': self.overpricing.to_dict(),
+            'underpricing': self.underpricing.to_dict(),
+            'extreme_over': self.extreme_over,
+            'extreme_under': self.extreme_under,
+            'rolling': self.rolling.to_dict(),
+            'regimes': {label: stats.to_dict() for label, stats in self.regimes.items()},
+            'yearly': {year: stats.to_dict() for year, stats in self.yearly.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        series = cls(state['ticker'], state['tenor_days'], state['rolling']['window'])
+        series.last_date = state['last_date']
+        series.premium = RunningStats.from_dict(state['premium'])
+        series.overpricing = RunningStats.from_dict(state['overpricing'])
+        series.underpricing = RunningStats.from_dict(state['underpricing'])
+        series.extreme_over = state['extreme_over']
+        series.extreme_under = state['extreme_under']
+        series.rolling = RollingWindowStats.from_dict(state['rolling'])
+        series.regimes = {label: RunningStats.from_dict(s) for label, s in state['regimes'].items()}
+        series.yearly = {year: RunningStats.from_dict(s) for year, s in state['yearly'].items()}
+        return series
+
+
+class StreamingPremiumStats:
+    """
+    Persisted PremiumSeriesState objects, one JSON file per (ticker, tenor)
+
+    Parameters:
+    - state_dir: Directory for the state files
+    - window: Rolling window length in observations
+
+    Usage:
+        stats = StreamingPremiumStats('data/processed/premium_stats')
+        summary = stats.update(aligned)   # aligned from align_forward
+    """
+
+    def __init__(self, state_dir, window=ROLLING_WINDOW):
+        self.state_dir = state_dir
+        self.window = window
+        os.makedirs(self.state_dir, exist_ok=True)
+
+    def _state_file(self, ticker, tenor_days):
+        safe_ticker = ticker.replace(' ', '_').replace('/', '_')
+        return os.path.join(self.state_dir, f'{safe_ticker}__{int(tenor_days)}d.json')
+
+    def load(self, ticker, tenor_days):
+        state_file = self._state_file(ticker, tenor_days)
+        if not os.path.exists(state_file):
+            return PremiumSeriesState(ticker, tenor_days, self.window)
+        with open(state_file, 'r') as f:
+            return PremiumSeriesState.from_dict(json.load(f))
+
+    def save(self, series):
+        state_file = self._state_file(series.ticker, series.tenor_days)
+        tmp_file = f'{state_file}.tmp'
+        with open(tmp_file, 'w') as f:
+            json.dump(series.to_dict(), f)
+        os.replace(tmp_file, state_file)
+        return state_file
+
+    def load_all(self):
+        series = []
+        for name in sorted(os.listdir(self.state_dir)):
+            if name.endswith('d.json'):
+                with open(os.path.join(self.state_dir, name), 'r') as f:
+                    series.append(PremiumSeriesState.from_dict(json.load(f)))
+        return series
+
+    def last_dates(self):
+        """{(ticker, tenor_days): last applied date} for every persisted series"""
+        return {(s.ticker, s.tenor_days): pd.Timestamp(s.last_date) for s in self.load_all() if s.last_date}
+
+    def reset(self):
+        """Drop all state, e.g. after history has been restated"""
+        for name in os.listdir(self.state_dir):
+            if name.endswith('d.json'):
+                os.remove(os.path.join(self.state_dir, name))
+
+    def update(self, aligned_df):
+        """
+        Fold new aligned observations into each series and persist the touched ones
+
+        Parameters:
+        - aligned_df: Tidy frame from align_forward (needs date, ticker, tenor_days,
+          implied_vol, vol_spread)
+
+        Returns the summary snapshot of every updated series as a DataFrame.
+        """
+        snapshots = []
+        for (ticker, tenor_days), rows in aligned_df.groupby(['ticker', 'tenor_days']):
+            series = self.load(ticker, tenor_days)
+            rows = rows.sort_values('date')
+            if series.last_date is not None:
+                rows = rows[rows['date'] > pd.Timestamp(series.last_date)]
+            if len(rows) == 0:
+                continue
+
+            for row in rows[['date', 'implied_vol', 'vol_spread']].itertuples(index=False):
+                series.update(row.date, float(row.implied_vol), float(row.vol_spread))
+
+            self.save(series)
+            snapshots.append(series.snapshot())
+
+        return pd.DataFrame(snapshots)
+
+    def summary(self):
+        """Snapshot of every persisted series"""
+        return pd.DataFrame([series.snapshot() for series in self.load_all()])
+
+    def regimes(self):
+        """Per-regime premium stats for every persisted series"""
+        frames = [series.regime_frame() for series in self.load_all()]
+        frames = [frame for frame in frames if len(frame)]
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
@@ -0,0 +1,299 @@
+"""
+VIX Call-Spread Strategy Backtest
+Vectorized backtest of the documented VIX strategy:
+- SHORT 1x 50Δ call + LONG 2x 10Δ calls on the next monthly expiry
+- Delta hedged with the UX future expiring with the options, rehedged daily
+- Rolled into the following expiry a set number of sessions before expiry
+
+Legs are chosen once per cycle, every held leg-day is marked in a single pass,
+and daily P&L is attributed by leg and by greek (delta, gamma, vega, theta,
+residual) using Black-76 greeks recomputed from the option prices.
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.analysis.black76 import DAYS_PER_YEAR, attach_forward, black76_greeks, fill_missing_greeks, implied_volatility
+from src.analysis.delta_selection import MAX_DELTA_ERROR, select_target_delta_options
+
+OPTION_MULTIPLIER = 100    # $100 per VIX option point
+FUTURE_MULTIPLIER = 1000   # $1000 per VIX future point
+STRATEGY_LEGS = {50: -1, 10: 2}   # target delta: quantity (SHORT 1x 50Δ, LONG 2x 10Δ)
+ROLL_SESSIONS_BEFORE_EXPIRY = 1
+TRADING_DAYS_PER_YEAR = 252
+
+GREEK_COLUMNS = ['delta_pnl', 'gamma_pnl', 'vega_pnl', 'theta_pnl', 'residual_pnl']
+
+
+def _option_price(options_df):
+    """Mid price, falling back to last where mid is missing"""
+    price = options_df['mid'] if 'mid' in options_df.columns else pd.Series(np.nan, index=options_df.index)
+    if 'last' in options_df.columns:
+        price = price.fillna(options_df['last'])
+    return price
+
+
+def _leg_name(target_delta, quantity):
+    """'short_50d' / 'long_10d' style label for a leg"""
+    return f"{'short' if quantity < 0 else 'long'}_{target_delta}d"
+
+
+def _future_price(futures_df):
+    price = futures_df['settle'] if 'settle' in futures_df.columns else pd.Series(np.nan, index=futures_df.index)
+    if 'last' in futures_df.columns:
+        price = price.fillna(futures_df['last'])
+    return price
+
+
+def build_cycles(trading_dates, expiries, roll_sessions=ROLL_SESSIONS_BEFORE_EXPIRY):
+    """
+    Monthly holding periods
+
+    Each expiry's options are entered on the previous cycle's roll date (or the
+    first trading date) and exited `roll_sessions` sessions before expiry.
+
+    Returns a DataFrame with ['cycle', 'expiry_date', 'entry_date', 'exit_date'].
+    """
+    trading_dates = pd.DatetimeIndex(sorted(pd.to_datetime(pd.Series(trading_dates)).unique()))
+    expiries = pd.DatetimeIndex(sorted(pd.to_datetime(pd.Series(expiries)).unique()))
+
+    exit_positions = trading_dates.searchsorted(expiries, side='left') - roll_sessions
+    valid = (exit_positions >= 0) & (exit_positions < len(trading_dates))
+    expiries = expiries[valid]
+    exits = trading_dates[exit_positions[valid]]
+
+    entries = pd.DatetimeIndex(np.r_[trading_dates[:1].values, exits[:-1].values])
+    cycles = pd.DataFrame({'expiry_date': expiries, 'entry_date': entries, 'exit_date': exits})
+    cycles = cycles[cycles['exit_date'] > cycles['entry_date']].reset_index(drop=True)
+    cycles.insert(0, 'cycle', np.arange(len(cycles)))
+    return cycles
+
+
+def select_strategy_legs(options_df, cycles, legs=STRATEGY_LEGS, max_delta_error=MAX_DELTA_ERROR):
+    """
+    Contracts to hold in each cycle, chosen on the cycle's entry date
+
+    Cycles missing either leg within the delta tolerance are left flat.
+    Returns one row per (cycle, leg) with ticker, strike, quantity and entry delta.
+    """
+    entry_chain = options_df.merge(
+        cycles.rename(columns={'entry_date': 'date'})[['cycle', 'date', 'expiry_date']],
+        on=['date', 'expiry_date'], how='inner'
+    )
+    picks = select_target_delta_options(
+        entry_chain, target_deltas=[delta / 100 for delta in legs],
+        group_keys=['cycle'], max_delta_error=max_delta_error, calls_only=True
+    )
+    if len(picks) == 0:
+        return pd.DataFrame(columns=['cycle', 'expiry_date', 'ticker', 'strike', 'target_delta',
+                                     'quantity', 'entry_delta', 'entry_date', 'exit_date'])
+
+    picks['target_delta'] = (picks['target_delta'] * 100).round().astype(int)
+    complete = picks.groupby('cycle')['target_delta'].transform('nunique') == len(legs)
+    picks = picks[complete]
+
+    selected = picks[['cycle', 'expiry_date', 'ticker', 'strike', 'target_delta', 'delta']].rename(
+        columns={'delta': 'entry_delta'}
+    )
+    selected['quantity'] = selected['target_delta'].map(legs)
+    selected = selected.merge(cycles[['cycle', 'entry_date', 'exit_date']], on='cycle')
+    return selected.sort_values(['cycle', 'target_delta'], ascending=[True, False]).reset_index(drop=True)
+
+
+def _expand_leg_days(legs, trading_dates):
+    """One row per (leg, trading date) from entry to exit inclusive"""
+    start = trading_dates.searchsorted(legs['entry_date'].to_numpy())
+    stop = trading_dates.searchsorted(legs['exit_date'].to_numpy(), side='right')
+    counts = stop - start
+
+    leg_index = np.repeat(np.arange(len(legs)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    days = legs.iloc[leg_index].reset_index(drop=True)
+    days.insert(0, 'leg_id', leg_index)
+    days['date'] = trading_dates[np.repeat(start, counts) + offsets]
+    return days
+
+
+def mark_legs(legs, options_df, futures_df, trading_dates):
+    """
+    Daily marks, greeks and P&L attribution for every held leg-day
+
+    Prices and forwards are carried forward over missing days. Greeks come
+    from Black-76 on the day's implied vol, and each day's P&L is explained
+    with the previous close's greeks:
+      delta = Δ·dF, gamma = ½Γ·dF², vega = ν·dσ, theta = Θ·days, residual = rest
+    """
+    days = _expand_leg_days(legs, trading_dates)
+
+    prices = options_df[['date', 'ticker']].assign(price=_option_price(options_df))
+    prices = prices.dropna(subset=['price']).drop_duplicates(['date', 'ticker'], keep='last')
+    days = days.merge(prices, on=['date', 'ticker'], how='left')
+    days['forward'] = attach_forward(days, futures_df.assign(forward_price=_future_price(futures_df)),
+                                     price_column='forward_price').to_numpy()
+    days[['price', 'forward']] = days.groupby('leg_id')[['price', 'forward']].ffill()
+
+    years = (days['expiry_date'] - days['date']).dt.days.to_numpy() / DAYS_PER_YEAR
+    strike = days['strike'].to_numpy(dtype='float64')
+    forward = days['forward'].to_numpy(dtype='float64')
+    days['iv'] = implied_volatility(days['price'].to_numpy(dtype='float64'), forward, strike, years)
+    days['iv'] = days.groupby('leg_id')['iv'].ffill()
+
+    greeks = black76_greeks(forward, strike, years, days['iv'].to_numpy(dtype='float64'))
+    for greek in ['delta', 'gamma', 'vega', 'theta']:
+        days[greek] = greeks[greek]
+    # Deep in/out of the money legs with no solvable vol: delta from moneyness
+    no_vol = days['iv'].isna()
+    days.loc[no_vol, 'delta'] = (forward[no_vol.to_numpy()] > strike[no_vol.to_numpy()]).astype(float)
+    days.loc[no_vol, ['gamma', 'vega', 'theta']] = 0.0
+
+    previous = days.groupby('leg_id')[['date', 'price', 'forward', 'iv', 'delta', 'gamma', 'vega', 'theta']].shift(1)
+    scale = days['quantity'] * OPTION_MULTIPLIER
+    d_forward = days['forward'] - previous['forward']
+
+    days['option_pnl'] = (scale * (days['price'] - previous['price'])).fillna(0.0)
+    days['delta_pnl'] = (scale * previous['delta'] * d_forward).fillna(0.0)
+    days['gamma_pnl'] = (scale * 0.5 * previous['gamma'] * d_forward ** 2).fillna(0.0)
+    days['vega_pnl'] = (scale * previous['vega'] * (days['iv'] - previous['iv']) * 100).fillna(0.0)
+    days['theta_pnl'] = (scale * previous['theta'] * (days['date'] - previous['date']).dt.days).fillna(0.0)
+    days['residual_pnl'] = days['option_pnl'] - days[GREEK_COLUMNS[:-1]].sum(axis=1)
+    days['position_delta'] = scale * days['delta']
+    return days
+
+
+def hedge_cycles(leg_days, round_contracts=False, hedge_ratio=1.0):
+    """
+    Daily UX hedge per cycle, in the future expiring with the options
+
+    After each close the hedge offsets hedge_ratio of the options' delta; it is
+    flat on the exit date. P&L on a day comes from the previous close's hedge.
+    """
+    hedge = leg_days.groupby(['cycle', 'date'], as_index=False).agg(
+        options_delta=('position_delta', 'sum'),
+        forward=('forward', 'first'),
+        exit_date=('exit_date', 'first')
+    )
+    contracts = -hedge_ratio * hedge['options_delta'] / FUTURE_MULTIPLIER
+    if round_contracts:
+        contracts = contracts.round()
+    hedge['hedge_contracts'] = contracts.where(hedge['date'] < hedge['exit_date'], 0.0)
+
+    previous = hedge.groupby('cycle')[['hedge_contracts', 'forward']].shift(1)
+    hedge['hedge_pnl'] = (previous['hedge_contracts'] * FUTURE_MULTIPLIER
+                          * (hedge['forward'] - previous['forward'])).fillna(0.0)
+    hedge['hedge_trade'] = (hedge['hedge_contracts'] - previous['hedge_contracts'].fillna(0.0)).abs()
+    return hedge.drop(columns='exit_date')
+
+
+def backtest_vix_call_spread(options_df, futures_df, legs=STRATEGY_LEGS, roll_sessions=ROLL_SESSIONS_BEFORE_EXPIRY,
+                             max_delta_error=MAX_DELTA_ERROR, hedge=True, round_hedge=False,
+                             hedge_ratio=1.0, option_cost=0.0, future_cost=0.0):
+    """
+    Run the strategy over stored option and futures history
+
+    Parameters:
+    - options_df: Option history with date, ticker, expiry_date, strike, mid/last, delta
+      (missing deltas are filled from Black-76 off the matching future)
+    - futures_df: UX futures history with date, expiry_date, settle/last
+    - legs: {target delta: quantity}, negative quantities are short
+    - hedge_ratio: Fraction of the options' delta hedged with futures
+    - option_cost: Cost per option contract per trade, in price points (e.g. half spread)
+    - future_cost: Cost per future contract traded, in price points
+
+    Returns a dict of DataFrames: daily, leg_days, legs, hedge, cycles, plus a summary dict.
+    """
+    options_df = options_df.copy()
+    futures_df = futures_df.copy()
+    for df in (options_df, futures_df):
+        df['date'] = pd.to_datetime(df['date'])
+        df['expiry_date'] = pd.to_datetime(df['expiry_date'])
+
+    trading_dates = pd.DatetimeIndex(sorted(futures_df['date'].unique()))
+    cycles = build_cycles(trading_dates, futures_df['expiry_date'].unique(), roll_sessions)
+
+    options_df['mid'] = _option_price(options_df)
+
+    # Deltas only matter on entry dates; fill missing ones there from Black-76
+    entry_keys = cycles.rename(columns={'entry_date': 'date'})[['date', 'expiry_date']]
+    entry_chain = options_df.merge(entry_keys, on=['date', 'expiry_date'], how='inner')
+    forward = attach_forward(entry_chain, futures_df.assign(forward_price=_future_price(futures_df)),
+                             price_column='forward_price')
+    entry_chain = fill_missing_greeks(entry_chain, forward, price_column='mid',
+                                      vol_column='implied_vol' if 'implied_vol' in entry_chain.columns else 'ivol')
+
+    strategy_legs = select_strategy_legs(entry_chain, cycles, legs, max_delta_error)
+    if len(strategy_legs) == 0:
+        print("❌ No cycle had both strategy legs within the delta tolerance")
+        return None
+
+    leg_days = mark_legs(strategy_legs, options_df, futures_df, trading_dates)
+    leg_days['leg'] = [_leg_name(delta, qty) for delta, qty in zip(leg_days['target_delta'], leg_days['quantity'])]
+
+    # Entry and exit each cost option_cost per contract
+    trade_day = (leg_days['date'] == leg_days['entry_date']) | (leg_days['date'] == leg_days['exit_date'])
+    leg_days['contracts_traded'] = np.where(trade_day, leg_days['quantity'].abs(), 0.0)
+    leg_days['cost'] = leg_days['contracts_traded'] * OPTION_MULTIPLIER * option_cost
+
+    hedge_df = hedge_cycles(leg_days, round_hedge, hedge_ratio) if hedge else pd.DataFrame(
+        columns=['cycle', 'date', 'options_delta', 'forward', 'hedge_contracts', 'hedge_pnl', 'hedge_trade']
+    )
+    if hedge:
+        hedge_df['cost'] = hedge_df['hedge_trade'] * FUTURE_MULTIPLIER * future_cost
+
+    daily = leg_days.pivot_table(index='date', columns='leg', values='option_pnl', aggfunc='sum', fill_value=0.0)
+    daily.columns = [f'{leg}_pnl' for leg in daily.columns]
+    daily = daily.join(leg_days.groupby('date')[GREEK_COLUMNS + ['option_pnl', 'position_delta']].sum())
+    daily = daily.rename(columns={'position_delta': 'options_delta'})
+
+    hedge_daily = hedge_df.groupby('date')[['hedge_pnl', 'hedge_contracts', 'cost']].sum() if hedge else None
+    daily['hedge_pnl'] = hedge_daily['hedge_pnl'] if hedge else 0.0
+    daily['hedge_contracts'] = hedge_daily['hedge_contracts'] if hedge else 0.0
+    daily = daily.fillna(0.0)
+    daily['costs'] = leg_days.groupby('date')['cost'].sum().reindex(daily.index, fill_value=0.0)
+    daily['option_contracts_traded'] = (
+        leg_days.groupby('date')['contracts_traded'].sum().reindex(daily.index, fill_value=0.0)
+    )
+    daily['future_contracts_traded'] = (
+        hedge_df.groupby('date')['hedge_trade'].sum().reindex(daily.index, fill_value=0.0) if hedge else 0.0
+    )
+    if hedge:
+        daily['costs'] += hedge_daily['cost'].reindex(daily.index, fill_value=0.0)
+
+    daily['total_pnl'] = daily['option_pnl'] + daily['hedge_pnl'] - daily['costs']
+    daily['cumulative_pnl'] = daily['total_pnl'].cumsum()
+    daily = daily.reset_index()
+
+    return {
+        'daily': daily,
+        'leg_days': leg_days,
+        'legs': strategy_legs,
+        'hedge': hedge_df,
+        'cycles': cycles,
+        'summary': summarize_backtest(daily, strategy_legs, cycles)
+    }
+
+
+def summarize_backtest(daily, legs, cycles):
+    """Headline statistics: P&L by leg and greek, Sharpe, drawdown, cycles traded"""
+    pnl = daily['total_pnl']
+    cumulative = daily['cumulative_pnl']
+    drawdown = cumulative - cumulative.cummax().clip(lower=0)
+    std = pnl.std()
+
+    summary = {
+        'start_date': daily['date'].min().strftime('%Y-%m-%d'),
+        'end_date': daily['date'].max().strftime('%Y-%m-%d'),
+        'trading_days': int(len(daily)),
+        'cycles_total': int(len(cycles)),
+        'cycles_traded': int(legs['cycle'].nunique()),
+        'total_pnl': float(pnl.sum()),
+        'sharpe_ratio': float(pnl.mean() / std * np.sqrt(TRADING_DAYS_PER_YEAR)) if std > 0 else 0.0,
+        'max_drawdown': float(drawdown.min()),
+        'hit_rate_pct': float((pnl > 0).mean() * 100),
+        'total_costs': float(daily['costs'].sum()),
+        'option_contracts_traded': float(daily['option_contracts_traded'].sum()),
+        'future_contracts_traded': float(daily['future_contracts_traded'].sum()),
+        'hedge_pnl': float(daily['hedge_pnl'].sum())
+    }
+    for column in [col for col in daily.columns if col.startswith(('short_', 'long_'))] + GREEK_COLUMNS:
+        summary[column] = float(daily[column].sum())
+    return summary
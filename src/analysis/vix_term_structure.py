@@ -0,0 +1,210 @@
+"""
+VIX Constant-Maturity Term Structure
+Interpolates the UX futures strip to fixed maturities (30/60/90/180 days) for
+every date at once, using the VIX futures expiry calendar to know each
+contract's days to expiry. The curve is a dense (date x maturity) array from
+which roll yield, slope and curvature are derived for the whole history in one
+pass.
+
+Expiry rule (Cboe): the Wednesday 30 days before the third Friday of the
+following month; if that Friday is not a trading day, 30 days before the
+session preceding it, and if the Wednesday is not a trading day, the session
+before it.
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.utils.trading_calendar import TradingCalendar
+
+CONSTANT_MATURITIES = (30, 60, 90, 180)
+DAYS_PER_YEAR = 365
+
+# Generic UX tickers in contract order, front month first
+GENERIC_FUTURES = ['UX1 Index', 'UX2 Index', 'UX3 Index', 'UX4 Index', 'UX5 Index',
+                   'UX6 Index', 'UX7 Index', 'UX8 Index', 'UX9 Index']
+
+
+def _previous_sessions(calendar, dates):
+    """Each date if it is a session, otherwise the session before it"""
+    positions = calendar.sessions.searchsorted(pd.DatetimeIndex(dates), side='right') - 1
+    return calendar.sessions[np.maximum(positions, 0)]
+
+
+def vix_futures_expiries(start, end, calendar=None):
+    """
+    Expiry dates of every monthly VIX future expiring between start and end
+
+    Parameters:
+    - start, end: Date range to cover
+    - calendar: TradingCalendar spanning the range (built if not given)
+    """
+    start = pd.Timestamp(start).normalize()
+    end = pd.Timestamp(end).normalize()
+    calendar = calendar or TradingCalendar(start - pd.Timedelta(days=10), end + pd.Timedelta(days=70))
+
+    # Third Friday of the month after each contract month
+    months = pd.date_range(start.replace(day=1), end + pd.Timedelta(days=62), freq='MS')
+    next_months = months + pd.DateOffset(months=1)
+    third_fridays = next_months + pd.to_timedelta((4 - next_months.weekday) % 7 + 14, unit='D')
+
+    fridays = _previous_sessions(calendar, third_fridays)
+    expiries = _previous_sessions(calendar, fridays - pd.Timedelta(days=30))
+    return expiries[(expiries >= start) & (expiries <= end)]
+
+
+def attach_expiries(futures_df, generic_tickers=GENERIC_FUTURES, expiries=None):
+    """
+    Expiry and days to expiry for generic (rolling) UX rows
+
+    A generic's n-th contract on a date is the n-th expiry after that date, so
+    the front month rolls to the next contract on its expiry day.
+
+    Parameters:
+    - futures_df: Rows with 'date' and 'ticker'
+    - generic_tickers: Generic tickers in contract order, front first
+    - expiries: Expiry calendar (default: vix_futures_expiries over the data)
+
+    Returns a copy with 'contract_rank', 'expiry_date' and 'days_to_expiry';
+    tickers not in generic_tickers get NaN.
+    """
+    df = futures_df.copy()
+    df['date'] = pd.to_datetime(df['date'])
+    if expiries is None:
+        horizon = pd.Timedelta(days=31 * (len(generic_tickers) + 1))
+        expiries = vix_futures_expiries(df['date'].min(), df['date'].max() + horizon)
+    expiries = pd.DatetimeIndex(expiries).sort_values()
+
+    rank = df['ticker'].map({ticker: n for n, ticker in enumerate(generic_tickers)})
+    position = expiries.searchsorted(df['date'].to_numpy(), side='right') + rank.fillna(-1).astype(int).to_numpy()
+    valid = rank.notna().to_numpy() & (position < len(expiries))
+
+    expiry = np.full(len(df), np.datetime64('NaT'), dtype='datetime64[ns]')
+    expiry[valid] = expiries.values[position[valid]]
+    df['contract_rank'] = rank
+    df['expiry_date'] = expiry
+    df['days_to_expiry'] = (df['expiry_date'] - df['date']).dt.days
+    return df
+
+
+class ConstantMaturityCurve:
+    """
+    Dense VIX futures curve at fixed maturities
+
+    Attributes:
+    - dates: DatetimeIndex for the row axis
+    - maturities: Maturities in calendar days for the column axis
+    - values: float64 array (len(dates), len(maturities)), NaN where the strip does not bracket a maturity
+    - spot: VIX spot aligned to dates (NaN where unknown)
+    """
+
+    def __init__(self, dates, maturities, values, spot=None):
+        self.dates = pd.DatetimeIndex(dates)
+        self.maturities = np.asarray(maturities, dtype='int64')
+        self.values = np.asarray(values, dtype='float64')
+        self.spot = np.full(len(self.dates), np.nan) if spot is None else np.asarray(spot, dtype='float64')
+
+    @classmethod
+    def from_futures(cls, futures_df, maturities=CONSTANT_MATURITIES, price_column='last_price', spot=None):
+        """
+        Interpolate the strip linearly in days to expiry
+
+        Parameters:
+        - futures_df: Rows with date, days_to_expiry and price_column (see attach_expiries)
+        - maturities: Target maturities in calendar days
+        - spot: Optional Series of VIX spot indexed by date; used as the 0-day
+          point so maturities inside the front contract can be interpolated
+        """
+        rows = futures_df.dropna(subset=['days_to_expiry', price_column])
+        rows = rows[rows['days_to_expiry'] >= 0]
+        date_codes, dates = pd.factorize(pd.to_datetime(rows['date']), sort=True)
+
+        # (date x contract slot) matrices of days to expiry and price, slots ordered by expiry
+        slot = rows.groupby(date_codes)['days_to_expiry'].rank(method='first').astype(int).to_numpy() - 1
+        n_slots = slot.max() + 2 if len(rows) else 1
+        days = np.full((len(dates), n_slots), np.nan)
+        prices = np.full((len(dates), n_slots), np.nan)
+        days[date_codes, slot + 1] = rows['days_to_expiry'].to_numpy(dtype='float64')
+        prices[date_codes, slot + 1] = rows[price_column].to_numpy(dtype='float64')
+
+        spot_values = None
+        if spot is not None:
+            spot_values = pd.Series(spot).groupby(level=0).last().reindex(dates).to_numpy(dtype='float64')
+            days[:, 0] = np.where(np.isnan(spot_values), np.nan, 0.0)
+            prices[:, 0] = spot_values
+
+        values = np.column_stack([_interpolate(days, prices, maturity) for maturity in maturities])
+        return cls(dates, maturities, values, spot_values)
+
+    def to_frame(self):
+        """Wide DataFrame with one cm_<n>d column per maturity"""
+        return pd.DataFrame(self.values, index=self.dates,
+                            columns=[f'cm_{maturity}d' for maturity in self.maturities])
+
+    def column(self, maturity):
+        return self.values[:, list(self.maturities).index(maturity)]
+
+    def metrics(self):
+        """
+        Term-structure signals for every date
+
+        - roll_yield: annualized return from the shortest maturity rolling down
+          to spot (or to the next maturity when spot is unknown); negative in contango
+        - slope: longest minus shortest maturity, in vol points
+        - slope_pct: slope relative to the shortest maturity
+        - curvature: middle maturity minus the straight line between the wings
+        """
+        front, back = self.values[:, 0], self.values[:, -1]
+        front_days = self.maturities[0]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if len(self.maturities) > 1:
+                curve_roll = (front - self.values[:, 1]) / self.values[:, 1] * DAYS_PER_YEAR / (
+                    self.maturities[1] - front_days)
+            else:
+                curve_roll = np.full(len(self.dates), np.nan)
+            spot_roll = (self.spot - front) / front * DAYS_PER_YEAR / front_days
+            roll_yield = np.where(np.isnan(self.spot), curve_roll, spot_roll)
+            slope_pct = (back - front) / front * 100
+
+        metrics = pd.DataFrame({
+            'roll_yield': roll_yield,
+            'slope': back - front,
+            'slope_pct': slope_pct
+        }, index=self.dates)
+
+        if len(self.maturities) >= 3:
+            middle = len(self.maturities) // 2
+            weight = (self.maturities[-1] - self.maturities[middle]) / (self.maturities[-1] - front_days)
+            metrics['curvature'] = self.values[:, middle] - (weight * front + (1 - weight) * back)
+        return metrics
+
+
+def _interpolate(days, prices, maturity):
+    """Row-wise linear interpolation at one maturity over unsorted, NaN-padded points"""
+    valid = ~np.isnan(days) & ~np.isnan(prices)
+    below = np.where(valid & (days <= maturity), days, -np.inf)
+    above = np.where(valid & (days >= maturity), days, np.inf)
+    lower = below.argmax(axis=1)
+    upper = above.argmin(axis=1)
+    rows = np.arange(len(days))
+
+    d0, d1 = below[rows, lower], above[rows, upper]
+    p0, p1 = prices[rows, lower], prices[rows, upper]
+    bracketed = np.isfinite(d0) & np.isfinite(d1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        weight = np.where(d1 > d0, (maturity - d0) / (d1 - d0), 0.0)
+    return np.where(bracketed, p0 + weight * (p1 - p0), np.nan)
+
+
+def term_structure_frame(futures_df, spot=None, generic_tickers=GENERIC_FUTURES,
+                         maturities=CONSTANT_MATURITIES, price_column='last_price'):
+    """
+    Constant-maturity curve and signals for a generic UX history
+
+    Returns a date-indexed frame with cm_<n>d columns plus roll_yield, slope,
+    slope_pct and curvature.
+    """
+    with_expiries = attach_expiries(futures_df, generic_tickers)
+    curve = ConstantMaturityCurve.from_futures(with_expiries, maturities, price_column, spot)
+    return curve.to_frame().join(curve.metrics())
@@ -0,0 +1,191 @@
+"""
+Volatility Matrix Cache
+Dense (trading date x ticker) NumPy matrices for each (data_type, vol field), built
+once from the long volatility frame, persisted next to the dataset and refreshed
+incrementally as new rows arrive. Basket and spread calculations become
+matrix-vector products over these arrays instead of per-ticker/per-date filtering.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+
+class VolatilityMatrix:
+    """
+    Dense volatility matrix for one (data_type, field)
+
+    Attributes:
+    - dates: DatetimeIndex for the row axis (sorted trading dates)
+    - tickers: Index for the column axis (sorted tickers)
+    - values: float64 array of shape (len(dates), len(tickers)), NaN where missing
+    - missing: bool array, True where no observation exists
+    """
+
+    def __init__(self, data_type, field, dates, tickers, values, missing=None):
+        self.data_type = data_type
+        self.field = field
+        self.dates = pd.DatetimeIndex(dates)
+        self.tickers = pd.Index(tickers)
+        self.values = np.asarray(values, dtype='float64')
+        self.missing = np.isnan(self.values) if missing is None else np.asarray(missing, dtype=bool)
+
+    @classmethod
+    def from_long(cls, df, data_type, field):
+        """Pivot the long (date, ticker, data_type, fields...) frame in one vectorized pass"""
+        rows = df[df['data_type'] == data_type]
+        date_codes, dates = pd.factorize(pd.to_datetime(rows['date']), sort=True)
+        ticker_codes, tickers = pd.factorize(rows['ticker'], sort=True)
+
+        values = np.full((len(dates), len(tickers)), np.nan)
+        if field in rows.columns:
+            values[date_codes, ticker_codes] = rows[field].to_numpy(dtype='float64', na_value=np.nan)
+
+        return cls(data_type, field, dates, tickers, values)
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+    def for_tickers(self, tickers):
+        """Matrix restricted (and ordered) to the given tickers; unknown tickers are all-missing"""
+        positions = self.tickers.get_indexer(tickers)
+        values = np.full((len(self.dates), len(tickers)), np.nan)
+        found = positions >= 0
+        values[:, found] = self.values[:, positions[found]]
+        return VolatilityMatrix(self.data_type, self.field, self.dates, tickers, values)
+
+    def series(self, ticker):
+        """Time series for one ticker, NaN-free"""
+        column = self.values[:, self.tickers.get_loc(ticker)]
+        return pd.Series(column, index=self.dates, name=self.field).dropna()
+
+    def to_frame(self):
+        """Wide DataFrame view (dates x tickers)"""
+        return pd.DataFrame(self.values, index=self.dates, columns=self.tickers)
+
+    def changed_rows(self, df):
+        """
+        Mask of long-frame rows whose (date, ticker) cell this matrix lacks or holds differently
+
+        Rows without a value for the field never count as changed.
+        """
+        rows_mask = (df['data_type'] == self.data_type).to_numpy()
+        if self.field not in df.columns:
+            return np.zeros(len(df), dtype=bool)
+        values = df[self.field].to_numpy(dtype='float64', na_value=np.nan)
+        date_pos = self.dates.get_indexer(pd.to_datetime(df['date']))
+        ticker_pos = self.tickers.get_indexer(df['ticker'])
+
+        known = (date_pos >= 0) & (ticker_pos >= 0)
+        cached = np.full(len(df), np.nan)
+        cached[known] = self.values[date_pos[known], ticker_pos[known]]
+        differs = ~np.isclose(values, cached, rtol=1e-12, atol=0.0) | np.isnan(cached)
+        return rows_mask & ~np.isnan(values) & differs
+
+    def merge(self, other):
+        """
+        Combine with a newer matrix for the same field
+
+        Axes become the union of both; observations in `other` override this one.
+        """
+        dates = self.dates.union(other.dates)
+        tickers = self.tickers.union(other.tickers)
+
+        values = np.full((len(dates), len(tickers)), np.nan)
+        for matrix in (self, other):
+            date_pos = dates.get_indexer(matrix.dates)
+            ticker_pos = tickers.get_indexer(matrix.tickers)
+            block = values[np.ix_(date_pos, ticker_pos)]
+            values[np.ix_(date_pos, ticker_pos)] = np.where(matrix.missing, block, matrix.values)
+
+        return VolatilityMatrix(self.data_type, self.field, dates, tickers, values)
+
+
+class VolatilityMatrixCache:
+    """
+    Persisted VolatilityMatrix objects, one .npz file per (data_type, field)
+
+    Parameters:
+    - cache_dir: Directory for the cached matrices, normally next to the dataset
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _cache_file(self, data_type, field):
+        return os.path.join(self.cache_dir, f'{data_type}__{field}.npz')
+
+    def save(self, matrix):
+        """Write a matrix atomically"""
+        cache_file = self._cache_file(matrix.data_type, matrix.field)
+        tmp_file = f'{cache_file}.tmp.npz'
+        np.savez(
+            tmp_file,
+            dates=matrix.dates.values.astype('datetime64[ns]').view('int64'),
+            tickers=np.asarray(matrix.tickers, dtype=str),
+            values=matrix.values,
+            missing=matrix.missing
+        )
+        os.replace(tmp_file, cache_file)
+        return cache_file
+
+    def load(self, data_type, field):
+        """Cached matrix, or None if it has not been built"""
+        cache_file = self._cache_file(data_type, field)
+        if not os.path.exists(cache_file):
+            return None
+        with np.load(cache_file) as cached:
+            return VolatilityMatrix(
+                data_type, field,
+                pd.to_datetime(cached['dates']),
+                cached['tickers'].tolist(),
+                cached['values'],
+                cached['missing']
+            )
+
+    def refresh(self, df, data_type, field):
+        """
+        Fold new rows into the cached matrix and persist it
+
+        Only rows whose cell is missing from the cache or holds a different
+        value are re-pivoted: new days, new tickers, backfilled gaps (e.g. from
+        a retried partial run) and restatements alike.
+        """
+        cached = self.load(data_type, field)
+        if cached is None or len(cached.dates) == 0:
+            return self.rebuild(df, data_type, field)
+
+        new_rows = df[cached.changed_rows(df)]
+        if len(new_rows) == 0:
+            return cached
+
+        matrix = cached.merge(VolatilityMatrix.from_long(new_rows, data_type, field))
+        self.save(matrix)
+        return matrix
+
+    def rebuild(self, df, data_type, field):
+        """Build the matrix from scratch and persist it"""
+        matrix = VolatilityMatrix.from_long(df, data_type, field)
+        self.save(matrix)
+        return matrix
+
+    def refresh_all(self, df, full=False):
+        """
+        Refresh every (data_type, vol field) present in df
+
+        Pass full=True when df is the complete dataset to rebuild instead of folding in.
+        Returns {(data_type, field): matrix}.
+        """
+        update = self.rebuild if full else self.refresh
+        matrices = {}
+        for data_type, rows in df.groupby('data_type'):
+            vol_fields = [
+                col for col in rows.columns
+                if 'vol' in col and pd.api.types.is_numeric_dtype(rows[col]) and rows[col].notna().any()
+            ]
+            for field in vol_fields:
+                matrices[(data_type, field)] = update(rows, data_type, field)
+        return matrices
@@ -0,0 +1,115 @@
+"""
+Basket vs Index Volatility Spread Strategy
+Daily P&L of the top-50 basket vs SPX volatility spread trade from the P&L
+notebooks (07-11), as a function of its parameters instead of hand-edited
+constants: tenor, vega notional, option expiry, hedge ratio on the index leg
+and roll cost.
+
+P&L follows notebook 08:
+- mark-to-market: vega notional x daily change in the implied spread
+- carry: vega notional x (realized spread - implied spread) / expiry_days
+The position is re-struck every expiry_days sessions, which drives turnover.
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.analysis.basket_volatility import calculate_basket_volatilities
+from src.analysis.forward_alignment import FORWARD_COMPARISON_PAIRS
+
+INDEX_TICKER = 'SPX Index'
+VEGA_NOTIONAL = 1_000_000
+
+# tenor: (implied field, realized field, days to expiry), as TENOR_CONFIG in notebook 08
+SPREAD_TENORS = {
+    '1m': FORWARD_COMPARISON_PAIRS[0],
+    '3m': FORWARD_COMPARISON_PAIRS[1],
+    '6m': FORWARD_COMPARISON_PAIRS[2],
+    '12m': FORWARD_COMPARISON_PAIRS[3]
+}
+
+
+def build_spread_inputs(vol_data, weights_data, index_ticker=INDEX_TICKER, tenors=SPREAD_TENORS,
+                        matrix_cache=None):
+    """
+    Basket and index volatilities for every tenor on one date axis
+
+    Parameters:
+    - vol_data: Long frame with ['date', 'ticker', 'data_type', vol fields...]
+    - weights_data: Basket weights with 'ticker' and 'normalized_weight' (in %)
+    - tenors: {tenor: (implied field, realized field, days)}, default SPREAD_TENORS
+    - matrix_cache: Optional VolatilityMatrixCache for the basket matrices
+
+    Returns a date-indexed frame with basket_implied_<tenor>, basket_realized_<tenor>,
+    index_implied_<tenor> and index_realized_<tenor> columns.
+    """
+    columns = {}
+    components = vol_data[vol_data['ticker'] != index_ticker]
+    index_rows = vol_data[vol_data['ticker'] == index_ticker].copy()
+    index_rows['date'] = pd.to_datetime(index_rows['date'])
+
+    for data_type, position in (('implied', 0), ('realized', 1)):
+        fields = {tenor: spec[position] for tenor, spec in tenors.items() if spec[position] in vol_data.columns}
+        if not fields:
+            continue
+        basket = calculate_basket_volatilities(components, weights_data, data_type, list(fields.values()),
+                                               matrix_cache=matrix_cache)
+        basket = basket.pivot(index='date', columns='field', values='basket_vol')
+        index_vols = index_rows[index_rows['data_type'] == data_type].groupby('date')[list(fields.values())].last()
+
+        for tenor, field in fields.items():
+            if field in basket.columns:
+                columns[f'basket_{data_type}_{tenor}'] = basket[field]
+            columns[f'index_{data_type}_{tenor}'] = index_vols[field]
+
+    inputs = pd.DataFrame(columns).sort_index()
+    inputs.index = pd.DatetimeIndex(inputs.index, name='date')
+    return inputs
+
+
+def vol_spread_pnl(inputs, tenor='12m', vega_notional=VEGA_NOTIONAL, expiry_days=None, hedge_ratio=1.0,
+                   roll_cost=0.0, tenors=SPREAD_TENORS):
+    """
+    Daily P&L of the basket vs index vol spread position
+
+    Parameters:
+    - inputs: Output of build_spread_inputs
+    - tenor: Key of tenors selecting the implied/realized pair
+    - vega_notional: Vega notional per side; P&L is notional x spread change (vol points) / 100
+    - expiry_days: Option life in sessions for carry and rolls (default: the tenor's days)
+    - hedge_ratio: Index vega held per unit of basket vega
+    - roll_cost: Cost per roll in vol points on the vega traded (both legs, close and reopen)
+
+    Returns a frame with date, implied_spread, realized_spread, mtm_pnl, carry_pnl,
+    roll, traded_vega, cost and total_pnl. Dates missing any input are skipped.
+    """
+    expiry_days = tenors[tenor][2] if expiry_days is None else expiry_days
+    required = [f'basket_implied_{tenor}', f'index_implied_{tenor}',
+                f'basket_realized_{tenor}', f'index_realized_{tenor}']
+    data = inputs[required].dropna()
+
+    implied_spread = data[required[0]].to_numpy() - hedge_ratio * data[required[1]].to_numpy()
+    realized_spread = data[required[2]].to_numpy() - hedge_ratio * data[required[3]].to_numpy()
+    vega_per_point = vega_notional / 100
+
+    mtm = np.r_[0.0, np.diff(implied_spread)] * vega_per_point
+    carry = (realized_spread - implied_spread) / expiry_days * vega_per_point
+
+    # Open on the first session, then close and reopen every expiry_days sessions
+    session = np.arange(len(data))
+    roll = (session % expiry_days == 0)
+    legs_vega = vega_notional * (1 + abs(hedge_ratio))
+    traded_vega = np.where(roll, np.where(session == 0, 1, 2) * legs_vega, 0.0)
+    cost = traded_vega / 100 * roll_cost
+
+    return pd.DataFrame({
+        'date': data.index,
+        'implied_spread': implied_spread,
+        'realized_spread': realized_spread,
+        'mtm_pnl': mtm,
+        'carry_pnl': carry,
+        'roll': roll,
+        'traded_vega': traded_vega,
+        'cost': cost,
+        'total_pnl': mtm + carry - cost
+    })
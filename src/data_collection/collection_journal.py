@@ -0,0 +1,126 @@
+"""
+Collection Journal
+Write-ahead journal for long-running Bloomberg collections: each security's data is
+durably written to disk before it is recorded as complete, so an interrupted run
+resumes exactly where it stopped without re-fetching or losing data.
+"""
+
+import os
+import re
+import json
+import hashlib
+import time
+from datetime import datetime
+
+import pandas as pd
+
+from src.utils.instrumentation import METRICS
+
+
+def _fsync_file(path):
+    """Force a written file's contents to disk"""
+    with open(path, 'r+b') as f:
+        os.fsync(f.fileno())
+
+
+class CollectionJournal:
+    """
+    Append-only journal of per-security data parts
+
+    Layout inside journal_dir:
+    - part_<security>_<hash>.parquet: data for one security (written atomically)
+    - journal.jsonl: one commit record per security, appended after its part is on disk
+    """
+
+    def __init__(self, journal_dir):
+        self.journal_dir = journal_dir
+        self.log_file = os.path.join(journal_dir, 'journal.jsonl')
+        os.makedirs(self.journal_dir, exist_ok=True)
+
+    def _part_file(self, ticker):
+        # The readable name alone collides ('BRK/B' and 'BRK B'); the ticker hash keeps parts apart
+        safe_name = re.sub(r'[^A-Za-z0-9]+', '_', ticker).strip('_')
+        digest = hashlib.sha1(ticker.encode()).hexdigest()[:10]
+        return os.path.join(self.journal_dir, f'part_{safe_name}_{digest}.parquet')
+
+    def append(self, ticker, df):
+        """
+        Durably store one security's data, then commit it to the journal
+
+        The commit record is only written once the part file is fsynced and in
+        place, so a crash at any point leaves either no record or a complete part.
+        """
+        part_file = self._part_file(ticker)
+        tmp_file = f'{part_file}.tmp'
+
+        started = time.perf_counter()
+        df.to_parquet(tmp_file, index=False)
+        _fsync_file(tmp_file)
+        os.replace(tmp_file, part_file)
+        METRICS.record_write('journal', part_file, len(df), time.perf_counter() - started)
+
+        record = {
+            'ticker': ticker,
+            'file': os.path.basename(part_file),
+            'rows': len(df),
+            'committed': datetime.now().isoformat()
+        }
+        line = json.dumps(record) + '\n'
+        if os.path.exists(self.log_file) and os.path.getsize(self.log_file) > 0:
+            with open(self.log_file, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    # Start on a fresh line after a torn record
+                    line = '\n' + line
+
+        with open(self.log_file, 'a') as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+        return part_file
+
+    def committed_records(self):
+        """Latest commit record per security whose part file is present"""
+        records = {}
+        if not os.path.exists(self.log_file):
+            return records
+
+        with open(self.log_file, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn final line from a crash mid-append is never a commit
+                    continue
+                if os.path.exists(os.path.join(self.journal_dir, record['file'])):
+                    records[record['ticker']] = record
+
+        return records
+
+    def completed_securities(self):
+        """Securities whose data is safely on disk"""
+        return set(self.committed_records())
+
+    def read_part(self, record):
+        """Data of one commit record"""
+        return pd.read_parquet(os.path.join(self.journal_dir, record['file']))
+
+    def load_all(self):
+        """Combine every committed part into a single DataFrame"""
+        frames = [self.read_part(record) for record in self.committed_records().values()]
+        frames = [frame for frame in frames if len(frame) > 0]
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, ignore_index=True)
+
+    def clear(self):
+        """Remove the journal and its parts once the combined data is saved"""
+        if os.path.exists(self.log_file):
+            os.remove(self.log_file)
+        for name in os.listdir(self.journal_dir):
+            if name.startswith('part_'):
+                os.remove(os.path.join(self.journal_dir, name))
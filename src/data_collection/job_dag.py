@@ -0,0 +1,219 @@
+"""
+Collection Job Graph
+In-process executor for the daily collection jobs. Jobs declare the jobs they
+depend on; a job starts as soon as all of its dependencies have succeeded, and
+independent jobs run concurrently in threads that borrow sessions from one
+shared BloombergSessionPool. The daily window becomes the longest dependency
+chain instead of the sum of every script, and no job pays interpreter start-up
+or a fresh Bloomberg session.
+
+Usage:
+    graph = JobGraph()
+    graph.add('weights', script_job('scripts/fetch_spx_weights.py'))
+    graph.add('historical', script_job('scripts/fetch_historical_volatility.py'), depends_on=['weights'])
+    results = graph.run(JobContext(session_pool=pool))
+"""
+
+import importlib.util
+import os
+import threading
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+
+_SCRIPT_MODULES = {}
+_SCRIPT_LOCK = threading.Lock()
+
+
+class JobContext:
+    """
+    Shared state handed to every job
+
+    Attributes:
+    - session_pool: BloombergSessionPool the jobs borrow sessions from
+    - results: {job name: result dict} of jobs finished so far
+    """
+
+    def __init__(self, session_pool=None, **extra):
+        self.session_pool = session_pool
+        self.results = {}
+        for key, value in extra.items():
+            setattr(self, key, value)
+
+
+def load_script(script_path):
+    """Import a script file once per process and return the module"""
+    script_path = os.path.abspath(script_path)
+    with _SCRIPT_LOCK:
+        module = _SCRIPT_MODULES.get(script_path)
+        if module is None:
+            name = os.path.splitext(os.path.basename(script_path))[0]
+            spec = importlib.util.spec_from_file_location(f'_job_{name}', script_path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            _SCRIPT_MODULES[script_path] = module
+    return module
+
+
+def script_job(script_path, function='main', consumer=None):
+    """
+    Job calling a collection script's entry point in this process
+
+    The script is imported on first run; its function is called with
+    session_pool=context.session_pool and should return True on success.
+    With a consumer name, the rows a planner_job fetched for that consumer
+    are passed as prefetched= (None if the planner has not run).
+    """
+    def run(context):
+        module = load_script(script_path)
+        if consumer is not None:
+            prefetched = getattr(context, 'prefetched', {}).get(consumer)
+            return getattr(module, function)(session_pool=context.session_pool, prefetched=prefetched)
+        return getattr(module, function)(session_pool=context.session_pool)
+    run.__name__ = f'{os.path.basename(script_path)}:{function}'
+    return run
+
+
+class Job:
+    def __init__(self, name, func, depends_on=(), max_attempts=1, retry_delay=0):
+        self.name = name
+        self.func = func
+        self.depends_on = list(depends_on)
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+
+
+class JobGraph:
+    """
+    Dependency graph of collection jobs
+
+    A job returns a truthy value on success; a falsy return or an exception is
+    a failure and is retried up to max_attempts. Jobs whose dependencies failed
+    are skipped.
+    """
+
+    def __init__(self):
+        self.jobs = {}
+
+    def add(self, name, func, depends_on=(), max_attempts=1, retry_delay=0):
+        """
+        Register a job
+
+        Parameters:
+        - name: Unique job name (used in reports)
+        - func: Callable taking the JobContext
+        - depends_on: Names of jobs that must succeed first
+        - max_attempts: Attempts before the job counts as failed
+        - retry_delay: Seconds to wait between attempts
+        """
+        if name in self.jobs:
+            raise ValueError(f"Duplicate job '{name}'")
+        self.jobs[name] = Job(name, func, depends_on, max_attempts, retry_delay)
+        return self
+
+    def validate(self):
+        """Raise ValueError on unknown dependencies or cycles; returns a topological order"""
+        for job in self.jobs.values():
+            unknown = [dep for dep in job.depends_on if dep not in self.jobs]
+            if unknown:
+                raise ValueError(f"Job '{job.name}' depends on unknown jobs {unknown}")
+
+        order, state = [], {}
+
+        def visit(name, path):
+            if state.get(name) == 'done':
+                return
+            if state.get(name) == 'visiting':
+                raise ValueError(f"Dependency cycle: {' -> '.join(path + [name])}")
+            state[name] = 'visiting'
+            for dep in self.jobs[name].depends_on:
+                visit(dep, path + [name])
+            state[name] = 'done'
+            order.append(name)
+
+        for name in self.jobs:
+            visit(name, [])
+        return order
+
+    def _run_job(self, job, context):
+        started = datetime.now()
+        start = time.perf_counter()
+        error = None
+        success = False
+        attempts = 0
+
+        for attempts in range(1, job.max_attempts + 1):
+            if attempts > 1:
+                print(f"🔄 Retrying {job.name} (attempt {attempts}/{job.max_attempts})")
+                time.sleep(job.retry_delay)
+            try:
+                success = bool(job.func(context))
+                error = None if success else 'Job reported failure'
+            except (Exception, SystemExit) as e:
+                # Scripts may sys.exit() on import problems; keep the scheduler alive
+                success = False
+                error = f"{type(e).__name__}: {e}\n{traceback.format_exc(limit=5)}"
+            if success:
+                break
+
+        return {
+            'status': 'success' if success else 'failed',
+            'success': success,
+            'attempts': attempts,
+            'error': error,
+            'depends_on': job.depends_on,
+            'started_at': started.isoformat(),
+            'finished_at': datetime.now().isoformat(),
+            'duration_seconds': time.perf_counter() - start
+        }
+
+    def run(self, context=None, max_workers=None):
+        """
+        Execute the graph; each job starts once its dependencies have succeeded
+
+        Returns {job name: result dict} with status ('success', 'failed' or
+        'skipped'), attempts, error, timings and duration_seconds.
+        """
+        self.validate()
+        context = context or JobContext()
+        max_workers = max_workers or len(self.jobs) or 1
+        results = context.results
+        pending = dict(self.jobs)
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job') as executor:
+            while pending or running:
+                for name, job in list(pending.items()):
+                    dep_status = [results[dep]['status'] if dep in results else None for dep in job.depends_on]
+                    if any(status in ('failed', 'skipped') for status in dep_status):
+                        print(f"⏭️  Skipping {name}: a dependency did not succeed")
+                        results[name] = {'status': 'skipped', 'success': False, 'attempts': 0,
+                                         'error': 'Dependency failed', 'depends_on': job.depends_on,
+                                         'started_at': None, 'finished_at': None, 'duration_seconds': 0.0}
+                        del pending[name]
+                    elif all(status == 'success' for status in dep_status):
+                        print(f"▶️  Starting {name}")
+                        running[executor.submit(self._run_job, job, context)] = name
+                        del pending[name]
+
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    results[name] = future.result()
+                    status = '✅' if results[name]['success'] else '❌'
+                    print(f"{status} {name} finished in {results[name]['duration_seconds']:.1f}s")
+
+        return results
+
+    def critical_path(self, results):
+        """Longest chain of run jobs by duration: (job names, seconds)"""
+        best = {}
+        for name in self.validate():
+            job = self.jobs[name]
+            previous = max((best[dep] for dep in job.depends_on), key=lambda item: item[1], default=([], 0.0))
+            duration = results.get(name, {}).get('duration_seconds', 0.0)
+            best[name] = (previous[0] + [name], previous[1] + duration)
+        return max(best.values(), key=lambda item: item[1], default=([], 0.0))
@@ -0,0 +1,222 @@
+"""
+Market Close Trigger
+Starts the daily collection when the exchange's data for the session is final
+instead of at a fixed clock time. The trigger sleeps until the next trading
+session's close (non-trading days are never woken for), then probes Bloomberg
+until the session's settlement is published - by default UX1's PX_SETTLE for
+that date - and fires as soon as it is. A deadline bounds the wait so a
+missing settlement still produces a (failing, alerted) run.
+
+Usage:
+    trigger = MarketCloseTrigger(probe=settlement_probe(pool))
+    trigger.run(lambda session_date, reason: collect())
+"""
+
+import logging
+import time
+from datetime import datetime, timedelta
+from datetime import time as clock_time
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+
+from src.utils.trading_calendar import TradingCalendar
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEZONE = 'US/Eastern'
+DEFAULT_CLOSE_TIME = '16:00'        # Cboe VIX futures settle at the 16:00 ET equity close
+DEFAULT_DEADLINE_TIME = '20:00'     # Run anyway if the settlement has not appeared by then
+MAX_SLEEP_SECONDS = 3600            # Re-read the clock at least hourly (laptop sleep, clock changes)
+
+
+def _parse_time(value):
+    hour, minute = (int(part) for part in value.split(':'))
+    return clock_time(hour, minute)
+
+
+def settlement_probe(session_pool, ticker='UX1 Index', field='PX_SETTLE', timeout_ms=10000):
+    """
+    Probe reporting whether a security's field is published for a session
+
+    Requests the field over the single session date; the data counts as final
+    once Bloomberg returns a value for that date.
+
+    Parameters:
+    - session_pool: BloombergSessionPool to borrow a session from
+    - ticker, field: Security and field whose value marks the day as final
+    - timeout_ms: Wait per response event
+    """
+    def probe(session_date):
+        import blpapi
+
+        day = pd.Timestamp(session_date).strftime('%Y%m%d')
+        pair = session_pool.acquire()
+        session, service = pair
+        try:
+            request = service.createRequest('HistoricalDataRequest')
+            request.getElement('securities').appendValue(ticker)
+            request.getElement('fields').appendValue(field)
+            request.set('startDate', day)
+            request.set('endDate', day)
+            session.sendRequest(request)
+
+            published = False
+            while True:
+                event = session.nextEvent(timeout_ms)
+                if event.eventType() in (blpapi.Event.PARTIAL_RESPONSE, blpapi.Event.RESPONSE):
+                    for msg in event:
+                        if not msg.hasElement('securityData'):
+                            continue
+                        field_data = msg.getElement('securityData').getElement('fieldData')
+                        for i in range(field_data.numValues()):
+                            if field_data.getValue(i).hasElement(field):
+                                published = True
+                    if event.eventType() == blpapi.Event.RESPONSE:
+                        break
+                elif event.eventType() == blpapi.Event.TIMEOUT:
+                    # The response may still arrive on this session; do not reuse it
+                    session_pool.discard(pair)
+                    return False
+        except Exception:
+            session_pool.discard(pair)
+            raise
+        session_pool.release(pair)
+        return published
+
+    probe.__name__ = f'{ticker} {field}'
+    return probe
+
+
+class MarketCloseTrigger:
+    """
+    Calendar-aware trigger firing once per trading session when its data is final
+
+    Parameters:
+    - probe: Callable(session_date) -> bool, True once the session's data is
+      published; None fires at close + settle_delay_minutes
+    - close_time: Exchange close as HH:MM in the exchange timezone
+    - settle_delay_minutes: Wait after the close before the first probe
+    - probe_interval_minutes: Wait between probes
+    - deadline_time: HH:MM after which the job runs without a positive probe
+    - timezone: Exchange timezone
+    - clock, sleep: Time source and sleep function (replaceable in tests)
+    """
+
+    def __init__(self, probe=None, close_time=DEFAULT_CLOSE_TIME, settle_delay_minutes=15,
+                 probe_interval_minutes=5, deadline_time=DEFAULT_DEADLINE_TIME, timezone=DEFAULT_TIMEZONE,
+                 clock=None, sleep=time.sleep):
+        self.probe = probe
+        self.close_time = _parse_time(close_time)
+        self.settle_delay = timedelta(minutes=settle_delay_minutes)
+        self.probe_interval = timedelta(minutes=probe_interval_minutes)
+        self.deadline_time = _parse_time(deadline_time)
+        self.tz = ZoneInfo(timezone)
+        self.clock = clock or (lambda: datetime.now(self.tz))
+        self.sleep = sleep
+        self.last_session = None
+        self._calendar = None
+
+    def calendar(self, date):
+        """Trading calendar covering a year ahead of date, rebuilt as time moves on"""
+        date = pd.Timestamp(date).normalize()
+        if self._calendar is None or not (
+                self._calendar.sessions[0] <= date and date + pd.Timedelta(days=30) <= self._calendar.sessions[-1]):
+            self._calendar = TradingCalendar(date - pd.Timedelta(days=10), date + pd.Timedelta(days=400))
+        return self._calendar
+
+    def _at(self, session_date, at_time):
+        return datetime.combine(pd.Timestamp(session_date).date(), at_time, tzinfo=self.tz)
+
+    def ready_time(self, session_date):
+        """Earliest time the session's data is probed for"""
+        return self._at(session_date, self.close_time) + self.settle_delay
+
+    def deadline(self, session_date):
+        return self._at(session_date, self.deadline_time)
+
+    def next_session(self, now=None):
+        """
+        Next trading session still to be collected
+
+        Sessions already fired for, and sessions whose deadline has passed
+        (e.g. when started late in the evening), are skipped.
+        """
+        now = now or self.clock()
+        day = pd.Timestamp(now.date())
+        while True:
+            session = self.calendar(day).next_session(day)
+            if (self.last_session is None or session.date() > self.last_session) and now < self.deadline(session):
+                return session.date()
+            day = session + pd.Timedelta(days=1)
+
+    def sleep_until(self, target):
+        while True:
+            remaining = (target - self.clock()).total_seconds()
+            if remaining <= 0:
+                return
+            self.sleep(min(remaining, MAX_SLEEP_SECONDS))
+
+    def wait_for_data(self, session_date):
+        """
+        Block until the session's data is final
+
+        Returns 'available' after a positive probe, 'scheduled' when there is no
+        probe, or 'deadline' when the deadline passed first.
+        """
+        self.sleep_until(self.ready_time(session_date))
+        if self.probe is None:
+            return 'scheduled'
+
+        deadline = self.deadline(session_date)
+        attempts = 0
+        while True:
+            attempts += 1
+            try:
+                if self.probe(session_date):
+                    logger.info(f"Data for {session_date} is final (probe {attempts} at "
+                                f"{self.clock().strftime('%H:%M')})")
+                    return 'available'
+            except Exception as e:
+                logger.warning(f"Availability probe failed: {e}")
+
+            now = self.clock()
+            if now >= deadline:
+                logger.warning(f"Data for {session_date} not confirmed by {self.deadline_time.strftime('%H:%M')}, "
+                               f"running anyway")
+                return 'deadline'
+            self.sleep_until(min(now + self.probe_interval, deadline))
+
+    def next_weekly_time(self, weekday, at_time, now=None):
+        """Next occurrence of a weekday (0 = Monday) at a time, strictly after now"""
+        now = now or self.clock()
+        days_ahead = (weekday - now.weekday()) % 7
+        target = self._at(now.date() + timedelta(days=days_ahead), at_time)
+        return target if target > now else target + timedelta(days=7)
+
+    def run(self, on_close, on_weekly=None, weekly_day=5, weekly_time='10:00'):
+        """
+        Fire on_close(session_date, reason) once per trading session, forever
+
+        Parameters:
+        - on_close: Job for a session; reason is 'available', 'scheduled' or 'deadline'
+        - on_weekly: Optional job run once a week (e.g. maintenance) between sessions
+        - weekly_day, weekly_time: When on_weekly runs (default Saturday 10:00)
+        """
+        weekly_time = _parse_time(weekly_time)
+        while True:
+            session_date = self.next_session()
+            ready = self.ready_time(session_date)
+
+            if on_weekly is not None:
+                weekly_at = self.next_weekly_time(weekly_day, weekly_time)
+                if weekly_at < ready:
+                    logger.info(f"Next event: weekly job at {weekly_at.strftime('%Y-%m-%d %H:%M %Z')}")
+                    self.sleep_until(weekly_at)
+                    on_weekly()
+                    continue
+
+            logger.info(f"Next event: {session_date} close, probing from {ready.strftime('%Y-%m-%d %H:%M %Z')}")
+            reason = self.wait_for_data(session_date)
+            self.last_session = session_date
+            on_close(session_date, reason)
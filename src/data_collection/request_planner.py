@@ -0,0 +1,285 @@
+"""
+Bloomberg Request Planner
+Jobs declare the data they need instead of requesting it themselves; the
+planner turns every declared need into the smallest set of
+HistoricalDataRequests, executes them once through the RequestEngine and fans
+the rows back out to each consumer.
+
+Planning works on (security, field, date) triples:
+1. every need contributes a date window per (security, field) - a snapshot
+   need (a current value) asks for the last few days before its as-of date;
+2. overlapping windows of the same (security, field) are merged, so a triple
+   wanted by several jobs is requested once;
+3. fields of a security sharing a merged window are requested together, and
+   securities with the same window and field set share a request (up to
+   MAX_SECURITIES_PER_REQUEST securities and MAX_FIELDS_PER_REQUEST fields).
+
+The daily scheduler runs a planner_job first; the consumer scripts expose
+data_needs() and receive their rows as main(prefetched=PlannedData).
+
+Usage:
+    planner = RequestPlanner()
+    planner.add('historical', [DataNeed('realized', tickers, realized_fields, '20250101', '20250630')])
+    planner.add('labeled', [DataNeed('volatility', tickers, labeled_fields, snapshot=True)])
+    results, summary = planner.execute(pool, 'data/request_plan/task_journal/20250630')
+    realized = results['historical'].frame('realized')
+"""
+
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from src.data_collection.request_engine import MAX_SECURITIES_PER_REQUEST, HistoricalRequest, RequestEngine
+
+MAX_FIELDS_PER_REQUEST = 25     # Bloomberg's field limit for a HistoricalDataRequest
+SNAPSHOT_LOOKBACK_DAYS = 7      # A snapshot takes the latest value in this window (covers weekends and holidays)
+MAX_GAP_DAYS = 3                # Windows this close are merged (bridges a weekend without extra triples)
+
+
+def _timestamp(value):
+    return pd.Timestamp(value).normalize()
+
+
+def merge_windows(windows, max_gap_days=MAX_GAP_DAYS):
+    """Merge overlapping (or nearly adjacent) (start, end) windows; returns them sorted"""
+    merged = []
+    for start, end in sorted(windows):
+        if merged and start <= merged[-1][1] + pd.Timedelta(days=max_gap_days + 1):
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def business_days(start, end):
+    """Weekdays in [start, end], the unit triples are counted in"""
+    return int(np.busday_count(start.date(), (end + pd.Timedelta(days=1)).date()))
+
+
+class DataNeed:
+    """
+    Data one consumer needs
+
+    Parameters:
+    - name: Label within the consumer (e.g. 'realized'); the frame is returned under it
+    - securities: Bloomberg tickers
+    - fields: {column name: Bloomberg field}; rows are returned under the column names
+    - start_date, end_date: Date range (anything pd.Timestamp accepts)
+    - snapshot: True for the latest value per security as of end_date (default today)
+      instead of a history
+    """
+
+    def __init__(self, name, securities, fields, start_date=None, end_date=None, snapshot=False):
+        self.name = name
+        self.securities = list(dict.fromkeys(securities))
+        self.fields = dict(fields)
+        self.snapshot = snapshot
+        self.end_date = _timestamp(end_date or datetime.now())
+        if snapshot:
+            self.start_date = self.end_date - pd.Timedelta(days=SNAPSHOT_LOOKBACK_DAYS)
+        else:
+            if start_date is None:
+                raise ValueError(f"DataNeed '{name}' needs a start_date (or snapshot=True)")
+            self.start_date = _timestamp(start_date)
+
+    def triples(self):
+        return len(self.securities) * len(set(self.fields.values())) * business_days(self.start_date, self.end_date)
+
+    def __repr__(self):
+        kind = 'snapshot' if self.snapshot else 'history'
+        return (f'DataNeed({self.name}: {len(self.securities)} securities x {len(self.fields)} fields, {kind} '
+                f'{self.start_date:%Y-%m-%d}-{self.end_date:%Y-%m-%d})')
+
+
+class PlannedData:
+    """
+    Rows fanned out to one consumer
+
+    Attributes:
+    - needs: {need name: DataNeed} as declared
+    - frames: {need name: DataFrame of date, ticker and the need's columns}
+    - failed_securities: Securities whose planned request failed after retries;
+      consumers fetch these on their own session, so a job retry does not
+      replay the failure
+    - security_errors: {ticker: message} for securities Bloomberg rejected
+    """
+
+    def __init__(self, consumer, needs, frames, failed_securities, security_errors):
+        self.consumer = consumer
+        self.needs = needs
+        self.frames = frames
+        self.failed_securities = failed_securities
+        self.security_errors = security_errors
+
+    def frame(self, name):
+        return self.frames[name]
+
+    def __repr__(self):
+        rows = ', '.join(f'{name}: {len(df)}' for name, df in self.frames.items())
+        return f'PlannedData({self.consumer}: {rows})'
+
+
+class RequestPlanner:
+    """
+    Minimal HistoricalDataRequests for the declared needs of several consumers
+
+    Parameters:
+    - max_securities: Securities per request
+    - max_fields: Fields per request
+    - max_gap_days: Windows of one (security, field) closer than this are merged
+    """
+
+    def __init__(self, max_securities=MAX_SECURITIES_PER_REQUEST, max_fields=MAX_FIELDS_PER_REQUEST,
+                 max_gap_days=MAX_GAP_DAYS):
+        self.max_securities = max_securities
+        self.max_fields = max_fields
+        self.max_gap_days = max_gap_days
+        self.needs = {}
+
+    def add(self, consumer, needs):
+        """Declare a consumer's needs (a consumer may be added once)"""
+        if consumer in self.needs:
+            raise ValueError(f"Consumer '{consumer}' already declared")
+        self.needs[consumer] = {need.name: need for need in needs}
+        return self
+
+    def _plan(self, needs):
+        windows = {}
+        for need in needs:
+            for security in need.securities:
+                for field in need.fields.values():
+                    windows.setdefault((security, field), []).append((need.start_date, need.end_date))
+
+        # Fields of one security that share a merged window are requested together
+        fields_by_window = {}
+        for (security, field), field_windows in windows.items():
+            for window in merge_windows(field_windows, self.max_gap_days):
+                fields_by_window.setdefault((security, window), set()).add(field)
+
+        # Securities with the same window and field set share a request
+        groups = {}
+        for (security, window), fields in fields_by_window.items():
+            groups.setdefault((window, tuple(sorted(fields))), []).append(security)
+
+        requests = []
+        for ((start, end), fields), securities in sorted(groups.items()):
+            securities = sorted(securities)
+            for i in range(0, len(securities), self.max_securities):
+                for j in range(0, len(fields), self.max_fields):
+                    requests.append(HistoricalRequest(securities[i:i + self.max_securities],
+                                                      fields[j:j + self.max_fields],
+                                                      start.strftime('%Y%m%d'), end.strftime('%Y%m%d'),
+                                                      name='planned'))
+        return requests, fields_by_window
+
+    def plan(self):
+        """HistoricalRequests covering every declared need"""
+        return self._plan([need for needs in self.needs.values() for need in needs.values()])[0]
+
+    def statistics(self):
+        """
+        Planned requests and (security, field, business day) triples, against
+        what the consumers would request planning on their own
+        """
+        requests, fields_by_window = self._plan([need for needs in self.needs.values() for need in needs.values()])
+        standalone = {consumer: self._plan(list(needs.values()))[0] for consumer, needs in self.needs.items()}
+        return {
+            'consumers': len(self.needs),
+            'needs': sum(len(needs) for needs in self.needs.values()),
+            'requests': len(requests),
+            'standalone_requests': sum(len(planned) for planned in standalone.values()),
+            'triples': sum(len(fields) * business_days(*window)
+                           for (_, window), fields in fields_by_window.items()),
+            'standalone_triples': sum(need.triples() for needs in self.needs.values() for need in needs.values())
+        }
+
+    def fan_out(self, df, failed_securities=(), security_errors=None):
+        """Split the fetched (date, ticker, <Bloomberg field>...) rows into each consumer's frames"""
+        security_errors = security_errors or {}
+        failed_securities = set(failed_securities)
+        results = {}
+        for consumer, needs in self.needs.items():
+            frames = {}
+            for name, need in needs.items():
+                columns = ['date', 'ticker'] + list(need.fields)
+                if df.empty:
+                    frames[name] = pd.DataFrame(columns=columns)
+                    continue
+                rows = df[df['ticker'].isin(need.securities)
+                          & df['date'].between(need.start_date, need.end_date)]
+                frame = pd.DataFrame({'date': rows['date'], 'ticker': rows['ticker']})
+                for column, field in need.fields.items():
+                    frame[column] = rows[field] if field in rows.columns else np.nan
+                frame = frame.dropna(subset=list(need.fields), how='all')
+                if need.snapshot:
+                    # Latest value of every field (groupby.last skips missing values)
+                    frame = frame.sort_values('date').groupby('ticker', sort=False).last().reset_index()
+                # Securities in the order the consumer declared them
+                order = {security: i for i, security in enumerate(need.securities)}
+                frames[name] = frame[columns].sort_values(
+                    ['ticker', 'date'], key=lambda col: col.map(order) if col.name == 'ticker' else col
+                ).reset_index(drop=True)
+
+            securities = {security for need in needs.values() for security in need.securities}
+            results[consumer] = PlannedData(
+                consumer, needs, frames, sorted(securities & failed_securities),
+                {ticker: error for ticker, error in security_errors.items() if ticker in securities})
+        return results
+
+    def execute(self, session_pool, journal_dir, workers=None, **engine_options):
+        """
+        Run the plan once and fan the rows out
+
+        Returns ({consumer: PlannedData}, summary) where summary holds the
+        statistics() counts plus rows, retries, failed_requests and
+        security_errors.
+        """
+        requests = self.plan()
+        summary = self.statistics()
+        print(f"📋 Planned {summary['requests']} requests for {summary['consumers']} consumers "
+              f"(standalone: {summary['standalone_requests']}); "
+              f"{summary['triples']:,} of {summary['standalone_triples']:,} triples")
+
+        engine = RequestEngine(session_pool, journal_dir, workers=workers, **engine_options)
+        df, task_summary = engine.run(requests)
+
+        failed = [request for request in requests if request.task().key in task_summary['failed']]
+        failed_securities = {security for request in failed for security in request.securities}
+        results = self.fan_out(df, failed_securities, task_summary['security_errors'])
+        summary.update({
+            'rows': len(df),
+            'retries': task_summary['retries'],
+            'failed_requests': task_summary['failed'],
+            'security_errors': task_summary['security_errors']
+        })
+
+        # Consumers get the rows in memory; a re-run after a failure resumes from the journal
+        if not failed:
+            engine.clear()
+        return results, summary
+
+
+def planner_job(consumers, journal_root, workers=None):
+    """
+    Job planning and executing the needs of consumer scripts
+
+    Each script in consumers ({consumer: script path}) exposes data_needs();
+    the fanned-out PlannedData is stored on context.prefetched for
+    script_job(..., consumer=...) to hand to the script's main().
+    """
+    from src.data_collection.job_dag import load_script
+
+    def run(context):
+        planner = RequestPlanner()
+        for consumer, script_path in consumers.items():
+            planner.add(consumer, load_script(script_path).data_needs())
+
+        journal_dir = os.path.join(journal_root, datetime.now().strftime('%Y%m%d'))
+        results, summary = planner.execute(context.session_pool, journal_dir, workers=workers)
+        context.prefetched = results
+        context.plan_summary = summary
+        return summary['rows'] > 0 or summary['requests'] == 0
+    run.__name__ = 'planner_job'
+    return run
@@ -0,0 +1,244 @@
+"""
+Collection Run-State Store
+Embedded SQLite database of scheduler runs, the jobs each run executed, and
+every collection a fetcher performed (range, rows, securities, retries,
+failures). Schedulers, fetchers and the daily report all read and write the
+same tables, so "did today's collection succeed?" or "what is stale?" is an
+indexed lookup instead of a crawl over logs, reports and progress files.
+
+Tables:
+- runs: one row per scheduler run (scheduler, session date, trigger, status, timings)
+- tasks: one row per job of a run (attempts, retries, rows, duration, error)
+- collections: one row per fetcher collection, updated while it progresses;
+  details holds collection-specific state (e.g. failed securities) as JSON
+
+Usage:
+    store = RunStateStore(os.path.join(project_root, 'data', 'run_state.db'))
+    run_id = store.start_run('vix_daily', session_date='2025-03-14')
+    store.record_task(run_id, 'VIX Data Collection', 'success', attempts=1, duration_seconds=812.4)
+    store.finish_run(run_id, 'success')
+    store.stale_collections(['vix_data', 'historical_volatility'], max_age_hours=30)
+"""
+
+import json
+import os
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+DEFAULT_DB_NAME = 'run_state.db'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    scheduler TEXT NOT NULL,
+    session_date TEXT,
+    trigger TEXT,
+    status TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    finished_at TEXT,
+    duration_seconds REAL,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_runs_scheduler ON runs (scheduler, started_at);
+
+CREATE TABLE IF NOT EXISTS tasks (
+    task_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id INTEGER NOT NULL REFERENCES runs (run_id),
+    name TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    retries INTEGER NOT NULL DEFAULT 0,
+    rows INTEGER,
+    started_at TEXT,
+    finished_at TEXT,
+    duration_seconds REAL,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_run ON tasks (run_id);
+CREATE INDEX IF NOT EXISTS idx_tasks_name ON tasks (name, status, finished_at);
+
+CREATE TABLE IF NOT EXISTS collections (
+    collection_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    status TEXT NOT NULL,
+    start_date TEXT,
+    end_date TEXT,
+    started_at TEXT NOT NULL,
+    finished_at TEXT,
+    duration_seconds REAL,
+    rows INTEGER,
+    securities INTEGER,
+    retries INTEGER NOT NULL DEFAULT 0,
+    failed_tasks INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    details TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_collections_name ON collections (name, status, finished_at);
+"""
+
+COLLECTION_FIELDS = ('status', 'start_date', 'end_date', 'rows', 'securities', 'retries', 'failed_tasks', 'error')
+
+
+def _now():
+    return datetime.now().isoformat(timespec='seconds')
+
+
+def _row_dict(row):
+    if row is None:
+        return None
+    record = dict(row)
+    if record.get('details') is not None:
+        record['details'] = json.loads(record['details'])
+    return record
+
+
+class RunStateStore:
+    """
+    SQLite store shared by the schedulers and fetchers
+
+    Each call opens its own short-lived connection, so the store is safe to
+    use from the job threads of one process and from several processes (the
+    database runs in WAL mode).
+
+    Parameters:
+    - db_path: Database file, created with its schema on first use
+    """
+
+    def __init__(self, db_path):
+        self.db_path = str(db_path)
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # Scheduler runs
+
+    def start_run(self, scheduler, session_date=None, trigger=None):
+        """Open a run; returns its run_id"""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                'INSERT INTO runs (scheduler, session_date, trigger, status, started_at) VALUES (?, ?, ?, ?, ?)',
+                (scheduler, str(session_date) if session_date else None, trigger, 'running', _now()))
+            return cursor.lastrowid
+
+    def finish_run(self, run_id, status, error=None):
+        finished = datetime.now()
+        with self._connect() as conn:
+            started = conn.execute('SELECT started_at FROM runs WHERE run_id = ?', (run_id,)).fetchone()[0]
+            duration = (finished - datetime.fromisoformat(started)).total_seconds()
+            conn.execute('UPDATE runs SET status = ?, finished_at = ?, duration_seconds = ?, error = ? '
+                         'WHERE run_id = ?',
+                         (status, finished.isoformat(timespec='seconds'), duration, error, run_id))
+
+    def record_task(self, run_id, name, status, attempts=1, duration_seconds=None, rows=None, error=None,
+                    started_at=None, finished_at=None):
+        """Record one finished job of a run; attempts beyond the first count as retries"""
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT INTO tasks (run_id, name, status, attempts, retries, rows, started_at, finished_at, '
+                'duration_seconds, error) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (run_id, name, status, attempts, max(attempts - 1, 0), rows, started_at,
+                 finished_at or _now(), duration_seconds, error))
+
+    def run_tasks(self, run_id):
+        with self._connect() as conn:
+            rows = conn.execute('SELECT * FROM tasks WHERE run_id = ? ORDER BY task_id', (run_id,)).fetchall()
+        return [dict(row) for row in rows]
+
+    def recent_runs(self, scheduler=None, limit=10):
+        query = 'SELECT * FROM runs'
+        params = ()
+        if scheduler is not None:
+            query += ' WHERE scheduler = ?'
+            params = (scheduler,)
+        with self._connect() as conn:
+            rows = conn.execute(query + ' ORDER BY started_at DESC LIMIT ?', params + (limit,)).fetchall()
+        return [dict(row) for row in rows]
+
+    def task_success_rate(self, since):
+        """{task name: (successful runs, total runs)} for tasks finished since a datetime"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT name, SUM(status = 'success'), COUNT(*) FROM tasks WHERE finished_at >= ? GROUP BY name",
+                (since.isoformat(timespec='seconds'),)).fetchall()
+        return {name: (int(successes), int(total)) for name, successes, total in rows}
+
+    # Fetcher collections
+
+    def start_collection(self, name, start_date=None, end_date=None, details=None):
+        """Open a collection record in status 'running'; returns its collection_id"""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                'INSERT INTO collections (name, status, start_date, end_date, started_at, details) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (name, 'running', start_date, end_date, _now(), json.dumps(details or {}, default=str)))
+            return cursor.lastrowid
+
+    def update_collection(self, collection_id, details=None, **fields):
+        """
+        Update a collection's columns (see COLLECTION_FIELDS); details are merged
+        into the stored JSON so progress can be saved incrementally
+        """
+        unknown = set(fields) - set(COLLECTION_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown collection fields: {sorted(unknown)}")
+
+        with self._connect() as conn:
+            if details is not None:
+                stored = conn.execute('SELECT details FROM collections WHERE collection_id = ?',
+                                      (collection_id,)).fetchone()[0]
+                merged = {**json.loads(stored or '{}'), **details}
+                fields['details'] = json.dumps(merged, default=str)
+            if fields:
+                assignments = ', '.join(f'{column} = ?' for column in fields)
+                conn.execute(f'UPDATE collections SET {assignments} WHERE collection_id = ?',
+                             (*fields.values(), collection_id))
+
+    def finish_collection(self, collection_id, status, details=None, **fields):
+        """Close a collection with its final status ('success', 'partial' or 'failed') and counts"""
+        finished = datetime.now()
+        with self._connect() as conn:
+            started = conn.execute('SELECT started_at FROM collections WHERE collection_id = ?',
+                                   (collection_id,)).fetchone()[0]
+            conn.execute('UPDATE collections SET finished_at = ?, duration_seconds = ? WHERE collection_id = ?',
+                         (finished.isoformat(timespec='seconds'),
+                          (finished - datetime.fromisoformat(started)).total_seconds(), collection_id))
+        self.update_collection(collection_id, details=details, status=status, **fields)
+
+    def last_collection(self, name, status=None):
+        """Most recent collection of a name (optionally with a given status), or None"""
+        query = 'SELECT * FROM collections WHERE name = ?'
+        params = (name,)
+        if status is not None:
+            query += ' AND status = ?'
+            params += (status,)
+        with self._connect() as conn:
+            row = conn.execute(query + ' ORDER BY started_at DESC, collection_id DESC LIMIT 1', params).fetchone()
+        return _row_dict(row)
+
+    def stale_collections(self, names, max_age_hours=30):
+        """
+        Collections without a successful run in the last max_age_hours
+
+        Returns {name: finished_at of the last success, or None if there never was one}.
+        """
+        cutoff = (datetime.now() - timedelta(hours=max_age_hours)).isoformat(timespec='seconds')
+        stale = {}
+        with self._connect() as conn:
+            for name in names:
+                last = conn.execute("SELECT MAX(finished_at) FROM collections WHERE name = ? AND status = 'success'",
+                                    (name,)).fetchone()[0]
+                if last is None or last < cutoff:
+                    stale[name] = last
+        return stale
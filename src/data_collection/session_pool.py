@@ -0,0 +1,168 @@
+"""
+Bloomberg Session Pool
+Started Bloomberg sessions shared by the collection jobs of one process, so
+jobs run back to back or side by side reuse an open //blp/refdata session
+instead of each paying session start-up. A session serves one job at a time;
+concurrent jobs each borrow their own, up to the pool size.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+from src.utils.instrumentation import InstrumentedSession
+
+REFDATA_SERVICE = '//blp/refdata'
+
+
+def open_refdata_session(service=REFDATA_SERVICE):
+    """Start an instrumented Bloomberg session and open the service; returns (session, service)"""
+    import blpapi
+
+    session = InstrumentedSession(blpapi.Session(blpapi.SessionOptions()))
+    if not session.start():
+        raise ConnectionError("Failed to start Bloomberg session")
+    if not session.openService(service):
+        session.stop()
+        raise ConnectionError(f"Failed to open Bloomberg service {service}")
+    return session, session.getService(service)
+
+
+class BloombergSessionPool:
+    """
+    Bounded pool of started sessions
+
+    Parameters:
+    - size: Maximum sessions open at once
+    - service: Service every session opens
+    - session_factory: Callable returning (session, service); defaults to
+      open_refdata_session, replaceable for offline runs
+
+    Usage:
+        pool = BloombergSessionPool(size=2)
+        with pool.session() as (session, ref_data_service):
+            ...
+        pool.close()
+    """
+
+    def __init__(self, size=2, service=REFDATA_SERVICE, session_factory=None):
+        self.size = size
+        self.service = service
+        self.session_factory = session_factory or (lambda: open_refdata_session(service))
+        self._idle = []
+        self._opened = []
+        # Signalled whenever a session or a slot frees up (release, discard, failed start, close)
+        self._available = threading.Condition(threading.Lock())
+
+    def acquire(self, timeout=None):
+        """
+        Borrow a session, starting a new one while under the pool size
+
+        Blocks until a session is released or a slot is freed; raises
+        TimeoutError if none is available within timeout seconds.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._available:
+            while not self._idle and len(self._opened) >= self.size:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(f"No Bloomberg session available within {timeout}s")
+                self._available.wait(remaining)
+            if self._idle:
+                return self._idle.pop()
+            # Reserve the slot before the (slow) start so concurrent callers respect size
+            self._opened.append(None)
+
+        try:
+            pair = self.session_factory()
+        except Exception:
+            with self._available:
+                if None in self._opened:
+                    self._opened.remove(None)
+                self._available.notify()
+            raise
+        with self._available:
+            if None in self._opened:
+                self._opened[self._opened.index(None)] = pair
+            else:
+                # The pool was closed during the start; count the session afresh
+                self._opened.append(pair)
+        return pair
+
+    def release(self, pair):
+        """Return a borrowed session to the pool"""
+        with self._available:
+            # A session from before close() is already stopped and no longer counted
+            if pair in self._opened:
+                self._idle.append(pair)
+                self._available.notify()
+
+    def discard(self, pair):
+        """Drop a session that failed mid-request (e.g. timed out) instead of handing it out again"""
+        with self._available:
+            if pair in self._opened:
+                self._opened.remove(pair)
+                self._available.notify()
+        try:
+            pair[0].stop()
+        except Exception:
+            pass
+
+    @contextmanager
+    def session(self, timeout=None):
+        pair = self.acquire(timeout)
+        try:
+            yield pair
+        finally:
+            self.release(pair)
+
+    def close(self):
+        """Stop every session the pool opened"""
+        with self._available:
+            opened = [pair for pair in self._opened if pair is not None]
+            self._opened = []
+            self._idle = []
+            self._available.notify_all()
+        for session, _ in opened:
+            try:
+                session.stop()
+            except Exception:
+                pass
+        return len(opened)
+
+
+class PooledSessionMixin:
+    """
+    Pooled connect/disconnect for fetchers holding a (session, refDataService) pair
+
+    connect() calls borrow_session(), disconnect() calls return_session(), and
+    every request that times out sets session_timed_out: the late response may
+    still arrive on that session, so it is discarded instead of released.
+    """
+
+    session_pool = None
+    session_timed_out = False
+
+    def borrow_session(self, session_pool, timeout=None):
+        """Take a session from the pool into self.session / self.refDataService"""
+        self.session_pool = session_pool
+        self.session_timed_out = False
+        self.session, self.refDataService = session_pool.acquire(timeout)
+
+    def return_session(self):
+        """
+        Hand a borrowed session back to its pool
+
+        Returns False (and does nothing) when no pooled session is held, so the
+        caller stops a session it started itself.
+        """
+        if self.session_pool is None or not getattr(self, 'session', None):
+            return False
+        pair = (self.session, self.refDataService)
+        if self.session_timed_out:
+            # Never hand a session with an in-flight response to the next job
+            self.session_pool.discard(pair)
+        else:
+            self.session_pool.release(pair)
+        self.session = None
+        return True
@@ -0,0 +1,161 @@
+"""
+Collection Task Runner
+Splits a collection into small tasks (security x field group x date range),
+journals each finished task's data, and retries only the tasks that failed,
+with exponential backoff. A re-run of the same collection skips every task
+already in the journal, so one flaky ticker costs a few seconds of retries
+instead of a delayed re-run of the whole script.
+"""
+
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from src.data_collection.collection_journal import CollectionJournal
+from src.utils.instrumentation import METRICS
+
+DEFAULT_MAX_ATTEMPTS = 4
+DEFAULT_BASE_DELAY = 2.0    # Seconds before the first retry round
+DEFAULT_MAX_DELAY = 60.0
+
+
+class RetryableTaskError(Exception):
+    """A task failed in a way worth retrying (timeout, dropped session, partial response)"""
+
+
+class CollectionTask:
+    """
+    One unit of collection work
+
+    Parameters:
+    - security: Bloomberg ticker
+    - field_group: Name of the field set requested together (e.g. 'realized')
+    - start_date, end_date: Request range as YYYYMMDD strings
+    - context: Extra details the fetch function needs (not part of the key)
+    """
+
+    def __init__(self, security, field_group, start_date, end_date, context=None):
+        self.security = security
+        self.field_group = field_group
+        self.start_date = start_date
+        self.end_date = end_date
+        self.context = context or {}
+
+    @property
+    def key(self):
+        return f'{self.security}|{self.field_group}|{self.start_date}|{self.end_date}'
+
+    def __repr__(self):
+        return f'CollectionTask({self.key})'
+
+
+def build_tasks(securities, field_groups, start_date, end_date):
+    """Every (security, field group) task over one date range"""
+    return [CollectionTask(security, group, start_date, end_date)
+            for group in field_groups for security in securities]
+
+
+class TaskRunner:
+    """
+    Run collection tasks with per-task retry and a journal of finished tasks
+
+    Parameters:
+    - journal_dir: Directory of the CollectionJournal holding finished tasks
+    - max_attempts: Attempts per task before it is reported as failed
+    - base_delay: Backoff before the first retry round, doubled each round
+    - max_delay: Upper bound on the backoff
+    - sleep: Sleep function (replaceable in tests); defaults to a sleep counted
+      as retry_backoff in the instrumentation metrics
+    - workers: Tasks fetched concurrently within a round (fetch must then be
+      thread-safe, e.g. borrowing sessions from a BloombergSessionPool)
+
+    Usage:
+        runner = TaskRunner('data/historical_volatility/task_journal/20250101_20250301')
+        summary = runner.run(tasks, fetch_task)
+        data = runner.load(tasks)
+    """
+
+    def __init__(self, journal_dir, max_attempts=DEFAULT_MAX_ATTEMPTS, base_delay=DEFAULT_BASE_DELAY,
+                 max_delay=DEFAULT_MAX_DELAY, sleep=None, workers=1):
+        self.journal = CollectionJournal(journal_dir)
+        self.workers = max(1, workers)
+        self._journal_lock = threading.Lock()
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.sleep = sleep or (lambda seconds: METRICS.sleep(seconds, reason='retry_backoff'))
+
+    def backoff(self, round_number):
+        """Delay before retry round n (1-based), with jitter so sessions do not retry in lockstep"""
+        delay = min(self.max_delay, self.base_delay * 2 ** (round_number - 1))
+        return delay * random.uniform(0.8, 1.2)
+
+    def run(self, tasks, fetch):
+        """
+        Fetch every task not yet journaled
+
+        fetch(task) returns a DataFrame (empty for a security with no data,
+        which counts as done) or raises; any exception marks the task for retry.
+
+        Returns a dict with counts of 'skipped', 'completed' and 'retries', and
+        'failed': {task key: last error} for tasks that exhausted their attempts.
+        """
+        done = self.journal.completed_securities()
+        pending = [task for task in tasks if task.key not in done]
+        summary = {'skipped': len(tasks) - len(pending), 'completed': 0, 'retries': 0, 'failed': {}}
+        if summary['skipped']:
+            print(f"   Skipping {summary['skipped']} task(s) already collected")
+
+        for attempt in range(1, self.max_attempts + 1):
+            if attempt > 1:
+                delay = self.backoff(attempt - 1)
+                print(f"   Retrying {len(pending)} failed task(s) in {delay:.1f}s "
+                      f"(attempt {attempt}/{self.max_attempts})")
+                self.sleep(delay)
+                summary['retries'] += len(pending)
+
+            outcomes = self._run_round(pending, fetch)
+            failed = [task for task, error in zip(pending, outcomes) if error is not None]
+            errors = {task.key: error for task, error in zip(pending, outcomes) if error is not None}
+            summary['completed'] += len(pending) - len(failed)
+
+            pending = failed
+            if not pending:
+                break
+
+        summary['failed'] = errors if pending else {}
+        for key, error in summary['failed'].items():
+            print(f"   WARNING: {key} failed after {self.max_attempts} attempts: {error}")
+        return summary
+
+    def _run_task(self, task, fetch):
+        """Fetch and journal one task; returns None on success or the error text"""
+        try:
+            df = fetch(task)
+            with self._journal_lock:
+                self.journal.append(task.key, df if df is not None else pd.DataFrame())
+            return None
+        except Exception as e:
+            return f'{type(e).__name__}: {e}'
+
+    def _run_round(self, tasks, fetch):
+        if self.workers == 1 or len(tasks) < 2:
+            return [self._run_task(task, fetch) for task in tasks]
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='collection-task') as executor:
+            return list(executor.map(lambda task: self._run_task(task, fetch), tasks))
+
+    def load(self, tasks=None):
+        """Journaled data of the given tasks (all tasks when None) as one DataFrame"""
+        records = self.journal.committed_records()
+        if tasks is not None:
+            keys = {task.key for task in tasks}
+            records = {key: record for key, record in records.items() if key in keys}
+        frames = [self.journal.read_part(record) for record in records.values()]
+        frames = [frame for frame in frames if len(frame) > 0]
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+    def clear(self):
+        """Forget finished tasks once their data has been saved downstream"""
+        self.journal.clear()
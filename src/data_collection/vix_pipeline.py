@@ -0,0 +1,303 @@
+"""
+VIX Data Pipeline
+One staged refresh of VIX spot, futures and options data, replacing the
+separate spot/futures/options fetchers that each ran their own request loop:
+
+1. discover: build the security master for a date range - VIX spot, the
+   generic UX1-UX9 strip, every monthly UX contract and a call strike ladder
+   per monthly expiry - with the date window each security trades in. Legacy
+   ticker aliases collapse onto one canonical ticker, so overlapping security
+   sets are requested once.
+2. plan: group securities sharing a field set and date window into
+   multi-security HistoricalDataRequests.
+3. fetch, normalize, store: run the plan through the concurrent
+   RequestEngine, fold the rows into the shared DedupeVolatilityStore (keyed
+   by ticker and Bloomberg field) and save the security master next to it.
+
+Downstream code reads the same store through load_spot(), load_futures() and
+load_options(), which return the collectors' wide layouts with contract
+metadata (expiry, strike) attached.
+
+Usage:
+    pipeline = VIXPipeline(data_dir, DedupeVolatilityStore(store_dir), session_pool=pool)
+    summary = pipeline.run('2015-07-01', '2025-07-01')
+    futures = pipeline.load_futures(generic=True)
+"""
+
+import os
+import re
+
+import pandas as pd
+
+from src.analysis.vix_term_structure import GENERIC_FUTURES, vix_futures_expiries
+from src.data_collection.request_engine import MAX_SECURITIES_PER_REQUEST, HistoricalRequest, RequestEngine
+
+SPOT_TICKER = 'VIX Index'
+
+SPOT_FIELDS = {
+    'vix_level': 'PX_LAST',
+    'vix_open': 'PX_OPEN',
+    'vix_high': 'PX_HIGH',
+    'vix_low': 'PX_LOW'
+}
+
+FUTURES_FIELDS = {
+    'last_price': 'PX_LAST',
+    'open_price': 'PX_OPEN',
+    'high_price': 'PX_HIGH',
+    'low_price': 'PX_LOW',
+    'settle_price': 'PX_SETTLE',
+    'volume': 'PX_VOLUME',
+    'open_interest': 'OPEN_INT'
+}
+
+OPTIONS_FIELDS = {
+    'last_price': 'PX_LAST',
+    'bid_price': 'PX_BID',
+    'ask_price': 'PX_ASK',
+    'mid_price': 'PX_MID',
+    'volume': 'PX_VOLUME',
+    'open_interest': 'OPEN_INT',
+    'implied_vol': 'IVOL_MID',
+    'delta': 'DELTA_MID',
+    'gamma': 'GAMMA_MID',
+    'theta': 'THETA_MID',
+    'vega': 'VEGA_MID',
+    'underlying_price': 'UNDL_PX'
+}
+
+FIELD_GROUPS = {'spot': SPOT_FIELDS, 'futures': FUTURES_FIELDS, 'options': OPTIONS_FIELDS}
+
+# Call strikes requested for every monthly expiry (the range VIX has traded in)
+OPTION_STRIKES = (15, 16, 17, 18, 19, 20, 22, 25, 30, 35, 40, 45, 50)
+
+CONTRACT_LISTING_DAYS = 300     # Monthly VIX futures list roughly nine months before expiry
+OPTION_LISTING_DAYS = 120       # Option history kept for the front expiries only
+
+MONTH_CODES = 'FGHJKMNQUVXZ'
+
+# Tickers the earlier fetchers used for the same instruments
+TICKER_ALIASES = {
+    'VIX3 Index': SPOT_TICKER,
+    'VIX1 Index': SPOT_TICKER,
+    '.VIX Index': SPOT_TICKER,
+    'CBOE VIX Index': SPOT_TICKER,
+    'VIX US Index': SPOT_TICKER,
+}
+_CBOE_GENERIC = re.compile(r'^CBOE VIX(\d) Index$')
+
+MASTER_COLUMNS = ['ticker', 'role', 'field_group', 'start_date', 'end_date', 'expiry_date', 'strike',
+                  'option_type']
+
+
+def canonical_ticker(ticker):
+    """Canonical Bloomberg ticker for an alias used by the earlier fetchers"""
+    match = _CBOE_GENERIC.match(ticker)
+    if match:
+        return f'UX{match.group(1)} Index'
+    return TICKER_ALIASES.get(ticker, ticker)
+
+
+def future_ticker(expiry):
+    """Monthly UX contract for an expiry, e.g. 2025-08-20 -> 'UXQ25 Index'"""
+    return f'UX{MONTH_CODES[expiry.month - 1]}{expiry.strftime("%y")} Index'
+
+
+def option_ticker(expiry, strike, option_type='C'):
+    """VIX option ticker in Bloomberg's 'VIX MM/DD/YY C20 Index' form"""
+    return f'VIX {expiry.strftime("%m/%d/%y")} {option_type}{strike:g} Index'
+
+
+def dedupe_securities(master):
+    """
+    One row per canonical ticker
+
+    Aliases are renamed to their canonical ticker and duplicate rows merged,
+    keeping the widest date window and the first non-null metadata.
+    """
+    if master.empty:
+        return master
+    master = master.assign(ticker=master['ticker'].map(canonical_ticker))
+    grouped = master.groupby('ticker', sort=False)
+    merged = grouped.first()
+    merged['start_date'] = grouped['start_date'].min()
+    merged['end_date'] = grouped['end_date'].max()
+    return merged.reset_index()[MASTER_COLUMNS]
+
+
+class VIXPipeline:
+    """
+    Discover -> plan -> fetch/normalize/store for the VIX complex
+
+    Parameters:
+    - data_dir: Directory for the security master and request journals
+    - store: DedupeVolatilityStore shared with the other collectors
+    - session_pool: BloombergSessionPool; one of size `workers` is opened
+      (and closed) per run when omitted
+    - workers: Requests in flight at once
+    - strikes: Call strikes discovered per monthly expiry (empty skips options)
+    """
+
+    def __init__(self, data_dir, store, session_pool=None, workers=2, strikes=OPTION_STRIKES):
+        self.data_dir = str(data_dir)
+        self.store = store
+        self.session_pool = session_pool
+        self.workers = workers
+        self.strikes = tuple(strikes)
+        self.master_file = os.path.join(self.data_dir, 'vix_securities.parquet')
+        os.makedirs(self.data_dir, exist_ok=True)
+
+    # Stage 1: discover
+
+    def discover(self, start_date, end_date, extra_securities=()):
+        """
+        Security master for a date range
+
+        Parameters:
+        - start_date, end_date: Range to collect
+        - extra_securities: Additional (ticker, field_group) pairs, e.g. tickers
+          a one-off analysis needs; aliases of known tickers are folded in
+
+        Returns a DataFrame with MASTER_COLUMNS.
+        """
+        start = pd.Timestamp(start_date).normalize()
+        end = pd.Timestamp(end_date).normalize()
+        rows = [{'ticker': SPOT_TICKER, 'role': 'spot', 'field_group': 'spot', 'start_date': start, 'end_date': end}]
+        rows += [{'ticker': ticker, 'role': 'generic_future', 'field_group': 'futures',
+                  'start_date': start, 'end_date': end} for ticker in GENERIC_FUTURES]
+
+        # Contracts expiring inside the range or listed by its end
+        expiries = vix_futures_expiries(start, end + pd.Timedelta(days=CONTRACT_LISTING_DAYS))
+        for expiry in expiries:
+            contract_start = max(start, expiry - pd.Timedelta(days=CONTRACT_LISTING_DAYS))
+            contract_end = min(end, expiry)
+            if contract_start > contract_end:
+                continue
+            rows.append({'ticker': future_ticker(expiry), 'role': 'future', 'field_group': 'futures',
+                         'start_date': contract_start, 'end_date': contract_end, 'expiry_date': expiry})
+
+            option_start = max(start, expiry - pd.Timedelta(days=OPTION_LISTING_DAYS))
+            if option_start > contract_end:
+                continue
+            rows += [{'ticker': option_ticker(expiry, strike), 'role': 'option', 'field_group': 'options',
+                      'start_date': option_start, 'end_date': contract_end, 'expiry_date': expiry,
+                      'strike': float(strike), 'option_type': 'Call'} for strike in self.strikes]
+
+        rows += [{'ticker': ticker, 'role': 'extra', 'field_group': group, 'start_date': start, 'end_date': end}
+                 for ticker, group in extra_securities]
+
+        master = pd.DataFrame(rows).reindex(columns=MASTER_COLUMNS)
+        return dedupe_securities(master)
+
+    # Stage 2: plan
+
+    def plan(self, master, max_securities=MAX_SECURITIES_PER_REQUEST):
+        """
+        HistoricalDataRequests covering the master
+
+        Securities with the same field group and date window share a request,
+        up to max_securities per request.
+        """
+        requests = []
+        for (group, start, end), rows in master.groupby(['field_group', 'start_date', 'end_date'], sort=True):
+            tickers = sorted(rows['ticker'])
+            fields = list(FIELD_GROUPS[group].values())
+            for i in range(0, len(tickers), max_securities):
+                requests.append(HistoricalRequest(tickers[i:i + max_securities], fields,
+                                                  start.strftime('%Y%m%d'), end.strftime('%Y%m%d'), name=group))
+        return requests
+
+    # Stage 3: fetch, normalize, store
+
+    def engine(self, session_pool, start_date, end_date):
+        period = f"{pd.Timestamp(start_date).strftime('%Y%m%d')}_{pd.Timestamp(end_date).strftime('%Y%m%d')}"
+        return RequestEngine(session_pool, os.path.join(self.data_dir, 'task_journal', f'refresh_{period}'),
+                             workers=self.workers)
+
+    def save_master(self, master):
+        """Merge the discovered securities into the stored master (atomically)"""
+        stored = self.load_master()
+        if not stored.empty:
+            master = dedupe_securities(pd.concat([stored, master], ignore_index=True))
+        tmp_file = f'{self.master_file}.tmp'
+        master.to_parquet(tmp_file, index=False)
+        os.replace(tmp_file, self.master_file)
+        return master
+
+    def run(self, start_date, end_date, extra_securities=()):
+        """
+        Full refresh for a date range as one planned batch
+
+        Returns a summary dict: securities, requests, rows, store statistics,
+        retries, failed requests and securities Bloomberg rejected.
+        """
+        from src.data_collection.session_pool import BloombergSessionPool
+
+        master = self.discover(start_date, end_date, extra_securities)
+        requests = self.plan(master)
+        print(f"📋 Discovered {len(master)} securities "
+              f"({', '.join(f'{role}: {count}' for role, count in master['role'].value_counts().items())})")
+        print(f"📋 Planned {len(requests)} requests")
+
+        session_pool = self.session_pool or BloombergSessionPool(size=self.workers)
+        try:
+            engine = self.engine(session_pool, start_date, end_date)
+            df, task_summary = engine.run(requests)
+        finally:
+            if session_pool is not self.session_pool:
+                session_pool.close()
+
+        summary = {
+            'securities': len(master),
+            'requests': len(requests),
+            'rows': len(df),
+            'retries': task_summary['retries'],
+            'failed_requests': task_summary['failed'],
+            'security_errors': task_summary['security_errors'],
+            'store': None
+        }
+        if not df.empty:
+            summary['store'] = self.store.ingest(
+                df, f"vix_refresh_{pd.Timestamp(start_date):%Y%m%d}_{pd.Timestamp(end_date):%Y%m%d}",
+                fields=[field for fields in FIELD_GROUPS.values() for field in fields.values()])
+        self.save_master(master)
+
+        if not task_summary['failed']:
+            engine.clear()
+        return summary
+
+    # Reads shared by downstream consumers
+
+    def load_master(self):
+        if not os.path.exists(self.master_file):
+            return pd.DataFrame(columns=MASTER_COLUMNS)
+        return pd.read_parquet(self.master_file)
+
+    def _load_role(self, roles, field_map, start_date=None, end_date=None):
+        master = self.load_master()
+        securities = master[master['role'].isin(roles)]
+        if securities.empty:
+            return pd.DataFrame(columns=['date', 'ticker'] + list(field_map))
+        wide = self.store.load_wide(field_map, tickers=list(securities['ticker']),
+                                    start_date=start_date, end_date=end_date)
+        metadata = securities[['ticker', 'role', 'expiry_date', 'strike', 'option_type']]
+        return wide.merge(metadata, on='ticker', how='left')
+
+    def load_spot(self, start_date=None, end_date=None):
+        """VIX spot: date, ticker, vix_level, vix_open, vix_high, vix_low"""
+        return self._load_role(['spot'], SPOT_FIELDS, start_date, end_date)[['date', 'ticker'] + list(SPOT_FIELDS)]
+
+    def load_futures(self, generic=True, start_date=None, end_date=None):
+        """
+        Futures in the fetchers' layout
+
+        generic=True returns the rolling UX1-UX9 strip (the input of
+        term_structure_frame); False returns the monthly contracts with their
+        expiry_date.
+        """
+        df = self._load_role(['generic_future' if generic else 'future'], FUTURES_FIELDS, start_date, end_date)
+        return df.drop(columns=['strike', 'option_type'])
+
+    def load_options(self, start_date=None, end_date=None):
+        """Option history with expiry_date, strike and option_type (input of select_target_delta_options)"""
+        return self._load_role(['option'], OPTIONS_FIELDS, start_date, end_date)
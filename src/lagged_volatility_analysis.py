@@ -3,10 +3,14 @@
 
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import plotly.graph_objects as go
 from datetime import datetime, timedelta
 
+from src.analysis.forward_alignment import FORWARD_COMPARISON_PAIRS, align_forward, split_by_tenor, to_comparison_frame
+from src.analysis.rendering import DEFAULT_MAX_POINTS, build_lagged_comparison_figure
+
+# 1M, 3M and 6M implied against 30D, 90D and 180D future realized
+LAGGED_COMPARISON_PAIRS = FORWARD_COMPARISON_PAIRS[:3]
+
 def create_lagged_volatility_comparison(df):
     """
     Create proper forward-looking volatility comparison
@@ -19,44 +23,37 @@ def create_lagged_volatility_comparison(df):
     print("🔄 CREATING PROPERLY LAGGED VOLATILITY COMPARISON")
     print("=" * 60)
     
-    # Create forward-looking realized volatility
-    comparisons = []
-    
-    # 1M implied vs 30D future realized
-    if 'implied_vol_1m_atm' in spx_implied.columns and 'realized_vol_30d' in spx_realized.columns:
-        print("📊 Processing 1M Implied vs 30D Future Realized...")
-        comp_1m = create_forward_comparison(
-            spx_implied, spx_realized, 
-            'implied_vol_1m_atm', 'realized_vol_30d', 
-            30, '1M Implied vs 30D Future Realized'
-        )
-        if len(comp_1m) > 0:
-            comparisons.append(comp_1m)
-    
-    # 3M implied vs 90D future realized
-    if 'implied_vol_3m_atm' in spx_implied.columns and 'realized_vol_90d' in spx_realized.columns:
-        print("📊 Processing 3M Implied vs 90D Future Realized...")
-        comp_3m = create_forward_comparison(
-            spx_implied, spx_realized,
-            'implied_vol_3m_atm', 'realized_vol_90d',
-            90, '3M Implied vs 90D Future Realized'
-        )
-        if len(comp_3m) > 0:
-            comparisons.append(comp_3m)
+    # 1M/3M/6M implied vs 30D/90D/180D future realized, aligned in one pass
+    try:
+        aligned = align_forward(spx_implied, spx_realized, pairs=LAGGED_COMPARISON_PAIRS)
+    except Exception as e:
+        print(f"   ❌ Error aligning forward realized volatility: {e}")
+        return []
     
-    # 6M implied vs 180D future realized  
-    if 'implied_vol_6m_atm' in spx_implied.columns and 'realized_vol_180d' in spx_realized.columns:
-        print("📊 Processing 6M Implied vs 180D Future Realized...")
-        comp_6m = create_forward_comparison(
-            spx_implied, spx_realized,
-            'implied_vol_6m_atm', 'realized_vol_180d', 
-            180, '6M Implied vs 180D Future Realized'
-        )
-        if len(comp_6m) > 0:
-            comparisons.append(comp_6m)
+    comparisons = []
+    for comparison in split_by_tenor(aligned).values():
+        implied_col, realized_col = comparison.columns[2], comparison.columns[3]
+        comparison_name = (f"{implied_col.split('_')[2].upper()} Implied vs "
+                           f"{realized_col.split('_')[2].upper()} Future Realized")
+        print(f"📊 Processing {comparison_name}...")
+        comparison = _label_comparison(comparison, comparison_name)
+        if len(comparison) > 0:
+            comparisons.append(comparison)
     
     return comparisons
 
+def _label_comparison(comparison, comparison_name):
+    """Tag a comparison with its name and print its summary"""
+    if len(comparison) > 0:
+        comparison['comparison_type'] = comparison_name
+        
+        print(f"   ✅ {comparison_name}: {len(comparison):,} observations")
+        print(f"      Date range: {comparison['date'].min().strftime('%Y-%m-%d')} to {comparison['date'].max().strftime('%Y-%m-%d')}")
+        print(f"      Avg vol spread: {comparison['vol_spread'].mean():.2f}%")
+        print(f"      Implied premium: {(comparison['vol_spread'] > 0).mean()*100:.1f}% of time")
+    
+    return comparison
+
 def create_forward_comparison(implied_df, realized_df, implied_col, realized_col, lag_days, comparison_name):
     """
     Create forward-looking comparison by lagging realized volatility
@@ -66,41 +63,14 @@ def create_forward_comparison(implied_df, realized_df, implied_col, realized_col
     - realized_df: DataFrame with realized volatility data  
     - implied_col: Column name for implied volatility
     - realized_col: Column name for realized volatility
-    - lag_days: Number of days to lag realized vol (to make it "future")
+    - lag_days: Number of trading sessions to lag realized vol (to make it "future")
     - comparison_name: Name for this comparison
     """
     
     try:
-        # Get clean datasets
-        implied_clean = implied_df[['date', implied_col]].dropna()
-        realized_clean = realized_df[['date', realized_col]].dropna()
-        
-        # Create future realized volatility by shifting dates backwards
-        # This makes realized vol "future" relative to implied vol
-        realized_future = realized_clean.copy()
-        realized_future['date'] = realized_future['date'] - pd.Timedelta(days=lag_days)
-        
-        # Merge: implied vol on date X with realized vol that STARTS on date X
-        comparison = pd.merge(
-            implied_clean, 
-            realized_future, 
-            on='date', 
-            how='inner',
-            suffixes=('_implied', '_future_realized')
-        )
-        
-        if len(comparison) > 0:
-            # Calculate metrics
-            comparison['vol_spread'] = comparison[implied_col] - comparison[realized_col]
-            comparison['vol_ratio'] = comparison[implied_col] / comparison[realized_col]
-            comparison['comparison_type'] = comparison_name
-            
-            print(f"   ✅ {comparison_name}: {len(comparison):,} observations")
-            print(f"      Date range: {comparison['date'].min().strftime('%Y-%m-%d')} to {comparison['date'].max().strftime('%Y-%m-%d')}")
-            print(f"      Avg vol spread: {comparison['vol_spread'].mean():.2f}%")
-            print(f"      Implied premium: {(comparison['vol_spread'] > 0).mean()*100:.1f}% of time")
-        
-        return comparison
+        # Shift by trading sessions and match realized vol with merge_asof, per ticker
+        aligned = align_forward(implied_df, realized_df, pairs=[(implied_col, realized_col, lag_days)])
+        return _label_comparison(to_comparison_frame(aligned, implied_col, realized_col), comparison_name)
         
     except Exception as e:
         print(f"   ❌ Error creating {comparison_name}: {e}")
@@ -155,80 +125,30 @@ def analyze_volatility_premium(comparison_df):
         for regime, stats in regime_analysis.iterrows():
             print(f"   {regime}: {stats['mean']:.2f}% ± {stats['std']:.2f}% ({int(stats['count'])} obs)")
 
-def plot_lagged_comparison(comparison_df):
+def plot_lagged_comparison(comparison_df, show=True, max_points=DEFAULT_MAX_POINTS):
     """
     Plot the properly lagged volatility comparison
+    
+    Returns the figure; it is only opened in a browser when show=True.
     """
     if len(comparison_df) == 0:
         print("No data to plot")
-        return
+        return None
     
-    # Get column names dynamically
-    implied_col = [col for col in comparison_df.columns if 'implied_vol' in col][0]
-    realized_col = [col for col in comparison_df.columns if 'realized_vol' in col][0]
+    fig = build_lagged_comparison_figure(comparison_df, max_points=max_points)
     
-    fig = go.Figure()
+    if show:
+        fig.show()
     
-    # Implied volatility
-    fig.add_trace(
-        go.Scatter(
-            x=comparison_df['date'],
-            y=comparison_df[implied_col],
-            mode='lines',
-            name='Implied Volatility (Forward-Looking)',
-            line=dict(color='#ff7f0e', width=2),
-            hovertemplate='<b>Implied Vol</b><br>Date: %{x}<br>Vol: %{y:.2f}%<extra></extra>'
-        )
-    )
-    
-    # Future realized volatility  
-    fig.add_trace(
-        go.Scatter(
-            x=comparison_df['date'],
-            y=comparison_df[realized_col],
-            mode='lines',
-            name='Future Realized Volatility',
-            line=dict(color='#1f77b4', width=2),
-            hovertemplate='<b>Future Realized Vol</b><br>Date: %{x}<br>Vol: %{y:.2f}%<extra></extra>'
-        )
-    )
-    
-    # Volatility spread
-    fig.add_trace(
-        go.Scatter(
-            x=comparison_df['date'],
-            y=comparison_df['vol_spread'],
-            mode='lines',
-            name='Vol Risk Premium (Implied - Future Realized)',
-            line=dict(color='#2ca02c', width=2, dash='dash'),
-            yaxis='y2',
-            hovertemplate='<b>Vol Risk Premium</b><br>Date: %{x}<br>Premium: %{y:.2f}%<extra></extra>'
-        )
-    )
-    
-    # Add zero line
-    fig.add_hline(y=0, line_dash="dot", line_color="gray", opacity=0.5)
-    
-    fig.update_layout(
-        title=f'Properly Lagged Volatility Analysis: {comparison_df["comparison_type"].iloc[0]}',
-        xaxis_title='Date',
-        yaxis_title='Volatility (%)',
-        yaxis2=dict(
-            title='Volatility Risk Premium (%)',
-            overlaying='y',
-            side='right'
-        ),
-        height=600,
-        template='plotly_white',
-        legend=dict(x=0.02, y=0.98)
-    )
-    
-    fig.show()
+    return fig
 
 # Example usage function
-def run_lagged_analysis(df):
+def run_lagged_analysis(df, show_plots=False, report=None):
     """
     Run the complete lagged volatility analysis
+    
+    No figures are built by default; pass show_plots=True (interactive and
+    notebook use) to show the charts, or a FigureReport to collect them.
     """
     print("🚀 RUNNING PROPERLY LAGGED VOLATILITY ANALYSIS")
     print("=" * 60)
@@ -257,7 +177,10 @@ def run_lagged_analysis(df):
         analyze_volatility_premium(comp_df)
         
         # Plot
-        plot_lagged_comparison(comp_df)
+        if report is not None:
+            report.add(plot_lagged_comparison(comp_df, show=False), comp_df['comparison_type'].iloc[0])
+        elif show_plots:
+            plot_lagged_comparison(comp_df)
     
     return comparisons
 
@@ -270,7 +193,7 @@ print("""
    df['date'] = pd.to_datetime(df['date'])
 
 2. Run the analysis:
-   comparisons = run_lagged_analysis(df)
+   comparisons = run_lagged_analysis(df, show_plots=True)
 
 3. The analysis will:
    ✅ Compare implied vol with FUTURE realized vol
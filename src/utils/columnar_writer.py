@@ -0,0 +1,169 @@
+"""
+Columnar Dataset Writer
+Single-write Parquet storage for collected volatility datasets with an atomically
+published "latest" manifest and on-demand CSV export. Readers that still open
+the legacy <dataset>_latest.parquet/.csv paths can opt in to having those
+copies refreshed on every publish.
+"""
+
+import os
+import json
+import shutil
+import time
+from datetime import datetime
+
+import pandas as pd
+
+from src.utils.instrumentation import METRICS
+
+# ~10 years of daily observations for one ticker/data_type, so a ticker scan
+# touches as few row groups as possible once the frame is sorted by ticker
+DEFAULT_ROW_GROUP_SIZE = 2520
+DEFAULT_COMPRESSION = 'zstd'
+SORT_COLUMNS = ['ticker', 'data_type', 'date']
+
+
+class ColumnarDatasetWriter:
+    """
+    Write a dataset once as Parquet and publish it as the latest version
+
+    Parameters:
+    - data_dir: Directory holding the dataset files
+    - dataset_name: File prefix, e.g. 'ten_year_volatility'
+    - row_group_size: Rows per Parquet row group
+    - compression: Parquet compression codec
+    - legacy_latest: Also refresh <dataset>_latest.parquet and _latest.csv on
+      every publish, for readers that open those paths directly
+    """
+
+    def __init__(self, data_dir, dataset_name, row_group_size=DEFAULT_ROW_GROUP_SIZE,
+                 compression=DEFAULT_COMPRESSION, legacy_latest=False):
+        self.data_dir = data_dir
+        self.dataset_name = dataset_name
+        self.row_group_size = row_group_size
+        self.compression = compression
+        self.legacy_latest = legacy_latest
+        self.manifest_file = os.path.join(data_dir, f'{dataset_name}_latest.json')
+        self.latest_parquet_file = os.path.join(data_dir, f'{dataset_name}_latest.parquet')
+        self.latest_csv_file = os.path.join(data_dir, f'{dataset_name}_latest.csv')
+
+        os.makedirs(self.data_dir, exist_ok=True)
+
+    def _sort_for_scans(self, df):
+        """Order rows so each ticker occupies contiguous row groups"""
+        sort_cols = [col for col in SORT_COLUMNS if col in df.columns]
+        if not sort_cols:
+            return df
+        return df.sort_values(sort_cols, kind='stable').reset_index(drop=True)
+
+    def write(self, df, tag=None, publish=True):
+        """
+        Write the frame to a single Parquet file and optionally publish it as latest
+
+        Returns the path of the Parquet file.
+        """
+        if tag is None:
+            tag = datetime.now().strftime('%Y%m%d_%H%M%S')
+
+        parquet_file = os.path.join(self.data_dir, f'{self.dataset_name}_{tag}.parquet')
+        tmp_file = f'{parquet_file}.tmp'
+
+        started = time.perf_counter()
+        df = self._sort_for_scans(df)
+        df.to_parquet(
+            tmp_file,
+            index=False,
+            compression=self.compression,
+            row_group_size=self.row_group_size
+        )
+        os.replace(tmp_file, parquet_file)
+        METRICS.record_write('columnar', parquet_file, len(df), time.perf_counter() - started)
+
+        if publish:
+            self.publish_latest(parquet_file, df)
+
+        return parquet_file
+
+    def _write_legacy_latest(self, parquet_file, df):
+        """Refresh the fixed-path latest copies (atomically, like the manifest)"""
+        started = time.perf_counter()
+        tmp_file = f'{self.latest_parquet_file}.tmp'
+        shutil.copyfile(parquet_file, tmp_file)
+        os.replace(tmp_file, self.latest_parquet_file)
+
+        tmp_file = f'{self.latest_csv_file}.tmp'
+        df.to_csv(tmp_file, index=False)
+        os.replace(tmp_file, self.latest_csv_file)
+        METRICS.record_write('legacy_latest', self.latest_csv_file, len(df), time.perf_counter() - started)
+
+    def publish_latest(self, parquet_file, df=None):
+        """Point the latest manifest at a written Parquet file"""
+        manifest = {
+            'dataset': self.dataset_name,
+            'file': os.path.basename(parquet_file),
+            'published': datetime.now().isoformat(),
+            'compression': self.compression,
+            'row_group_size': self.row_group_size
+        }
+        if df is not None:
+            manifest['rows'] = len(df)
+            manifest['columns'] = list(df.columns)
+
+        tmp_file = f'{self.manifest_file}.tmp'
+        with open(tmp_file, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_file, self.manifest_file)
+
+        if self.legacy_latest:
+            self._write_legacy_latest(parquet_file, df if df is not None else pd.read_parquet(parquet_file))
+
+        return self.manifest_file
+
+    def load_manifest(self):
+        """Return the latest manifest, or None if nothing has been published"""
+        if not os.path.exists(self.manifest_file):
+            return None
+        with open(self.manifest_file, 'r') as f:
+            return json.load(f)
+
+    def latest_path(self):
+        """Path of the Parquet file the manifest currently points at"""
+        manifest = self.load_manifest()
+        if manifest is None:
+            return None
+        return os.path.join(self.data_dir, manifest['file'])
+
+    def load_latest(self, columns=None, tickers=None):
+        """
+        Load the latest published dataset
+
+        Parameters:
+        - columns: Optional subset of columns to read
+        - tickers: Optional list of tickers; skips row groups for other tickers
+        """
+        parquet_file = self.latest_path()
+        if parquet_file is None:
+            return pd.DataFrame()
+
+        filters = [('ticker', 'in', list(tickers))] if tickers else None
+        return pd.read_parquet(parquet_file, columns=columns, filters=filters)
+
+    def export_csv(self, csv_file=None, parquet_file=None):
+        """
+        Export a Parquet file (latest by default) to CSV on demand
+
+        Returns the CSV path, or None if there is nothing to export.
+        """
+        if parquet_file is None:
+            parquet_file = self.latest_path()
+        if parquet_file is None:
+            return None
+
+        if csv_file is None:
+            csv_file = self.latest_csv_file
+
+        tmp_file = f'{csv_file}.tmp'
+        pd.read_parquet(parquet_file).to_csv(tmp_file, index=False)
+        os.replace(tmp_file, csv_file)
+
+        return csv_file
@@ -0,0 +1,390 @@
+"""
+Deduplicating Volatility Store
+Content-addressed storage for (ticker, date, field) observations collected by the
+overlapping historical, ten-year and strategy pulls. Observations are grouped into
+blocks per (ticker, field, year); each block is hashed by key and values and stored
+exactly once, and restated Bloomberg values are recorded in a revision log.
+"""
+
+import os
+import time
+import hashlib
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from config.bloomberg_config import VOLATILITY_FIELDS
+from src.utils.instrumentation import METRICS
+
+# Clean column names used across the collectors, mapped to the Bloomberg field
+# they hold. Values are stored under the Bloomberg field so that the same
+# observation pulled under different clean names is still deduplicated.
+FIELD_ALIASES = {
+    **VOLATILITY_FIELDS,
+    'realized_vol_180d': 'VOLATILITY_180D',
+    'realized_vol_252d': 'VOLATILITY_260D',
+    'implied_vol_1m_50delta': '1MTH_IMPVOL_50.0DELTA_DF',
+    'implied_vol_3m_50delta': '3MTH_IMPVOL_50.0DELTA_DF',
+    'implied_vol_6m_50delta': '6MTH_IMPVOL_50.0DELTA_DF',
+    'implied_vol_12m_50delta': '12MTH_IMPVOL_50.0DELTA_DF'
+}
+
+# Columns ingested by default: the clean names above and their Bloomberg fields.
+# Anything else in a collector frame (weights, market caps, prices) is skipped
+# unless the caller passes it explicitly as fields=.
+VOLATILITY_COLUMNS = frozenset(FIELD_ALIASES) | frozenset(FIELD_ALIASES.values())
+
+KEY_COLUMNS = ['ticker', 'field', 'period']
+INDEX_DTYPES = {'ticker': 'object', 'field': 'object', 'period': 'int64', 'block_hash': 'object',
+                'pack': 'object', 'rows': 'int64', 'updated': 'object'}
+BLOCK_DTYPES = {'ticker': 'object', 'field': 'object', 'date': 'datetime64[ns]', 'value': 'float64'}
+NON_VALUE_COLUMNS = {'date', 'ticker', 'data_type', 'timestamp', 'collection_timestamp'}
+
+# A daily pull rewrites every current-year block, so superseded rows pile up;
+# ingest compacts once they outnumber the live rows or the packs pile up
+COMPACT_GARBAGE_RATIO = 1.0
+COMPACT_MAX_PACKS = 32
+
+
+def _empty_frame(dtypes):
+    return pd.DataFrame({col: pd.Series(dtype=dtype) for col, dtype in dtypes.items()})
+
+
+def _block_hash(ticker, field, period, dates, values):
+    """Hash a block by its key and its (date, value) content"""
+    digest = hashlib.sha256(f'{ticker}|{field}|{period}'.encode())
+    digest.update(np.ascontiguousarray(dates, dtype='int64').tobytes())
+    digest.update(np.ascontiguousarray(values, dtype='float64').tobytes())
+    return digest.hexdigest()
+
+
+class DedupeVolatilityStore:
+    """
+    Content-addressed store of volatility observations
+
+    Layout inside store_dir:
+    - packs/pack_<timestamp>.parquet: block rows (block_hash, date, value) written per ingest
+    - index.parquet: current block per (ticker, field, period) and the pack holding it
+    - revisions.parquet: log of restated values (old vs new) with source and detection time
+    """
+
+    def __init__(self, store_dir):
+        self.store_dir = store_dir
+        self.pack_dir = os.path.join(store_dir, 'packs')
+        self.index_file = os.path.join(store_dir, 'index.parquet')
+        self.revisions_file = os.path.join(store_dir, 'revisions.parquet')
+        os.makedirs(self.pack_dir, exist_ok=True)
+
+    # ------------------------------------------------------------------
+    # Index and pack I/O
+    # ------------------------------------------------------------------
+    def load_index(self):
+        """Current block index (one row per ticker/field/period)"""
+        if not os.path.exists(self.index_file):
+            return _empty_frame(INDEX_DTYPES)
+        return pd.read_parquet(self.index_file)
+
+    def _write_atomic(self, df, path):
+        tmp_file = f'{path}.tmp'
+        started = time.perf_counter()
+        df.to_parquet(tmp_file, index=False)
+        os.replace(tmp_file, path)
+        METRICS.record_write('dedupe_store', path, len(df), time.perf_counter() - started)
+
+    def _read_blocks(self, index_rows):
+        """Read the (date, value) rows for the given index entries, keyed by ticker/field"""
+        if len(index_rows) == 0:
+            return _empty_frame(BLOCK_DTYPES)
+
+        frames = []
+        for pack, pack_rows in index_rows.groupby('pack'):
+            hashes = pack_rows['block_hash'].tolist()
+            rows = pd.read_parquet(
+                os.path.join(self.pack_dir, pack),
+                filters=[('block_hash', 'in', hashes)]
+            )
+            frames.append(rows.merge(pack_rows[['block_hash', 'ticker', 'field']], on='block_hash'))
+
+        blocks = pd.concat(frames, ignore_index=True)
+        return blocks[['ticker', 'field', 'date', 'value']]
+
+    # ------------------------------------------------------------------
+    # Ingest
+    # ------------------------------------------------------------------
+    def value_columns(self, df, date_column='date', fields=None):
+        """
+        Numeric columns of a frame that hold storable fields
+
+        Only VOLATILITY_COLUMNS qualify, plus any names given in fields (e.g.
+        the Bloomberg mnemonics of another collector).
+        """
+        allowed = VOLATILITY_COLUMNS | frozenset(fields or ())
+        return [
+            col for col in df.columns
+            if col in allowed and col not in NON_VALUE_COLUMNS and col != date_column
+            and pd.api.types.is_numeric_dtype(df[col])
+        ]
+
+    def to_long(self, df, date_column='date', fields=None):
+        """Melt a wide collector frame into (ticker, field, date, value) observations"""
+        value_columns = self.value_columns(df, date_column, fields)
+        long_df = df[['ticker', date_column] + value_columns].melt(
+            id_vars=['ticker', date_column], var_name='field', value_name='value'
+        ).dropna(subset=['value'])
+
+        long_df = long_df.rename(columns={date_column: 'date'})
+        long_df['date'] = pd.to_datetime(long_df['date']).dt.normalize()
+        long_df['field'] = long_df['field'].map(lambda name: FIELD_ALIASES.get(name, name))
+        long_df['value'] = long_df['value'].astype('float64')
+
+        # Within one pull the last value for an observation wins
+        return long_df.drop_duplicates(['ticker', 'field', 'date'], keep='last')
+
+    def ingest(self, df, source, date_column='date', fields=None, compact=True):
+        """
+        Add a collected frame to the store
+
+        Parameters:
+        - df: Wide frame with 'ticker', a date column and numeric volatility columns
+        - source: Label for the pull (file name, job name) recorded with revisions
+        - date_column: Column holding the observation date
+        - fields: Extra column names to store besides VOLATILITY_COLUMNS
+        - compact: Compact afterwards if needs_compaction() (off for bulk loads
+          that compact once at the end)
+
+        Returns a dict of ingest statistics.
+        """
+        new_obs = self.to_long(df, date_column=date_column, fields=fields)
+        stats = {'observations': len(new_obs), 'blocks_unchanged': 0,
+                 'blocks_written': 0, 'revisions': 0, 'compacted': False}
+        if len(new_obs) == 0:
+            return stats
+
+        new_obs['period'] = new_obs['date'].dt.year
+        index = self.load_index()
+
+        # Existing content of every block this pull touches
+        touched = new_obs[KEY_COLUMNS].drop_duplicates()
+        touched_index = index.merge(touched, on=KEY_COLUMNS, how='inner')
+        existing = self._read_blocks(touched_index)
+
+        # Restatements: same observation, different value
+        overlap = new_obs.merge(existing, on=['ticker', 'field', 'date'],
+                                how='inner', suffixes=('', '_old'))
+        changed = overlap[~np.isclose(overlap['value'], overlap['value_old'], rtol=1e-12, atol=0.0)]
+        if len(changed) > 0:
+            revisions = pd.DataFrame({
+                'ticker': changed['ticker'].values,
+                'field': changed['field'].values,
+                'date': changed['date'].values,
+                'old_value': changed['value_old'].values,
+                'new_value': changed['value'].values,
+                'source': source,
+                'detected': datetime.now().isoformat()
+            })
+            if os.path.exists(self.revisions_file):
+                revisions = pd.concat([pd.read_parquet(self.revisions_file), revisions], ignore_index=True)
+            self._write_atomic(revisions, self.revisions_file)
+            stats['revisions'] = len(changed)
+
+        # Merge: new values override existing ones, existing history is kept
+        merged = pd.concat([existing, new_obs[['ticker', 'field', 'date', 'value']]], ignore_index=True)
+        merged = merged.drop_duplicates(['ticker', 'field', 'date'], keep='last')
+        merged['period'] = merged['date'].dt.year
+        merged = merged.sort_values(KEY_COLUMNS + ['date'], kind='stable')
+
+        current_hashes = dict(zip(map(tuple, index[KEY_COLUMNS].values), index['block_hash']))
+        known_hashes = dict(zip(index['block_hash'], index['pack']))
+
+        pack_name = f"pack_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.parquet"
+        new_rows = []
+        index_updates = []
+        updated = datetime.now().isoformat()
+
+        for key, block in merged.groupby(KEY_COLUMNS, sort=False):
+            dates = block['date'].values.astype('datetime64[ns]').view('int64')
+            values = block['value'].values
+            block_hash = _block_hash(*key, dates, values)
+
+            if current_hashes.get(key) == block_hash:
+                stats['blocks_unchanged'] += 1
+                continue
+
+            pack = known_hashes.get(block_hash)
+            if pack is None:
+                # Content not stored anywhere yet: write one physical copy
+                new_rows.append(pd.DataFrame({
+                    'block_hash': block_hash,
+                    'date': block['date'].values,
+                    'value': values
+                }))
+                pack = pack_name
+                known_hashes[block_hash] = pack
+                stats['blocks_written'] += 1
+
+            index_updates.append({
+                'ticker': key[0], 'field': key[1], 'period': key[2],
+                'block_hash': block_hash, 'pack': pack,
+                'rows': len(block), 'updated': updated
+            })
+
+        if new_rows:
+            self._write_atomic(pd.concat(new_rows, ignore_index=True),
+                               os.path.join(self.pack_dir, pack_name))
+
+        if index_updates:
+            updates = pd.DataFrame(index_updates)
+            index = pd.concat([index, updates], ignore_index=True)
+            index = index.drop_duplicates(KEY_COLUMNS, keep='last')
+            self._write_atomic(index.reset_index(drop=True), self.index_file)
+
+        if compact and new_rows and self.needs_compaction(index):
+            self.compact()
+            stats['compacted'] = True
+
+        return stats
+
+    def ingest_file(self, path, source=None, date_column='date', fields=None):
+        """Ingest a saved CSV or Parquet collector file"""
+        if path.endswith('.parquet'):
+            df = pd.read_parquet(path)
+        else:
+            df = pd.read_csv(path)
+        return self.ingest(df, source or os.path.basename(path), date_column=date_column, fields=fields)
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+    def _pack_files(self):
+        return sorted(name for name in os.listdir(self.pack_dir) if name.endswith('.parquet'))
+
+    def needs_compaction(self, index=None):
+        """
+        True once the packs hold more superseded block rows than
+        COMPACT_GARBAGE_RATIO x the live ones, or more than COMPACT_MAX_PACKS packs
+
+        Reads only the pack footers.
+        """
+        packs = self._pack_files()
+        if len(packs) > COMPACT_MAX_PACKS:
+            return True
+        if index is None:
+            index = self.load_index()
+        live = int(index.drop_duplicates('block_hash')['rows'].sum())
+        stored = sum(pq.read_metadata(os.path.join(self.pack_dir, name)).num_rows for name in packs)
+        return stored - live > COMPACT_GARBAGE_RATIO * live
+
+    def compact(self):
+        """
+        Rewrite the blocks the index references into one pack and delete the rest
+
+        Every ingest that changes a block adds a pack and leaves the superseded
+        block rows behind, so packs only grow until compacted (ingest does so
+        when needs_compaction() says the garbage is worth it). The new pack and
+        index are written before any old pack is removed; an interrupted
+        compaction leaves unreferenced packs that the next one deletes.
+
+        Returns a dict with packs_before, packs_removed and rows_kept.
+        """
+        index = self.load_index()
+        packs = self._pack_files()
+        stats = {'packs_before': len(packs), 'packs_removed': 0, 'rows_kept': 0}
+
+        if len(index) > 0:
+            frames = []
+            for pack, pack_rows in index.groupby('pack'):
+                frames.append(pd.read_parquet(
+                    os.path.join(self.pack_dir, pack),
+                    filters=[('block_hash', 'in', pack_rows['block_hash'].unique().tolist())]
+                ))
+            rows = pd.concat(frames, ignore_index=True).drop_duplicates(['block_hash', 'date'])
+            pack_name = f"pack_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.parquet"
+            self._write_atomic(rows.reset_index(drop=True), os.path.join(self.pack_dir, pack_name))
+            index = index.assign(pack=pack_name)
+            self._write_atomic(index, self.index_file)
+            stats['rows_kept'] = len(rows)
+            keep = {pack_name}
+        else:
+            keep = set()
+
+        for name in packs:
+            if name not in keep:
+                os.remove(os.path.join(self.pack_dir, name))
+                stats['packs_removed'] += 1
+        return stats
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+    def load(self, tickers=None, fields=None, start_date=None, end_date=None):
+        """
+        Load current observations as a long (ticker, field, date, value) frame
+
+        Fields may be given as Bloomberg mnemonics or clean column names.
+        """
+        index = self.load_index()
+        if tickers is not None:
+            index = index[index['ticker'].isin(tickers)]
+        if fields is not None:
+            index = index[index['field'].isin([FIELD_ALIASES.get(f, f) for f in fields])]
+        if start_date is not None:
+            index = index[index['period'] >= pd.Timestamp(start_date).year]
+        if end_date is not None:
+            index = index[index['period'] <= pd.Timestamp(end_date).year]
+
+        long_df = self._read_blocks(index)
+        if start_date is not None:
+            long_df = long_df[long_df['date'] >= pd.Timestamp(start_date)]
+        if end_date is not None:
+            long_df = long_df[long_df['date'] <= pd.Timestamp(end_date)]
+        return long_df.sort_values(['ticker', 'field', 'date']).reset_index(drop=True)
+
+    def load_wide(self, field_map, data_type=None, tickers=None, start_date=None, end_date=None):
+        """
+        Load observations in the collectors' wide layout
+
+        Parameters:
+        - field_map: {clean_name: bloomberg_field}, e.g. a fetcher's realized_fields
+        - data_type: Optional value for a 'data_type' column ('realized'/'implied')
+        """
+        long_df = self.load(tickers=tickers, fields=list(field_map.values()),
+                            start_date=start_date, end_date=end_date)
+        wide = long_df.pivot_table(index=['date', 'ticker'], columns='field',
+                                   values='value', aggfunc='last')
+        wide = wide.reindex(columns=list(field_map.values()))
+        wide.columns = list(field_map.keys())
+        wide = wide.reset_index()
+        if data_type is not None:
+            wide.insert(2, 'data_type', data_type)
+        return wide
+
+    def load_frame(self, field_maps, tickers=None, start_date=None, end_date=None):
+        """
+        Unified analysis frame across every pull folded into the store
+
+        Parameters:
+        - field_maps: {data_type: {clean_name: bloomberg_field}}, e.g.
+          {'realized': fetcher.realized_fields, 'implied': fetcher.implied_fields}
+
+        Returns one wide frame per data_type stacked in the collectors' layout
+        (date, ticker, data_type, clean columns), sorted by ticker and date.
+        """
+        frames = [
+            self.load_wide(field_map, data_type=data_type, tickers=tickers,
+                           start_date=start_date, end_date=end_date)
+            for data_type, field_map in field_maps.items()
+        ]
+        frame = pd.concat(frames, ignore_index=True)
+        return frame.sort_values(['ticker', 'data_type', 'date'], kind='stable').reset_index(drop=True)
+
+    def load_revisions(self, ticker=None):
+        """Revision log of restated values"""
+        if not os.path.exists(self.revisions_file):
+            return pd.DataFrame(columns=['ticker', 'field', 'date', 'old_value',
+                                         'new_value', 'source', 'detected'])
+        revisions = pd.read_parquet(self.revisions_file)
+        if ticker is not None:
+            revisions = revisions[revisions['ticker'] == ticker]
+        return revisions
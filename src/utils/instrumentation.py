@@ -0,0 +1,331 @@
+"""
+Collection Instrumentation
+Process-wide metrics for the Bloomberg hot path: per-request latency
+histograms, requests in flight, time blocked waiting for events, time spent
+parsing responses and sleeping (rate limiting, retry backoff), and rows and
+bytes written by the dataset writers. Metrics are exported as a Prometheus
+text file (node_exporter textfile collector format) and as JSON.
+
+Metrics:
+- bloomberg_request_seconds: sendRequest to final RESPONSE, by request type
+- bloomberg_requests_total: finished requests, by request type and outcome
+- bloomberg_requests_in_flight: requests sent and not yet answered
+- bloomberg_wait_seconds_total: time blocked in nextEvent()
+- bloomberg_response_messages_total: messages received in responses
+- parse_seconds / rows_parsed_total: response parsing, by source
+- sleep_seconds_total: deliberate sleeps, by reason
+- write_seconds / write_rows_total / write_bytes_total: dataset writes, by writer
+
+Usage:
+    session = InstrumentedSession(blpapi.Session(options))
+    with METRICS.timer('parse_seconds', source='vix_data'):
+        ...
+    METRICS.sleep(1, reason='rate_limit')
+    METRICS.export(os.path.join(project_root, 'data', 'metrics'), 'vix_data')
+"""
+
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from datetime import datetime
+
+# Seconds; spans a cached reference request up to a multi-year history pull
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+HELP = {
+    'bloomberg_request_seconds': 'Latency from sendRequest to the final RESPONSE event',
+    'bloomberg_requests_total': 'Bloomberg requests finished, by outcome',
+    'bloomberg_requests_in_flight': 'Bloomberg requests sent and not yet answered',
+    'bloomberg_wait_seconds_total': 'Time blocked in Session.nextEvent',
+    'bloomberg_response_messages_total': 'Messages received in PARTIAL_RESPONSE and RESPONSE events',
+    'parse_seconds': 'Time spent turning Bloomberg responses into rows',
+    'rows_parsed_total': 'Rows parsed from Bloomberg responses',
+    'sleep_seconds_total': 'Time spent in deliberate sleeps',
+    'write_seconds': 'Time spent writing dataset files',
+    'write_rows_total': 'Rows written to dataset files',
+    'write_bytes_total': 'Bytes written to dataset files',
+}
+
+
+def _label_key(labels):
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(key, extra=()):
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (
+        f'{name}="' + value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+        for name, value in pairs
+    )
+    return '{' + ','.join(escaped) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """Fixed-bucket histogram; counts are per bucket and made cumulative on export"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        running = 0
+        result = []
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            running += count
+            result.append((bound, running))
+        return result
+
+    def quantile(self, q):
+        """Upper bucket bound containing the q-quantile (None when empty)"""
+        if self.count == 0:
+            return None
+        target = q * self.count
+        for bound, running in self.cumulative():
+            if running >= target:
+                return bound
+        return float('inf')
+
+
+class MetricsRegistry:
+    """
+    Thread-safe counters, gauges and histograms keyed by name and labels
+
+    Parameters:
+    - buckets: Histogram bucket bounds in seconds
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._counters = {}
+            self._gauges = {}
+            self._histograms = {}
+
+    def inc(self, name, value=1, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set_gauge(self, name, value, **labels):
+        with self._lock:
+            self._gauges[(name, _label_key(labels))] = value
+
+    def add_gauge(self, name, delta, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._gauges[key] = self._gauges.get(key, 0) + delta
+
+    def observe(self, name, value, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self.buckets)
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """Observe the block's duration in a histogram, also when it raises"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def sleep(self, seconds, reason='rate_limit'):
+        """time.sleep that is counted in sleep_seconds_total"""
+        if seconds <= 0:
+            return
+        started = time.perf_counter()
+        try:
+            time.sleep(seconds)
+        finally:
+            self.inc('sleep_seconds_total', time.perf_counter() - started, reason=reason)
+
+    def record_write(self, writer, path, rows, seconds):
+        """Record one file written by a dataset writer"""
+        self.observe('write_seconds', seconds, writer=writer)
+        self.inc('write_rows_total', rows, writer=writer)
+        self.inc('write_bytes_total', os.path.getsize(path), writer=writer)
+
+    def snapshot(self):
+        """JSON-serialisable view of every metric"""
+        with self._lock:
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+            histograms = {key: (h.cumulative(), h.sum, h.count, h.quantile(0.5), h.quantile(0.99))
+                          for key, h in self._histograms.items()}
+
+        def series(items, render):
+            grouped = {}
+            for (name, key), value in sorted(items.items()):
+                grouped.setdefault(name, []).append({'labels': dict(key), **render(value)})
+            return grouped
+
+        return {
+            'exported_at': datetime.now().isoformat(timespec='seconds'),
+            'counters': series(counters, lambda value: {'value': value}),
+            'gauges': series(gauges, lambda value: {'value': value}),
+            'histograms': series(histograms, lambda h: {
+                'count': h[2], 'sum': h[1],
+                'p50_le': None if h[3] is None else _format_value(h[3]),
+                'p99_le': None if h[4] is None else _format_value(h[4]),
+                'buckets': {_format_value(bound): running for bound, running in h[0]},
+            }),
+        }
+
+    def to_prometheus(self):
+        """Prometheus text exposition of every metric"""
+        with self._lock:
+            counters = sorted(self._counters.items())
+            gauges = sorted(self._gauges.items())
+            histograms = sorted((key, (h.cumulative(), h.sum, h.count)) for key, h in self._histograms.items())
+
+        lines = []
+        declared = set()
+
+        def declare(name, kind):
+            if name not in declared:
+                declared.add(name)
+                lines.append(f'# HELP {name} {HELP.get(name, name)}')
+                lines.append(f'# TYPE {name} {kind}')
+
+        for (name, key), value in counters:
+            declare(name, 'counter')
+            lines.append(f'{name}{_format_labels(key)} {_format_value(value)}')
+        for (name, key), value in gauges:
+            declare(name, 'gauge')
+            lines.append(f'{name}{_format_labels(key)} {_format_value(value)}')
+        for (name, key), (buckets, total, count) in histograms:
+            declare(name, 'histogram')
+            for bound, running in buckets:
+                lines.append(f'{name}_bucket{_format_labels(key, [("le", _format_value(bound))])} {running}')
+            lines.append(f'{name}_sum{_format_labels(key)} {_format_value(float(total))}')
+            lines.append(f'{name}_count{_format_labels(key)} {count}')
+        return '\n'.join(lines) + '\n'
+
+    def export(self, directory, name):
+        """
+        Write <name>.prom and <name>.json into directory (atomically)
+
+        Returns (prom_file, json_file).
+        """
+        os.makedirs(directory, exist_ok=True)
+        prom_file = os.path.join(directory, f'{name}.prom')
+        json_file = os.path.join(directory, f'{name}.json')
+
+        for path, content in ((prom_file, self.to_prometheus()),
+                              (json_file, json.dumps(self.snapshot(), indent=2, default=str))):
+            tmp_file = f'{path}.tmp'
+            with open(tmp_file, 'w') as f:
+                f.write(content)
+            os.replace(tmp_file, path)
+        return prom_file, json_file
+
+
+METRICS = MetricsRegistry()
+
+
+class InstrumentedSession:
+    """
+    Bloomberg session wrapper timing every request
+
+    sendRequest() starts a request's clock and raises the in-flight gauge;
+    nextEvent() measures the time blocked and, on the RESPONSE event carrying
+    a request's correlation id, records its latency. A TIMEOUT event ends every
+    pending request as 'timeout', since callers abandon the request on it.
+    Everything else is delegated to the wrapped session.
+
+    Parameters:
+    - session: blpapi.Session (or a stand-in with the same interface)
+    - registry: MetricsRegistry to record into
+    """
+
+    def __init__(self, session, registry=None):
+        self._session = session
+        self._registry = registry or METRICS
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        return getattr(self._session, name)
+
+    @property
+    def session(self):
+        return self._session
+
+    def sendRequest(self, request, *args, **kwargs):
+        try:
+            request_type = str(request.asElement().name())
+        except Exception:
+            request_type = 'request'
+
+        started = time.perf_counter()
+        correlation_id = self._session.sendRequest(request, *args, **kwargs)
+        with self._lock:
+            self._pending[self._cid_key(correlation_id)] = (request_type, started)
+        self._registry.add_gauge('bloomberg_requests_in_flight', 1)
+        return correlation_id
+
+    @staticmethod
+    def _cid_key(correlation_id):
+        try:
+            return correlation_id.value()
+        except AttributeError:
+            return correlation_id
+
+    def _finish(self, keys, outcome):
+        now = time.perf_counter()
+        with self._lock:
+            finished = [self._pending.pop(key) for key in keys if key in self._pending]
+        for request_type, started in finished:
+            if outcome == 'response':
+                self._registry.observe('bloomberg_request_seconds', now - started, request=request_type)
+            self._registry.inc('bloomberg_requests_total', request=request_type, outcome=outcome)
+        if finished:
+            self._registry.add_gauge('bloomberg_requests_in_flight', -len(finished))
+
+    def nextEvent(self, *args, **kwargs):
+        started = time.perf_counter()
+        event = self._session.nextEvent(*args, **kwargs)
+        self._registry.inc('bloomberg_wait_seconds_total', time.perf_counter() - started)
+
+        import blpapi
+
+        event_type = event.eventType()
+        if event_type in (blpapi.Event.PARTIAL_RESPONSE, blpapi.Event.RESPONSE):
+            messages = list(event)
+            self._registry.inc('bloomberg_response_messages_total', len(messages))
+            if event_type == blpapi.Event.RESPONSE:
+                keys = [self._cid_key(cid) for msg in messages for cid in msg.correlationIds()]
+                with self._lock:
+                    if not keys and len(self._pending) == 1:
+                        keys = list(self._pending)
+                self._finish(keys, 'response')
+        elif event_type == blpapi.Event.TIMEOUT:
+            with self._lock:
+                keys = list(self._pending)
+            self._finish(keys, 'timeout')
+        return event
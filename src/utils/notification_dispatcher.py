@@ -0,0 +1,324 @@
+"""
+Notification Dispatcher
+Background queue for email/Slack alerts so collection never waits on mail or
+webhook latency. notify() only enqueues; a worker thread coalesces whatever
+arrives within a short window into one digest, rate-limits each sink, and
+keeps the SMTP connection and HTTP session open between sends.
+
+Sinks:
+- SMTPSink: one SMTP connection reused across digests, reopened when dropped
+- SlackSink: incoming webhook over a persistent requests.Session
+- LocalSink: appends to a JSON-lines file and keeps sent messages in memory,
+  for tests and dry runs
+
+Usage:
+    dispatcher = dispatcher_from_config(email_config, slack_config)
+    dispatcher.notify("Daily Collection Success", body)
+    ...
+    dispatcher.close()   # flushes pending notifications
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import smtplib
+import threading
+import time
+from datetime import datetime
+from email.message import EmailMessage
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_COALESCE_SECONDS = 30
+DEFAULT_MIN_INTERVAL_SECONDS = 60
+SMTP_IDLE_SECONDS = 240     # Servers commonly drop idle connections after ~5 minutes
+
+_STOP = object()
+_FLUSH = object()
+
+_SHARED = {}
+_SHARED_LOCK = threading.Lock()
+
+
+class Notification:
+    def __init__(self, subject, body, level='info'):
+        self.subject = subject
+        self.body = body
+        self.level = level
+        self.created_at = datetime.now()
+
+
+def build_digest(notifications):
+    """Subject and body for one or more notifications sent together"""
+    if len(notifications) == 1:
+        return notifications[0].subject, notifications[0].body
+
+    errors = sum(n.level == 'error' for n in notifications)
+    subject = f"{len(notifications)} notifications" + (f" ({errors} error{'s' if errors > 1 else ''})" if errors else '')
+    sections = [
+        f"[{n.created_at.strftime('%H:%M:%S')}] {n.subject}\n{n.body.strip()}" for n in notifications
+    ]
+    return subject, f"\n\n{'-' * 40}\n\n".join(sections)
+
+
+class SMTPSink:
+    """
+    Email sink reusing one SMTP connection
+
+    Parameters follow email_config.json: smtp_server, smtp_port, sender_email,
+    sender_password, recipient_emails; subject_prefix is prepended to subjects.
+    """
+
+    name = 'email'
+
+    def __init__(self, smtp_server, smtp_port, sender_email, sender_password, recipient_emails,
+                 subject_prefix='', timeout=30, **_):
+        self.smtp_server = smtp_server
+        self.smtp_port = smtp_port
+        self.sender_email = sender_email
+        self.sender_password = sender_password
+        self.recipient_emails = list(recipient_emails)
+        self.subject_prefix = subject_prefix
+        self.timeout = timeout
+        self._server = None
+        self._last_used = 0.0
+
+    def _connection(self):
+        if self._server is not None and time.monotonic() - self._last_used > SMTP_IDLE_SECONDS:
+            self.close()
+        if self._server is None:
+            server = smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=self.timeout)
+            server.starttls()
+            server.login(self.sender_email, self.sender_password)
+            self._server = server
+        return self._server
+
+    def send(self, subject, body):
+        msg = EmailMessage()
+        msg['From'] = self.sender_email
+        msg['To'] = ', '.join(self.recipient_emails)
+        msg['Subject'] = f"{self.subject_prefix}{subject}"
+        msg.set_content(body)
+
+        try:
+            self._connection().send_message(msg)
+        except smtplib.SMTPServerDisconnected:
+            # Server closed the kept-alive connection; reconnect once
+            self._server = None
+            self._connection().send_message(msg)
+        self._last_used = time.monotonic()
+
+    def close(self):
+        if self._server is not None:
+            try:
+                self._server.quit()
+            except Exception:
+                pass
+            self._server = None
+
+
+class SlackSink:
+    """Slack incoming-webhook sink over a persistent HTTP session"""
+
+    name = 'slack'
+
+    def __init__(self, webhook_url, channel=None, username='VIX Data Bot', icon_emoji=None, text_prefix='',
+                 timeout=10, **_):
+        import requests
+
+        self.webhook_url = webhook_url
+        self.channel = channel
+        self.username = username
+        self.icon_emoji = icon_emoji
+        self.text_prefix = text_prefix
+        self.timeout = timeout
+        self._http = requests.Session()
+
+    def send(self, subject, body):
+        payload = {'text': f"{self.text_prefix}{body}", 'username': self.username}
+        if self.channel:
+            payload['channel'] = self.channel
+        if self.icon_emoji:
+            payload['icon_emoji'] = self.icon_emoji
+
+        response = self._http.post(self.webhook_url, json=payload, timeout=self.timeout)
+        if response.status_code != 200:
+            raise RuntimeError(f"Slack webhook returned {response.status_code}")
+
+    def close(self):
+        self._http.close()
+
+
+class LocalSink:
+    """Sink recording messages in memory and, optionally, a JSON-lines file"""
+
+    name = 'local'
+
+    def __init__(self, path=None):
+        self.path = path
+        self.sent = []
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def send(self, subject, body):
+        record = {'sent_at': datetime.now().isoformat(), 'subject': subject, 'body': body}
+        self.sent.append(record)
+        if self.path:
+            with open(self.path, 'a') as f:
+                f.write(json.dumps(record) + '\n')
+
+    def close(self):
+        pass
+
+
+class NotificationDispatcher:
+    """
+    Queue notifications and deliver them from a background thread
+
+    Parameters:
+    - sinks: Sink objects with send(subject, body) and close()
+    - coalesce_seconds: After the first notification arrives, wait this long
+      for more and send them as one digest; an 'error' notification ends the
+      window early so failures go out promptly
+    - min_interval_seconds: Minimum gap between two sends to the same sink;
+      notifications arriving in the meantime join the next digest
+    - max_queue: Queue size; beyond it notify() drops and logs instead of blocking
+    """
+
+    def __init__(self, sinks, coalesce_seconds=DEFAULT_COALESCE_SECONDS,
+                 min_interval_seconds=DEFAULT_MIN_INTERVAL_SECONDS, max_queue=1000):
+        self.sinks = list(sinks)
+        self.coalesce_seconds = coalesce_seconds
+        self.min_interval_seconds = min_interval_seconds
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._last_sent = {}
+        self._pending = 0
+        self._done = threading.Condition()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _ensure_worker(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._worker, name='notification-dispatcher', daemon=True)
+                self._thread.start()
+
+    def notify(self, subject, body, level='info'):
+        """Enqueue a notification; never blocks on delivery"""
+        if not self.sinks:
+            return False
+        self._ensure_worker()
+        with self._done:
+            try:
+                self._queue.put_nowait(Notification(subject, body, level))
+            except queue.Full:
+                logger.error(f"Notification queue full, dropping: {subject}")
+                return False
+            self._pending += 1
+        return True
+
+    def _collect_batch(self, first):
+        """First notification plus everything arriving within the coalescing window"""
+        batch = [first]
+        deadline = time.monotonic() + self.coalesce_seconds
+        stop = False
+        while first.level != 'error':
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                stop = True
+                break
+            if item is _FLUSH:
+                break
+            batch.append(item)
+            if item.level == 'error':
+                break
+        return batch, stop
+
+    def _deliver(self, batch):
+        subject, body = build_digest(batch)
+        for sink in self.sinks:
+            wait = self._last_sent.get(sink, -float('inf')) + self.min_interval_seconds - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            try:
+                sink.send(subject, body)
+                logger.info(f"{sink.name} notification sent ({len(batch)} message(s))")
+            except Exception as e:
+                logger.error(f"Failed to send {sink.name} notification: {e}")
+            self._last_sent[sink] = time.monotonic()
+
+    def _worker(self):
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                break
+            if first is _FLUSH:
+                continue
+            batch, stop = self._collect_batch(first)
+            self._deliver(batch)
+            with self._done:
+                self._pending -= len(batch)
+                self._done.notify_all()
+            if stop:
+                break
+
+    def flush(self, timeout=None):
+        """Deliver everything queued now, without waiting out the coalescing window"""
+        with self._done:
+            if self._pending == 0:
+                return True
+        self._queue.put(_FLUSH)
+        with self._done:
+            return self._done.wait_for(lambda: self._pending == 0, timeout)
+
+    def close(self, timeout=60):
+        """Flush pending notifications, stop the worker and close the sinks"""
+        if self._thread is not None and self._thread.is_alive():
+            self.flush(timeout)
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+        for sink in self.sinks:
+            sink.close()
+
+
+def dispatcher_from_config(email_config=None, slack_config=None, local_path=None, subject_prefix='',
+                           slack_prefix='', **options):
+    """
+    Dispatcher for the repo's email/Slack config dicts
+
+    Missing or placeholder configs add no sink. With local_path set, messages
+    go only to a LocalSink at that path (no email or Slack is sent).
+    """
+    if local_path:
+        return NotificationDispatcher([LocalSink(local_path)], **options)
+
+    sinks = []
+    if email_config and email_config.get('sender_email') and email_config.get('recipient_emails'):
+        sinks.append(SMTPSink(subject_prefix=subject_prefix, **email_config))
+    if slack_config and slack_config.get('webhook_url') and 'your/webhook' not in slack_config['webhook_url'] \
+            and 'YOUR/WEBHOOK' not in slack_config['webhook_url']:
+        sinks.append(SlackSink(text_prefix=slack_prefix, **slack_config))
+    return NotificationDispatcher(sinks, **options)
+
+
+def shared_dispatcher(key, factory):
+    """
+    Process-wide dispatcher for a key, built once by factory()
+
+    Lets code run both standalone and inside a long-lived scheduler share one
+    queue; pending notifications are flushed when the interpreter exits.
+    """
+    with _SHARED_LOCK:
+        if key not in _SHARED:
+            dispatcher = factory()
+            atexit.register(dispatcher.close)
+            _SHARED[key] = dispatcher
+        return _SHARED[key]
@@ -0,0 +1,88 @@
+"""
+Exchange Trading Calendar
+NYSE/Cboe session calendar built from pandas holiday rules, used to align
+volatility series by trading days and to skip non-trading days in scheduling.
+"""
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.holiday import (
+    AbstractHolidayCalendar, Holiday, GoodFriday, USMartinLutherKingJr,
+    USPresidentsDay, USMemorialDay, USLaborDay, USThanksgivingDay,
+    nearest_workday, sunday_to_monday
+)
+
+# One-off full-day closures not covered by the recurring rules
+SPECIAL_CLOSURES = [
+    '2001-09-11', '2001-09-12', '2001-09-13', '2001-09-14',
+    '2004-06-11', '2007-01-02', '2012-10-29', '2012-10-30',
+    '2018-12-05', '2025-01-09'
+]
+
+
+class NYSEHolidayCalendar(AbstractHolidayCalendar):
+    """Recurring NYSE full-day holidays"""
+    rules = [
+        # A Saturday New Year's Day is not observed on the Friday before
+        Holiday('New Years Day', month=1, day=1, observance=sunday_to_monday),
+        USMartinLutherKingJr,
+        USPresidentsDay,
+        GoodFriday,
+        USMemorialDay,
+        Holiday('Juneteenth', month=6, day=19, start_date='2022-01-01', observance=nearest_workday),
+        Holiday('Independence Day', month=7, day=4, observance=nearest_workday),
+        USLaborDay,
+        USThanksgivingDay,
+        Holiday('Christmas', month=12, day=25, observance=nearest_workday)
+    ]
+
+
+class TradingCalendar:
+    """
+    Precomputed trading sessions between two dates
+
+    Parameters:
+    - start: First date to cover
+    - end: Last date to cover
+    """
+
+    def __init__(self, start, end):
+        start = pd.Timestamp(start).normalize()
+        end = pd.Timestamp(end).normalize()
+        holidays = NYSEHolidayCalendar().holidays(start, end)
+        holidays = holidays.union(pd.DatetimeIndex(SPECIAL_CLOSURES))
+        business_days = pd.bdate_range(start, end)
+        self.sessions = business_days[~business_days.isin(holidays)]
+
+    @classmethod
+    def covering(cls, dates, forward_days=0):
+        """Calendar spanning the given dates plus room to shift forward_days sessions ahead"""
+        dates = pd.to_datetime(pd.Series(dates))
+        # ~1.5 calendar days per session leaves slack for holidays
+        padding = pd.Timedelta(days=int(forward_days * 1.5) + 10)
+        return cls(dates.min(), dates.max() + padding)
+
+    def is_trading_day(self, date):
+        return pd.Timestamp(date).normalize() in self.sessions
+
+    def session_positions(self, dates):
+        """Position of each date's session; non-trading dates roll forward to the next session"""
+        dates = pd.DatetimeIndex(pd.to_datetime(dates)).normalize()
+        return self.sessions.searchsorted(dates, side='left')
+
+    def shift(self, dates, sessions):
+        """
+        Move each date forward (or back, for negative values) by a number of trading sessions
+
+        Returns a DatetimeIndex with NaT where the result falls outside the calendar.
+        """
+        positions = self.session_positions(dates) + sessions
+        in_range = (positions >= 0) & (positions < len(self.sessions))
+        shifted = np.full(len(positions), np.datetime64('NaT'), dtype='datetime64[ns]')
+        shifted[in_range] = self.sessions.values[positions[in_range]]
+        return pd.DatetimeIndex(shifted)
+
+    def next_session(self, date):
+        """First trading session on or after date"""
+        position = self.session_positions([date])[0]
+        return self.sessions[position] if position < len(self.sessions) else None
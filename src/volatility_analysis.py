@@ -11,13 +11,14 @@ Key Concepts:
 
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 from datetime import datetime, timedelta
 import warnings
 warnings.filterwarnings('ignore')
 
+from src.analysis.forward_alignment import FORWARD_COMPARISON_PAIRS, align_forward, split_by_tenor
+from src.analysis.rendering import DEFAULT_MAX_POINTS, build_forward_looking_figure
+from src.analysis.rolling_stats import REGIME_BINS, REGIME_LABELS, StreamingPremiumStats
+
 class VolatilityAnalyzer:
     """
     Advanced volatility analysis with proper forward-looking comparisons
@@ -52,75 +53,37 @@ class VolatilityAnalyzer:
         realized = self.realized_df[self.realized_df['ticker'] == ticker].copy()
         implied = self.implied_df[self.implied_df['ticker'] == ticker].copy()
         
-        comparisons = []
+        # Every (implied_col, realized_col, lag in trading sessions) pair in one alignment pass
+        try:
+            aligned = align_forward(implied, realized, pairs=FORWARD_COMPARISON_PAIRS)
+        except Exception as e:
+            print(f"   ❌ Error: {e}")
+            return []
         
-        # Define comparison pairs (implied_col, realized_col, lag_days)
-        comparison_pairs = [
-            ('implied_vol_1m_atm', 'realized_vol_30d', 30),
-            ('implied_vol_3m_atm', 'realized_vol_90d', 90),
-            ('implied_vol_6m_atm', 'realized_vol_180d', 180),
-            ('implied_vol_12m_atm', 'realized_vol_252d', 252)
-        ]
-        
-        for implied_col, realized_col, lag_days in comparison_pairs:
-            if implied_col in implied.columns and realized_col in realized.columns:
-                print(f"📊 Processing {implied_col} vs {realized_col} (+{lag_days}d forward)...")
-                
-                comp = self._create_single_comparison(
-                    implied, realized, implied_col, realized_col, lag_days
-                )
-                
-                if len(comp) > 0:
-                    comp['comparison_type'] = f"{implied_col} vs {realized_col} forward"
-                    comp['tenor_days'] = lag_days
-                    comparisons.append(comp)
+        comparisons = []
+        for lag_days, comp in split_by_tenor(aligned).items():
+            implied_col, realized_col = comp.columns[2], comp.columns[3]
+            print(f"📊 Processing {implied_col} vs {realized_col} (+{lag_days}d forward)...")
+            self._report_comparison(comp)
+            
+            comp['comparison_type'] = f"{implied_col} vs {realized_col} forward"
+            comp['tenor_days'] = lag_days
+            comparisons.append(comp)
         
         return comparisons
     
-    def _create_single_comparison(self, implied_df, realized_df, implied_col, realized_col, lag_days):
+    def _report_comparison(self, comparison):
         """
-        Create a single forward-looking comparison
+        Print the risk premium summary of a single forward-looking comparison
         """
-        try:
-            # Clean data
-            implied_clean = implied_df[['date', implied_col]].dropna()
-            realized_clean = realized_df[['date', realized_col]].dropna()
-            
-            # Shift realized vol dates backward to create "future" alignment
-            realized_future = realized_clean.copy()
-            realized_future['date'] = realized_future['date'] - pd.Timedelta(days=lag_days)
-            
-            # Merge: today's implied vol with realized vol starting today
-            comparison = pd.merge(
-                implied_clean, 
-                realized_future, 
-                on='date', 
-                how='inner'
-            )
-            
-            if len(comparison) > 0:
-                # Calculate metrics
-                comparison['vol_spread'] = comparison[implied_col] - comparison[realized_col]
-                comparison['vol_ratio'] = comparison[implied_col] / comparison[realized_col]
-                comparison['abs_spread'] = abs(comparison['vol_spread'])
-                
-                # Risk premium statistics
-                avg_premium = comparison['vol_spread'].mean()
-                premium_frequency = (comparison['vol_spread'] > 0).mean() * 100
-                
-                print(f"   ✅ {len(comparison):,} observations")
-                print(f"      Date range: {comparison['date'].min().strftime('%Y-%m-%d')} to {comparison['date'].max().strftime('%Y-%m-%d')}")
-                print(f"      Avg risk premium: {avg_premium:.2f}%")
-                print(f"      Premium frequency: {premium_frequency:.1f}%")
-                
-                return comparison
-            else:
-                print(f"   ❌ No overlapping data found")
-                return pd.DataFrame()
-                
-        except Exception as e:
-            print(f"   ❌ Error: {e}")
-            return pd.DataFrame()
+        # Risk premium statistics
+        avg_premium = comparison['vol_spread'].mean()
+        premium_frequency = (comparison['vol_spread'] > 0).mean() * 100
+        
+        print(f"   ✅ {len(comparison):,} observations")
+        print(f"      Date range: {comparison['date'].min().strftime('%Y-%m-%d')} to {comparison['date'].max().strftime('%Y-%m-%d')}")
+        print(f"      Avg risk premium: {avg_premium:.2f}%")
+        print(f"      Premium frequency: {premium_frequency:.1f}%")
     
     def analyze_volatility_risk_premium(self, comparison_df):
         """
@@ -155,8 +118,8 @@ class VolatilityAnalyzer:
         implied_col = [col for col in comparison_df.columns if 'implied_vol' in col][0]
         comparison_df['vol_regime'] = pd.cut(
             comparison_df[implied_col],
-            bins=[0, 12, 20, 30, float('inf')],
-            labels=['Very Low Vol', 'Low Vol', 'Elevated Vol', 'High Vol']
+            bins=REGIME_BINS,
+            labels=REGIME_LABELS
         )
         
         regime_stats = comparison_df.groupby('vol_regime')['vol_spread'].agg([
@@ -175,111 +138,87 @@ class VolatilityAnalyzer:
         
         return analysis
     
-    def plot_forward_looking_analysis(self, comparison_df, title_suffix=""):
-        """
-        Create comprehensive plots for forward-looking analysis
+    def create_forward_looking_comparison_batch(self, tickers=None):
         """
-        if len(comparison_df) == 0:
-            return
-        
-        # Get column names
-        implied_col = [col for col in comparison_df.columns if 'implied_vol' in col][0]
-        realized_col = [col for col in comparison_df.columns if 'realized_vol' in col][0]
-        
-        # Create subplots
-        fig = make_subplots(
-            rows=3, cols=1,
-            subplot_titles=[
-                f'Forward-Looking Volatility Comparison {title_suffix}',
-                'Volatility Risk Premium Over Time', 
-                'Risk Premium Distribution'
-            ],
-            vertical_spacing=0.08,
-            specs=[[{"secondary_y": False}],
-                   [{"secondary_y": True}], 
-                   [{"secondary_y": False}]]
-        )
+        Forward-looking comparisons for every ticker and tenor pair in one pass
         
-        # Plot 1: Time series comparison
-        fig.add_trace(
-            go.Scatter(
-                x=comparison_df['date'],
-                y=comparison_df[implied_col],
-                mode='lines',
-                name='Implied Vol (Today)',
-                line=dict(color='#ff7f0e', width=2)
-            ),
-            row=1, col=1
-        )
-        
-        fig.add_trace(
-            go.Scatter(
-                x=comparison_df['date'],
-                y=comparison_df[realized_col],
-                mode='lines',
-                name='Future Realized Vol',
-                line=dict(color='#1f77b4', width=2)
-            ),
-            row=1, col=1
-        )
+        Returns the tidy frame from align_forward (one row per date/ticker/tenor).
+        """
+        realized = self.realized_df
+        implied = self.implied_df
+        if tickers is not None:
+            realized = realized[realized['ticker'].isin(tickers)]
+            implied = implied[implied['ticker'].isin(tickers)]
         
-        # Plot 2: Risk premium with rolling average
-        fig.add_trace(
-            go.Scatter(
-                x=comparison_df['date'],
-                y=comparison_df['vol_spread'],
-                mode='lines',
-                name='Risk Premium',
-                line=dict(color='#2ca02c', width=1, dash='dot'),
-                opacity=0.6
-            ),
-            row=2, col=1
-        )
+        return align_forward(implied, realized, pairs=FORWARD_COMPARISON_PAIRS)
+    
+    def analyze_volatility_risk_premium_batch(self, aligned_df):
+        """
+        Risk premium statistics for every (ticker, tenor) using groupby aggregation
         
-        # Add rolling average
-        rolling_premium = comparison_df['vol_spread'].rolling(window=60, center=True).mean()
-        fig.add_trace(
-            go.Scatter(
-                x=comparison_df['date'],
-                y=rolling_premium,
-                mode='lines',
-                name='60-Day Rolling Avg Premium',
-                line=dict(color='#d62728', width=3)
-            ),
-            row=2, col=1
+        Returns a dict of tidy DataFrames:
+        - summary: one row per (ticker, tenor_days) with basic and frequency stats
+        - regimes: premium stats per (ticker, tenor_days, vol_regime)
+        - yearly: premium stats per (ticker, tenor_days, year)
+        """
+        keys = ['ticker', 'tenor_days']
+        df = aligned_df.copy()
+        spread = df['vol_spread']
+        
+        # Indicator columns let every statistic come out of one groupby
+        df['premium_positive'] = (spread > 0).astype(float) * 100
+        df['overpricing'] = spread.where(spread > 0)
+        df['underpricing'] = spread.where(spread < 0)
+        df['extreme_over'] = (spread > 10).astype(float) * 100
+        df['extreme_under'] = (spread < -10).astype(float) * 100
+        
+        grouped = df.groupby(keys)
+        summary = grouped['vol_spread'].agg(
+            mean_premium='mean', median_premium='median', std_premium='std',
+            min_premium='min', max_premium='max', observations='count'
         )
-        
-        # Plot 3: Distribution
-        fig.add_trace(
-            go.Histogram(
-                x=comparison_df['vol_spread'],
-                nbinsx=50,
-                name='Premium Distribution',
-                marker_color='rgba(55, 128, 191, 0.7)',
-                showlegend=False
-            ),
-            row=3, col=1
+        summary['sharpe_ratio'] = (summary['mean_premium'] / summary['std_premium']).where(
+            summary['std_premium'] > 0, 0.0
         )
+        summary['implied_higher_pct'] = grouped['premium_positive'].mean()
+        summary['avg_overpricing'] = grouped['overpricing'].mean()
+        summary['avg_underpricing'] = grouped['underpricing'].mean()
+        summary['extreme_overpricing_pct'] = grouped['extreme_over'].mean()
+        summary['extreme_underpricing_pct'] = grouped['extreme_under'].mean()
+        summary['first_date'] = grouped['date'].min()
+        summary['last_date'] = grouped['date'].max()
+        
+        df['vol_regime'] = pd.cut(df['implied_vol'], bins=REGIME_BINS, labels=REGIME_LABELS)
+        regimes = df.groupby(keys + ['vol_regime'], observed=True)['vol_spread'].agg(
+            ['mean', 'median', 'std', 'count']
+        ).round(2)
+        
+        df['year'] = df['date'].dt.year
+        yearly = df.groupby(keys + ['year'])['vol_spread'].agg(['mean', 'count']).round(2)
+        
+        return {
+            'summary': summary.reset_index(),
+            'regimes': regimes.reset_index(),
+            'yearly': yearly.reset_index()
+        }
+    
+    def plot_forward_looking_analysis(self, comparison_df, title_suffix="", show=True,
+                                      max_points=DEFAULT_MAX_POINTS):
+        """
+        Create comprehensive plots for forward-looking analysis
         
-        # Add zero lines
-        for row in [1, 2]:
-            fig.add_hline(y=0, line_dash="dot", line_color="gray", opacity=0.5, row=row, col=1)
+        Returns the figure; it is only opened in a browser when show=True.
+        Series longer than max_points are downsampled for display.
+        """
+        if len(comparison_df) == 0:
+            return None
         
-        # Update layout
-        fig.update_layout(
-            title=f'Advanced Volatility Risk Premium Analysis {title_suffix}',
-            height=1000,
-            template='plotly_white',
-            showlegend=True
-        )
+        fig = build_forward_looking_figure(comparison_df, title_suffix, max_points=max_points)
         
-        # Update y-axis labels
-        fig.update_yaxes(title_text="Volatility (%)", row=1, col=1)
-        fig.update_yaxes(title_text="Risk Premium (%)", row=2, col=1) 
-        fig.update_yaxes(title_text="Frequency", row=3, col=1)
-        fig.update_xaxes(title_text="Risk Premium (%)", row=3, col=1)
+        if show:
+            fig.show()
         
-        fig.show()
+        return fig
     
     def generate_trading_insights(self, analysis_results):
         """
@@ -335,9 +274,16 @@ class VolatilityAnalyzer:
             for regime, stats in regime_df.iterrows():
                 print(f"   {regime}: {stats['mean']:.2f}% avg premium ({int(stats['count'])} obs)")
 
-def run_advanced_volatility_analysis(data_df, ticker='SPX Index'):
+def run_advanced_volatility_analysis(data_df, ticker='SPX Index', show_plots=False, report=None):
     """
     Run complete advanced volatility analysis
+    
+    Parameters:
+    - show_plots: Open each tenor's figure in a browser; interactive and
+      notebook callers pass True
+    - report: Optional FigureReport; figures are added to it instead of shown
+    
+    By default (no show_plots, no report) no figures are built at all.
     """
     print("🚀 ADVANCED VOLATILITY ANALYSIS")
     print("=" * 60)
@@ -388,11 +334,74 @@ def run_advanced_volatility_analysis(data_df, ticker='SPX Index'):
             analyzer.generate_trading_insights(analysis)
             
             # Create plots
-            analyzer.plot_forward_looking_analysis(comp_df, f"({tenor} days)")
+            if report is not None:
+                fig = analyzer.plot_forward_looking_analysis(comp_df, f"({tenor} days)", show=False)
+                report.add(fig, f"{ticker} {comparison_type}")
+            elif show_plots:
+                analyzer.plot_forward_looking_analysis(comp_df, f"({tenor} days)")
             
             results[f"{tenor}_day"] = {
                 'data': comp_df,
                 'analysis': analysis
             }
     
-    return results
\ No newline at end of file
+    return results
+
+def run_batch_volatility_analysis(data_df, tickers=None):
+    """
+    Volatility risk premium scan across all tickers and tenors at once
+    
+    No per-ticker printing or plotting; returns a dict with the aligned
+    comparisons and the tidy summary/regimes/yearly frames.
+    """
+    analyzer = VolatilityAnalyzer(data_df)
+    
+    aligned = analyzer.create_forward_looking_comparison_batch(tickers)
+    if len(aligned) == 0:
+        print("❌ No valid forward-looking comparisons created")
+        return None
+    
+    results = analyzer.analyze_volatility_risk_premium_batch(aligned)
+    results['comparisons'] = aligned
+    
+    summary = results['summary']
+    print(f"✅ Batch analysis: {summary['ticker'].nunique()} tickers, "
+          f"{summary['tenor_days'].nunique()} tenors, {len(aligned):,} comparisons")
+    
+    return results
+
+def run_incremental_volatility_update(data_df, state_dir, tickers=None):
+    """
+    Daily risk premium update using persisted streaming statistics
+    
+    Only implied observations after each ticker's earliest persisted date are
+    aligned, and each (ticker, tenor) series folds in just its new rows.
+    Returns the summary snapshot of every series.
+    """
+    stats = StreamingPremiumStats(state_dir)
+    analyzer = VolatilityAnalyzer(data_df)
+    
+    implied = analyzer.implied_df
+    realized = analyzer.realized_df
+    if tickers is not None:
+        implied = implied[implied['ticker'].isin(tickers)]
+        realized = realized[realized['ticker'].isin(tickers)]
+    
+    # Per ticker, skip implied dates every persisted tenor has already seen
+    last_dates = stats.last_dates()
+    if last_dates:
+        cutoffs = pd.Series(last_dates).groupby(level=0).min()
+        cutoff = implied['ticker'].map(cutoffs)
+        implied = implied[cutoff.isna() | (implied['date'] > cutoff)]
+    
+    aligned = align_forward(implied, realized, pairs=FORWARD_COMPARISON_PAIRS)
+    
+    # Persisted rows are final, so hold back horizons that run past the latest
+    # realized data (their nearest match could still change)
+    latest_realized = realized.groupby('ticker')['date'].max()
+    aligned = aligned[aligned['target_date'] <= aligned['ticker'].map(latest_realized)]
+    
+    updated = stats.update(aligned)
+    print(f"✅ Incremental update: {len(updated)} series updated from {len(aligned):,} new comparisons")
+    
+    return stats.summary()
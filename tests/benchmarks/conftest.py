@@ -0,0 +1,52 @@
+"""
+Benchmark Suite
+Throughput baselines for collection, analysis and storage, run with
+pytest-benchmark on synthetic data of production size:
+
+- test_collection_benchmarks: the collectors driven end to end against the
+  offline blpapi stand-in at 1, 50 and 500 securities x 10 years
+- test_analysis_benchmarks: basket vol, forward comparison, delta selection
+  and term structure kernels
+- test_storage_benchmarks: columnar writer, collection journal and dedupe
+  store save/load paths
+- test_cli_startup: start-up budget of the bloombergdata CLI (plain pytest,
+  no plugin needed)
+
+Results are saved per commit (pytest-benchmark names each run after the
+commit it measured) so a regression shows up against the previous run:
+
+    python -m pytest tests/benchmarks --benchmark-autosave
+    python -m pytest tests/benchmarks --benchmark-autosave --benchmark-compare --benchmark-compare-fail=mean:10%
+    pytest-benchmark compare --group-by=name
+
+The benchmark modules are skipped when pytest-benchmark is not installed.
+"""
+
+import os
+import sys
+
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from tests.benchmarks.offline_blpapi import OfflineBloomberg, installed  # noqa: E402
+from tests.benchmarks.synthetic import securities, volatility_frame  # noqa: E402
+
+
+@pytest.fixture
+def offline_bloomberg():
+    backend = OfflineBloomberg()
+    with installed(backend):
+        yield backend
+
+
+@pytest.fixture(scope='session')
+def vol_frame_50():
+    return volatility_frame(securities(50))
+
+
+@pytest.fixture(scope='session')
+def vol_frame_500():
+    return volatility_frame(securities(500))
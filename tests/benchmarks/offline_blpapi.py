@@ -0,0 +1,289 @@
+"""
+Offline blpapi Stand-In
+Minimal in-process replacement for the parts of blpapi the collectors use
+(Session, SessionOptions, Event, CorrelationId, HistoricalDataRequest
+elements), answering requests with deterministic synthetic daily history so
+collection code can be benchmarked without a Bloomberg Terminal.
+
+Every (security, field) gets its own seeded random walk, so repeated requests
+return identical values. Securities listed in missing_securities answer with a
+securityError, as Bloomberg does for unknown tickers.
+
+Usage:
+    with installed(OfflineBloomberg()):
+        session = blpapi.Session(blpapi.SessionOptions())
+        ...
+"""
+
+import sys
+import types
+import zlib
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+
+class Event:
+    ADMIN = 1
+    SESSION_STATUS = 2
+    PARTIAL_RESPONSE = 6
+    RESPONSE = 5
+    TIMEOUT = 10
+
+    def __init__(self, event_type, messages=()):
+        self._type = event_type
+        self._messages = list(messages)
+
+    def eventType(self):
+        return self._type
+
+    def __iter__(self):
+        return iter(self._messages)
+
+
+class CorrelationId:
+    def __init__(self, value):
+        self._value = value
+
+    def value(self):
+        return self._value
+
+
+class Name(str):
+    pass
+
+
+class _Value:
+    """Leaf element holding one value"""
+
+    __slots__ = ('_value',)
+
+    def __init__(self, value):
+        self._value = value
+
+    def getValue(self, index=0):
+        return self._value
+
+
+class _ListElement:
+    """Array element (request securities/fields, response fieldData)"""
+
+    def __init__(self, name, values=None):
+        self._name = Name(name)
+        self._values = [] if values is None else values
+
+    def name(self):
+        return self._name
+
+    def appendValue(self, value):
+        self._values.append(value)
+
+    def numValues(self):
+        return len(self._values)
+
+    def getValue(self, index=0):
+        return self._values[index]
+
+    def values(self):
+        return list(self._values)
+
+
+class _FieldDataRow:
+    """One date of a HistoricalDataResponse: 'date' plus the fields with a value"""
+
+    __slots__ = ('_date', '_fields')
+
+    def __init__(self, date, fields):
+        self._date = date
+        self._fields = fields
+
+    def hasElement(self, name):
+        return name == 'date' or name in self._fields
+
+    def getElement(self, name):
+        if name == 'date':
+            return _Value(self._date)
+        return _Value(self._fields[name])
+
+
+class _Structure:
+    """Element with named children"""
+
+    def __init__(self, name, children):
+        self._name = Name(name)
+        self._children = children
+
+    def name(self):
+        return self._name
+
+    def hasElement(self, name):
+        return name in self._children
+
+    def getElement(self, name):
+        return self._children[name]
+
+
+class Message(_Structure):
+    def __init__(self, message_type, children, correlation_id):
+        super().__init__(message_type, children)
+        self._correlation_id = correlation_id
+
+    def messageType(self):
+        return self._name
+
+    def correlationIds(self):
+        return [self._correlation_id]
+
+
+class Request:
+    def __init__(self, request_type):
+        self._element = _Structure(request_type, {
+            'securities': _ListElement('securities'),
+            'fields': _ListElement('fields'),
+        })
+        self.settings = {}
+
+    def asElement(self):
+        return self._element
+
+    def getElement(self, name):
+        return self._element.getElement(name)
+
+    def set(self, name, value):
+        self.settings[name] = value
+
+
+class Service:
+    def __init__(self, name):
+        self._name = name
+
+    def name(self):
+        return self._name
+
+    def createRequest(self, request_type):
+        return Request(request_type)
+
+
+class SessionOptions:
+    def setServerHost(self, host):
+        pass
+
+    def setServerPort(self, port):
+        pass
+
+
+def synthetic_series(security, field, dates):
+    """Deterministic positive random walk (volatility-like levels) for one security/field"""
+    rng = np.random.default_rng(zlib.crc32(f'{security}|{field}'.encode()))
+    level = 15.0 + 25.0 * rng.random()
+    steps = rng.normal(0.0, 0.6, len(dates))
+    return np.clip(level + np.cumsum(steps), 5.0, 150.0)
+
+
+class OfflineBloomberg:
+    """
+    Shared state of the stand-in: the synthetic data and request counters
+
+    Parameters:
+    - missing_securities: Securities answered with a securityError
+    - coverage: Fraction of (date, field) values present; the rest are omitted
+      from fieldData the way Bloomberg omits missing fields
+    """
+
+    def __init__(self, missing_securities=(), coverage=0.98):
+        self.missing_securities = set(missing_securities)
+        self.coverage = coverage
+        self.requests = 0
+        self.rows = 0
+
+    def history(self, security, fields, start, end):
+        dates = pd.bdate_range(pd.Timestamp(start), pd.Timestamp(end))
+        columns = {field: synthetic_series(security, field, dates) for field in fields}
+        present = np.random.default_rng(zlib.crc32(security.encode())).random((len(dates), len(fields)))
+        present = present < self.coverage
+
+        rows = []
+        for i, day in enumerate(dates.date):
+            values = {field: float(columns[field][i]) for j, field in enumerate(fields) if present[i, j]}
+            rows.append(_FieldDataRow(day, values))
+        self.rows += len(rows)
+        return rows
+
+    def respond(self, request, correlation_id):
+        """Response messages for a HistoricalDataRequest, one per security"""
+        self.requests += 1
+        fields = request.getElement('fields').values()
+        start = request.settings.get('startDate')
+        end = request.settings.get('endDate')
+
+        messages = []
+        for sequence, security in enumerate(request.getElement('securities').values()):
+            children = {'security': _Value(security), 'sequenceNumber': _Value(sequence)}
+            if security in self.missing_securities:
+                children['securityError'] = _Structure('securityError', {
+                    'message': _Value('Unknown/Invalid security')})
+            else:
+                children['fieldData'] = _ListElement('fieldData', self.history(security, fields, start, end))
+            messages.append(Message('HistoricalDataResponse', {
+                'securityData': _Structure('securityData', children)}, correlation_id))
+        return messages
+
+    def session_class(self):
+        backend = self
+
+        class Session:
+            def __init__(self, options=None):
+                self._events = deque()
+                self._next_id = 0
+
+            def start(self):
+                return True
+
+            def stop(self):
+                return True
+
+            def openService(self, name):
+                return True
+
+            def getService(self, name):
+                return Service(name)
+
+            def sendRequest(self, request, identity=None, correlationId=None):
+                self._next_id += 1
+                correlation_id = correlationId or CorrelationId(self._next_id)
+                self._events.append(Event(Event.RESPONSE, backend.respond(request, correlation_id)))
+                return correlation_id
+
+            def nextEvent(self, timeout=0):
+                if self._events:
+                    return self._events.popleft()
+                return Event(Event.TIMEOUT)
+
+        return Session
+
+    def module(self):
+        """A 'blpapi' module object backed by this instance"""
+        module = types.ModuleType('blpapi')
+        module.Session = self.session_class()
+        module.SessionOptions = SessionOptions
+        module.Event = Event
+        module.CorrelationId = CorrelationId
+        module.Name = Name
+        module.backend = self
+        return module
+
+
+@contextmanager
+def installed(backend):
+    """Make `import blpapi` return the stand-in for the duration of the block"""
+    previous = sys.modules.get('blpapi')
+    sys.modules['blpapi'] = backend.module()
+    try:
+        yield sys.modules['blpapi']
+    finally:
+        if previous is None:
+            sys.modules.pop('blpapi', None)
+        else:
+            sys.modules['blpapi'] = previous
@@ -0,0 +1,83 @@
+"""
+Synthetic Benchmark Data
+Production-sized inputs for the benchmark suite: ten years of daily
+volatility history per security, basket weights, VIX option chains and the
+generic UX futures strip, all deterministic so runs are comparable.
+"""
+
+import importlib.util
+import os
+
+import numpy as np
+import pandas as pd
+
+from tests.benchmarks.offline_blpapi import synthetic_series
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+YEARS = 10
+END_DATE = pd.Timestamp('2025-06-30')
+START_DATE = END_DATE - pd.DateOffset(years=YEARS)
+
+REALIZED_FIELDS = ['realized_vol_30d', 'realized_vol_90d', 'realized_vol_180d', 'realized_vol_252d']
+IMPLIED_FIELDS = ['implied_vol_1m_atm', 'implied_vol_3m_atm', 'implied_vol_6m_atm', 'implied_vol_12m_atm',
+                  'implied_vol_1m_50delta', 'implied_vol_3m_50delta', 'implied_vol_6m_50delta',
+                  'implied_vol_12m_50delta']
+
+
+def securities(count):
+    return [f'SEC{i:03d} US Equity' for i in range(count)]
+
+
+def load_script(name):
+    """Import a module from scripts/ (they are run as files, not as a package)"""
+    spec = importlib.util.spec_from_file_location(f'bench_{name}', os.path.join(PROJECT_ROOT, 'scripts', f'{name}.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def volatility_frame(tickers, start=START_DATE, end=END_DATE):
+    """Long (date, ticker, data_type, vol fields...) frame as the collectors save it"""
+    dates = pd.bdate_range(start, end)
+    frames = []
+    for data_type, fields in (('realized', REALIZED_FIELDS), ('implied', IMPLIED_FIELDS)):
+        for ticker in tickers:
+            frame = pd.DataFrame({field: synthetic_series(ticker, field, dates) for field in fields})
+            frame.insert(0, 'data_type', data_type)
+            frame.insert(0, 'ticker', ticker)
+            frame.insert(0, 'date', dates)
+            frames.append(frame)
+    return pd.concat(frames, ignore_index=True)
+
+
+def basket_weights(tickers):
+    weights = np.linspace(2.0, 0.5, len(tickers))
+    return pd.DataFrame({'ticker': tickers, 'normalized_weight': 100.0 * weights / weights.sum()})
+
+
+def option_chain(start=START_DATE, end=END_DATE, expiries_per_day=3, strikes=13):
+    """Daily VIX call chains: a few listed expiries with a strike ladder each"""
+    dates = pd.bdate_range(start, end)
+    rng = np.random.default_rng(7)
+    n = len(dates) * expiries_per_day * strikes
+    date = np.repeat(dates.values, expiries_per_day * strikes)
+    expiry_offset = np.tile(np.repeat(np.arange(1, expiries_per_day + 1) * 30, strikes), len(dates))
+    moneyness = np.tile(np.linspace(-1.5, 2.5, strikes), len(dates) * expiries_per_day)
+    delta = np.clip(0.55 - 0.25 * moneyness + rng.normal(0, 0.02, n), 0.01, 0.99)
+    return pd.DataFrame({
+        'date': date,
+        'expiry_date': date + pd.to_timedelta(expiry_offset, unit='D').values,
+        'strike': np.tile(np.linspace(12, 50, strikes), len(dates) * expiries_per_day),
+        'delta': delta,
+        'px_last': np.abs(rng.normal(2.0, 1.0, n)),
+    })
+
+
+def futures_strip(start=START_DATE, end=END_DATE, contracts=9):
+    """Generic UX1..UXn settlement history in contango around a VIX random walk"""
+    dates = pd.bdate_range(start, end)
+    spot = synthetic_series('VIX Index', 'PX_LAST', dates)
+    frames = [pd.DataFrame({'date': dates, 'ticker': f'UX{n} Index', 'last_price': spot + 0.8 * n})
+              for n in range(1, contracts + 1)]
+    return pd.concat(frames, ignore_index=True), pd.Series(spot, index=dates)
@@ -0,0 +1,57 @@
+"""
+Analysis Benchmarks
+Vectorized analysis kernels on ten years of production-sized inputs: basket
+volatility over the top 50 components, forward implied/realized comparison,
+target delta selection over daily VIX option chains, and the constant-maturity
+term structure of the UX strip.
+"""
+
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+from src.analysis.basket_volatility import calculate_basket_volatilities  # noqa: E402
+from src.analysis.delta_selection import select_target_delta_options  # noqa: E402
+from src.analysis.forward_alignment import align_forward  # noqa: E402
+from src.analysis.vix_term_structure import term_structure_frame  # noqa: E402
+from tests.benchmarks.synthetic import (  # noqa: E402
+    IMPLIED_FIELDS, REALIZED_FIELDS, basket_weights, futures_strip, option_chain, securities
+)
+
+
+@pytest.fixture(scope='module')
+def chain():
+    return option_chain()
+
+
+@pytest.fixture(scope='module')
+def strip():
+    return futures_strip()
+
+
+def test_basket_volatility(benchmark, vol_frame_50):
+    benchmark.group = 'analysis'
+    weights = basket_weights(securities(50))
+    result = benchmark(calculate_basket_volatilities, vol_frame_50, weights, 'implied', IMPLIED_FIELDS)
+    assert len(result) > 0
+
+
+def test_forward_comparison(benchmark, vol_frame_50):
+    benchmark.group = 'analysis'
+    implied = vol_frame_50[vol_frame_50['data_type'] == 'implied'][['date', 'ticker'] + IMPLIED_FIELDS]
+    realized = vol_frame_50[vol_frame_50['data_type'] == 'realized'][['date', 'ticker'] + REALIZED_FIELDS]
+    aligned = benchmark(align_forward, implied, realized)
+    assert len(aligned) > 0
+
+
+def test_delta_selection(benchmark, chain):
+    benchmark.group = 'analysis'
+    selected = benchmark(select_target_delta_options, chain)
+    assert len(selected) > 0
+
+
+def test_term_structure(benchmark, strip):
+    benchmark.group = 'analysis'
+    futures, spot = strip
+    curve = benchmark(term_structure_frame, futures, spot)
+    assert len(curve) > 0
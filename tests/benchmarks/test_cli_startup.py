@@ -0,0 +1,44 @@
+"""
+CLI Start-up Budget
+`python -m bloombergdata --help` and the light commands must start within
+STARTUP_BUDGET_MS and must not import the heavy collection stack.
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from bloombergdata.cli import STARTUP_BUDGET_MS
+from tests.benchmarks.synthetic import PROJECT_ROOT
+
+HEAVY_MODULES = ('pandas', 'numpy', 'blpapi', 'pyarrow', 'matplotlib', 'plotly', 'requests')
+
+
+def _best_of(args, runs=5):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        completed = subprocess.run([sys.executable, '-m', 'bloombergdata', *args], cwd=PROJECT_ROOT,
+                                   capture_output=True, text=True)
+        timings.append((time.perf_counter() - started) * 1000)
+        assert completed.returncode in (0, 1), completed.stderr
+    return min(timings)
+
+
+@pytest.mark.parametrize('args', [['--help'], ['collect', '--help'], ['metrics']])
+def test_startup_within_budget(args):
+    elapsed = _best_of(args)
+    assert elapsed < STARTUP_BUDGET_MS, f"{' '.join(args)} took {elapsed:.0f} ms"
+
+
+def test_light_commands_skip_heavy_imports():
+    code = ("import sys; from bloombergdata.cli import build_parser, cmd_metrics; "
+            "cmd_metrics(build_parser().parse_args(['metrics'])); "
+            f"print('loaded:', ','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+    completed = subprocess.run([sys.executable, '-c', code], cwd=PROJECT_ROOT, capture_output=True, text=True,
+                               env={**os.environ, 'PYTHONPATH': PROJECT_ROOT})
+    assert completed.returncode == 0, completed.stderr
+    assert completed.stdout.strip().splitlines()[-1] == 'loaded:', completed.stdout
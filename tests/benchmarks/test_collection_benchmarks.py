@@ -0,0 +1,99 @@
+"""
+Collection Benchmarks
+The collectors driven end to end (request, parse, journal, combine) against
+the offline blpapi stand-in, at 1, 50 and 500 securities x 10 years.
+"""
+
+import os
+
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+from src.data_collection.task_runner import TaskRunner  # noqa: E402
+from src.utils.instrumentation import InstrumentedSession  # noqa: E402
+from tests.benchmarks.synthetic import END_DATE, START_DATE, load_script, securities  # noqa: E402
+
+SECURITY_COUNTS = [1, 50, 500]
+
+
+def _rounds(count):
+    return 1 if count >= 500 else 3
+
+
+@pytest.fixture
+def historical_fetcher(offline_bloomberg, tmp_path):
+    module = load_script('fetch_historical_volatility')
+    module.project_root = str(tmp_path)
+    fetcher = module.HistoricalVolatilityFetcher()
+    assert fetcher.connect()
+    yield fetcher
+    fetcher.disconnect()
+
+
+@pytest.fixture
+def ten_year_fetcher(offline_bloomberg, tmp_path):
+    module = load_script('fetch_ten_year_volatility_data')
+    module.project_root = str(tmp_path)
+    fetcher = module.TenYearVolatilityFetcher()
+    fetcher.start_date, fetcher.end_date = START_DATE.to_pydatetime(), END_DATE.to_pydatetime()
+    assert fetcher.connect()
+    yield fetcher
+    fetcher.disconnect()
+
+
+@pytest.mark.parametrize('count', SECURITY_COUNTS)
+def test_historical_collection(benchmark, historical_fetcher, offline_bloomberg, tmp_path, count):
+    """Task-runner collection: one task per (security, field group), journaled, then combined"""
+    benchmark.group = f'collection-{count}'
+    tickers = securities(count)
+    start, end = START_DATE.strftime('%Y%m%d'), END_DATE.strftime('%Y%m%d')
+    rounds = iter(range(_rounds(count) + 1))
+
+    def setup():
+        runner = TaskRunner(os.path.join(tmp_path, f'journal_{next(rounds)}'), sleep=lambda seconds: None)
+        return (tickers, start, end, runner), {}
+
+    df, summary = benchmark.pedantic(historical_fetcher.fetch_historical_volatility, setup=setup,
+                                     rounds=_rounds(count))
+    assert not summary['failed']
+    assert df['ticker'].nunique() == count
+
+
+@pytest.mark.parametrize('count', SECURITY_COUNTS)
+def test_ten_year_request_parse(benchmark, ten_year_fetcher, count):
+    """Ten-year fetcher's request and response parsing for realized and implied fields"""
+    benchmark.group = f'collection-{count}'
+    tickers = securities(count)
+
+    def fetch_all():
+        rows = 0
+        for ticker in tickers:
+            rows += len(ten_year_fetcher.fetch_security_volatility_data(
+                ticker, ten_year_fetcher.realized_fields, 'realized'))
+            rows += len(ten_year_fetcher.fetch_security_volatility_data(
+                ticker, ten_year_fetcher.implied_fields, 'implied'))
+        return rows
+
+    rows = benchmark.pedantic(fetch_all, rounds=_rounds(count))
+    assert rows > 0
+
+
+def test_instrumented_session_overhead(benchmark, offline_bloomberg):
+    """Per-request cost the instrumentation wrapper adds on top of the session"""
+    import blpapi
+
+    session = InstrumentedSession(blpapi.Session(blpapi.SessionOptions()))
+    service = session.getService('//blp/refdata')
+    request = service.createRequest('HistoricalDataRequest')
+    request.getElement('securities').appendValue('SEC000 US Equity')
+    request.getElement('fields').appendValue('PX_LAST')
+    request.set('startDate', END_DATE.strftime('%Y%m%d'))
+    request.set('endDate', END_DATE.strftime('%Y%m%d'))
+
+    def round_trip():
+        session.sendRequest(request)
+        return session.nextEvent(1000)
+
+    event = benchmark(round_trip)
+    assert event.eventType() == blpapi.Event.RESPONSE
@@ -0,0 +1,101 @@
+"""
+Storage Benchmarks
+Save and load paths for ten years of volatility history: the columnar dataset
+writer (Parquet write plus latest manifest, filtered reads), the collection
+journal (per-security durable parts) and the deduplicating store (first
+ingest, unchanged re-ingest, long reads).
+"""
+
+import os
+
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+from src.data_collection.collection_journal import CollectionJournal  # noqa: E402
+from src.utils.columnar_writer import ColumnarDatasetWriter  # noqa: E402
+from src.utils.dedupe_store import DedupeVolatilityStore  # noqa: E402
+from tests.benchmarks.synthetic import securities  # noqa: E402
+
+
+@pytest.mark.parametrize('size', [50, 500])
+def test_columnar_write(benchmark, tmp_path, vol_frame_50, vol_frame_500, size):
+    benchmark.group = 'storage-save'
+    df = vol_frame_50 if size == 50 else vol_frame_500
+    writer = ColumnarDatasetWriter(str(tmp_path), 'bench')
+    tags = iter(range(100))
+    path = benchmark.pedantic(lambda: writer.write(df, tag=f'run_{next(tags)}'), rounds=3)
+    assert os.path.exists(path)
+
+
+@pytest.mark.parametrize('size', [50, 500])
+def test_columnar_load(benchmark, tmp_path, vol_frame_50, vol_frame_500, size):
+    benchmark.group = 'storage-load'
+    df = vol_frame_50 if size == 50 else vol_frame_500
+    writer = ColumnarDatasetWriter(str(tmp_path), 'bench')
+    writer.write(df, tag='load')
+    loaded = benchmark(writer.load_latest)
+    assert len(loaded) == len(df)
+
+
+def test_columnar_load_tickers(benchmark, tmp_path, vol_frame_500):
+    """Row-group pruned read of a few tickers out of 500"""
+    benchmark.group = 'storage-load'
+    writer = ColumnarDatasetWriter(str(tmp_path), 'bench')
+    writer.write(vol_frame_500, tag='load')
+    tickers = securities(5)
+    loaded = benchmark(writer.load_latest, tickers=tickers)
+    assert set(loaded['ticker']) == set(tickers)
+
+
+def test_journal_append(benchmark, tmp_path, vol_frame_50):
+    benchmark.group = 'storage-save'
+    parts = [(ticker, frame) for ticker, frame in vol_frame_50.groupby('ticker', sort=False)]
+    rounds = iter(range(100))
+
+    def append_all():
+        journal = CollectionJournal(os.path.join(tmp_path, f'journal_{next(rounds)}'))
+        for ticker, frame in parts:
+            journal.append(ticker, frame)
+        return journal
+
+    journal = benchmark.pedantic(append_all, rounds=3)
+    assert len(journal.completed_securities()) == len(parts)
+
+
+def test_journal_load_all(benchmark, tmp_path, vol_frame_50):
+    benchmark.group = 'storage-load'
+    journal = CollectionJournal(str(tmp_path))
+    for ticker, frame in vol_frame_50.groupby('ticker', sort=False):
+        journal.append(ticker, frame)
+    loaded = benchmark(journal.load_all)
+    assert len(loaded) == len(vol_frame_50)
+
+
+def test_store_first_ingest(benchmark, tmp_path, vol_frame_50):
+    benchmark.group = 'storage-save'
+    rounds = iter(range(100))
+
+    def ingest():
+        store = DedupeVolatilityStore(os.path.join(tmp_path, f'store_{next(rounds)}'))
+        return store.ingest(vol_frame_50, 'bench')
+
+    stats = benchmark.pedantic(ingest, rounds=3)
+    assert stats['blocks_written'] > 0
+
+
+def test_store_unchanged_ingest(benchmark, tmp_path, vol_frame_50):
+    """Re-ingesting an identical pull: every block hash matches, nothing is written"""
+    benchmark.group = 'storage-save'
+    store = DedupeVolatilityStore(str(tmp_path))
+    store.ingest(vol_frame_50, 'initial')
+    stats = benchmark.pedantic(store.ingest, args=(vol_frame_50, 'repeat'), rounds=3)
+    assert stats['blocks_written'] == 0
+
+
+def test_store_load(benchmark, tmp_path, vol_frame_50):
+    benchmark.group = 'storage-load'
+    store = DedupeVolatilityStore(str(tmp_path))
+    store.ingest(vol_frame_50, 'initial')
+    loaded = benchmark(store.load)
+    assert len(loaded) > 0
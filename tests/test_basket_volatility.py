@@ -0,0 +1,85 @@
+"""
+Basket Volatility Tests
+The vectorized weighted basket against a per-date loop, weight coverage
+filtering, and several tenors computed in one pass.
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.analysis.basket_volatility import calculate_basket_volatilities, calculate_basket_volatility
+
+TICKERS = ['AAPL US Equity', 'MSFT US Equity', 'NVDA US Equity']
+WEIGHTS = pd.DataFrame({'ticker': TICKERS, 'normalized_weight': [50.0, 30.0, 20.0]})
+
+
+def _vol_data(periods=80, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range('2024-01-02', periods=periods)
+    rows = pd.DataFrame({
+        'date': np.repeat(dates, len(TICKERS)),
+        'ticker': TICKERS * periods,
+        'data_type': 'implied',
+        'implied_vol_1m_atm': rng.uniform(15, 45, periods * len(TICKERS)),
+        'implied_vol_12m_atm': rng.uniform(20, 35, periods * len(TICKERS))
+    })
+    # NVDA is missing on every fourth date
+    gaps = (rows['ticker'] == 'NVDA US Equity') & (rows['date'].isin(dates[::4]))
+    return rows[~gaps].reset_index(drop=True)
+
+
+def _loop_basket(vol_data, field, min_coverage=60):
+    """The notebooks' original per-date loop"""
+    weights = WEIGHTS.set_index('ticker')['normalized_weight']
+    rows = []
+    for date, day in vol_data.groupby('date'):
+        day = day.dropna(subset=[field])
+        coverage = weights.reindex(day['ticker']).sum()
+        if coverage > min_coverage:
+            weighted = (day[field].to_numpy() * weights.reindex(day['ticker']).to_numpy()).sum()
+            rows.append((date, weighted / coverage, coverage))
+    return pd.DataFrame(rows, columns=['date', 'basket_vol', 'weight_coverage'])
+
+
+def test_basket_matches_per_date_loop():
+    vol_data = _vol_data()
+
+    basket = calculate_basket_volatility(vol_data, WEIGHTS, 'implied', 'implied_vol_1m_atm')
+    expected = _loop_basket(vol_data, 'implied_vol_1m_atm')
+
+    assert basket.columns.tolist() == ['date', 'top50_implied_vol', 'implied_weight_coverage',
+                                       'implied_components_count']
+    np.testing.assert_allclose(basket['top50_implied_vol'], expected['basket_vol'])
+    np.testing.assert_allclose(basket['implied_weight_coverage'], expected['weight_coverage'])
+    assert set(basket['implied_components_count']) == {2, 3}
+
+
+def test_dates_below_weight_coverage_are_dropped():
+    vol_data = _vol_data()
+    # Without AAPL the remaining weight never exceeds 50%
+    vol_data = vol_data[vol_data['ticker'] != 'AAPL US Equity']
+
+    basket = calculate_basket_volatility(vol_data, WEIGHTS, 'implied', 'implied_vol_1m_atm')
+
+    assert basket.empty
+
+
+def test_components_with_short_history_are_excluded():
+    vol_data = _vol_data()
+    # NVDA has 60 observations, fewer than the 70 required here
+    basket = calculate_basket_volatilities(vol_data, WEIGHTS, 'implied', ['implied_vol_1m_atm'],
+                                           min_observations=70)
+
+    assert (basket['components_count'] == 2).all()
+    assert (basket['weight_coverage'] == 80.0).all()
+
+
+def test_several_tenors_in_one_pass():
+    vol_data = _vol_data()
+    fields = ['implied_vol_1m_atm', 'implied_vol_12m_atm']
+
+    basket = calculate_basket_volatilities(vol_data, WEIGHTS, 'implied', fields)
+
+    for field in fields:
+        single = calculate_basket_volatilities(vol_data, WEIGHTS, 'implied', field)
+        pd.testing.assert_frame_equal(basket[basket['field'] == field].reset_index(drop=True), single)
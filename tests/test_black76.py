@@ -0,0 +1,86 @@
+"""
+Black-76 Tests
+Implied vol round-trips, greeks against finite differences, and matching each
+option to the future expiring with it.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analysis.black76 import (DAYS_PER_YEAR, attach_forward, black76_greeks, black76_price,
+                                  chain_greeks, implied_volatility)
+
+
+def test_implied_volatility_round_trips_prices():
+    forward = np.array([18.0, 18.0, 18.0, 25.0, 25.0])
+    strike = np.array([12.0, 18.0, 30.0, 20.0, 45.0])
+    years = np.array([0.05, 0.1, 0.25, 0.5, 1.0])
+    sigma = np.array([0.6, 0.85, 1.2, 0.9, 1.5])
+
+    for is_call in (True, False):
+        price = black76_price(forward, strike, years, sigma, rate=0.03, is_call=is_call)
+        solved = implied_volatility(price, forward, strike, years, rate=0.03, is_call=is_call)
+        np.testing.assert_allclose(solved, sigma, rtol=1e-6)
+
+
+def test_implied_volatility_is_nan_outside_arbitrage_bounds():
+    # Below intrinsic, above the forward, and not a price at all
+    solved = implied_volatility([1.0, 19.0, np.nan], 18.0, [15.0, 15.0, 15.0], 0.25)
+    assert np.isnan(solved).all()
+
+
+@pytest.mark.parametrize('is_call', [True, False])
+def test_greeks_match_finite_differences(is_call):
+    forward, strike, years, sigma = 20.0, 22.0, 0.2, 0.9
+    greeks = black76_greeks(forward, strike, years, sigma, is_call=is_call)
+
+    def price(f=forward, t=years, s=sigma):
+        return float(black76_price(f, strike, t, s, is_call=is_call))
+
+    bump = 1e-3
+    delta = (price(f=forward + bump) - price(f=forward - bump)) / (2 * bump)
+    gamma = (price(f=forward + bump) - 2 * price() + price(f=forward - bump)) / bump ** 2
+    vega = (price(s=sigma + bump) - price(s=sigma - bump)) / (2 * bump) / 100
+    # Theta is the decay over one calendar day as expiry approaches
+    day = 1 / DAYS_PER_YEAR
+    theta = (price(t=years - day) - price(t=years + day)) / 2
+
+    assert greeks['price'] == pytest.approx(price())
+    assert greeks['delta'] == pytest.approx(delta, rel=1e-6)
+    assert greeks['gamma'] == pytest.approx(gamma, rel=1e-4)
+    assert greeks['vega'] == pytest.approx(vega, rel=1e-6)
+    assert greeks['theta'] == pytest.approx(theta, rel=1e-4)
+
+
+def test_attach_forward_uses_the_future_expiring_with_each_option():
+    futures = pd.DataFrame({
+        'date': ['2025-06-02', '2025-06-02', '2025-06-03', '2025-06-03'],
+        'expiry_date': ['2025-06-18', '2025-07-16', '2025-06-18', '2025-07-16'],
+        'settle': [18.0, 20.0, 18.5, np.nan]
+    })
+    options = pd.DataFrame({
+        'date': ['2025-06-03', '2025-06-02', '2025-06-03', '2025-06-04'],
+        'expiry_date': ['2025-07-16', '2025-07-16', '2025-06-18', '2025-06-18'],
+        'strike': 20.0
+    }, index=[10, 11, 12, 13])
+
+    forward = attach_forward(options, futures)
+
+    assert forward.index.tolist() == [10, 11, 12, 13]
+    # A missing settle or quote date gives no forward rather than another day's
+    np.testing.assert_array_equal(forward.to_numpy(), [np.nan, 20.0, 18.5, np.nan])
+
+
+def test_chain_greeks_leave_expired_options_unpriced():
+    options = pd.DataFrame({
+        'date': ['2025-06-20', '2025-06-02'],
+        'expiry_date': ['2025-06-18', '2025-06-18'],
+        'strike': [18.0, 18.0],
+        'mid': [1.2, 1.2]
+    })
+
+    greeks = chain_greeks(options, 18.0)
+
+    assert greeks.loc[0, ['ivol', 'delta']].isna().all()
+    assert greeks.loc[1, 'delta'] == pytest.approx(0.5, abs=0.05)
@@ -0,0 +1,68 @@
+"""
+Collection Journal Tests
+Commit handling of the write-ahead journal: only fully written parts count as
+complete, and a torn final line from a crash mid-append is never a commit.
+"""
+
+import os
+
+import pandas as pd
+
+from src.data_collection.collection_journal import CollectionJournal
+
+
+def _frame(ticker, rows=3):
+    return pd.DataFrame({
+        'date': pd.bdate_range('2025-01-01', periods=rows),
+        'ticker': ticker,
+        'realized_vol_30d': [15.0 + i for i in range(rows)]
+    })
+
+
+def test_append_commits_security(tmp_path):
+    journal = CollectionJournal(str(tmp_path))
+    journal.append('AAPL US Equity', _frame('AAPL US Equity'))
+    journal.append('MSFT US Equity', _frame('MSFT US Equity', rows=2))
+
+    assert journal.completed_securities() == {'AAPL US Equity', 'MSFT US Equity'}
+    assert len(journal.load_all()) == 5
+
+
+def test_torn_line_is_not_a_commit(tmp_path):
+    journal = CollectionJournal(str(tmp_path))
+    journal.append('AAPL US Equity', _frame('AAPL US Equity'))
+    with open(journal.log_file, 'a') as f:
+        f.write('{"ticker": "MSFT US Equity", "file": "part_MS')
+
+    assert journal.completed_securities() == {'AAPL US Equity'}
+
+    # The next commit starts on a fresh line instead of extending the torn record
+    journal.append('MSFT US Equity', _frame('MSFT US Equity'))
+    assert journal.completed_securities() == {'AAPL US Equity', 'MSFT US Equity'}
+
+
+def test_record_without_part_is_not_a_commit(tmp_path):
+    journal = CollectionJournal(str(tmp_path))
+    part_file = journal.append('AAPL US Equity', _frame('AAPL US Equity'))
+    os.remove(part_file)
+
+    assert journal.completed_securities() == set()
+    assert journal.load_all().empty
+
+
+def test_similar_tickers_keep_separate_parts(tmp_path):
+    journal = CollectionJournal(str(tmp_path))
+    journal.append('BRK/B US Equity', _frame('BRK/B US Equity', rows=2))
+    journal.append('BRK B US Equity', _frame('BRK B US Equity', rows=4))
+
+    df = journal.load_all()
+    assert df.groupby('ticker').size().to_dict() == {'BRK B US Equity': 4, 'BRK/B US Equity': 2}
+
+
+def test_clear_removes_journal_and_parts(tmp_path):
+    journal = CollectionJournal(str(tmp_path))
+    journal.append('AAPL US Equity', _frame('AAPL US Equity'))
+    journal.clear()
+
+    assert journal.completed_securities() == set()
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,64 @@
+"""
+Columnar Writer Tests
+Publishing through the latest manifest, ticker-filtered reads, and the legacy
+fixed-path copies being written only when asked for.
+"""
+
+import os
+
+import pandas as pd
+
+from src.utils.columnar_writer import ColumnarDatasetWriter
+
+
+def _dataset():
+    dates = pd.bdate_range('2025-01-01', periods=3)
+    return pd.DataFrame({
+        'date': list(dates) * 2,
+        'ticker': ['SPX Index'] * 3 + ['AAPL US Equity'] * 3,
+        'data_type': 'realized',
+        'realized_vol_30d': [15.0, 16.0, 17.0, 25.0, 26.0, 27.0]
+    })
+
+
+def test_latest_manifest_points_at_newest_write(tmp_path):
+    writer = ColumnarDatasetWriter(str(tmp_path), 'ten_year_volatility')
+    writer.write(_dataset(), tag='first')
+    second = writer.write(_dataset().assign(realized_vol_30d=1.0), tag='second')
+
+    manifest = writer.load_manifest()
+    assert manifest['file'] == os.path.basename(second)
+    assert manifest['rows'] == 6
+    assert writer.load_latest()['realized_vol_30d'].eq(1.0).all()
+
+
+def test_load_latest_filters_tickers_and_rows_are_grouped(tmp_path):
+    writer = ColumnarDatasetWriter(str(tmp_path), 'ten_year_volatility')
+    writer.write(_dataset(), tag='data')
+
+    # Sorted by ticker on write, so each ticker is contiguous
+    assert writer.load_latest(columns=['ticker'])['ticker'].tolist() == ['AAPL US Equity'] * 3 + ['SPX Index'] * 3
+    spx = writer.load_latest(tickers=['SPX Index'])
+    assert spx['realized_vol_30d'].tolist() == [15.0, 16.0, 17.0]
+
+
+def test_legacy_latest_files_are_opt_in(tmp_path):
+    writer = ColumnarDatasetWriter(str(tmp_path), 'ten_year_volatility')
+    writer.write(_dataset(), tag='data')
+    assert not os.path.exists(writer.latest_csv_file)
+    assert not os.path.exists(writer.latest_parquet_file)
+
+    writer.legacy_latest = True
+    writer.write(_dataset(), tag='again')
+    assert len(pd.read_csv(writer.latest_csv_file)) == 6
+    assert len(pd.read_parquet(writer.latest_parquet_file)) == 6
+
+
+def test_export_csv_on_demand(tmp_path):
+    writer = ColumnarDatasetWriter(str(tmp_path), 'historical_volatility')
+    assert writer.export_csv() is None
+
+    writer.write(_dataset(), tag='data')
+    csv_file = writer.export_csv()
+    assert csv_file == writer.latest_csv_file
+    assert pd.read_csv(csv_file)['realized_vol_30d'].sum() == _dataset()['realized_vol_30d'].sum()
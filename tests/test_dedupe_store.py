@@ -0,0 +1,97 @@
+"""
+Dedupe Store Tests
+Deduplication, revision detection and compaction of the content-addressed
+volatility store, and the unified frame built from it.
+"""
+
+import os
+
+import pandas as pd
+
+from src.utils.dedupe_store import DedupeVolatilityStore
+
+
+def _pull(values, ticker='SPX Index'):
+    return pd.DataFrame({
+        'date': pd.bdate_range('2025-01-01', periods=len(values)),
+        'ticker': ticker,
+        'data_type': 'realized',
+        'realized_vol_30d': values
+    })
+
+
+def test_identical_pull_writes_nothing(tmp_path):
+    store = DedupeVolatilityStore(str(tmp_path))
+    first = store.ingest(_pull([15.0, 16.0, 17.0]), 'first')
+    second = store.ingest(_pull([15.0, 16.0, 17.0]), 'second')
+
+    assert first['blocks_written'] == 1
+    assert second['blocks_written'] == 0
+    assert second['blocks_unchanged'] == 1
+    assert second['revisions'] == 0
+
+
+def test_restated_value_is_logged_as_revision(tmp_path):
+    store = DedupeVolatilityStore(str(tmp_path))
+    store.ingest(_pull([15.0, 16.0, 17.0]), 'first')
+    stats = store.ingest(_pull([15.0, 16.5, 17.0]), 'second')
+
+    assert stats['revisions'] == 1
+    revisions = store.load_revisions('SPX Index')
+    assert len(revisions) == 1
+    revision = revisions.iloc[0]
+    assert revision['field'] == 'VOLATILITY_30D'
+    assert (revision['old_value'], revision['new_value'], revision['source']) == (16.0, 16.5, 'second')
+
+    # The restated value replaces the old one
+    loaded = store.load(tickers=['SPX Index'])
+    assert sorted(loaded['value']) == [15.0, 16.5, 17.0]
+
+
+def test_non_volatility_columns_are_skipped(tmp_path):
+    store = DedupeVolatilityStore(str(tmp_path))
+    df = _pull([15.0, 16.0]).assign(weight=[0.07, 0.07])
+
+    assert store.value_columns(df) == ['realized_vol_30d']
+    assert set(store.value_columns(df, fields=['weight'])) == {'realized_vol_30d', 'weight'}
+
+
+def test_daily_ingest_compacts_superseded_blocks(tmp_path):
+    store = DedupeVolatilityStore(str(tmp_path))
+    values = [15.0, 16.0]
+    compactions = 0
+    # Each day's pull rewrites the whole current-year block
+    for day in range(10):
+        values.append(17.0 + day)
+        compactions += store.ingest(_pull(values), f'day_{day}')['compacted']
+
+    assert compactions > 0
+    assert not store.needs_compaction()
+    assert len(os.listdir(store.pack_dir)) < 10
+    assert store.load(tickers=['SPX Index'])['value'].tolist() == values
+
+
+def test_bulk_ingest_can_defer_compaction(tmp_path):
+    store = DedupeVolatilityStore(str(tmp_path))
+    for day in range(4):
+        store.ingest(_pull([15.0] * (day + 1)), f'day_{day}', compact=False)
+
+    assert len(os.listdir(store.pack_dir)) == 4
+    assert store.compact()['packs_removed'] == 4
+    assert len(os.listdir(store.pack_dir)) == 1
+
+
+def test_load_frame_unifies_overlapping_pulls(tmp_path):
+    store = DedupeVolatilityStore(str(tmp_path))
+    store.ingest(_pull([15.0, 16.0, 17.0]), 'three_year')
+    store.ingest(_pull([16.0, 17.0, 18.0]).assign(date=pd.bdate_range('2025-01-02', periods=3)), 'incremental')
+    implied = _pull([20.0]).assign(data_type='implied').rename(columns={'realized_vol_30d': 'implied_vol_3m_atm'})
+    store.ingest(implied, 'implied')
+
+    frame = store.load_frame({'realized': {'realized_vol_30d': 'VOLATILITY_30D'},
+                              'implied': {'implied_vol_3m_atm': '3MTH_IMPVOL_100.0%MNY_DF'}})
+
+    assert list(frame.columns) == ['date', 'ticker', 'data_type', 'realized_vol_30d', 'implied_vol_3m_atm']
+    realized = frame[frame['data_type'] == 'realized']
+    assert realized['realized_vol_30d'].tolist() == [15.0, 16.0, 17.0, 18.0]
+    assert frame.loc[frame['data_type'] == 'implied', 'implied_vol_3m_atm'].tolist() == [20.0]
@@ -0,0 +1,62 @@
+"""
+Delta Selection Tests
+The vectorized target-delta pick against a per-group loop, ties, and the
+maximum delta error.
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.analysis.delta_selection import select_target_delta_options
+
+
+def _chain(seed=11):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for date in pd.bdate_range('2025-01-02', periods=20):
+        for expiry in ['2025-02-19', '2025-03-18']:
+            for strike in range(12, 40):
+                rows.append({'date': date, 'expiry_date': pd.Timestamp(expiry), 'strike': strike,
+                             'delta': rng.uniform(0.01, 0.99)})
+    return pd.DataFrame(rows)
+
+
+def test_selection_matches_per_group_loop():
+    chain = _chain()
+
+    selected = select_target_delta_options(chain, max_delta_error=None)
+
+    expected = []
+    for _, group in chain.groupby(['date', 'expiry_date']):
+        for target in (0.10, 0.50):
+            expected.append(group.loc[(group['delta'] - target).abs().idxmin(), 'strike'])
+    assert selected['strike'].tolist() == expected
+    assert selected['delta_label'].tolist()[:2] == ['10Δ', '50Δ']
+
+
+def test_ties_pick_lower_delta():
+    chain = pd.DataFrame({
+        'date': pd.Timestamp('2025-01-02'),
+        'expiry_date': pd.Timestamp('2025-02-19'),
+        'strike': [25, 20],
+        'delta': [0.375, 0.625]
+    })
+
+    selected = select_target_delta_options(chain, target_deltas=[0.5], max_delta_error=None)
+
+    assert selected['strike'].tolist() == [25]
+
+
+def test_picks_beyond_max_delta_error_are_dropped():
+    chain = pd.DataFrame({
+        'date': pd.Timestamp('2025-01-02'),
+        'expiry_date': pd.Timestamp('2025-02-19'),
+        'strike': [30, 20],
+        'delta': [0.11, 0.70]
+    })
+
+    selected = select_target_delta_options(chain)
+
+    # Nothing is within 5 delta points of 50 delta
+    assert selected['strike'].tolist() == [30]
+    assert selected['target_delta'].tolist() == [0.10]
@@ -0,0 +1,75 @@
+"""
+Forward Alignment Tests
+Trading-session horizons across holidays, merge_asof matching of realized vol,
+and the one-pass comparisons built on top of align_forward.
+"""
+
+import pandas as pd
+
+from src.analysis.forward_alignment import align_forward, split_by_tenor
+from src.lagged_volatility_analysis import create_forward_comparison, create_lagged_volatility_comparison
+
+
+def _frame(dates, **columns):
+    return pd.DataFrame({'date': pd.to_datetime(dates), 'ticker': 'SPX Index', **columns})
+
+
+def test_horizon_counts_sessions_across_holidays():
+    implied = _frame(['2025-07-02'], implied_vol_1m_atm=[18.0])
+    realized = _frame(['2025-07-03', '2025-07-07', '2025-07-08'], realized_vol_30d=[14.0, 15.0, 16.0])
+
+    aligned = align_forward(implied, realized, pairs=[('implied_vol_1m_atm', 'realized_vol_30d', 2)])
+
+    # 2025-07-04 is Independence Day: two sessions after 07-02 is 07-07, not 07-04
+    row = aligned.iloc[0]
+    assert row['target_date'] == pd.Timestamp('2025-07-07')
+    assert row['realized_vol'] == 15.0
+    assert row['vol_spread'] == 3.0
+
+
+def test_gap_at_target_matches_nearest_observation_within_tolerance():
+    implied = _frame(['2025-03-03', '2025-03-04'], implied_vol_1m_atm=[20.0, 21.0])
+    # No realized value on the 03-06 target, and nothing near the 03-07 target but 03-21
+    realized = _frame(['2025-03-05', '2025-03-21'], realized_vol_30d=[17.0, 30.0])
+
+    aligned = align_forward(implied, realized, pairs=[('implied_vol_1m_atm', 'realized_vol_30d', 3)],
+                            tolerance=pd.Timedelta(days=1))
+
+    assert aligned['date'].tolist() == [pd.Timestamp('2025-03-03')]
+    assert aligned['realized_date'].tolist() == [pd.Timestamp('2025-03-05')]
+
+
+def test_single_ticker_frames_without_ticker_column():
+    dates = pd.bdate_range('2025-01-02', periods=10)
+    implied = pd.DataFrame({'date': dates, 'implied_vol_1m_atm': 20.0})
+    realized = pd.DataFrame({'date': dates, 'realized_vol_30d': range(10)})
+
+    comparison = create_forward_comparison(implied, realized, 'implied_vol_1m_atm', 'realized_vol_30d',
+                                           3, '1M Implied vs 30D Future Realized')
+
+    assert (comparison['ticker'] == 'SPX Index').all()
+    # Three sessions after 2025-01-02 is 01-07, the fourth row
+    assert comparison['realized_vol_30d'].iloc[0] == 3
+
+
+def test_one_pass_comparisons_match_per_pair_alignment():
+    dates = pd.bdate_range('2024-01-02', periods=300)
+    implied = _frame(dates, implied_vol_1m_atm=20.0, implied_vol_3m_atm=21.0, implied_vol_6m_atm=22.0)
+    realized = _frame(dates, realized_vol_30d=range(300), realized_vol_90d=range(300),
+                      realized_vol_180d=range(300))
+    df = pd.concat([implied.assign(data_type='implied'), realized.assign(data_type='realized')])
+
+    comparisons = create_lagged_volatility_comparison(df)
+    by_tenor = split_by_tenor(align_forward(implied, realized))
+
+    assert [c['comparison_type'].iloc[0] for c in comparisons] == [
+        '1M Implied vs 30D Future Realized',
+        '3M Implied vs 90D Future Realized',
+        '6M Implied vs 180D Future Realized'
+    ]
+    assert list(by_tenor) == [30, 90, 180]
+    for comparison, tenor in zip(comparisons, [30, 90, 180]):
+        single = create_forward_comparison(implied, realized, comparison.columns[2], comparison.columns[3],
+                                           tenor, 'single')
+        pd.testing.assert_frame_equal(comparison.drop(columns='comparison_type'),
+                                      single.drop(columns='comparison_type'))
@@ -0,0 +1,64 @@
+"""
+Job Graph Tests
+Dependency handling of the in-process job executor: retries, and skipping
+the jobs downstream of a failure.
+"""
+
+import pytest
+
+from src.data_collection.job_dag import JobContext, JobGraph
+
+
+def test_failed_dependency_skips_dependents():
+    ran = []
+
+    def job(name, success=True):
+        def run(context):
+            ran.append(name)
+            return success
+        return run
+
+    graph = JobGraph()
+    graph.add('weights', job('weights', success=False))
+    graph.add('historical', job('historical'), depends_on=['weights'])
+    graph.add('strategy', job('strategy'), depends_on=['historical'])
+    graph.add('vix', job('vix'))
+    results = graph.run(JobContext())
+
+    assert results['weights']['status'] == 'failed'
+    assert results['historical']['status'] == 'skipped'
+    assert results['strategy']['status'] == 'skipped'
+    assert results['vix']['status'] == 'success'
+    assert sorted(ran) == ['vix', 'weights']
+
+
+def test_failed_job_is_retried():
+    attempts = []
+
+    def flaky(context):
+        attempts.append(len(attempts) + 1)
+        if len(attempts) == 1:
+            raise ConnectionError('Bloomberg session dropped')
+        return True
+
+    graph = JobGraph()
+    graph.add('flaky', flaky, max_attempts=3)
+    graph.add('after', lambda context: context.results['flaky']['success'], depends_on=['flaky'])
+    results = graph.run(JobContext())
+
+    assert results['flaky']['status'] == 'success'
+    assert results['flaky']['attempts'] == 2
+    assert results['after']['status'] == 'success'
+
+
+def test_validate_rejects_cycles_and_unknown_dependencies():
+    graph = JobGraph()
+    graph.add('a', lambda context: True, depends_on=['b'])
+    graph.add('b', lambda context: True, depends_on=['a'])
+    with pytest.raises(ValueError, match='cycle'):
+        graph.validate()
+
+    graph = JobGraph()
+    graph.add('a', lambda context: True, depends_on=['missing'])
+    with pytest.raises(ValueError, match='unknown'):
+        graph.validate()
@@ -0,0 +1,169 @@
+"""
+Market Close Trigger Tests
+Picking the next trading session across weekends and holidays, and probing for
+the settlement until it is published or the deadline passes, on a fake clock
+and a stand-in Bloomberg session.
+"""
+
+import sys
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+from zoneinfo import ZoneInfo
+
+from src.data_collection.market_close_trigger import MarketCloseTrigger, settlement_probe
+from src.data_collection.session_pool import BloombergSessionPool
+
+EASTERN = ZoneInfo('US/Eastern')
+
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += timedelta(seconds=seconds)
+
+
+def _trigger(now, probe=None, **kwargs):
+    clock = FakeClock(datetime(*now, tzinfo=EASTERN))
+    return MarketCloseTrigger(probe=probe, clock=clock, sleep=clock.sleep, **kwargs), clock
+
+
+def test_next_session_skips_weekend_and_holiday():
+    # Friday 2025-07-04 is Independence Day, so from Thursday night the next session is Monday
+    trigger, _ = _trigger((2025, 7, 3, 21, 0))
+    assert trigger.next_session() == date(2025, 7, 7)
+
+    # Before the deadline the same day is still due, until it has fired
+    trigger, _ = _trigger((2025, 7, 3, 19, 0))
+    assert trigger.next_session() == date(2025, 7, 3)
+    trigger.last_session = date(2025, 7, 3)
+    assert trigger.next_session() == date(2025, 7, 7)
+
+
+def test_wait_for_data_fires_on_first_positive_probe():
+    answers = iter([False, False, True])
+    trigger, clock = _trigger((2025, 7, 7, 9, 30), probe=lambda session_date: next(answers))
+
+    assert trigger.wait_for_data(date(2025, 7, 7)) == 'available'
+    # First probe at 16:15, then every 5 minutes
+    assert clock.now == datetime(2025, 7, 7, 16, 25, tzinfo=EASTERN)
+
+
+def test_wait_for_data_runs_anyway_at_deadline():
+    def probe(session_date):
+        raise ConnectionError('no session')
+
+    trigger, clock = _trigger((2025, 7, 7, 16, 0), probe=probe, deadline_time='17:00')
+
+    assert trigger.wait_for_data(date(2025, 7, 7)) == 'deadline'
+    assert clock.now == datetime(2025, 7, 7, 17, 0, tzinfo=EASTERN)
+
+
+def test_without_probe_fires_at_close_plus_delay():
+    trigger, clock = _trigger((2025, 7, 7, 12, 0), settle_delay_minutes=30)
+
+    assert trigger.wait_for_data(date(2025, 7, 7)) == 'scheduled'
+    assert clock.now == datetime(2025, 7, 7, 16, 30, tzinfo=EASTERN)
+
+
+class Element:
+    def __init__(self, value):
+        self.value = value
+
+    def hasElement(self, name):
+        return name in self.value
+
+    def getElement(self, name):
+        return Element(self.value[name])
+
+    def numValues(self):
+        return len(self.value)
+
+    def getValue(self, index):
+        return Element(self.value[index])
+
+
+class Event:
+    RESPONSE, PARTIAL_RESPONSE, TIMEOUT = 'RESPONSE', 'PARTIAL_RESPONSE', 'TIMEOUT'
+
+    def __init__(self, event_type, messages=()):
+        self.event_type = event_type
+        self.messages = messages
+
+    def eventType(self):
+        return self.event_type
+
+    def __iter__(self):
+        return iter(self.messages)
+
+
+class Values(list):
+    appendValue = list.append
+
+
+class Request(dict):
+    def getElement(self, name):
+        return self.setdefault(name, Values())
+
+    set = dict.__setitem__
+
+
+class FakeSession:
+    """Session and refdata service in one; answers with a settle unless silent"""
+
+    def __init__(self, silent=False):
+        self.silent = silent
+        self.requests = []
+        self.events = []
+        self.stopped = False
+
+    def createRequest(self, name):
+        return Request()
+
+    def sendRequest(self, request):
+        self.requests.append(request)
+        if not self.silent:
+            data = {'securityData': {'fieldData': [{'date': request['startDate'], 'PX_SETTLE': 17.85}]}}
+            self.events.append(Event(Event.RESPONSE, [Element(data)]))
+
+    def nextEvent(self, timeout):
+        return self.events.pop(0) if self.events else Event(Event.TIMEOUT)
+
+    def stop(self):
+        self.stopped = True
+
+
+def _pool(silent=False):
+    def factory():
+        session = FakeSession(silent)
+        return session, session
+
+    return BloombergSessionPool(size=1, session_factory=factory)
+
+
+def test_settlement_probe_reports_published_value(monkeypatch):
+    monkeypatch.setitem(sys.modules, 'blpapi', SimpleNamespace(Event=Event))
+    pool = _pool()
+
+    assert settlement_probe(pool)(date(2025, 7, 7))
+    # The session went back to the pool
+    session, _ = pool.acquire(timeout=0.05)
+    assert session.requests == [{'securities': ['UX1 Index'], 'fields': ['PX_SETTLE'],
+                                 'startDate': '20250707', 'endDate': '20250707'}]
+
+
+def test_settlement_probe_discards_session_on_timeout(monkeypatch):
+    monkeypatch.setitem(sys.modules, 'blpapi', SimpleNamespace(Event=Event))
+    pool = _pool(silent=True)
+    first = pool.acquire()
+    pool.release(first)
+
+    assert not settlement_probe(pool)(date(2025, 7, 7))
+    assert first[0].stopped
+    assert pool.acquire(timeout=0.05) is not first
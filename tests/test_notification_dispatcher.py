@@ -0,0 +1,91 @@
+"""
+Notification Dispatcher Tests
+Coalescing into digests, errors ending the window early, per-sink rate limits
+and config handling, with LocalSink in place of email and Slack.
+"""
+
+import json
+import time
+from datetime import datetime
+
+from src.utils.notification_dispatcher import LocalSink, NotificationDispatcher, dispatcher_from_config
+
+
+class FailingSink:
+    name = 'failing'
+
+    def send(self, subject, body):
+        raise ConnectionError('smtp down')
+
+    def close(self):
+        pass
+
+
+def _wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_notifications_in_window_are_coalesced():
+    sink = LocalSink()
+    dispatcher = NotificationDispatcher([sink], coalesce_seconds=30, min_interval_seconds=0)
+    for n in range(3):
+        assert dispatcher.notify(f'Collection {n}', f'body {n}')
+
+    assert dispatcher.flush(timeout=5)
+
+    assert len(sink.sent) == 1
+    assert sink.sent[0]['subject'] == '3 notifications'
+    assert all(f'Collection {n}' in sink.sent[0]['body'] for n in range(3))
+    dispatcher.close()
+
+
+def test_error_ends_the_window_early():
+    sink = LocalSink()
+    dispatcher = NotificationDispatcher([sink], coalesce_seconds=60, min_interval_seconds=0)
+    dispatcher.notify('Started', 'collection started')
+    dispatcher.notify('Failed', 'collection failed', level='error')
+
+    # No flush: the error alone sends the digest
+    assert _wait_for(lambda: len(sink.sent) == 1)
+    assert sink.sent[0]['subject'] == '2 notifications (1 error)'
+    dispatcher.close()
+
+
+def test_sends_to_a_sink_are_rate_limited():
+    sink = LocalSink()
+    dispatcher = NotificationDispatcher([sink], coalesce_seconds=0, min_interval_seconds=0.3)
+    dispatcher.notify('First', 'one')
+    dispatcher.flush(timeout=5)
+    dispatcher.notify('Second', 'two')
+    dispatcher.flush(timeout=5)
+
+    first, second = (datetime.fromisoformat(record['sent_at']) for record in sink.sent)
+    assert (second - first).total_seconds() >= 0.29
+    dispatcher.close()
+
+
+def test_failing_sink_does_not_stop_others(tmp_path):
+    path = str(tmp_path / 'notifications.jsonl')
+    sink = LocalSink(path)
+    dispatcher = NotificationDispatcher([FailingSink(), sink], coalesce_seconds=30, min_interval_seconds=0)
+    dispatcher.notify('Daily Collection Success', 'all good')
+
+    # close() flushes what is pending before stopping the worker
+    dispatcher.close()
+
+    with open(path) as f:
+        assert [json.loads(line)['subject'] for line in f] == ['Daily Collection Success']
+
+
+def test_dispatcher_from_config(tmp_path):
+    local = dispatcher_from_config({'sender_email': 'a@example.com', 'recipient_emails': ['b@example.com']},
+                                   local_path=str(tmp_path / 'out.jsonl'))
+    assert [type(sink) for sink in local.sinks] == [LocalSink]
+
+    placeholder = dispatcher_from_config({'sender_email': '', 'recipient_emails': []},
+                                         {'webhook_url': 'https://hooks.slack.com/services/YOUR/WEBHOOK/URL'})
+    assert placeholder.sinks == []
+    assert not placeholder.notify('Ignored', 'no sinks configured')
@@ -0,0 +1,75 @@
+"""
+Realized Volatility Tests
+Close-to-close volatility against a direct computation, the range estimators on
+a simulated constant-volatility path, and the dataset layout of local columns.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analysis.realized_volatility import (ESTIMATORS, LOCAL_DATA_TYPE, realized_volatility,
+                                              realized_volatility_wide)
+
+
+def _simulated_prices(days=2000, sigma=0.20, steps=200, seed=7, ticker='SPX Index'):
+    """OHLC bars from a driftless intraday random walk with annualized volatility sigma"""
+    rng = np.random.default_rng(seed)
+    increments = rng.normal(0, sigma / np.sqrt(252 * steps), (days, steps))
+    path = np.log(100) + np.cumsum(increments.ravel()).reshape(days, steps)
+    opens = np.concatenate([[np.log(100)], path[:-1, -1]])
+    return pd.DataFrame({
+        'date': pd.bdate_range('2015-01-02', periods=days),
+        'ticker': ticker,
+        'open_price': np.exp(opens),
+        'high_price': np.exp(np.maximum(path.max(axis=1), opens)),
+        'low_price': np.exp(np.minimum(path.min(axis=1), opens)),
+        'last_price': np.exp(path[:, -1])
+    })
+
+
+def test_close_to_close_matches_direct_computation():
+    prices = pd.concat([_simulated_prices(days=60, ticker='SPX Index'),
+                        _simulated_prices(days=60, seed=8, ticker='AAPL US Equity')])
+
+    vol = realized_volatility(prices, windows=[21], estimators=['close_to_close'])
+
+    for ticker, group in prices.groupby('ticker'):
+        returns = np.log(group['last_price']).diff().iloc[-21:]
+        expected = returns.std(ddof=1) * np.sqrt(252) * 100
+        last = vol[vol['ticker'] == ticker].iloc[-1]
+        assert last['realized_vol'] == pytest.approx(expected)
+        assert last['date'] == group['date'].iloc[-1]
+    # The first full window ends on the 22nd price
+    assert len(vol) == 2 * (60 - 21)
+
+
+@pytest.mark.parametrize('estimator', ESTIMATORS)
+def test_estimators_recover_simulated_volatility(estimator):
+    prices = _simulated_prices()
+
+    vol = realized_volatility(prices, windows=[1500], estimators=[estimator])
+
+    # Range estimators read a discretely sampled high/low, so they sit slightly low
+    assert vol['realized_vol'].iloc[-1] == pytest.approx(20.0, rel=0.1)
+
+
+def test_range_estimators_skipped_without_ohlc():
+    prices = _simulated_prices(days=40)[['date', 'ticker', 'last_price']]
+
+    vol = realized_volatility(prices, windows=[21])
+
+    assert set(vol['estimator']) == {'close_to_close'}
+
+
+def test_wide_layout_uses_local_columns():
+    prices = _simulated_prices(days=300)
+
+    wide = realized_volatility_wide(prices, windows=(30, 90), estimators=('close_to_close', 'yang_zhang'))
+
+    assert wide.columns.tolist() == ['date', 'ticker', 'data_type', 'realized_vol_cc_30d',
+                                     'realized_vol_cc_90d', 'realized_vol_yz_30d', 'realized_vol_yz_90d']
+    assert (wide['data_type'] == LOCAL_DATA_TYPE).all()
+    # Rows start once the shortest window is full; longer windows are NaN until theirs is
+    assert wide['date'].iloc[0] == prices['date'].iloc[30]
+    assert wide['realized_vol_cc_90d'].isna().sum() == 60
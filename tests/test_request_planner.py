@@ -0,0 +1,74 @@
+"""
+Request Planner Tests
+Window merging, shared requests across consumers and the fan-out of fetched
+rows back to each consumer's needs.
+"""
+
+import pandas as pd
+
+from src.data_collection.request_planner import DataNeed, RequestPlanner, merge_windows
+
+
+def _ts(value):
+    return pd.Timestamp(value)
+
+
+def test_merge_windows_joins_overlaps_and_short_gaps():
+    windows = [(_ts('2025-01-01'), _ts('2025-01-10')),
+               (_ts('2025-01-05'), _ts('2025-01-20')),
+               (_ts('2025-01-23'), _ts('2025-01-31')),    # Within the 3-day gap
+               (_ts('2025-03-01'), _ts('2025-03-31'))]
+
+    assert merge_windows(windows) == [(_ts('2025-01-01'), _ts('2025-01-31')),
+                                      (_ts('2025-03-01'), _ts('2025-03-31'))]
+
+
+def test_merge_windows_keeps_distant_windows_apart():
+    windows = [(_ts('2025-02-01'), _ts('2025-02-10')), (_ts('2025-01-01'), _ts('2025-01-10'))]
+
+    assert merge_windows(windows, max_gap_days=0) == sorted(windows)
+
+
+def test_shared_triples_are_requested_once():
+    planner = RequestPlanner()
+    planner.add('historical', [DataNeed('realized', ['SPX Index', 'AAPL US Equity'],
+                                        {'realized_vol_30d': 'VOLATILITY_30D'}, '2025-01-01', '2025-06-30')])
+    planner.add('labeled', [DataNeed('volatility', ['SPX Index'],
+                                     {'realized_vol_30d': 'VOLATILITY_30D'}, end_date='2025-06-30', snapshot=True)])
+
+    requests = planner.plan()
+    assert len(requests) == 1
+    assert sorted(requests[0].securities) == ['AAPL US Equity', 'SPX Index']
+    statistics = planner.statistics()
+    assert statistics['triples'] < statistics['standalone_triples']
+
+
+def test_fan_out_splits_rows_per_consumer():
+    planner = RequestPlanner()
+    planner.add('historical', [DataNeed('realized', ['AAPL US Equity', 'SPX Index'],
+                                        {'realized_vol_30d': 'VOLATILITY_30D'}, '2025-06-02', '2025-06-06')])
+    planner.add('labeled', [DataNeed('volatility', ['SPX Index'],
+                                     {'realized_vol_30d': 'VOLATILITY_30D', 'implied_vol_3m_atm': '3MTH_IMPVOL_100.0%MNY_DF'},
+                                     end_date='2025-06-06', snapshot=True)])
+    dates = pd.bdate_range('2025-06-02', '2025-06-06')
+    df = pd.DataFrame({
+        'date': list(dates) * 2,
+        'ticker': ['SPX Index'] * 5 + ['AAPL US Equity'] * 5,
+        'VOLATILITY_30D': [10.0, 11.0, 12.0, 13.0, 14.0, 20.0, 21.0, 22.0, 23.0, 24.0],
+        '3MTH_IMPVOL_100.0%MNY_DF': [15.0, 16.0, 17.0, None, None] + [None] * 5
+    })
+
+    results = planner.fan_out(df, failed_securities=['AAPL US Equity'], security_errors={'BAD Index': 'Unknown'})
+
+    realized = results['historical'].frame('realized')
+    assert list(realized.columns) == ['date', 'ticker', 'realized_vol_30d']
+    assert realized['ticker'].tolist() == ['AAPL US Equity'] * 5 + ['SPX Index'] * 5    # Declared order
+    assert results['historical'].failed_securities == ['AAPL US Equity']
+
+    # Snapshot: the latest value of each field, even when it is from different days
+    snapshot = results['labeled'].frame('volatility')
+    assert len(snapshot) == 1
+    assert snapshot.loc[0, 'realized_vol_30d'] == 14.0
+    assert snapshot.loc[0, 'implied_vol_3m_atm'] == 17.0
+    assert results['labeled'].failed_securities == []
+    assert results['labeled'].security_errors == {}
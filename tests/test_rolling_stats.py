@@ -0,0 +1,84 @@
+"""
+Rolling Statistics Tests
+Streaming premium statistics against the batch pandas computation, persisted
+across several incremental updates.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analysis.rolling_stats import RollingWindowStats, RunningStats, StreamingPremiumStats
+
+
+def _aligned(periods=300, seed=3):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range('2023-01-02', periods=periods)
+    implied = rng.uniform(10, 40, periods)
+    return pd.DataFrame({
+        'date': dates,
+        'ticker': 'SPX Index',
+        'tenor_days': 30,
+        'implied_vol': implied,
+        'vol_spread': implied - rng.uniform(8, 35, periods)
+    })
+
+
+def test_running_stats_match_pandas():
+    values = pd.Series(np.random.default_rng(0).normal(2, 5, 500))
+    stats = RunningStats()
+    for x in values:
+        stats.add(x)
+
+    assert stats.mean == pytest.approx(values.mean())
+    assert stats.std == pytest.approx(values.std())
+    assert (stats.min, stats.max) == (values.min(), values.max())
+
+
+def test_rolling_window_matches_pandas_rolling():
+    values = pd.Series(np.random.default_rng(1).normal(0, 3, 200))
+    window = RollingWindowStats(window=20)
+    for i, x in enumerate(values):
+        window.add(str(i), x)
+
+    tail = values.iloc[-20:]
+    assert window.mean == pytest.approx(tail.mean())
+    assert window.std == pytest.approx(tail.std())
+    for q in (0.05, 0.5, 0.95):
+        assert window.quantile(q) == pytest.approx(tail.quantile(q))
+    assert window.center_date == str(len(values) - 20 + 10)
+
+
+def test_incremental_updates_match_batch(tmp_path):
+    aligned = _aligned()
+    stats = StreamingPremiumStats(str(tmp_path))
+    # Three daily runs with overlapping batches; the overlap must not be counted twice
+    stats.update(aligned.iloc[:100])
+    stats.update(aligned.iloc[50:200])
+    snapshot = stats.update(aligned.iloc[150:]).iloc[0]
+
+    spread = aligned['vol_spread']
+    assert snapshot['observations'] == len(aligned)
+    assert snapshot['mean_premium'] == pytest.approx(spread.mean())
+    assert snapshot['std_premium'] == pytest.approx(spread.std())
+    assert snapshot['implied_higher_pct'] == pytest.approx((spread > 0).mean() * 100)
+    assert snapshot['rolling_mean'] == pytest.approx(spread.rolling(60).mean().iloc[-1])
+    assert snapshot['rolling_q95'] == pytest.approx(spread.iloc[-60:].quantile(0.95))
+    assert snapshot['last_date'] == aligned['date'].iloc[-1].strftime('%Y-%m-%d')
+
+    regimes = stats.regimes().set_index('vol_regime')
+    by_regime = spread.groupby(pd.cut(aligned['implied_vol'], [0, 12, 20, 30, np.inf],
+                                      labels=['Very Low Vol', 'Low Vol', 'Elevated Vol', 'High Vol']),
+                               observed=True)
+    for label, group in by_regime:
+        assert regimes.loc[label, 'count'] == len(group)
+        assert regimes.loc[label, 'mean'] == pytest.approx(group.mean())
+
+
+def test_rerun_without_new_rows_changes_nothing(tmp_path):
+    aligned = _aligned(periods=80)
+    stats = StreamingPremiumStats(str(tmp_path))
+    stats.update(aligned)
+
+    assert stats.update(aligned).empty
+    assert stats.last_dates() == {('SPX Index', 30): aligned['date'].iloc[-1]}
@@ -0,0 +1,77 @@
+"""
+Run-State Store Tests
+Runs and their jobs, incremental collection progress, and the staleness query
+the daily report relies on.
+"""
+
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.data_collection.run_state import RunStateStore
+
+
+def test_run_with_tasks_and_success_rate(tmp_path):
+    store = RunStateStore(str(tmp_path / 'run_state.db'))
+    run_id = store.start_run('vix_daily', session_date='2025-03-14', trigger='available')
+    store.record_task(run_id, 'VIX Data Collection', 'success', attempts=3, rows=1200)
+    store.record_task(run_id, 'Daily Report', 'failed', error='SMTP timeout')
+    store.finish_run(run_id, 'partial')
+
+    run = store.recent_runs('vix_daily')[0]
+    assert (run['status'], run['session_date'], run['trigger']) == ('partial', '2025-03-14', 'available')
+    assert run['duration_seconds'] is not None
+    tasks = store.run_tasks(run_id)
+    assert [(task['name'], task['retries']) for task in tasks] == [('VIX Data Collection', 2), ('Daily Report', 0)]
+    assert store.task_success_rate(datetime.now() - timedelta(hours=1)) == {
+        'VIX Data Collection': (1, 1), 'Daily Report': (0, 1)}
+
+
+def test_collection_details_merge_across_updates(tmp_path):
+    store = RunStateStore(str(tmp_path / 'run_state.db'))
+    collection_id = store.start_collection('historical_volatility', '20250101', '20250301',
+                                           details={'tickers': 52})
+    store.update_collection(collection_id, rows=1000, details={'failed_securities': ['BAD Index']})
+    store.finish_collection(collection_id, 'partial', rows=2000, failed_tasks=1)
+
+    record = store.last_collection('historical_volatility')
+    assert record['status'] == 'partial'
+    assert record['rows'] == 2000 and record['failed_tasks'] == 1
+    assert record['details'] == {'tickers': 52, 'failed_securities': ['BAD Index']}
+    assert store.last_collection('historical_volatility', status='success') is None
+
+    with pytest.raises(ValueError):
+        store.update_collection(collection_id, bogus=1)
+
+
+def test_stale_collections(tmp_path):
+    db_path = str(tmp_path / 'run_state.db')
+    store = RunStateStore(db_path)
+    fresh = store.start_collection('vix_data')
+    store.finish_collection(fresh, 'success')
+    old = store.start_collection('historical_volatility')
+    store.finish_collection(old, 'success')
+    store.finish_collection(store.start_collection('ten_year_volatility'), 'failed')
+
+    two_days_ago = (datetime.now() - timedelta(days=2)).isoformat(timespec='seconds')
+    with sqlite3.connect(db_path) as conn:
+        conn.execute('UPDATE collections SET finished_at = ? WHERE collection_id = ?', (two_days_ago, old))
+
+    stale = store.stale_collections(['vix_data', 'historical_volatility', 'ten_year_volatility'])
+    assert stale == {'historical_volatility': two_days_ago, 'ten_year_volatility': None}
+
+
+def test_concurrent_job_threads_share_the_store(tmp_path):
+    store = RunStateStore(str(tmp_path / 'run_state.db'))
+    run_id = store.start_run('scheduler')
+
+    threads = [threading.Thread(target=store.record_task, args=(run_id, f'job {n}', 'success'))
+               for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(store.run_tasks(run_id)) == 8
@@ -0,0 +1,128 @@
+"""
+Session Pool Tests
+Borrowing, timeouts and discarding of pooled sessions, with a stand-in session
+factory instead of Bloomberg.
+"""
+
+import threading
+
+import pytest
+
+from src.data_collection.session_pool import BloombergSessionPool, PooledSessionMixin
+
+
+class Fetcher(PooledSessionMixin):
+    def __init__(self):
+        self.session = None
+        self.refDataService = None
+
+
+class FakeSession:
+    def __init__(self):
+        self.stopped = False
+
+    def stop(self):
+        self.stopped = True
+
+
+def _pool(size=1):
+    opened = []
+
+    def factory():
+        opened.append((FakeSession(), 'service'))
+        return opened[-1]
+
+    return BloombergSessionPool(size=size, session_factory=factory), opened
+
+
+def _acquire_in_thread(pool):
+    result = {}
+
+    def run():
+        result['pair'] = pool.acquire(timeout=5)
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread, result
+
+
+def test_released_session_is_reused():
+    pool, opened = _pool(size=2)
+    pair = pool.acquire()
+    pool.release(pair)
+
+    assert pool.acquire() is pair
+    assert len(opened) == 1
+
+
+def test_acquire_times_out_when_pool_is_exhausted():
+    pool, _ = _pool(size=1)
+    pool.acquire()
+
+    with pytest.raises(TimeoutError):
+        pool.acquire(timeout=0.05)
+
+
+def test_release_wakes_a_waiting_acquire():
+    pool, _ = _pool(size=1)
+    pair = pool.acquire()
+    thread, result = _acquire_in_thread(pool)
+    pool.release(pair)
+    thread.join(5)
+
+    assert result['pair'] is pair
+
+
+def test_discard_stops_session_and_wakes_a_waiting_acquire():
+    pool, opened = _pool(size=1)
+    pair = pool.acquire()
+    thread, result = _acquire_in_thread(pool)
+    pool.discard(pair)
+    thread.join(5)
+
+    assert not thread.is_alive()
+    assert pair[0].stopped
+    # The freed slot starts a new session instead of handing out the discarded one
+    assert result['pair'] is not pair
+    assert len(opened) == 2
+
+
+def test_close_stops_sessions_and_drops_late_releases():
+    pool, _ = _pool(size=2)
+    first, second = pool.acquire(), pool.acquire()
+    pool.release(first)
+
+    assert pool.close() == 2
+    assert first[0].stopped and second[0].stopped
+
+    # A session borrowed before close() never returns to the pool
+    pool.release(second)
+    assert pool.acquire() is not second
+
+
+def test_fetcher_releases_session_unless_a_request_timed_out():
+    pool, opened = _pool(size=1)
+    fetcher = Fetcher()
+    fetcher.borrow_session(pool)
+    pair = (fetcher.session, fetcher.refDataService)
+    assert fetcher.return_session()
+    assert fetcher.session is None and not pair[0].stopped
+
+    fetcher.borrow_session(pool)
+    assert (fetcher.session, fetcher.refDataService) == pair
+    fetcher.session_timed_out = True
+    assert fetcher.return_session()
+    assert pair[0].stopped
+
+    # The next borrow starts a clean session with the flag reset
+    fetcher.borrow_session(pool)
+    assert fetcher.session is not pair[0] and not fetcher.session_timed_out
+    assert len(opened) == 2
+
+
+def test_return_session_leaves_own_sessions_alone():
+    fetcher = Fetcher()
+    fetcher.session = FakeSession()
+
+    assert not fetcher.return_session()
+    assert not fetcher.session.stopped
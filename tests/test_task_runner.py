@@ -0,0 +1,66 @@
+"""
+Task Runner Tests
+Retrying only the failed tasks with backoff, giving up after max_attempts, and
+skipping tasks a previous run already journaled.
+"""
+
+import pandas as pd
+
+from src.data_collection.task_runner import TaskRunner, build_tasks
+
+
+def _frame(task):
+    return pd.DataFrame({'ticker': [task.security], 'field_group': [task.field_group], 'value': [1.0]})
+
+
+def test_only_failed_tasks_are_retried(tmp_path):
+    tasks = build_tasks(['SPX Index', 'AAPL US Equity'], ['realized', 'implied'], '20250101', '20250301')
+    calls = []
+    delays = []
+
+    def fetch(task):
+        calls.append(task.key)
+        if task.security == 'AAPL US Equity' and calls.count(task.key) < 3:
+            raise TimeoutError('no response')
+        return _frame(task)
+
+    runner = TaskRunner(str(tmp_path), base_delay=1.0, sleep=delays.append)
+    summary = runner.run(tasks, fetch)
+
+    assert summary == {'skipped': 0, 'completed': 4, 'retries': 4, 'failed': {}}
+    assert len(calls) == 8
+    # Backoff doubles per round, within the jitter
+    assert 0.8 <= delays[0] <= 1.2 and 1.6 <= delays[1] <= 2.4
+    assert len(runner.load()) == 4
+
+
+def test_task_fails_after_max_attempts(tmp_path):
+    tasks = build_tasks(['SPX Index', 'BAD Index'], ['realized'], '20250101', '20250301')
+
+    def fetch(task):
+        if task.security == 'BAD Index':
+            raise ConnectionError('session dropped')
+        return _frame(task)
+
+    runner = TaskRunner(str(tmp_path), max_attempts=3, sleep=lambda seconds: None)
+    summary = runner.run(tasks, fetch)
+
+    assert summary['completed'] == 1
+    assert summary['failed'] == {'BAD Index|realized|20250101|20250301': 'ConnectionError: session dropped'}
+    assert runner.load()['ticker'].tolist() == ['SPX Index']
+
+
+def test_rerun_skips_journaled_tasks(tmp_path):
+    tasks = build_tasks(['SPX Index', 'AAPL US Equity'], ['realized'], '20250101', '20250301')
+    TaskRunner(str(tmp_path)).run(tasks[:1], _frame)
+    fetched = []
+
+    def fetch(task):
+        fetched.append(task.security)
+        return _frame(task)
+
+    summary = TaskRunner(str(tmp_path), workers=2).run(tasks, fetch)
+
+    assert summary['skipped'] == 1
+    assert fetched == ['AAPL US Equity']
+    assert sorted(TaskRunner(str(tmp_path)).load(tasks)['ticker']) == ['AAPL US Equity', 'SPX Index']
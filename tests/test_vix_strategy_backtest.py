@@ -0,0 +1,88 @@
+"""
+VIX Strategy Backtest Tests
+Monthly cycles and rolls, leg selection, and the P&L identities the daily
+attribution and the futures hedge must satisfy on a synthetic Black-76 market.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analysis.black76 import DAYS_PER_YEAR, black76_price
+from src.analysis.vix_strategy_backtest import GREEK_COLUMNS, backtest_vix_call_spread, build_cycles
+
+EXPIRIES = pd.to_datetime(['2025-02-19', '2025-03-18', '2025-04-16'])
+STRIKES = np.arange(10.0, 50.0, 0.5)
+
+
+def _market(seed=5, sigma=0.9):
+    """UX futures per expiry and call chains priced off them at a flat vol"""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range('2025-01-02', '2025-04-15')
+    spot = 18 + np.cumsum(rng.normal(0, 0.3, len(dates)))
+
+    futures, options = [], []
+    for n, expiry in enumerate(EXPIRIES):
+        live = dates < expiry
+        forward = spot[live] + 0.8 * (n + 1)
+        futures.append(pd.DataFrame({'date': dates[live], 'expiry_date': expiry, 'settle': forward}))
+        for date, f in zip(dates[live], forward):
+            years = (expiry - date).days / DAYS_PER_YEAR
+            options.append(pd.DataFrame({
+                'date': date,
+                'ticker': [f'VIX {expiry:%m/%d/%y} C{strike:g} Index' for strike in STRIKES],
+                'expiry_date': expiry,
+                'strike': STRIKES,
+                'mid': black76_price(f, STRIKES, years, sigma)
+            }))
+    return pd.concat(options, ignore_index=True), pd.concat(futures, ignore_index=True)
+
+
+def test_cycles_roll_one_session_before_expiry():
+    dates = pd.bdate_range('2025-01-02', '2025-03-31')
+
+    cycles = build_cycles(dates, EXPIRIES[:2])
+
+    assert cycles['entry_date'].tolist() == [pd.Timestamp('2025-01-02'), pd.Timestamp('2025-02-18')]
+    assert cycles['exit_date'].tolist() == [pd.Timestamp('2025-02-18'), pd.Timestamp('2025-03-17')]
+
+
+def test_legs_are_the_documented_call_spread():
+    options, futures = _market()
+
+    result = backtest_vix_call_spread(options, futures)
+
+    legs = result['legs']
+    assert legs['cycle'].nunique() == len(result['cycles']) == 3
+    assert legs.groupby('target_delta')['quantity'].first().to_dict() == {10: 2, 50: -1}
+    assert (legs['expiry_date'] == legs['cycle'].map(result['cycles']['expiry_date'])).all()
+    assert (legs['entry_delta'] - legs['target_delta'] / 100).abs().max() < 0.05
+
+
+def test_daily_pnl_identities():
+    options, futures = _market()
+
+    result = backtest_vix_call_spread(options, futures, option_cost=0.05)
+    daily, leg_days, hedge = result['daily'], result['leg_days'], result['hedge']
+
+    # Greeks plus residual explain the option P&L, leg by leg and in total
+    np.testing.assert_allclose(leg_days[GREEK_COLUMNS].sum(axis=1), leg_days['option_pnl'], atol=1e-9)
+    np.testing.assert_allclose(daily['short_50d_pnl'] + daily['long_10d_pnl'], daily['option_pnl'])
+    np.testing.assert_allclose(daily['total_pnl'], daily['option_pnl'] + daily['hedge_pnl'] - daily['costs'])
+
+    # A full delta hedge in the same future cancels the delta term exactly
+    np.testing.assert_allclose(daily['hedge_pnl'], -daily['delta_pnl'], atol=1e-6)
+    assert (hedge.loc[hedge['date'] == hedge['cycle'].map(result['cycles']['exit_date']),
+                      'hedge_contracts'] == 0).all()
+
+    # Three legs' contracts each bought and sold once per cycle
+    assert result['summary']['total_costs'] == pytest.approx(3 * 2 * 3 * 100 * 0.05)
+
+
+def test_unhedged_run_has_no_futures_pnl():
+    options, futures = _market()
+
+    result = backtest_vix_call_spread(options, futures, hedge=False)
+
+    assert (result['daily']['hedge_pnl'] == 0).all()
+    assert result['summary']['total_pnl'] == pytest.approx(result['daily']['option_pnl'].sum())
@@ -0,0 +1,70 @@
+"""
+VIX Term Structure Tests
+The futures expiry calendar (including holiday adjustments), rolling generic
+contracts onto expiries, and constant-maturity interpolation of a known curve.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analysis.vix_term_structure import (ConstantMaturityCurve, attach_expiries, term_structure_frame,
+                                             vix_futures_expiries)
+
+
+def test_expiry_calendar_2025():
+    expiries = vix_futures_expiries('2025-01-01', '2025-12-31')
+
+    # March is a Tuesday: April's third Friday is Good Friday, so it counts from Thursday
+    assert [day.strftime('%m-%d') for day in expiries] == [
+        '01-22', '02-19', '03-18', '04-16', '05-21', '06-18',
+        '07-16', '08-20', '09-17', '10-22', '11-19', '12-17'
+    ]
+
+
+def test_generic_contracts_roll_on_expiry_day():
+    futures = pd.DataFrame({'date': ['2025-02-18', '2025-02-19', '2025-02-19', '2025-02-19'],
+                            'ticker': ['UX1 Index', 'UX1 Index', 'UX2 Index', 'VIX Index']})
+
+    with_expiries = attach_expiries(futures)
+
+    assert with_expiries['expiry_date'].dt.strftime('%Y-%m-%d').tolist()[:3] == [
+        '2025-02-19', '2025-03-18', '2025-04-16']
+    assert with_expiries['days_to_expiry'].tolist()[:3] == [1, 27, 56]
+    assert with_expiries['expiry_date'].isna().tolist() == [False, False, False, True]
+
+
+def _linear_strip(dates, intercept=15.0, slope=0.05):
+    """Generic strip priced on a straight line in days to expiry"""
+    futures = pd.DataFrame({'date': np.repeat(dates, 8),
+                            'ticker': [f'UX{n} Index' for n in range(1, 9)] * len(dates)})
+    futures = attach_expiries(futures)
+    futures['last_price'] = intercept + slope * futures['days_to_expiry']
+    return futures
+
+
+def test_linear_curve_is_recovered_exactly():
+    dates = pd.bdate_range('2025-03-03', periods=30)
+    futures = _linear_strip(dates)
+    spot = pd.Series(15.0, index=dates)
+
+    frame = term_structure_frame(futures, spot=spot)
+
+    for maturity in (30, 60, 90, 180):
+        np.testing.assert_allclose(frame[f'cm_{maturity}d'], 15.0 + 0.05 * maturity)
+    np.testing.assert_allclose(frame['slope'], 0.05 * 150)
+    np.testing.assert_allclose(frame['curvature'], 0.0, atol=1e-12)
+    # Contango: spot below the 30-day point rolls down at a negative yield
+    assert frame['roll_yield'].iloc[0] == pytest.approx((15.0 - 16.5) / 16.5 * 365 / 30)
+
+
+def test_maturities_outside_the_strip_are_nan_without_spot():
+    dates = pd.bdate_range('2025-03-03', periods=5)
+    futures = _linear_strip(dates)
+    futures = futures[futures['ticker'].isin(['UX2 Index', 'UX3 Index'])]
+
+    curve = ConstantMaturityCurve.from_futures(futures, maturities=(30, 60, 180))
+
+    # UX2/UX3 sit roughly 40-80 days out: 60 is bracketed, 30 and 180 are not
+    assert np.isnan(curve.column(30)).all() and np.isnan(curve.column(180)).all()
+    np.testing.assert_allclose(curve.column(60), 18.0)
@@ -0,0 +1,62 @@
+"""
+Volatility Matrix Cache Tests
+Pivoting the long frame into (date x ticker) matrices and refreshing the cached
+matrices with new days, backfilled gaps and restated values.
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.analysis.vol_matrix_cache import VolatilityMatrix, VolatilityMatrixCache
+
+
+def _long(dates, ticker, values, data_type='realized'):
+    return pd.DataFrame({
+        'date': pd.to_datetime(dates),
+        'ticker': ticker,
+        'data_type': data_type,
+        'realized_vol_30d': values
+    })
+
+
+def test_from_long_pivots_and_masks_missing_cells():
+    df = pd.concat([_long(['2025-01-02', '2025-01-03'], 'SPX Index', [15.0, 16.0]),
+                    _long(['2025-01-03'], 'AAPL US Equity', [25.0]),
+                    _long(['2025-01-02'], 'SPX Index', [99.0], data_type='implied')])
+
+    matrix = VolatilityMatrix.from_long(df, 'realized', 'realized_vol_30d')
+
+    assert matrix.tickers.tolist() == ['AAPL US Equity', 'SPX Index']
+    np.testing.assert_array_equal(matrix.missing, [[True, False], [False, False]])
+    np.testing.assert_array_equal(matrix.for_tickers(['SPX Index', 'MSFT US Equity']).values,
+                                  [[15.0, np.nan], [16.0, np.nan]])
+
+
+def test_refresh_folds_in_new_days_backfills_and_restatements(tmp_path):
+    cache = VolatilityMatrixCache(str(tmp_path))
+    # A partial first run: AAPL is missing its first day
+    first = pd.concat([_long(['2025-01-02', '2025-01-03', '2025-01-06'], 'SPX Index', [15.0, 16.0, 17.0]),
+                       _long(['2025-01-03', '2025-01-06'], 'AAPL US Equity', [25.0, 26.0])])
+    cache.refresh(first, 'realized', 'realized_vol_30d')
+
+    retry = pd.concat([_long(['2025-01-02'], 'AAPL US Equity', [24.0]),              # Backfilled gap
+                       _long(['2025-01-03'], 'SPX Index', [16.5]),                    # Restated
+                       _long(['2025-01-06', '2025-01-07'], 'SPX Index', [17.0, 18.0])])  # Unchanged, new day
+    refreshed = cache.refresh(retry, 'realized', 'realized_vol_30d')
+
+    full = pd.concat([first, retry]).drop_duplicates(['date', 'ticker'], keep='last')
+    expected = VolatilityMatrix.from_long(full, 'realized', 'realized_vol_30d')
+    assert refreshed.dates.equals(expected.dates)
+    np.testing.assert_array_equal(refreshed.values, expected.values)
+
+    # And it was persisted
+    np.testing.assert_array_equal(cache.load('realized', 'realized_vol_30d').values, expected.values)
+
+
+def test_changed_rows_ignores_cached_and_empty_values(tmp_path):
+    cache = VolatilityMatrixCache(str(tmp_path))
+    df = _long(['2025-01-02', '2025-01-03'], 'SPX Index', [15.0, 16.0])
+    matrix = cache.refresh(df, 'realized', 'realized_vol_30d')
+
+    again = pd.concat([df, _long(['2025-01-06'], 'SPX Index', [np.nan])])
+    assert not matrix.changed_rows(again).any()
@@ -18,6 +18,8 @@ from email.mime.multipart import MimeMultipart
 from pathlib import Path
 import logging
 
+from src.analysis.black76 import attach_forward, fill_missing_greeks
+
 try:
     import blpapi
     print("✅ Bloomberg API imported successfully")
@@ -277,13 +279,21 @@ class VIXStrategyDataFetcher:
         
         return pd.DataFrame(all_data)
     
-    def identify_target_delta_options(self, options_df, target_deltas=[10, 50]):
+    def identify_target_delta_options(self, options_df, target_deltas=[10, 50], futures_df=None):
         """
         Identify options closest to target deltas for POSITION INITIATION only
         This finds the specific contracts to enter at the start of each expiry cycle
+        
+        futures_df: optional UX futures history; option-days missing DELTA_MID or
+        IVOL_MID get Black-76 greeks off the future expiring with them
         """
         self.logger.info("Identifying target delta options for position initiation...")
         
+        if futures_df is not None and len(futures_df) > 0:
+            forward = attach_forward(options_df, futures_df, price_column='settle')
+            options_df = fill_missing_greeks(options_df, forward, price_column='mid', vol_column='implied_vol')
+            self.logger.info(f"Black-76 greeks filled for {(options_df['greeks_source'] == 'black76').sum()} option-days")
+        
         target_options = []
         
         # Group by expiry to find entry points for each monthly cycle
@@ -474,7 +484,7 @@ class VIXStrategyDataFetcher:
             # 4. CRITICAL: Identify Specific Positions to Enter
             if len(options_df) > 0:
                 self.logger.info("*** PHASE 1: Identifying specific option contracts to enter ***")
-                target_delta_df = self.identify_target_delta_options(options_df)
+                target_delta_df = self.identify_target_delta_options(options_df, futures_df=futures_df)
                 strategy_data['position_entry_points'] = target_delta_df
                 
                 # 5. CRITICAL: Create Position Tracking Manifest
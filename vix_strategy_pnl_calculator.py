@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+VIX Strategy P&L Calculator
+Runs the SHORT 1x 50Δ / LONG 2x 10Δ call spread backtest with daily UX delta
+hedge and monthly roll over data saved by VIXStrategyDataFetcher, and writes
+daily P&L, leg marks and a summary to data/vix_strategy/results.
+"""
+
+import sys
+import json
+import argparse
+from pathlib import Path
+from datetime import datetime
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.absolute()))
+
+from src.analysis.vix_strategy_backtest import backtest_vix_call_spread
+
+
+class VIXStrategyPnLCalculator:
+    """
+    Strategy performance from stored collections
+
+    Usage:
+        calculator = VIXStrategyPnLCalculator('./data/vix_strategy')
+        results = calculator.run_full_analysis()            # latest collection
+        results = calculator.run_full_analysis('20250720_110020')
+    """
+
+    OPTION_DATASETS = ['vix_options_discovery', 'position_tracking']
+
+    def __init__(self, data_dir='./data/vix_strategy', option_cost=0.0, future_cost=0.0):
+        self.data_dir = Path(data_dir)
+        self.results_dir = self.data_dir / 'results'
+        self.option_cost = option_cost
+        self.future_cost = future_cost
+
+    def latest_timestamp(self):
+        """Timestamp of the most recent collection with futures data"""
+        files = sorted(self.data_dir.glob('vix_strategy_vix_futures_*.csv'))
+        if not files:
+            return None
+        return files[-1].stem.replace('vix_strategy_vix_futures_', '')
+
+    def _load(self, data_type, timestamp):
+        path = self.data_dir / f'vix_strategy_{data_type}_{timestamp}.csv'
+        if not path.exists():
+            return pd.DataFrame()
+        return pd.read_csv(path, parse_dates=['date'])
+
+    def load_data(self, data_timestamp=None):
+        """
+        Options and futures for one collection
+
+        Option rows from chain discovery and position tracking are combined,
+        keeping the tracked row where both cover the same (ticker, date).
+        """
+        timestamp = data_timestamp or self.latest_timestamp()
+        if timestamp is None:
+            print(f"❌ No VIX futures data found in {self.data_dir}")
+            return None, None, None
+
+        frames = [self._load(data_type, timestamp) for data_type in self.OPTION_DATASETS]
+        frames = [df for df in frames if len(df) > 0]
+        futures_df = self._load('vix_futures', timestamp)
+        if not frames or len(futures_df) == 0:
+            print(f"❌ Collection {timestamp} is missing options or futures data")
+            return None, None, timestamp
+
+        options_df = pd.concat(frames, ignore_index=True)
+        options_df = options_df.drop_duplicates(['ticker', 'date'], keep='last').reset_index(drop=True)
+        print(f"📊 Loaded {len(options_df):,} option rows and {len(futures_df):,} futures rows ({timestamp})")
+        return options_df, futures_df, timestamp
+
+    def save_results(self, results, timestamp):
+        """Write daily P&L, leg marks and summary; returns the summary path"""
+        self.results_dir.mkdir(parents=True, exist_ok=True)
+        results['daily'].to_csv(self.results_dir / f'strategy_daily_pnl_{timestamp}.csv', index=False)
+        results['leg_days'].to_csv(self.results_dir / f'strategy_leg_marks_{timestamp}.csv', index=False)
+        results['hedge'].to_csv(self.results_dir / f'strategy_hedge_{timestamp}.csv', index=False)
+
+        summary_file = self.results_dir / f'strategy_summary_{timestamp}.json'
+        with open(summary_file, 'w') as f:
+            json.dump(results['summary'], f, indent=2)
+        return summary_file
+
+    def print_summary(self, summary):
+        print("\n📈 STRATEGY PERFORMANCE")
+        print("=" * 60)
+        print(f"Period:          {summary['start_date']} to {summary['end_date']}")
+        print(f"Cycles traded:   {summary['cycles_traded']} / {summary['cycles_total']}")
+        print(f"Total P&L:       ${summary['total_pnl']:,.0f}")
+        print(f"Sharpe ratio:    {summary['sharpe_ratio']:.2f}")
+        print(f"Max drawdown:    ${summary['max_drawdown']:,.0f}")
+        print(f"Hit rate:        {summary['hit_rate_pct']:.1f}%")
+        print(f"Costs:           ${summary['total_costs']:,.0f}")
+        print("\nP&L attribution:")
+        for key in ['short_50d_pnl', 'long_10d_pnl', 'hedge_pnl',
+                    'delta_pnl', 'gamma_pnl', 'vega_pnl', 'theta_pnl', 'residual_pnl']:
+            if key in summary:
+                print(f"  {key:<15} ${summary[key]:>12,.0f}")
+
+    def run_full_analysis(self, data_timestamp=None):
+        """Load a collection, backtest it and save the results; returns the results dict"""
+        options_df, futures_df, timestamp = self.load_data(data_timestamp)
+        if options_df is None:
+            return None
+
+        start = datetime.now()
+        results = backtest_vix_call_spread(options_df, futures_df,
+                                           option_cost=self.option_cost, future_cost=self.future_cost)
+        if results is None:
+            return None
+        elapsed = (datetime.now() - start).total_seconds()
+
+        summary_file = self.save_results(results, timestamp)
+        self.print_summary(results['summary'])
+        print(f"\n✅ Backtest ran in {elapsed:.2f}s; results saved to {summary_file.parent}")
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='VIX call spread strategy P&L')
+    parser.add_argument('--data-dir', default='./data/vix_strategy')
+    parser.add_argument('--timestamp', help='Collection timestamp (default: latest)')
+    parser.add_argument('--option-cost', type=float, default=0.0, help='Cost per option contract traded, in points')
+    parser.add_argument('--future-cost', type=float, default=0.0, help='Cost per future contract traded, in points')
+    args = parser.parse_args()
+
+    calculator = VIXStrategyPnLCalculator(args.data_dir, args.option_cost, args.future_cost)
+    results = calculator.run_full_analysis(args.timestamp)
+    sys.exit(0 if results else 1)
+
+
+if __name__ == "__main__":
+    main()